@@ -9,6 +9,8 @@ from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from collections import defaultdict
 
+from metric_values import metric_value
+
 # Import models
 try:
     from database import SessionLocal, Competitor
@@ -154,23 +156,24 @@ class ThreatScoreCalculator:
         size_overlap = any(s in size_focus for s in self.CERTIFY_SIZE_FOCUS)
         components["customer_size_overlap"] = 80 if size_overlap else 30
         
-        # 3. Funding Strength
+        # 3. Funding Strength (v5.2.1: typed funding_total_value, USD)
         funding = (competitor.get("funding_total") or "").lower()
-        if "public" in funding or ">$100m" in funding or "$100m" in funding or "$300m" in funding:
+        funding_usd = metric_value(competitor, "funding_total") or 0
+        if "public" in funding or funding_usd >= 100_000_000:
             components["funding_strength"] = 90
             signals.append("Well-funded competitor")
-        elif "$50m" in funding or "$40m" in funding:
+        elif funding_usd >= 40_000_000:
             components["funding_strength"] = 60
         else:
             components["funding_strength"] = 30
         
-        # 4. Growth Rate
-        growth = (competitor.get("employee_growth_rate") or "").lower()
-        if "20%" in growth or "25%" in growth or "30%" in growth:
+        # 4. Growth Rate (percent)
+        growth = metric_value(competitor, "employee_growth_rate") or 0
+        if growth >= 20:
             components["growth_rate"] = 90
             signals.append("Rapid growth detected")
             recommendations.append(f"Monitor {competitor.get('name')} for aggressive expansion")
-        elif "10%" in growth or "15%" in growth:
+        elif growth >= 10:
             components["growth_rate"] = 60
         else:
             components["growth_rate"] = 30
@@ -181,13 +184,13 @@ class ThreatScoreCalculator:
         components["product_breadth"] = min(product_count * 20, 100)
         
         # 6. Customer Base
-        customers = competitor.get("customer_count") or ""
-        if "100000" in customers or "75000" in customers or "40000" in customers:
+        customers = metric_value(competitor, "customer_count") or 0
+        if customers >= 40000:
             components["customer_base"] = 95
             signals.append("Large installed base")
-        elif "3000" in customers or "5000" in customers or "25000" in customers:
+        elif customers >= 3000:
             components["customer_base"] = 70
-        elif "500" in customers or "1000" in customers:
+        elif customers >= 500:
             components["customer_base"] = 50
         else:
             components["customer_base"] = 30
@@ -256,14 +259,12 @@ class MarketShareEstimator:
         """Estimate competitor market share."""
         data_points = {}
         
-        # Extract customer count
+        # Customer and employee counts (typed columns when the dict carries them)
         customer_str = competitor.get("customer_count") or "0"
-        customers = self._parse_number(customer_str)
+        customers = int(metric_value(competitor, "customer_count") or 0)
         data_points["customers"] = customers
         
-        # Extract employee count for revenue estimation
-        employee_str = competitor.get("employee_count") or "0"
-        employees = self._parse_number(employee_str)
+        employees = int(metric_value(competitor, "employee_count") or 0)
         data_points["employees"] = employees
         
         # Estimate based on customers
@@ -294,13 +295,6 @@ class MarketShareEstimator:
             methodology=methodology,
             data_points=data_points
         )
-    
-    def _parse_number(self, s: str) -> int:
-        """Parse a number string like '3000+' or '1,500'."""
-        import re
-        s = s.replace(",", "").replace("+", "")
-        match = re.search(r'\d+', s)
-        return int(match.group()) if match else 0
 
 
 # ============== Feature Gap Analysis ==============
@@ -0,0 +1,437 @@
+"""
+Certify Intel - Competitor Metrics Rollup (v5.2.1)
+Precomputed competitor metrics for the analytics dashboard, market map, threat distribution
+and sales priority matrix.
+
+Every non-deleted competitor has one row in competitor_metrics_rollup with the
+values those views derive from it: status, threat level, typed customer and
+employee counts, dimension scores, weaknesses/strengths and the sales priority
+bucket. The single analytics_rollup_state row holds the dashboard aggregates
+(status and threat counts, average data quality, dimension averages), a
+version number bumped on every refresh and the refresh timestamps. Requests
+read the state row and the rollup rows instead of loading and scoring every
+competitor; responses carry the version and timestamps so clients can tell
+whether what they hold is stale.
+
+Rows are refreshed:
+1. Incrementally - competitors written through an ORM session are queued when
+   the session commits (install_change_tracking) and recomputed after a short
+   debounce, or before the next rollup read in the same process
+2. Fully - rebuild() recomputes every row on first use, when ROLLUP_VERSION is
+   bumped, on POST /api/analytics/rollup/rebuild and on the scheduler interval,
+   which also picks up writes from other processes and raw SQL
+
+Configuration (environment):
+    ANALYTICS_ROLLUP_DEBOUNCE_SECONDS   Delay before refreshing queued competitors (default 2)
+    ANALYTICS_ROLLUP_REBUILD_MINUTES    Scheduled full rebuild interval, 0 to disable (default 60)
+"""
+import os
+import json
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from change_tracking import track_committed
+from sales_marketing_module import DimensionID
+
+logger = logging.getLogger(__name__)
+
+
+# Bump when a computed value changes so every row is rebuilt
+ROLLUP_VERSION = "1"
+
+DEBOUNCE_SECONDS = float(os.getenv("ANALYTICS_ROLLUP_DEBOUNCE_SECONDS", "2"))
+REBUILD_MINUTES = int(os.getenv("ANALYTICS_ROLLUP_REBUILD_MINUTES", "60"))
+
+# Competitor.dim_<id>_score for each evaluation dimension
+DIMENSION_IDS = tuple(d.value for d in DimensionID)
+
+PRIORITY_BUCKETS = ("high_priority", "medium_priority", "low_priority", "not_assessed")
+
+FRESH_DAYS = 7   # Updated within 7 days
+STALE_DAYS = 30  # Not updated in 30+ days
+
+# session.info key for competitor ids flushed but not yet committed
+_PENDING_KEY = "analytics_rollup_changes"
+
+
+# ============== Row computation ==============
+
+def sales_priority(threat_level: Optional[str], weaknesses: List[str], strengths: List[str]) -> str:
+    """Sales priority bucket from threat level and dimension weaknesses (score <= 2)."""
+    if not weaknesses and not strengths:
+        return "not_assessed"
+    if threat_level == "High" and weaknesses:
+        return "high_priority"
+    if threat_level in ("High", "Medium") or len(weaknesses) >= 3:
+        return "medium_priority"
+    return "low_priority"
+
+
+def rollup_values(c: Any) -> Dict[str, Any]:
+    """Column values of the rollup row for one Competitor."""
+    scores = {}
+    for dim_id in DIMENSION_IDS:
+        score = getattr(c, f"dim_{dim_id}_score", None)
+        if score is not None:
+            scores[dim_id] = score
+    weaknesses = [dim_id for dim_id, score in scores.items() if score <= 2]
+    strengths = [dim_id for dim_id, score in scores.items() if score >= 4]
+    return {
+        "name": c.name,
+        "status": c.status,
+        "threat_level": c.threat_level,
+        "last_updated": c.last_updated,
+        "data_quality_score": c.data_quality_score,
+        "customer_count": c.customer_count_value,
+        "employee_count": c.employee_count_value,
+        "category": c.product_categories[:50] if c.product_categories else None,
+        "dim_overall_score": c.dim_overall_score,
+        "dimension_scores": json.dumps(scores),
+        "weaknesses": json.dumps(weaknesses),
+        "strengths": json.dumps(strengths),
+        "weakness_count": len(weaknesses),
+        "strength_count": len(strengths),
+        "sales_priority": sales_priority(c.threat_level, weaknesses, strengths),
+    }
+
+
+def summarize(rows: Iterable[Any]) -> Dict[str, Any]:
+    """Dashboard aggregates over rollup rows (stored on the state row)."""
+    total = 0
+    quality_sum = 0
+    status_counts: Dict[str, int] = {}
+    threat_levels: Dict[str, int] = {}
+    dimension_scores: Dict[str, List[int]] = {}
+    for row in rows:
+        total += 1
+        quality_sum += row.data_quality_score or 0
+        status = row.status or "Unknown"
+        status_counts[status] = status_counts.get(status, 0) + 1
+        level = row.threat_level or ""
+        threat_levels[level] = threat_levels.get(level, 0) + 1
+        for dim_id, score in json.loads(row.dimension_scores or "{}").items():
+            dimension_scores.setdefault(dim_id, []).append(score)
+
+    return {
+        "total": total,
+        "status_counts": status_counts,
+        "threat_levels": threat_levels,  # Exact threat_level values; "" when unset
+        "avg_data_quality": round(quality_sum / total, 1) if total else 0,
+        "dimension_averages": {
+            dim_id.replace("_", " ").title(): sum(scores) / len(scores)
+            for dim_id, scores in dimension_scores.items()
+        },
+    }
+
+
+def row_to_priority_entry(row: Any) -> Dict[str, Any]:
+    """Sales priority matrix entry for a rollup row."""
+    return {
+        "id": row.competitor_id,
+        "name": row.name,
+        "threat_level": row.threat_level,
+        "overall_score": row.dim_overall_score,
+        "weakness_count": row.weakness_count or 0,
+        "strength_count": row.strength_count or 0,
+        "weaknesses": json.loads(row.weaknesses or "[]"),
+        "strengths": json.loads(row.strengths or "[]"),
+    }
+
+
+# ============== Rollup ==============
+
+class MetricsRollup:
+    """
+    Keeps competitor_metrics_rollup and analytics_rollup_state current.
+
+    Competitor ids queued by mark_changed() are refreshed by a debounce timer
+    in a session from session_factory (debounce_seconds=None disables the
+    timer; queued ids are then refreshed by the next read). Refreshes and
+    rebuilds are serialized within the process.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        debounce_seconds: Optional[float] = DEBOUNCE_SECONDS
+    ):
+        self._session_factory = session_factory
+        self.debounce_seconds = debounce_seconds
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._pending: Set[int] = set()
+        self._timer: Optional[threading.Timer] = None
+        self.stats = {
+            "refreshes": 0,         # Incremental refreshes
+            "rows_refreshed": 0,
+            "rebuilds": 0,
+            "errors": 0,
+        }
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def _new_session(self) -> Session:
+        if self._session_factory is None:
+            from database import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    # ============== Incremental refresh ==============
+
+    def mark_changed(self, competitor_ids: Iterable[int]):
+        """Queue competitors for refresh and start the debounce timer."""
+        ids = {i for i in competitor_ids if i is not None}
+        if not ids:
+            return
+        with self._lock:
+            self._pending |= ids
+            if self.debounce_seconds is None or self._timer is not None:
+                return
+            self._timer = threading.Timer(self.debounce_seconds, self._refresh_in_background)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _refresh_in_background(self):
+        with self._lock:
+            self._timer = None
+        db = self._new_session()
+        try:
+            self.refresh_pending(db)
+        except Exception as e:
+            logger.warning(f"Analytics rollup refresh failed: {e}")
+        finally:
+            db.close()
+
+    @property
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def refresh_pending(self, db: Session) -> int:
+        """Refresh every queued competitor. Returns rows refreshed."""
+        with self._lock:
+            ids, self._pending = self._pending, set()
+        if not ids:
+            return 0
+        try:
+            return self.refresh(db, ids)
+        except Exception:
+            db.rollback()
+            with self._lock:
+                self._pending |= ids  # Retried by the next refresh
+            self._count("errors")
+            raise
+
+    def refresh(self, db: Session, competitor_ids: Iterable[int]) -> int:
+        """Recompute the rows of some competitors (deleted ones are dropped) and the aggregates."""
+        from database import Competitor, CompetitorMetricsRollup
+
+        ids = list(set(competitor_ids))
+        with self._refresh_lock:
+            competitors = {
+                c.id: c for c in db.query(Competitor).filter(
+                    Competitor.id.in_(ids), Competitor.is_deleted == False
+                )
+            }
+            rows = {
+                r.competitor_id: r for r in db.query(CompetitorMetricsRollup).filter(
+                    CompetitorMetricsRollup.competitor_id.in_(ids)
+                )
+            }
+            now = datetime.utcnow()
+            for competitor_id in ids:
+                competitor, row = competitors.get(competitor_id), rows.get(competitor_id)
+                if competitor is None:
+                    if row is not None:
+                        db.delete(row)
+                    continue
+                if row is None:
+                    row = CompetitorMetricsRollup(competitor_id=competitor_id)
+                    db.add(row)
+                for column, value in rollup_values(competitor).items():
+                    setattr(row, column, value)
+                row.refreshed_at = now
+            db.flush()
+            self._store_state(db, now, rebuilt=False)
+            db.commit()
+        self._count("refreshes")
+        self._count("rows_refreshed", len(ids))
+        return len(ids)
+
+    # ============== Full rebuild ==============
+
+    def rebuild(self, db: Session) -> int:
+        """Recompute every row from the competitors table. Returns rows written."""
+        from database import Competitor, CompetitorMetricsRollup
+
+        with self._refresh_lock:
+            with self._lock:
+                self._pending.clear()  # Covered by the rebuild
+            now = datetime.utcnow()
+            db.query(CompetitorMetricsRollup).delete(synchronize_session=False)
+            count = 0
+            for competitor in db.query(Competitor).filter(Competitor.is_deleted == False).all():
+                db.add(CompetitorMetricsRollup(competitor_id=competitor.id, refreshed_at=now, **rollup_values(competitor)))
+                count += 1
+            db.flush()
+            self._store_state(db, now, rebuilt=True)
+            db.commit()
+        self._count("rebuilds")
+        return count
+
+    def _store_state(self, db: Session, now: datetime, rebuilt: bool):
+        """Recompute the aggregates and bump the version (in the caller's transaction)."""
+        from database import AnalyticsRollupState, CompetitorMetricsRollup
+
+        summary = json.dumps(summarize(db.query(
+            CompetitorMetricsRollup.status, CompetitorMetricsRollup.threat_level,
+            CompetitorMetricsRollup.data_quality_score, CompetitorMetricsRollup.dimension_scores
+        )))
+        values = {"summary": summary, "refreshed_at": now}
+        if rebuilt:
+            values.update(rollup_version=ROLLUP_VERSION, rebuilt_at=now)
+        # Increment in SQL so refreshes from several processes don't reuse a version
+        updated = db.query(AnalyticsRollupState).filter(AnalyticsRollupState.id == 1).update(
+            dict(values, version=AnalyticsRollupState.version + 1), synchronize_session=False
+        )
+        if not updated:
+            db.add(AnalyticsRollupState(id=1, version=1, **values))
+
+    # ============== Request path ==============
+
+    def current_state(self, db: Session):
+        """
+        The state row after applying this process's queued changes; rebuilds
+        when the rollup was never built or ROLLUP_VERSION changed. Refreshes
+        and rebuilds commit in a session of their own, so the caller's
+        request session is only read from.
+        """
+        from database import AnalyticsRollupState, CompetitorMetricsRollup
+
+        state = db.get(AnalyticsRollupState, 1)
+        if self.pending_count or state is None or state.rollup_version != ROLLUP_VERSION:
+            session = self._new_session()
+            try:
+                if self.pending_count:
+                    try:
+                        self.refresh_pending(session)
+                    except Exception as e:
+                        logger.warning(f"Analytics rollup refresh failed, serving previous rows: {e}")
+                stored = session.get(AnalyticsRollupState, 1)
+                if stored is None or stored.rollup_version != ROLLUP_VERSION:
+                    self.rebuild(session)
+            finally:
+                session.close()
+            # Rollup rows the caller already loaded were rewritten by the other session
+            for obj in list(db.identity_map.values()):
+                if isinstance(obj, (AnalyticsRollupState, CompetitorMetricsRollup)):
+                    db.expire(obj)
+            state = db.get(AnalyticsRollupState, 1)
+        return state
+
+    def summary(self, db: Session) -> Dict[str, Any]:
+        """Stored dashboard aggregates plus "rollup" version info."""
+        state = self.current_state(db)
+        summary = json.loads(state.summary or "{}")
+        summary["rollup"] = version_info(state)
+        return summary
+
+    def rows(self, db: Session):
+        """Query over the rollup rows (call current_state or summary first)."""
+        from database import CompetitorMetricsRollup
+        return db.query(CompetitorMetricsRollup)
+
+    def freshness_counts(self, db: Session, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Competitors updated within FRESH_DAYS and not updated in more than STALE_DAYS (age in days)."""
+        from database import CompetitorMetricsRollup
+
+        now = now or datetime.utcnow()
+        # (now - last_updated).days <= 7 / > 30 on whole days, as the dashboard always counted
+        fresh_cutoff = now - timedelta(days=FRESH_DAYS + 1)
+        stale_cutoff = now - timedelta(days=STALE_DAYS + 1)
+        updated = CompetitorMetricsRollup.last_updated
+        fresh, stale = db.query(
+            func.sum(case((updated > fresh_cutoff, 1), else_=0)),
+            func.sum(case((updated <= stale_cutoff, 1), else_=0)),
+        ).one()
+        return {"fresh": int(fresh or 0), "stale": int(stale or 0)}
+
+    def get_stats(self, db: Session) -> Dict[str, Any]:
+        """Counters, queued competitors and the current version info (no refresh)."""
+        from database import AnalyticsRollupState, CompetitorMetricsRollup
+
+        with self._lock:
+            stats = dict(self.stats)
+            stats["pending"] = len(self._pending)
+        stats["rows"] = db.query(func.count(CompetitorMetricsRollup.competitor_id)).scalar()
+        state = db.get(AnalyticsRollupState, 1)
+        stats["rollup"] = version_info(state) if state else None
+        stats["rebuild_required"] = state is None or state.rollup_version != ROLLUP_VERSION
+        return stats
+
+    def shutdown(self, refresh: bool = True):
+        """Cancel the debounce timer and (optionally) apply queued changes now."""
+        with self._lock:
+            timer, self._timer = self._timer, None
+        if timer:
+            timer.cancel()
+        if refresh and self.pending_count:
+            db = self._new_session()
+            try:
+                self.refresh_pending(db)
+            finally:
+                db.close()
+
+
+def version_info(state: Any) -> Dict[str, Any]:
+    """Version and timestamps clients compare to decide whether their copy is stale."""
+    return {
+        "version": state.version,
+        "refreshed_at": state.refreshed_at.isoformat() if state.refreshed_at else None,
+        "rebuilt_at": state.rebuilt_at.isoformat() if state.rebuilt_at else None,
+    }
+
+
+# ============== Change tracking ==============
+
+def _apply_commit(competitor_ids):
+    if _rollup_instance is not None:
+        _rollup_instance.mark_changed(competitor_ids)
+
+
+def install_change_tracking():
+    """Hook every SQLAlchemy session so committed competitor writes refresh their rollup rows."""
+    from database import Competitor
+
+    track_committed(_PENDING_KEY, (Competitor,), _apply_commit)
+
+
+# ============== CONVENIENCE FUNCTIONS ==============
+
+# Singleton instance
+_rollup_instance = None
+_rollup_lock = threading.Lock()
+
+
+def get_metrics_rollup() -> MetricsRollup:
+    """Get the metrics rollup (installs change tracking on first use)."""
+    global _rollup_instance
+    if _rollup_instance is None:
+        with _rollup_lock:
+            if _rollup_instance is None:
+                _rollup_instance = MetricsRollup()
+                install_change_tracking()
+    return _rollup_instance
+
+
+def shutdown_metrics_rollup():
+    """Apply queued changes and stop the debounce timer."""
+    if _rollup_instance is not None:
+        _rollup_instance.shutdown()
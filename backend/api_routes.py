@@ -22,6 +22,7 @@ from extended_features import (
     WinLossRecord, ClassificationWorkflow
 )
 from analytics import AnalyticsEngine
+from metric_values import METRIC_FIELDS
 from reports import ReportManager
 from external_scrapers import ExternalDataCollector
 from data_enrichment import data_enrichment, ClearbitLogoService
@@ -464,6 +465,10 @@ async def get_competitor_analysis(competitor_id: int):
         "employee_count": comp.employee_count,
         "latest_round": comp.latest_round,
     }
+    # Typed metrics (v5.2.1) so the analytics engine doesn't re-parse the text fields
+    comp_dict.update({
+        f"{field}_value": getattr(comp, f"{field}_value") for field in METRIC_FIELDS
+    })
     
     return analytics_engine.full_analysis(comp_dict)
 
@@ -2,16 +2,21 @@
 """
 Backup Manager Module
 Handles automated database backups and retention policies.
+
+v5.2.1: Backs up whatever DATABASE_URL points at. SQLite files are copied
+with the online backup API (consistent even in WAL mode, where the main file
+alone may lag the -wal file); PostgreSQL is dumped with pg_dump when it is
+installed.
 """
 import os
 import shutil
 import glob
+import subprocess
 from datetime import datetime
 from pathlib import Path
 
 # Configuration
 BACKUP_DIR = "backups"
-DB_FILE = "certify_intel.db"
 MAX_BACKUPS = 7  # Keep last 7 days
 
 def ensure_backup_dir():
@@ -20,25 +25,59 @@ def ensure_backup_dir():
         os.makedirs(BACKUP_DIR)
         print(f"Created backup directory: {BACKUP_DIR}")
 
+def _backup_sqlite(engine, backup_filename):
+    """Page-by-page copy through SQLite's backup API on a pooled connection."""
+    import sqlite3
+    raw = engine.raw_connection()
+    try:
+        target = sqlite3.connect(backup_filename)
+        try:
+            raw.driver_connection.backup(target)
+        finally:
+            target.close()
+    finally:
+        raw.close()
+
+def _backup_postgres(engine, backup_filename):
+    """pg_dump custom-format archive (restore with pg_restore)."""
+    if not shutil.which("pg_dump"):
+        print("Warning: pg_dump not found on PATH. Skipping PostgreSQL backup.")
+        return False
+    url = engine.url.set(drivername="postgresql")
+    env = dict(os.environ, PGPASSWORD=url.password or "")
+    subprocess.run(
+        ["pg_dump", "--format=custom", "--file", backup_filename,
+         url.set(password=None).render_as_string(hide_password=False)],
+        check=True, env=env, capture_output=True, timeout=3600
+    )
+    return True
+
 def create_backup():
     """Create a backup of the current database."""
     try:
         ensure_backup_dir()
-        
-        if not os.path.exists(DB_FILE):
-            print(f"Warning: Database file {DB_FILE} not found. Skipping backup.")
-            return False
+        from database import engine
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_filename = f"{BACKUP_DIR}/certify_intel_backup_{timestamp}.db"
-        
-        # Copy the file
-        shutil.copy2(DB_FILE, backup_filename)
+        if engine.dialect.name == "sqlite":
+            db_file = engine.url.database
+            if not db_file or not os.path.exists(db_file):
+                print(f"Warning: Database file {db_file} not found. Skipping backup.")
+                return False
+            backup_filename = f"{BACKUP_DIR}/certify_intel_backup_{timestamp}.db"
+            _backup_sqlite(engine, backup_filename)
+        elif engine.dialect.name == "postgresql":
+            backup_filename = f"{BACKUP_DIR}/certify_intel_backup_{timestamp}.dump"
+            if not _backup_postgres(engine, backup_filename):
+                return False
+        else:
+            print(f"Warning: No backup method for {engine.dialect.name}. Skipping backup.")
+            return False
         print(f"Database backup created: {backup_filename}")
-        
+
         # Prune old backups
         prune_old_backups()
-        
+
         return True
     except Exception as e:
         print(f"Error creating backup: {e}")
@@ -48,7 +87,7 @@ def prune_old_backups():
     """Remove backups older than MAX_BACKUPS."""
     try:
         # Get list of backup files
-        backups = glob.glob(f"{BACKUP_DIR}/certify_intel_backup_*.db")
+        backups = glob.glob(f"{BACKUP_DIR}/certify_intel_backup_*.db") + glob.glob(f"{BACKUP_DIR}/certify_intel_backup_*.dump")
         
         # Sort by creation time (newest first)
         backups.sort(key=os.path.getctime, reverse=True)
@@ -0,0 +1,127 @@
+"""
+Certify Intel - Keyword Matching Benchmark (v5.2.1)
+Compares the original per-keyword substring loops with the compiled KeywordMatcher.
+
+Each article (headline + snippet) goes through the keyword work done on a
+news refresh: keyword sentiment, event detection and dimension keyword
+matching. Reports articles/sec for both implementations and checks that they
+agree on every article.
+
+Usage:
+    python benchmark_keywords.py
+    python benchmark_keywords.py --count 20000 --repeat 5
+"""
+import argparse
+import random
+import sys
+import time
+
+from news_monitor import NewsMonitor
+from sales_marketing_module import DIMENSION_METADATA, DimensionID, match_dimension_signals
+
+COMPANIES = ["Phreesia", "Epic Systems", "athenahealth", "Clearwave", "Health Catalyst", "Kyruus"]
+HEADLINES = [
+    "{c} raises ${n} million in Series {s} funding to expand patient intake",
+    "{c} faces lawsuit over data breach affecting {n},000 patients",
+    "{c} announces partnership with {c2} to streamline hospital check-in workflows",
+    "{c} reports {n}% growth as demand for digital front door tools rises",
+    "{c} cuts {n} jobs amid slowing growth in healthcare IT spending",
+    "{c} appoints new chief executive officer",
+    "Health system goes live with {c} scheduling across {n} clinics",
+    "{c} names new CFO",
+]
+SNIPPETS = [
+    "The company said the EHR integration with Epic and Cerner will reduce implementation time for customers.",
+    "Analysts expect pricing pressure as hospitals renegotiate contracts and look for ROI dashboards.",
+    "Customers cited easy onboarding, responsive support and strong uptime in recent reviews.",
+    "The release adds HIPAA-compliant messaging, SOC 2 reporting and new analytics for administrators.",
+    "",
+]
+
+
+def synthetic_articles(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    return [
+        (
+            rng.choice(HEADLINES).format(
+                c=rng.choice(COMPANIES), c2=rng.choice(COMPANIES), n=rng.randint(2, 400), s=rng.choice("ABCDE")
+            ),
+            rng.choice(SNIPPETS),
+        )
+        for _ in range(count)
+    ]
+
+
+# ============== Original implementations (pre-v5.2.1) ==============
+
+def original_sentiment(text):
+    text_lower = text.lower()
+    positive = sum(1 for word in NewsMonitor.POSITIVE_KEYWORDS if word in text_lower)
+    negative = sum(1 for word in NewsMonitor.NEGATIVE_KEYWORDS if word in text_lower)
+    return "positive" if positive > negative else "negative" if negative > positive else "neutral"
+
+
+def original_event(text):
+    text_lower = text.lower()
+    for event_type, keywords in NewsMonitor.EVENT_KEYWORDS.items():
+        if any(keyword in text_lower for keyword in keywords):
+            return event_type
+    return None
+
+
+def original_dimensions(text):
+    text_lower = text.lower()
+    result = {}
+    for dim_id in DimensionID:
+        meta = DIMENSION_METADATA[dim_id]
+        matches = sum(1 for s in meta.get("keywords", []) + meta.get("review_signals", []) if s.lower() in text_lower)
+        if matches:
+            result[dim_id.value] = matches
+    return result
+
+
+def run_original(articles):
+    return [
+        (original_sentiment(f"{t} {s}"), original_event(f"{t} {s}"), original_dimensions(f"{t} {s}"))
+        for t, s in articles
+    ]
+
+
+def run_compiled(articles):
+    monitor = NewsMonitor.__new__(NewsMonitor)  # Keyword helpers need no sources or API keys
+    return [
+        (monitor._keyword_sentiment(f"{t} {s}"), monitor._detect_event_type(f"{t} {s}"), match_dimension_signals(f"{t} {s}"))
+        for t, s in articles
+    ]
+
+
+def best_rate(run, articles, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run(articles)
+        best = min(best, time.perf_counter() - start)
+    return len(articles) / best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=5000, help="Synthetic article count")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per implementation (best is reported)")
+    args = parser.parse_args()
+
+    articles = synthetic_articles(args.count)
+    before, expected = best_rate(run_original, articles, args.repeat)
+    after, actual = best_rate(run_compiled, articles, args.repeat)
+    mismatches = sum(a != b for a, b in zip(expected, actual))
+
+    print(f"\n{len(articles)} articles (sentiment + event + dimension keywords), best of {args.repeat}\n")
+    print(f"{'implementation':<28}{'articles/s':>12}")
+    print(f"{'substring loops (original)':<28}{before:>12.0f}")
+    print(f"{'compiled KeywordMatcher':<28}{after:>12.0f}")
+    print(f"\nspeedup {after / before:.2f}x, {mismatches} mismatching articles")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
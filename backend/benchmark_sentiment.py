@@ -0,0 +1,153 @@
+"""
+Certify Intel - Sentiment Backend Benchmark (v5.2.1)
+Compares the original full-precision pipeline with the optimized CPU backends.
+
+For each backend it reports model load time, bulk throughput (texts/sec over
+the whole corpus), per-request latency p50/p95 for small refresh-sized
+batches, and label agreement with the baseline. A final row shows the same
+bulk run served from the score cache.
+
+Usage:
+    python benchmark_sentiment.py
+    python benchmark_sentiment.py --model general --texts headlines.txt --backends pytorch,int8,onnx
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+
+import ml_sentiment
+from ml_sentiment import MLSentimentAnalyzer, SentimentResult, SentimentResultCache, BACKENDS
+
+COMPANIES = ["Phreesia", "Epic Systems", "athenahealth", "Clearwave", "Health Catalyst", "Kyruus"]
+TEMPLATES = [
+    "{c} raises ${n} million in Series {s} funding to expand patient intake",
+    "{c} faces lawsuit over data breach affecting {n},000 patients",
+    "{c} announces partnership with {c2} to streamline hospital check-in workflows",
+    "{c} reports quarterly revenue growth of {n}% as demand for digital front door tools rises",
+    "{c} cuts {n} jobs amid slowing growth in healthcare IT spending",
+    "{c} appoints new chief executive officer",
+    "{c} launches AI scheduling assistant. The release lets health systems automate reminders, "
+    "waitlists and intake forms across {n} locations without adding staff.",
+]
+
+
+def synthetic_headlines(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    return [
+        rng.choice(TEMPLATES).format(
+            c=rng.choice(COMPANIES), c2=rng.choice(COMPANIES), n=rng.randint(2, 400), s=rng.choice("ABCDE")
+        )
+        for _ in range(count)
+    ]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def measure(name, analyze, texts, request_size):
+    analyze(texts[:request_size])  # Warm-up
+    start = time.perf_counter()
+    labels = [r.label for r in analyze(texts)]
+    bulk = time.perf_counter() - start
+
+    latencies = []
+    for i in range(0, len(texts), request_size):
+        t0 = time.perf_counter()
+        analyze(texts[i:i + request_size])
+        latencies.append((time.perf_counter() - t0) * 1000)
+    return {
+        "name": name,
+        "texts_per_sec": len(texts) / bulk if bulk else float("inf"),
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": percentile(latencies, 95),
+        "labels": labels,
+    }
+
+
+def memory_cache():
+    """Score cache backed by a throwaway in-memory database."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+    from database import Base
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return SentimentResultCache(session_factory=sessionmaker(bind=engine))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="financial", choices=sorted(MLSentimentAnalyzer.MODELS))
+    parser.add_argument("--backends", default="int8,onnx", help="Comma-separated: " + ",".join(BACKENDS))
+    parser.add_argument("--texts", help="File with one headline per line (default: synthetic)")
+    parser.add_argument("--count", type=int, default=512, help="Synthetic headline count")
+    parser.add_argument("--request-size", type=int, default=8, help="Texts per latency-measured request")
+    args = parser.parse_args()
+
+    if not ml_sentiment.TRANSFORMERS_AVAILABLE:
+        print("Transformers not installed. Run: pip install transformers torch")
+        return 1
+
+    if args.texts:
+        with open(args.texts, encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()]
+    else:
+        texts = synthetic_headlines(args.count)
+
+    no_cache = SentimentResultCache()
+    no_cache.enabled = False
+
+    rows = []
+    start = time.perf_counter()
+    baseline = MLSentimentAnalyzer(model_type=args.model, backend="pytorch", cache=no_cache)
+    load_s = time.perf_counter() - start
+    if not baseline.is_available:
+        print("Baseline model failed to load.")
+        return 1
+
+    # The pre-v5.2.1 call: one unbucketed pipeline call, batch size 1, max_length 512
+    def original(batch):
+        return [
+            SentimentResult(label=baseline._map_label(r), score=r["score"], model=baseline.model_name, latency_ms=0)
+            for r in baseline.pipeline(batch)
+        ]
+
+    row = measure("baseline (original pipeline)", original, texts, args.request_size)
+    row["load_s"] = load_s
+    rows.append(row)
+
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    for backend in ["pytorch"] + [b for b in backends if b != "pytorch"]:
+        start = time.perf_counter()
+        analyzer = MLSentimentAnalyzer(model_type=args.model, backend=backend, cache=no_cache)
+        load_s = time.perf_counter() - start
+        if analyzer.backend != backend:
+            print(f"Skipping {backend}: not available (fell back to {analyzer.backend})")
+            continue
+        row = measure(f"{backend} (bucketed)", analyzer.analyze_batch, texts, args.request_size)
+        row["load_s"] = load_s
+        rows.append(row)
+
+    cached = MLSentimentAnalyzer(model_type=args.model, backend=analyzer.backend, cache=memory_cache())
+    cached.analyze_batch(texts)  # Populate
+    row = measure(f"{cached.backend} + score cache (warm)", cached.analyze_batch, texts, args.request_size)
+    row["load_s"] = 0.0
+    rows.append(row)
+
+    reference = rows[0]["labels"]
+    print(f"\n{len(texts)} texts, model {baseline.model_name}, {args.request_size} texts per request\n")
+    print(f"{'backend':<34}{'load s':>8}{'texts/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'agree':>8}")
+    for row in rows:
+        agree = sum(a == b for a, b in zip(reference, row["labels"])) / len(reference)
+        print(f"{row['name']:<34}{row['load_s']:>8.1f}{row['texts_per_sec']:>10.1f}"
+              f"{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{agree:>8.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
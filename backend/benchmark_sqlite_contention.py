@@ -0,0 +1,155 @@
+"""
+Certify Intel - SQLite Contention Benchmark (v5.2.1)
+Write throughput and read latency while scrapers write concurrently.
+
+Simulates a refresh-all against a scratch database file: scraper threads
+ingest batches of rows in their own transactions and log small activity rows
+between batches, while a reader thread runs dashboard-style queries. The run
+is repeated with the default settings (rollback journal, one commit per
+activity row) and with the production profile (WAL, pragmas, activity rows
+through the write queue). Reports rows written per second, lock errors and
+reader latency percentiles.
+
+Usage:
+    python benchmark_sqlite_contention.py
+    python benchmark_sqlite_contention.py --scrapers 8 --batches 40 --activity 10
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, Text, create_engine, func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+import sqlite_profile
+
+metadata = MetaData()
+articles = Table(
+    "bench_articles", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("competitor_id", Integer, index=True),
+    Column("title", String),
+    Column("snippet", Text),
+    Column("fetched_at", DateTime, server_default=func.current_timestamp()),
+)
+activity = Table(
+    "bench_activity", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("action_type", String, index=True),
+    Column("action_details", Text),
+)
+
+
+def run_scenario(profile: bool, scrapers: int, batches: int, batch_rows: int, activity_rows: int):
+    path = os.path.join(tempfile.mkdtemp(prefix="certify_bench_"), "bench.db")
+    url = f"sqlite:///{path}"
+    engine = create_engine(url, connect_args=sqlite_profile.connect_args(url, enabled=profile),
+                           pool_size=scrapers + 2)
+    sqlite_profile.apply_sqlite_profile(engine, enabled=profile)
+    metadata.create_all(engine)
+    writer = sqlite_profile.WriteQueue(sessionmaker(bind=engine)) if profile else None
+
+    errors = {"locked": 0}
+    latencies = []
+    done = threading.Event()
+
+    def log_activity(scraper_id, n):
+        row = {"action_type": "scrape_progress", "action_details": f"scraper {scraper_id} item {n}"}
+        if writer is not None:
+            writer.submit(lambda db: db.execute(activity.insert().values(**row)))
+            return
+        with engine.begin() as conn:
+            conn.execute(activity.insert().values(**row))
+
+    def scraper(scraper_id):
+        for b in range(batches):
+            rows = [{"competitor_id": scraper_id, "title": f"Headline {b}-{i}", "snippet": "x" * 400}
+                    for i in range(batch_rows)]
+            try:
+                with engine.begin() as conn:
+                    conn.execute(articles.insert(), rows)
+                for n in range(activity_rows):
+                    log_activity(scraper_id, n)
+            except OperationalError:
+                errors["locked"] += 1
+
+    def reader():
+        query = (select(articles.c.competitor_id, func.count(), func.max(articles.c.fetched_at))
+                 .group_by(articles.c.competitor_id))
+        while not done.is_set():
+            start = time.perf_counter()
+            try:
+                with engine.connect() as conn:
+                    conn.execute(query).all()
+                    conn.execute(select(func.count()).select_from(activity)).scalar()
+                latencies.append((time.perf_counter() - start) * 1000)
+            except OperationalError:
+                errors["locked"] += 1
+            time.sleep(0.002)
+
+    read_thread = threading.Thread(target=reader)
+    read_thread.start()
+    start = time.perf_counter()
+    threads = [threading.Thread(target=scraper, args=(i,)) for i in range(scrapers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    if writer is not None:
+        writer.flush()
+    elapsed = time.perf_counter() - start
+    done.set()
+    read_thread.join()
+    if writer is not None:
+        writer.shutdown()
+
+    with engine.connect() as conn:
+        written = (conn.execute(select(func.count()).select_from(articles)).scalar()
+                   + conn.execute(select(func.count()).select_from(activity)).scalar())
+    engine.dispose()
+
+    latencies.sort()
+    pct = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] if latencies else 0.0
+    return {
+        "rows_per_sec": written / elapsed,
+        "written": written,
+        "locked": errors["locked"],
+        "reads": len(latencies),
+        "read_p50_ms": statistics.median(latencies) if latencies else 0.0,
+        "read_p95_ms": pct(0.95),
+        "read_max_ms": latencies[-1] if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scrapers", type=int, default=6, help="Concurrent scraper threads")
+    parser.add_argument("--batches", type=int, default=25, help="Ingest transactions per scraper")
+    parser.add_argument("--batch-rows", type=int, default=20, help="Rows per ingest transaction")
+    parser.add_argument("--activity", type=int, default=8, help="Activity rows logged after each batch")
+    args = parser.parse_args()
+
+    print(f"\n{args.scrapers} scrapers x {args.batches} batches ({args.batch_rows} rows + "
+          f"{args.activity} activity rows each), one concurrent reader\n")
+    print(f"{'profile':<22}{'rows/s':>10}{'written':>10}{'locked':>8}{'reads':>8}"
+          f"{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}")
+    results = {}
+    for name, profile in (("default", False), ("production (WAL)", True)):
+        r = run_scenario(profile, args.scrapers, args.batches, args.batch_rows, args.activity)
+        results[name] = r
+        print(f"{name:<22}{r['rows_per_sec']:>10.0f}{r['written']:>10}{r['locked']:>8}{r['reads']:>8}"
+              f"{r['read_p50_ms']:>9.2f}{r['read_p95_ms']:>9.2f}{r['read_max_ms']:>9.2f}")
+
+    before, after = results["default"], results["production (WAL)"]
+    print(f"\nwrite throughput {after['rows_per_sec'] / before['rows_per_sec']:.2f}x, "
+          f"read p95 {before['read_p95_ms']:.2f} -> {after['read_p95_ms']:.2f} ms")
+    return 1 if after["locked"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
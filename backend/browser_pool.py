@@ -0,0 +1,352 @@
+"""
+Certify Intel - Shared Browser Pool (v5.2.1)
+Process-wide pool of long-lived Chromium instances for all Playwright scraping.
+
+Features:
+- One browser launch shared by every scrape job (no cold start per competitor)
+- Isolated BrowserContext per lease (cookies/storage never leak between jobs)
+- Concurrency cap on simultaneously open contexts
+- Automatic relaunch of crashed/disconnected browsers
+- Browser recycling after N pages to stop memory creep
+
+Usage:
+    pool = get_browser_pool()
+    async with pool.context(viewport={"width": 1920, "height": 1080}) as context:
+        page = await context.new_page()
+        await page.goto("https://example.com")
+
+Configuration (environment):
+    BROWSER_POOL_SIZE                 Number of Chromium processes (default 2)
+    BROWSER_POOL_MAX_CONTEXTS         Max concurrently open contexts (default 6)
+    BROWSER_POOL_MAX_PAGES            Pages served before a browser is recycled (default 200)
+    BROWSER_POOL_HEADLESS             "false" to run headed for debugging (default true)
+"""
+import asyncio
+import os
+import signal
+import logging
+import threading
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+try:
+    from playwright.async_api import async_playwright, Browser, BrowserContext
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    PLAYWRIGHT_AVAILABLE = False
+    Browser = object
+    BrowserContext = object
+    async_playwright = None
+
+logger = logging.getLogger(__name__)
+
+
+# Chromium flags shared by all scrapers (previously duplicated per scraper)
+BROWSER_LAUNCH_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--no-sandbox'
+]
+
+
+@dataclass
+class _BrowserSlot:
+    """A single Chromium process managed by the pool."""
+    index: int
+    browser: Optional[Browser] = None
+    generation: int = 0
+    pages_served: int = 0
+    active_contexts: int = 0
+    launched_at: Optional[datetime] = None
+    crashed: bool = False
+    retiring: List[Browser] = field(default_factory=list)
+
+    @property
+    def is_healthy(self) -> bool:
+        if self.browser is None or self.crashed:
+            return False
+        try:
+            return self.browser.is_connected()
+        except Exception:
+            return False
+
+
+class BrowserPool:
+    """
+    Long-lived pool of Chromium browsers handing out isolated contexts.
+
+    A pool is bound to the event loop it was first used on; Playwright objects
+    cannot be shared across loops. Use get_browser_pool() to obtain the
+    process-wide instance for the running loop.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = None,
+        max_contexts: int = None,
+        max_pages_per_browser: int = None,
+        headless: bool = None
+    ):
+        self.pool_size = max(1, pool_size or int(os.getenv("BROWSER_POOL_SIZE", "2")))
+        self.max_contexts = max(1, max_contexts or int(os.getenv("BROWSER_POOL_MAX_CONTEXTS", "6")))
+        self.max_pages_per_browser = max(
+            1, max_pages_per_browser or int(os.getenv("BROWSER_POOL_MAX_PAGES", "200"))
+        )
+        if headless is None:
+            headless = os.getenv("BROWSER_POOL_HEADLESS", "true").lower() != "false"
+        self.headless = headless
+
+        self._playwright = None
+        self._slots = [_BrowserSlot(index=i) for i in range(self.pool_size)]
+        self._semaphore = asyncio.Semaphore(self.max_contexts)
+        self._lock = asyncio.Lock()
+        self._next_slot = 0
+        self._closed = False
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Counters for /api diagnostics
+        self.stats = {
+            "launches": 0,
+            "recycles": 0,
+            "crash_restarts": 0,
+            "contexts_served": 0,
+            "pages_served": 0,
+            "waits": 0,
+        }
+
+    # ============== Public API ==============
+
+    @asynccontextmanager
+    async def context(self, **context_kwargs):
+        """
+        Lease an isolated BrowserContext from the pool.
+
+        Blocks while max_contexts leases are already open. The context is
+        always closed on exit; the underlying browser stays alive.
+
+        Args:
+            **context_kwargs: Passed straight to Browser.new_context()
+        """
+        if not PLAYWRIGHT_AVAILABLE:
+            raise RuntimeError("Playwright is not installed")
+        if self._closed:
+            raise RuntimeError("Browser pool has been shut down")
+
+        if self.loop is None:
+            self.loop = asyncio.get_running_loop()
+
+        if self._semaphore.locked():
+            self.stats["waits"] += 1
+
+        async with self._semaphore:
+            slot, browser = await self._checkout()
+            context = None
+            try:
+                context = await browser.new_context(**context_kwargs)
+                context.on("page", lambda _page: self._count_page(slot))
+                self.stats["contexts_served"] += 1
+                yield context
+            finally:
+                if context is not None:
+                    try:
+                        await context.close()
+                    except Exception:
+                        pass  # Browser may have crashed mid-lease
+                await self._checkin(slot, browser)
+
+    async def close(self):
+        """Close every browser and stop Playwright."""
+        self._closed = True
+        async with self._lock:
+            for slot in self._slots:
+                for browser in [slot.browser] + slot.retiring:
+                    await self._close_browser(browser)
+                slot.browser = None
+                slot.retiring = []
+            if self._playwright:
+                try:
+                    await self._playwright.stop()
+                except Exception:
+                    pass
+                self._playwright = None
+
+    def _terminate_driver(self) -> bool:
+        """SIGTERM the Playwright driver process (its exit handler closes the browsers)."""
+        transport = getattr(getattr(self._playwright, "_connection", None), "_transport", None)
+        pid = getattr(getattr(transport, "_proc", None), "pid", None)
+        self._playwright = None
+        if not pid:
+            return False
+        try:
+            os.kill(pid, signal.SIGTERM)
+            return True
+        except OSError:
+            return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return pool counters and per-browser status."""
+        return {
+            **self.stats,
+            "pool_size": self.pool_size,
+            "max_contexts": self.max_contexts,
+            "max_pages_per_browser": self.max_pages_per_browser,
+            "browsers": [
+                {
+                    "slot": slot.index,
+                    "healthy": slot.is_healthy,
+                    "generation": slot.generation,
+                    "pages_served": slot.pages_served,
+                    "active_contexts": slot.active_contexts,
+                    "launched_at": slot.launched_at.isoformat() if slot.launched_at else None,
+                }
+                for slot in self._slots
+            ],
+        }
+
+    # ============== Internals ==============
+
+    async def _checkout(self):
+        """Pick the least-loaded slot, (re)launching its browser if needed."""
+        async with self._lock:
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+
+            # Round-robin start, then prefer the slot with fewest open contexts
+            order = self._slots[self._next_slot:] + self._slots[:self._next_slot]
+            self._next_slot = (self._next_slot + 1) % self.pool_size
+            slot = min(order, key=lambda s: s.active_contexts)
+
+            if slot.browser is not None and slot.pages_served >= self.max_pages_per_browser:
+                # Retire the old browser; it is closed once its last lease ends
+                logger.info(
+                    f"Recycling browser slot {slot.index} after {slot.pages_served} pages"
+                )
+                if slot.browser.contexts:
+                    slot.retiring.append(slot.browser)
+                else:
+                    await self._close_browser(slot.browser)
+                slot.browser = None
+                self.stats["recycles"] += 1
+            elif slot.browser is not None and not slot.is_healthy:
+                logger.warning(f"Browser slot {slot.index} disconnected, relaunching")
+                await self._close_browser(slot.browser)
+                slot.browser = None
+                self.stats["crash_restarts"] += 1
+
+            if slot.browser is None:
+                await self._launch(slot)
+
+            slot.active_contexts += 1
+            return slot, slot.browser
+
+    async def _checkin(self, slot: _BrowserSlot, browser: Browser):
+        """Release a lease and close retired browsers that are now idle."""
+        async with self._lock:
+            slot.active_contexts = max(0, slot.active_contexts - 1)
+            if browser is not slot.browser and browser in slot.retiring:
+                # Retired browsers are only closed when no lease still uses them
+                if not browser.contexts:
+                    slot.retiring.remove(browser)
+                    await self._close_browser(browser)
+
+    async def _launch(self, slot: _BrowserSlot):
+        browser = await self._playwright.chromium.launch(
+            headless=self.headless,
+            args=BROWSER_LAUNCH_ARGS
+        )
+        slot.browser = browser
+        slot.generation += 1
+        slot.pages_served = 0
+        slot.crashed = False
+        slot.launched_at = datetime.utcnow()
+        self.stats["launches"] += 1
+
+        def _on_disconnect(_browser, slot=slot, generation=slot.generation):
+            if slot.generation == generation:
+                slot.crashed = True
+
+        browser.on("disconnected", _on_disconnect)
+
+    def _count_page(self, slot: _BrowserSlot):
+        slot.pages_served += 1
+        self.stats["pages_served"] += 1
+
+    @staticmethod
+    async def _close_browser(browser: Optional[Browser]):
+        if browser is None:
+            return
+        try:
+            await browser.close()
+        except Exception:
+            pass
+
+
+# ============== CONVENIENCE FUNCTIONS ==============
+
+# Singleton instance (one per running event loop)
+_pool_instance: Optional[BrowserPool] = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """
+    Get the process-wide browser pool.
+
+    If the pool was created on an event loop that is no longer running
+    (e.g. a sync endpoint calling asyncio.run), a fresh pool is created.
+    """
+    global _pool_instance
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    stale = (
+        _pool_instance is None
+        or _pool_instance._closed
+        or (
+            _pool_instance.loop is not None
+            and loop is not None
+            and _pool_instance.loop is not loop
+        )
+    )
+    if stale:
+        if _pool_instance is not None:
+            _close_abandoned_pool(_pool_instance)
+        _pool_instance = BrowserPool()
+    return _pool_instance
+
+
+def _close_abandoned_pool(pool: BrowserPool):
+    """
+    Close a pool replaced because its event loop is not the running one.
+
+    Playwright objects only work on their own loop, so the close runs there:
+    scheduled onto it if it is running in another thread, or on a helper
+    thread if it is idle. A loop that is already closed (asyncio.run has
+    returned) cannot run it, so the Playwright driver is terminated instead,
+    which shuts its browsers down.
+    """
+    loop = pool.loop
+    if pool._closed or loop is None:
+        return
+    if loop.is_running():
+        asyncio.run_coroutine_threadsafe(pool.close(), loop)
+    elif not loop.is_closed():
+        threading.Thread(
+            target=loop.run_until_complete, args=(pool.close(),), name="browser-pool-close", daemon=True
+        ).start()
+    else:
+        pool._closed = True
+        if not pool._terminate_driver():
+            logger.warning("Browser pool replaced after its event loop closed; its browsers could not be closed")
+
+
+async def shutdown_browser_pool():
+    """Close the shared browser pool (called from app shutdown)."""
+    global _pool_instance
+    if _pool_instance is not None and not _pool_instance._closed:
+        await _pool_instance.close()
+    _pool_instance = None
@@ -0,0 +1,74 @@
+"""
+Certify Intel - Committed Write Tracking (v5.2.1)
+Reports the rows an ORM session wrote once its transaction commits.
+
+Caches derived from database rows (context fragments, the metrics rollup)
+register with track_committed(). One set of global SQLAlchemy Session
+listeners serves every registration: after each flush the new, dirty and
+deleted objects of the registered model classes are identified and kept in
+session.info under the registration key; after commit each key's identities
+are handed to its callback, and a rollback discards them.
+"""
+import threading
+from itertools import chain
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+# session.info key -> (model classes, identify, on_commit)
+_trackers: Dict[str, Tuple[tuple, Callable[[Any], Hashable], Callable[[Set[Hashable]], None]]] = {}
+_listeners_installed = False
+_install_lock = threading.Lock()
+
+
+def _identify_by_id(obj: Any) -> Hashable:
+    return obj.id
+
+
+def _track_flush(session, flush_context):
+    """Remember the tracked objects written in this transaction."""
+    written = list(chain(session.new, session.dirty, session.deleted))
+    for key, (model_classes, identify, _) in list(_trackers.items()):
+        for obj in written:
+            if isinstance(obj, model_classes):
+                session.info.setdefault(key, set()).add(identify(obj))
+
+
+def _apply_commit(session):
+    for key, (_, _, on_commit) in list(_trackers.items()):
+        pending = session.info.pop(key, None)
+        if pending:
+            on_commit(pending)
+
+
+def _discard_rollback(session):
+    for key in list(_trackers):
+        session.info.pop(key, None)
+
+
+def track_committed(
+    key: str,
+    model_classes: Iterable[type],
+    on_commit: Callable[[Set[Hashable]], None],
+    identify: Optional[Callable[[Any], Hashable]] = None
+):
+    """
+    Call on_commit with the identities of committed writes to model_classes.
+
+    Args:
+        key: session.info key; registering the same key again replaces it
+        model_classes: ORM classes whose new, changed or deleted rows are reported
+        on_commit: Receives the set of identities after the session commits
+        identify: Maps a written object to its identity (default obj.id)
+    """
+    global _listeners_installed
+    _trackers[key] = (tuple(model_classes), identify or _identify_by_id, on_commit)
+    with _install_lock:
+        if _listeners_installed:
+            return
+        event.listen(Session, "after_flush", _track_flush)
+        event.listen(Session, "after_commit", _apply_commit)
+        event.listen(Session, "after_rollback", _discard_rollback)
+        _listeners_installed = True
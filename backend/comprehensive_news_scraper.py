@@ -89,12 +89,16 @@ class ComprehensiveNewsScraper:
         self.mediastack_key = os.getenv("MEDIASTACK_API_KEY")
         self.newsdata_key = os.getenv("NEWSDATA_API_KEY")
 
+        # v5.2.1: Incremental NewsMonitor digests awaiting commit_fetch_state, by competitor
+        self._pending_digests: Dict[str, Any] = {}
+
     def fetch_competitor_news(
         self,
         competitor_name: str,
         competitor_id: Optional[int] = None,
         days: int = 90,
-        max_articles: int = 100
+        max_articles: int = 100,
+        incremental: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Fetch news for a single competitor from all available sources.
@@ -104,16 +108,23 @@ class ComprehensiveNewsScraper:
             competitor_id: Optional database ID
             days: Number of days to look back
             max_articles: Maximum articles to return
+            incremental: Only new NewsMonitor items since the last incremental fetch (v5.2.1);
+                call commit_fetch_state(competitor_name) once the articles are stored
 
         Returns:
             List of news article dictionaries
         """
         articles = []
+        monitor_ok = False
+        self._pending_digests.pop(competitor_name, None)
 
         # Strategy 1: Use existing NewsMonitor if available
         if self.news_monitor:
             try:
-                digest = self.news_monitor.fetch_news(competitor_name, days)
+                digest = self.news_monitor.fetch_news(competitor_name, days, incremental=incremental)
+                monitor_ok = True
+                if incremental:
+                    self._pending_digests[competitor_name] = digest
                 for article in digest.articles:
                     articles.append({
                         "title": article.title,
@@ -132,7 +143,8 @@ class ComprehensiveNewsScraper:
                 print(f"NewsMonitor error for {competitor_name}: {e}")
 
         # Strategy 2: Direct Google News RSS (backup/additional)
-        if len(articles) < 10:
+        # An incremental fetch with few results just means little new news
+        if len(articles) < 10 and not (incremental and monitor_ok):
             try:
                 google_articles = self._fetch_google_news_rss(competitor_name)
                 for a in google_articles:
@@ -166,6 +178,21 @@ class ComprehensiveNewsScraper:
 
         return unique_articles[:max_articles]
 
+    def commit_fetch_state(self, competitor_name: str, articles: List[Dict[str, Any]]) -> int:
+        """
+        Advance NewsMonitor's incremental state after the articles returned by
+        fetch_competitor_news(incremental=True) were stored (v5.2.1).
+
+        Sources with new items cut off by max_articles keep their old mark, so
+        the next refresh fetches those again.
+        """
+        digest = self._pending_digests.pop(competitor_name, None)
+        if digest is None or not self.news_monitor:
+            return 0
+        urls = {a.get("url") for a in articles}
+        stored = [a for a in digest.articles if a.url in urls]
+        return self.news_monitor.commit_fetch_state(digest, stored)
+
     def _fetch_google_news_rss(self, company_name: str) -> List[Dict[str, Any]]:
         """Fetch news directly from Google News RSS."""
         articles = []
@@ -335,6 +362,7 @@ class NewsFeedService:
             NewsFeedResult with summary
         """
         from database import SessionLocal, Competitor, NewsArticleCache
+        from news_ingest import ingest_articles, extend_cache_expiry
 
         if self.db is None:
             self.db = SessionLocal()
@@ -386,40 +414,23 @@ class NewsFeedService:
                         competitor_name=comp.name,
                         competitor_id=comp.id,
                         days=90,
-                        max_articles=50
+                        max_articles=50,
+                        incremental=True
                     )
 
                     if articles:
                         result.competitors_with_news += 1
 
-                        # Cache articles
-                        for article in articles:
-                            # Check if already cached
-                            existing = self.db.query(NewsArticleCache).filter(
-                                NewsArticleCache.url == article.get("url")
-                            ).first()
-
-                            if not existing:
-                                cache_entry = NewsArticleCache(
-                                    competitor_id=comp.id,
-                                    competitor_name=comp.name,
-                                    title=article.get("title", "")[:500],
-                                    url=article.get("url", ""),
-                                    source=article.get("source", "Unknown"),
-                                    source_type=article.get("source_type", "unknown"),
-                                    published_at=self._parse_date(article.get("published_at")),
-                                    snippet=article.get("snippet", "")[:1000] if article.get("snippet") else None,
-                                    sentiment=article.get("sentiment", "neutral"),
-                                    event_type=article.get("event_type"),
-                                    is_major_event=article.get("is_major_event", False),
-                                    fetched_at=datetime.utcnow(),
-                                    cache_expires_at=datetime.utcnow() + timedelta(hours=24),
-                                    created_at=datetime.utcnow()
-                                )
-                                self.db.add(cache_entry)
-                                result.new_articles_found += 1
-
-                            result.total_articles_cached += 1
+                        # Cache articles (batched, deduplicated by URL hash and headline)
+                        ingested = ingest_articles(self.db, [
+                            dict(article, competitor_id=comp.id, competitor_name=comp.name,
+                                 source=article.get("source", "Unknown"),
+                                 source_type=article.get("source_type", "unknown"),
+                                 published_at=self._parse_date(article.get("published_at")))
+                            for article in articles
+                        ], ttl_hours=24)
+                        result.new_articles_found += ingested.inserted
+                        result.total_articles_cached += len(articles)
 
                         # Track sources
                         for article in articles:
@@ -427,7 +438,9 @@ class NewsFeedService:
                             if source_type not in result.sources_used:
                                 result.sources_used.append(source_type)
 
+                    extend_cache_expiry(self.db, [comp.id], days=90, ttl_hours=24)
                     self.db.commit()
+                    self.scraper.commit_fetch_state(comp.name, articles)
 
                 except Exception as e:
                     result.errors.append(f"{comp.name}: {str(e)[:50]}")
@@ -521,38 +534,9 @@ class NewsFeedService:
         return status_list
 
     def _parse_date(self, date_str: Optional[str]) -> Optional[datetime]:
-        """Parse various date formats to datetime."""
-        if not date_str:
-            return None
-
-        try:
-            # Try common formats
-            formats = [
-                "%Y-%m-%dT%H:%M:%SZ",
-                "%Y-%m-%dT%H:%M:%S",
-                "%a, %d %b %Y %H:%M:%S %z",
-                "%a, %d %b %Y %H:%M:%S GMT",
-                "%Y-%m-%d %H:%M:%S",
-                "%Y-%m-%d",
-            ]
-
-            for fmt in formats:
-                try:
-                    return datetime.strptime(date_str.strip(), fmt)
-                except ValueError:
-                    continue
-
-            # Last resort: parse with dateutil if available
-            try:
-                from dateutil import parser
-                return parser.parse(date_str)
-            except Exception:
-                pass
-
-        except Exception:
-            pass
-
-        return None
+        """Parse various date formats to a naive UTC datetime."""
+        from news_feed import parse_published_date
+        return parse_published_date(date_str)
 
 
 # ==============================================================================
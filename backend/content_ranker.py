@@ -0,0 +1,306 @@
+"""
+Certify Intel - Content Ranker (v5.2.1)
+Relevance-ranked trimming of scraped page text before LLM extraction.
+
+Instead of sending the first N characters of a page, the text is:
+1. Split into sentences and grouped into blocks
+2. Stripped of boilerplate (cookie banners, CTAs, footers) including sentences
+   repeated across a competitor's other pages
+3. Ranked with BM25 plus field-specific signal patterns for the fields the
+   page's prompt asks for (pricing, features, company)
+4. Packed into a token budget, keeping the selected blocks in page order
+
+Configuration (environment):
+    EXTRACTION_TRIM_ENABLED    "false" to fall back to a plain character cut (default true)
+    EXTRACTION_TOKEN_BUDGET    Approximate tokens of page text per prompt (default 2000)
+"""
+import os
+import re
+import math
+import hashlib
+import logging
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+# Rough chars-per-token ratio for English marketing copy
+CHARS_PER_TOKEN = 4
+
+# Target size of a ranked block (sentences are grouped up to this length)
+BLOCK_CHARS = 400
+
+# Field groups: BM25 query terms and regex signals per group of extraction fields
+FIELD_GROUPS = {
+    "pricing": {
+        "terms": [
+            "price", "pricing", "plan", "plans", "tier", "tiers", "month", "monthly", "annual",
+            "annually", "year", "per", "provider", "visit", "location", "user", "subscription",
+            "fee", "fees", "cost", "setup", "implementation", "trial", "free", "quote",
+            "starter", "professional", "enterprise", "billed", "contract", "discount",
+        ],
+        "signals": [r"[$€£]\s?\d", r"\d+\s?(?:/|per)\s?(?:mo|month|yr|year|provider|visit|user)", r"\bfree trial\b"],
+    },
+    "features": {
+        "terms": [
+            "feature", "features", "platform", "solution", "intake", "check", "registration",
+            "eligibility", "verification", "insurance", "payment", "payments", "billing",
+            "scheduling", "telehealth", "reminders", "engagement", "kiosk", "biometric",
+            "integration", "integrations", "integrates", "ehr", "emr", "epic", "cerner",
+            "athenahealth", "athena", "eclinicalworks", "nextgen", "allscripts", "meditech",
+            "hipaa", "soc", "hitrust", "api", "automation", "workflow", "analytics",
+        ],
+        "signals": [r"\b(?:HIPAA|SOC\s?2|HITRUST|ISO\s?27001)\b", r"\b(?:Epic|Cerner|athenahealth|eClinicalWorks|NextGen)\b"],
+    },
+    "company": {
+        "terms": [
+            "founded", "headquarters", "headquartered", "based", "employees", "team", "people",
+            "customers", "clients", "health", "systems", "hospitals", "practices", "providers",
+            "organizations", "serve", "serving", "trusted", "funding", "raised", "series",
+            "investors", "backed", "acquired", "offices", "nationwide", "countries", "states",
+        ],
+        "signals": [r"\b(?:founded|established|since)\s+(?:in\s+)?(?:19|20)\d{2}\b",
+                    r"\b\d[\d,]*\+?\s*(?:customers|clients|providers|practices|hospitals|health systems|employees|organizations)\b",
+                    r"\$\d+(?:\.\d+)?\s?(?:M|B|million|billion)\b"],
+    },
+}
+FIELD_GROUPS["general"] = {
+    "terms": sorted({t for g in FIELD_GROUPS.values() for t in g["terms"]}),
+    "signals": [s for g in FIELD_GROUPS.values() for s in g["signals"]],
+}
+
+# Prompt page type -> field group
+PAGE_TYPE_GROUPS = {
+    "pricing": "pricing",
+    "features": "features",
+    "product": "features",
+    "products": "features",
+    "integrations": "features",
+    "about": "company",
+    "customers": "company",
+}
+
+# Site-agnostic boilerplate sentences
+BOILERPLATE_PATTERNS = re.compile(
+    r"(?:we use cookies|this (?:web)?site uses cookies|accept (?:all )?cookies|cookie (?:settings|policy|preferences)"
+    r"|all rights reserved|privacy policy|terms of (?:use|service)|subscribe to our newsletter"
+    r"|sign up for our newsletter|skip to (?:main )?content|follow us on|enable javascript)",
+    re.I
+)
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9$\"'(])|\n+")
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+@dataclass
+class TrimResult:
+    """Trimmed content plus bookkeeping for logging/tests."""
+    content: str
+    field_group: str
+    chars_in: int
+    chars_out: int
+    blocks_total: int = 0
+    blocks_selected: int = 0
+    sentences_dropped: int = 0  # Boilerplate sentences removed
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split collapsed page text into sentences (scraped text has no line breaks)."""
+    return [s.strip() for s in _SENTENCE_SPLIT.split(text or "") if s and s.strip()]
+
+
+def sentence_fingerprint(sentence: str) -> str:
+    normalized = re.sub(r"\s+", " ", sentence.lower()).strip()
+    return hashlib.md5(normalized.encode("utf-8")).hexdigest()
+
+
+def group_blocks(sentences: List[str], block_chars: int = BLOCK_CHARS) -> List[str]:
+    """Group consecutive sentences into blocks of roughly block_chars."""
+    blocks, current, length = [], [], 0
+    for sentence in sentences:
+        if current and length + len(sentence) > block_chars:
+            blocks.append(" ".join(current))
+            current, length = [], 0
+        current.append(sentence)
+        length += len(sentence) + 1
+    if current:
+        blocks.append(" ".join(current))
+    return blocks
+
+
+def bm25_scores(blocks: List[str], query_terms: List[str], k1: float = 1.5, b: float = 0.75) -> List[float]:
+    """Okapi BM25 score of each block against the query terms."""
+    docs = [_TOKEN.findall(block.lower()) for block in blocks]
+    if not docs:
+        return []
+    avg_len = sum(len(d) for d in docs) / len(docs) or 1.0
+    doc_freq = Counter(term for d in docs for term in set(d))
+    n_docs = len(docs)
+    query = set(query_terms)
+
+    scores = []
+    for doc in docs:
+        tf = Counter(doc)
+        score = 0.0
+        for term in query:
+            if term not in tf:
+                continue
+            idf = math.log(1 + (n_docs - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+            freq = tf[term]
+            score += idf * freq * (k1 + 1) / (freq + k1 * (1 - b + b * len(doc) / avg_len))
+        scores.append(score)
+    return scores
+
+
+class ContentRanker:
+    """
+    Trims page text to the most relevant blocks for an extraction prompt.
+
+    Remembers sentence fingerprints per competitor page so boilerplate repeated
+    across a site's pages can be dropped. Pages are registered automatically
+    when trimmed; register_site_pages() primes all pages of a scrape at once.
+    """
+
+    def __init__(self, token_budget: Optional[int] = None, max_sites: int = 200):
+        self.enabled = os.getenv("EXTRACTION_TRIM_ENABLED", "true").lower() != "false"
+        self.token_budget = token_budget or int(os.getenv("EXTRACTION_TOKEN_BUDGET", "2000"))
+        self.max_sites = max_sites
+        self._sites: "OrderedDict[str, Dict[str, Set[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._signal_patterns = {
+            group: [re.compile(p, re.I) for p in spec["signals"]]
+            for group, spec in FIELD_GROUPS.items()
+        }
+
+    # ============== Site boilerplate ==============
+
+    def register_site_pages(self, competitor_name: str, page_contents: Dict[str, str]):
+        """Record every scraped page of a competitor before extracting any of them."""
+        for page_type, content in page_contents.items():
+            self._register_page(competitor_name, page_type, split_sentences(content))
+
+    def _register_page(self, competitor_name: str, page_type: str, sentences: List[str]):
+        key = (competitor_name or "").lower()
+        with self._lock:
+            site = self._sites.setdefault(key, {})
+            site[page_type] = {sentence_fingerprint(s) for s in sentences}
+            self._sites.move_to_end(key)
+            while len(self._sites) > self.max_sites:
+                self._sites.popitem(last=False)
+
+    def _repeated_fingerprints(self, competitor_name: str, page_type: str) -> Set[str]:
+        """Fingerprints seen on this page and at least one other page of the site."""
+        with self._lock:
+            site = self._sites.get((competitor_name or "").lower(), {})
+            others = [fps for other, fps in site.items() if other != page_type]
+        if not others:
+            return set()
+        return set().union(*others)
+
+    # ============== Trimming ==============
+
+    def field_group_for(self, page_type: str) -> str:
+        return PAGE_TYPE_GROUPS.get(page_type, "general")
+
+    def trim(
+        self,
+        competitor_name: str,
+        content: str,
+        page_type: str = "homepage",
+        token_budget: Optional[int] = None
+    ) -> TrimResult:
+        """Return the most relevant content for this page type within the token budget."""
+        budget_chars = (token_budget or self.token_budget) * CHARS_PER_TOKEN
+        group = self.field_group_for(page_type)
+        content = content or ""
+
+        if not self.enabled:
+            trimmed = content if len(content) <= budget_chars else content[:budget_chars] + "..."
+            return TrimResult(trimmed, group, len(content), len(trimmed))
+
+        sentences = split_sentences(content)
+        repeated = self._repeated_fingerprints(competitor_name, page_type)
+        self._register_page(competitor_name, page_type, sentences)
+
+        signals = self._signal_patterns[group]
+        kept, seen, dropped = [], set(), 0
+        for sentence in sentences:
+            fp = sentence_fingerprint(sentence)
+            has_signal = any(p.search(sentence) for p in signals)
+            is_boilerplate = (
+                fp in seen
+                or (BOILERPLATE_PATTERNS.search(sentence) and len(sentence) < 300)
+                or (fp in repeated and not has_signal)  # Keep repeated facts like "$299/month"
+            )
+            seen.add(fp)
+            if is_boilerplate:
+                dropped += 1
+                continue
+            kept.append(sentence)
+
+        blocks = group_blocks(kept)
+        cleaned = " ".join(blocks)
+        if len(cleaned) <= budget_chars:
+            return TrimResult(cleaned, group, len(content), len(cleaned), len(blocks), len(blocks), dropped)
+
+        selected = self._select_blocks(blocks, group, budget_chars)
+        if not selected:
+            # A single oversized block (text without sentence breaks)
+            trimmed = cleaned[:budget_chars] + "..."
+            return TrimResult(trimmed, group, len(content), len(trimmed), len(blocks), 0, dropped)
+        trimmed = "\n\n".join(blocks[i] for i in selected)
+        return TrimResult(trimmed, group, len(content), len(trimmed), len(blocks), len(selected), dropped)
+
+    def _select_blocks(self, blocks: List[str], group: str, budget_chars: int) -> List[int]:
+        """Greedy packing of the highest-scoring blocks; returns indices in page order."""
+        scores = bm25_scores(blocks, FIELD_GROUPS[group]["terms"])
+        for i, block in enumerate(blocks):
+            scores[i] += 2.0 * sum(len(p.findall(block)) for p in self._signal_patterns[group])
+        # The opening block usually names the product and value proposition
+        if blocks:
+            scores[0] += 1.0
+
+        order = sorted(range(len(blocks)), key=lambda i: (-scores[i], i))
+        selected, used = [], 0
+        for i in order:
+            cost = len(blocks[i]) + 2
+            if used + cost > budget_chars:
+                continue
+            selected.append(i)
+            used += cost
+        return sorted(selected)
+
+
+# ============== CONVENIENCE FUNCTIONS ==============
+
+# Singleton instance
+_ranker_instance = None
+
+
+def get_content_ranker() -> ContentRanker:
+    """Get the content ranker instance."""
+    global _ranker_instance
+    if _ranker_instance is None:
+        _ranker_instance = ContentRanker()
+    return _ranker_instance
+
+
+def trim_for_extraction(
+    competitor_name: str,
+    content: str,
+    page_type: str = "homepage",
+    token_budget: Optional[int] = None
+) -> str:
+    """Relevance-trimmed page text for an extraction prompt."""
+    result = get_content_ranker().trim(competitor_name, content, page_type, token_budget)
+    if result.chars_out < result.chars_in:
+        logger.debug(
+            f"Trimmed {competitor_name}/{page_type} ({result.field_group}): "
+            f"{result.chars_in} -> {result.chars_out} chars, "
+            f"{result.blocks_selected}/{result.blocks_total} blocks, "
+            f"{result.sentences_dropped} boilerplate sentences dropped"
+        )
+    return result.content
@@ -0,0 +1,345 @@
+"""
+Certify Intel - Context Fragment Store (v5.2.1)
+Prebuilt per-competitor and per-knowledge-base-item context for the executive summary and chat.
+
+Each competitor (and each active knowledge base item) is rendered once into a
+text fragment per prompt variant and stored in the context_fragments table.
+Requests only run a light column query to compute fingerprints and then
+concatenate the stored fragments. A fragment is rebuilt when:
+1. Its fingerprint changes (competitor last_updated, data source count and
+   latest data source update, knowledge base item length)
+2. The competitor, one of its data sources or the knowledge base item was
+   written through an ORM session since the fragment was built
+3. CONTEXT_FRAGMENT_VERSION is bumped (template change)
+
+Live values (stock quotes) are not part of a fragment; callers append them.
+
+Configuration (environment):
+    CONTEXT_FRAGMENTS_ENABLED    "false" to render every fragment on each request (default true)
+"""
+import os
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from change_tracking import track_committed
+
+logger = logging.getLogger(__name__)
+
+
+# Bump when a fragment template changes so every fragment is rebuilt
+CONTEXT_FRAGMENT_VERSION = "1"
+
+SCOPE_COMPETITOR = "competitor"
+SCOPE_KNOWLEDGE_BASE = "knowledge_base"
+VARIANTS = ("summary", "chat")
+
+# session.info key for changes flushed but not yet committed
+_PENDING_KEY = "context_fragment_changes"
+
+
+# ============== Templates ==============
+
+def render_competitor_fragment(c: Any, variant: str) -> str:
+    """Static context for one competitor (no position header, no live stock data)."""
+    if variant == "chat":
+        text = f"""
+---
+COMPETITOR: {c.name}
+THREAT: {c.threat_level}
+WEBSITE: {c.website or 'N/A'}
+PRICING: {c.base_price or 'N/A'} ({c.pricing_model or 'Unknown Model'})
+OFFERING: {c.product_categories or 'N/A'}
+FEATURES: {c.key_features or 'N/A'}
+EMPLOYEES: {c.employee_count or 'N/A'}
+G2 RATING: {c.g2_rating or 'N/A'}
+"""
+        if not (c.is_public and c.ticker_symbol):
+            text += "PUBLIC COMPANY: No (Private)\n"
+        return text + f"NOTES: {c.notes or ''}\n"
+
+    return f"""NAME: {c.name}
+THREAT LEVEL: {c.threat_level}
+STATUS: {c.status or 'Active'}
+WEBSITE: {c.website or 'N/A'}
+LAST UPDATED: {c.last_updated.strftime('%Y-%m-%d %H:%M') if c.last_updated else 'N/A'}
+DATA QUALITY SCORE: {c.data_quality_score or 'N/A'}/100
+
+PRICING INFO:
+- Model: {c.pricing_model or 'Unknown'}
+- Base Price: {c.base_price or 'N/A'}
+- Price Unit: {c.price_unit or 'N/A'}
+
+PRODUCT INFO:
+- Categories: {c.product_categories or 'N/A'}
+- Key Features: {c.key_features or 'N/A'}
+- Integrations: {c.integration_partners or 'N/A'}
+- Certifications: {c.certifications or 'N/A'}
+
+MARKET INFO:
+- Target Segments: {c.target_segments or 'N/A'}
+- Customer Size Focus: {c.customer_size_focus or 'N/A'}
+- Geographic Focus: {c.geographic_focus or 'N/A'}
+- Customer Count: {c.customer_count or 'N/A'}
+- Key Customers: {c.key_customers or 'N/A'}
+- G2 Rating: {c.g2_rating or 'N/A'}
+
+COMPANY INFO:
+- Headquarters: {c.headquarters or 'N/A'}
+- Founded: {c.year_founded or 'N/A'}
+- Employees: {c.employee_count or 'N/A'}
+- Employee Growth: {c.employee_growth_rate or 'N/A'}
+- Total Funding: {c.funding_total or 'N/A'}
+- Latest Round: {c.latest_round or 'N/A'}
+- Is Public: {'Yes' if c.is_public else 'No (Private)'}
+
+NOTES: {c.notes or 'None'}
+"""
+
+
+def render_knowledge_base_fragment(item: Any, variant: str) -> str:
+    """Context for one knowledge base item."""
+    if variant == "chat":
+        return f"\n--- {item.title} ---\n{item.content_text}\n"
+    return f"\n--- {item.title} ({item.source_type}) ---\n{item.content_text}\n"
+
+
+def make_fingerprint(*parts: Any) -> str:
+    raw = "|".join([CONTEXT_FRAGMENT_VERSION] + ["" if p is None else str(p) for p in parts])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class ContextFragmentStore:
+    """
+    Persistent store of rendered context fragments.
+
+    Writes made through SQLAlchemy sessions are tracked by session event hooks
+    (install_change_tracking) and mark the affected fragments dirty once the
+    session commits. Fingerprints catch writes that bypass the ORM.
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv("CONTEXT_FRAGMENTS_ENABLED", "true").lower() != "false"
+        self._lock = threading.Lock()
+        # (scope, variant) -> {entity_id: mark generation}
+        self._dirty: Dict[Tuple[str, str], Dict[int, int]] = {}
+        self._generation = 0
+        self.stats = {
+            "served": 0,      # Fragments served without rebuilding
+            "rebuilt": 0,
+            "invalidated": 0,
+            "pruned": 0,
+            "errors": 0,
+        }
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self.stats[key] += amount
+
+    # ============== Invalidation ==============
+
+    def invalidate(self, scope: str, entity_id: int):
+        """Mark one competitor or knowledge base item for rebuild in every variant."""
+        if entity_id is None:
+            return
+        with self._lock:
+            self._generation += 1
+            for variant in VARIANTS:
+                self._dirty.setdefault((scope, variant), {})[entity_id] = self._generation
+            self.stats["invalidated"] += 1
+
+    def clear(self, db: Session) -> int:
+        """Drop every stored fragment (they are rebuilt on the next request)."""
+        from database import ContextFragment
+
+        deleted = db.query(ContextFragment).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+
+    # ============== Request path ==============
+
+    def competitor_fragments(self, db: Session, variant: str) -> List[Tuple[Any, str]]:
+        """
+        (snapshot, fragment) for every non-deleted competitor, ordered by id.
+
+        The snapshot is a light row with id, name, threat_level, is_public,
+        ticker_symbol, stock_exchange and pricing_model for counts and live data.
+        """
+        from database import Competitor, DataSource
+
+        snapshots = db.query(
+            Competitor.id, Competitor.name, Competitor.threat_level, Competitor.is_public,
+            Competitor.ticker_symbol, Competitor.stock_exchange, Competitor.pricing_model,
+            Competitor.last_updated
+        ).filter(Competitor.is_deleted == False).order_by(Competitor.id).all()
+
+        source_activity = {
+            competitor_id: (count, latest)
+            for competitor_id, count, latest in db.query(
+                DataSource.competitor_id, func.count(DataSource.id), func.max(DataSource.updated_at)
+            ).group_by(DataSource.competitor_id)
+        }
+
+        fingerprints = {
+            s.id: make_fingerprint(s.last_updated, *source_activity.get(s.id, (0, None)))
+            for s in snapshots
+        }
+
+        def load(ids):
+            return {c.id: c for c in db.query(Competitor).filter(Competitor.id.in_(ids))}
+
+        fragments = self._resolve(db, SCOPE_COMPETITOR, variant, fingerprints, load, render_competitor_fragment)
+        return [(s, fragments[s.id]) for s in snapshots if s.id in fragments]
+
+    def knowledge_base_fragments(self, db: Session, variant: str) -> List[str]:
+        """Fragments for every active knowledge base item, ordered by id."""
+        from database import KnowledgeBaseItem
+
+        # Everything the fragment renders except the text itself, which is covered by updated_at and its length
+        items = db.query(
+            KnowledgeBaseItem.id, KnowledgeBaseItem.created_at, KnowledgeBaseItem.updated_at,
+            KnowledgeBaseItem.title, KnowledgeBaseItem.source_type, func.length(KnowledgeBaseItem.content_text)
+        ).filter(KnowledgeBaseItem.is_active == True).order_by(KnowledgeBaseItem.id).all()
+        fingerprints = {item[0]: make_fingerprint(*item[1:]) for item in items}
+
+        def load(ids):
+            return {i.id: i for i in db.query(KnowledgeBaseItem).filter(KnowledgeBaseItem.id.in_(ids))}
+
+        fragments = self._resolve(
+            db, SCOPE_KNOWLEDGE_BASE, variant, fingerprints, load, render_knowledge_base_fragment
+        )
+        return [fragments[item[0]] for item in items if item[0] in fragments]
+
+    def _resolve(
+        self,
+        db: Session,
+        scope: str,
+        variant: str,
+        fingerprints: Dict[int, str],
+        load: Callable[[List[int]], Dict[int, Any]],
+        render: Callable[[Any, str], str]
+    ) -> Dict[int, str]:
+        """Return entity_id -> fragment, rebuilding stale fragments and pruning orphans."""
+        from database import ContextFragment
+
+        if not self.enabled:
+            return {entity_id: render(obj, variant) for entity_id, obj in load(list(fingerprints)).items()}
+
+        with self._lock:
+            dirty = dict(self._dirty.get((scope, variant), {}))
+
+        stored = {
+            row.entity_id: row for row in db.query(ContextFragment).filter(
+                ContextFragment.scope == scope, ContextFragment.variant == variant
+            )
+        }
+        stale = [
+            entity_id for entity_id, fingerprint in fingerprints.items()
+            if entity_id in dirty or entity_id not in stored or stored[entity_id].fingerprint != fingerprint
+        ]
+
+        fragments = {
+            entity_id: row.content for entity_id, row in stored.items()
+            if entity_id in fingerprints and entity_id not in stale
+        }
+        self._count("served", len(fragments))
+        if not stale and len(stored) == len(fragments):
+            return fragments
+
+        objects = load(stale) if stale else {}
+        for entity_id, obj in objects.items():
+            fragments[entity_id] = render(obj, variant)
+
+        try:
+            now = datetime.utcnow()
+            for entity_id, obj in objects.items():
+                row = stored.get(entity_id)
+                if row is None:
+                    row = ContextFragment(scope=scope, entity_id=entity_id, variant=variant)
+                    db.add(row)
+                row.fingerprint = fingerprints[entity_id]
+                row.content = fragments[entity_id]
+                row.char_count = len(row.content)
+                row.built_at = now
+            orphans = [row for entity_id, row in stored.items() if entity_id not in fingerprints]
+            for row in orphans:
+                db.delete(row)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            self._count("errors")
+            logger.warning(f"Context fragment store failed ({scope}/{variant}): {e}")
+            return fragments
+
+        self._count("rebuilt", len(objects))
+        self._count("pruned", len(orphans))
+        with self._lock:
+            current = self._dirty.get((scope, variant), {})
+            for entity_id, generation in dirty.items():
+                # Keep marks made while we were rebuilding
+                if current.get(entity_id) == generation and (entity_id in objects or entity_id not in fingerprints):
+                    del current[entity_id]
+        return fragments
+
+    def get_stats(self, db: Session) -> Dict[str, Any]:
+        """Counters plus stored fragment counts and sizes per scope/variant."""
+        from database import ContextFragment
+
+        with self._lock:
+            stats = dict(self.stats)
+            stats["pending_rebuilds"] = sum(len(ids) for ids in self._dirty.values())
+        stats["enabled"] = self.enabled
+        stats["fragments"] = {
+            f"{scope}/{variant}": {"count": count, "chars": int(chars or 0)}
+            for scope, variant, count, chars in db.query(
+                ContextFragment.scope, ContextFragment.variant,
+                func.count(ContextFragment.id), func.sum(ContextFragment.char_count)
+            ).group_by(ContextFragment.scope, ContextFragment.variant)
+        }
+        return stats
+
+
+# ============== Change tracking ==============
+
+def _fragment_key(obj) -> Tuple[str, int]:
+    """Fragment a written competitor, data source or KB item belongs to."""
+    from database import DataSource, KnowledgeBaseItem
+
+    if isinstance(obj, DataSource):
+        return (SCOPE_COMPETITOR, obj.competitor_id)
+    if isinstance(obj, KnowledgeBaseItem):
+        return (SCOPE_KNOWLEDGE_BASE, obj.id)
+    return (SCOPE_COMPETITOR, obj.id)
+
+
+def _apply_commit(pending):
+    store = get_context_store()
+    for scope, entity_id in pending:
+        store.invalidate(scope, entity_id)
+
+
+def install_change_tracking():
+    """Hook every SQLAlchemy session so committed writes invalidate fragments."""
+    from database import Competitor, DataSource, KnowledgeBaseItem
+
+    track_committed(_PENDING_KEY, (Competitor, DataSource, KnowledgeBaseItem), _apply_commit, _fragment_key)
+
+
+# ============== CONVENIENCE FUNCTIONS ==============
+
+# Singleton instance
+_store_instance = None
+
+
+def get_context_store() -> ContextFragmentStore:
+    """Get the context fragment store (installs change tracking on first use)."""
+    global _store_instance
+    if _store_instance is None:
+        _store_instance = ContextFragmentStore()
+        install_change_tracking()
+    return _store_instance
@@ -0,0 +1,427 @@
+"""
+Certify Intel - Log Retention & Archival (v5.2.1)
+Keeps data_change_history, change_log and activity_logs bounded.
+
+Rows older than a table's retention window are, one chunk at a time and in one
+transaction per chunk:
+1. Counted into log_summaries (per day or week, per competitor and key, e.g.
+   field_name/changed_by for data_change_history)
+2. Archived: written to a gzipped JSON lines file (file), copied into
+   <table>_archive (table), or dropped (delete)
+3. Deleted from the hot table; retention_progress records the last archived id
+
+The job stops when RETENTION_MAX_SECONDS is used up and carries on with the
+oldest remaining rows on the next run, so an interrupted or time-boxed run is
+simply resumed. In file mode a chunk's file is written before its transaction
+commits; a run interrupted in between rewrites the same file (named by id
+range) or, rarely, archives a row twice - ids identify duplicates.
+
+Freed pages are reused by new rows, so the database stops growing once the
+hot tables are bounded. Set RETENTION_VACUUM=true to also shrink the file
+(SQLite VACUUM, locks the database while it runs) after a run that archived
+rows.
+
+Configuration (environment):
+    DATA_RETENTION_ENABLED                 "true" to run the nightly job at 4 AM (default false)
+    DATA_CHANGE_HISTORY_RETENTION_DAYS     Raw rows kept, 0 keeps everything (default 365)
+    DATA_CHANGE_HISTORY_SUMMARY_PERIOD     day or week (default day)
+    CHANGE_LOG_RETENTION_DAYS              (default 365)
+    CHANGE_LOG_SUMMARY_PERIOD              (default day)
+    ACTIVITY_LOG_RETENTION_DAYS            (default 90)
+    ACTIVITY_LOG_SUMMARY_PERIOD            (default week)
+    RETENTION_ARCHIVE_MODE                 file, table or delete (default file)
+    RETENTION_ARCHIVE_DIR                  Archive file directory (default ./archives)
+    RETENTION_CHUNK_SIZE                   Rows per transaction (default 1000)
+    RETENTION_CHUNK_PAUSE_MS               Pause between chunks for other writers (default 50)
+    RETENTION_MAX_SECONDS                  Time budget per run (default 600)
+    RETENTION_VACUUM                       "true" to compact the database after archiving (default false)
+"""
+import os
+import gzip
+import json
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+RETENTION_ENABLED = os.getenv("DATA_RETENTION_ENABLED", "false").lower() == "true"
+ARCHIVE_MODE = os.getenv("RETENTION_ARCHIVE_MODE", "file").lower()
+ARCHIVE_DIR = os.getenv("RETENTION_ARCHIVE_DIR", "./archives")
+CHUNK_SIZE = int(os.getenv("RETENTION_CHUNK_SIZE", "1000"))
+CHUNK_PAUSE_MS = int(os.getenv("RETENTION_CHUNK_PAUSE_MS", "50"))
+MAX_SECONDS = int(os.getenv("RETENTION_MAX_SECONDS", "600"))
+VACUUM_AFTER_RUN = os.getenv("RETENTION_VACUUM", "false").lower() == "true"
+
+ARCHIVE_MODES = ("file", "table", "delete")
+PERIODS = ("day", "week")
+
+
+@dataclass
+class RetentionPolicy:
+    """How long raw rows of one table are kept and how they are summarized."""
+    table: str
+    timestamp: str            # Age column
+    retention_days: int       # 0 keeps everything
+    period: str               # Summary bucket: day or week
+    key: str                  # Summary key column
+    sub_key: str              # Summary sub-key column
+    has_competitor: bool = True
+
+
+POLICIES: Dict[str, RetentionPolicy] = {
+    policy.table: policy for policy in (
+        RetentionPolicy(
+            "data_change_history", "changed_at",
+            int(os.getenv("DATA_CHANGE_HISTORY_RETENTION_DAYS", "365")),
+            os.getenv("DATA_CHANGE_HISTORY_SUMMARY_PERIOD", "day"),
+            "field_name", "changed_by",
+        ),
+        RetentionPolicy(
+            "change_log", "detected_at",
+            int(os.getenv("CHANGE_LOG_RETENTION_DAYS", "365")),
+            os.getenv("CHANGE_LOG_SUMMARY_PERIOD", "day"),
+            "change_type", "severity",
+        ),
+        RetentionPolicy(
+            "activity_logs", "created_at",
+            int(os.getenv("ACTIVITY_LOG_RETENTION_DAYS", "90")),
+            os.getenv("ACTIVITY_LOG_SUMMARY_PERIOD", "week"),
+            "action_type", "user_email", has_competitor=False,
+        ),
+    )
+}
+
+
+def _model(table: str):
+    from database import ActivityLog, ChangeLog, DataChangeHistory
+    return {
+        "data_change_history": DataChangeHistory,
+        "change_log": ChangeLog,
+        "activity_logs": ActivityLog,
+    }[table]
+
+
+def period_start(ts: datetime, period: str) -> datetime:
+    """Start of the day, or of the week (Monday), containing ts."""
+    day = datetime(ts.year, ts.month, ts.day)
+    if period == "week":
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+def _row_dict(model, row) -> Dict[str, Any]:
+    return {c.name: getattr(row, c.name) for c in model.__table__.columns}
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+# ============== Retention Job ==============
+
+class RetentionJob:
+    """
+    Summarizes, archives and deletes log rows past their retention window.
+
+    One run at a time per process; each chunk commits its summaries, archive
+    rows, deletions and progress together.
+    """
+
+    def __init__(
+        self,
+        policies: Optional[Dict[str, RetentionPolicy]] = None,
+        archive_mode: str = ARCHIVE_MODE,
+        archive_dir: str = ARCHIVE_DIR,
+        chunk_size: int = CHUNK_SIZE,
+        chunk_pause_ms: int = CHUNK_PAUSE_MS,
+        vacuum: bool = VACUUM_AFTER_RUN
+    ):
+        if archive_mode not in ARCHIVE_MODES:
+            raise ValueError(f"RETENTION_ARCHIVE_MODE must be one of {', '.join(ARCHIVE_MODES)}, got {archive_mode!r}")
+        self.policies = policies if policies is not None else POLICIES
+        for policy in self.policies.values():
+            if policy.period not in PERIODS:
+                raise ValueError(f"Summary period for {policy.table} must be day or week, got {policy.period!r}")
+        self.archive_mode = archive_mode
+        self.archive_dir = archive_dir
+        self.chunk_size = chunk_size
+        self.chunk_pause_ms = chunk_pause_ms
+        self.vacuum = vacuum
+        self._run_lock = threading.Lock()
+
+    # ============== Status ==============
+
+    def eligible_counts(self, db: Session, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Rows per table currently past their retention window."""
+        now = now or datetime.utcnow()
+        counts = {}
+        for policy in self.policies.values():
+            if policy.retention_days <= 0:
+                continue
+            model = _model(policy.table)
+            cutoff = now - timedelta(days=policy.retention_days)
+            counts[policy.table] = db.query(func.count(model.id)).filter(
+                getattr(model, policy.timestamp) < cutoff
+            ).scalar()
+        return counts
+
+    def get_status(self, db: Session) -> Dict[str, Any]:
+        """Policies, per-table progress and the rows a run would archive now."""
+        from database import RetentionProgress
+
+        progress = {p.table_name: p for p in db.query(RetentionProgress)}
+        eligible = self.eligible_counts(db)
+        tables = {}
+        for policy in self.policies.values():
+            model = _model(policy.table)
+            p = progress.get(policy.table)
+            tables[policy.table] = {
+                "retention_days": policy.retention_days,
+                "summary_period": policy.period,
+                "rows": db.query(func.count(model.id)).scalar(),
+                "eligible": eligible.get(policy.table, 0),
+                "status": p.status if p else None,
+                "rows_archived": p.rows_archived if p else 0,
+                "last_archived_id": p.last_archived_id if p else None,
+                "last_run_rows": p.last_run_rows if p else 0,
+                "started_at": p.started_at.isoformat() if p and p.started_at else None,
+                "finished_at": p.finished_at.isoformat() if p and p.finished_at else None,
+                "last_error": p.last_error if p else None,
+            }
+        return {
+            "enabled": RETENTION_ENABLED,
+            "archive_mode": self.archive_mode,
+            "archive_dir": os.path.abspath(self.archive_dir) if self.archive_mode == "file" else None,
+            "running": self._run_lock.locked(),
+            "tables": tables,
+        }
+
+    # ============== Run ==============
+
+    def run(
+        self,
+        db: Session,
+        tables: Optional[List[str]] = None,
+        max_seconds: Optional[float] = None,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Archive rows past retention for the given tables (default all).
+
+        Returns {"tables": {table: {"archived", "status"}}, "compacted": bool},
+        or {"skipped": ...} when a run is already in progress.
+        """
+        if not self._run_lock.acquire(blocking=False):
+            return {"skipped": "A retention run is already in progress"}
+        try:
+            now = now or datetime.utcnow()
+            deadline = time.monotonic() + (MAX_SECONDS if max_seconds is None else max_seconds)
+            report: Dict[str, Any] = {"tables": {}, "compacted": False}
+            for policy in self.policies.values():
+                if (tables and policy.table not in tables) or policy.retention_days <= 0:
+                    continue
+                report["tables"][policy.table] = self._run_table(db, policy, now, deadline)
+            if self.vacuum and any(t["archived"] for t in report["tables"].values()):
+                report["compacted"] = self.compact(db)
+            return report
+        finally:
+            self._run_lock.release()
+
+    def _run_table(self, db: Session, policy: RetentionPolicy, now: datetime, deadline: float) -> Dict[str, Any]:
+        from database import RetentionProgress
+
+        model = _model(policy.table)
+        ts_column = getattr(model, policy.timestamp)
+        cutoff = now - timedelta(days=policy.retention_days)
+
+        progress = db.get(RetentionProgress, policy.table)
+        if progress is None:
+            progress = RetentionProgress(table_name=policy.table, rows_archived=0)
+            db.add(progress)
+        progress.status = "running"
+        progress.cutoff = cutoff
+        progress.started_at = now
+        progress.finished_at = None
+        progress.last_error = None
+        progress.last_run_rows = 0
+        db.commit()
+
+        archived = 0
+        try:
+            while True:
+                if time.monotonic() >= deadline:
+                    progress.status = "partial"
+                    break
+                rows = db.query(model).filter(ts_column < cutoff).order_by(model.id).limit(self.chunk_size).all()
+                if not rows:
+                    progress.status = "complete"
+                    break
+                count = self._archive_chunk(db, policy, model, rows, cutoff)
+                progress.last_archived_id = rows[-1].id
+                progress.rows_archived = (progress.rows_archived or 0) + count
+                progress.last_run_rows = (progress.last_run_rows or 0) + count
+                db.commit()
+                archived += count
+                if self.chunk_pause_ms:
+                    time.sleep(self.chunk_pause_ms / 1000)
+            progress.finished_at = datetime.utcnow()
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Retention run for {policy.table} failed: {e}")
+            progress = db.get(RetentionProgress, policy.table)
+            progress.status = "error"
+            progress.last_error = str(e)[:1000]
+            progress.finished_at = datetime.utcnow()
+            db.commit()
+        return {"archived": archived, "status": progress.status}
+
+    def _archive_chunk(self, db: Session, policy: RetentionPolicy, model, rows: List[Any], cutoff: datetime) -> int:
+        """Summarize, archive and delete one chunk (committed by the caller). Returns rows removed."""
+        from database import ARCHIVE_TABLES
+
+        records = [_row_dict(model, row) for row in rows]
+        self._summarize(db, policy, records)
+        if self.archive_mode == "table":
+            db.execute(ARCHIVE_TABLES[policy.table].insert(), records)
+        elif self.archive_mode == "file":
+            self._write_file(policy.table, records)
+
+        # The chunk is the lowest ids past the cutoff, so the id range plus the age filter selects exactly it
+        return db.query(model).filter(
+            model.id >= records[0]["id"], model.id <= records[-1]["id"], getattr(model, policy.timestamp) < cutoff
+        ).delete(synchronize_session=False)
+
+    def _summarize(self, db: Session, policy: RetentionPolicy, records: List[Dict[str, Any]]):
+        """Add the chunk's row counts to log_summaries."""
+        from database import LogSummary
+
+        groups: Dict[tuple, Dict[str, Any]] = {}
+        for record in records:
+            ts = record[policy.timestamp]
+            competitor_id = record.get("competitor_id") if policy.has_competitor else None
+            group_key = (period_start(ts, policy.period), competitor_id, record.get(policy.key), record.get(policy.sub_key))
+            group = groups.setdefault(group_key, {"count": 0, "first": ts, "last": ts, "name": None})
+            group["count"] += 1
+            group["first"] = min(group["first"], ts)
+            group["last"] = max(group["last"], ts)
+            if policy.has_competitor and record.get("competitor_name"):
+                group["name"] = record["competitor_name"]
+
+        existing = {
+            (s.period_start, s.competitor_id, s.key, s.sub_key): s
+            for s in db.query(LogSummary).filter(
+                LogSummary.source_table == policy.table,
+                LogSummary.period == policy.period,
+                LogSummary.period_start.in_({k[0] for k in groups}),
+            )
+        }
+        now = datetime.utcnow()
+        for (start, competitor_id, key, sub_key), group in groups.items():
+            summary = existing.get((start, competitor_id, key, sub_key))
+            if summary is None:
+                db.add(LogSummary(
+                    source_table=policy.table, period=policy.period, period_start=start,
+                    competitor_id=competitor_id, competitor_name=group["name"], key=key, sub_key=sub_key,
+                    row_count=group["count"], first_at=group["first"], last_at=group["last"], updated_at=now,
+                ))
+                continue
+            summary.row_count = (summary.row_count or 0) + group["count"]
+            summary.first_at = min(summary.first_at, group["first"]) if summary.first_at else group["first"]
+            summary.last_at = max(summary.last_at, group["last"]) if summary.last_at else group["last"]
+            summary.competitor_name = group["name"] or summary.competitor_name
+            summary.updated_at = now
+
+    def _write_file(self, table: str, records: List[Dict[str, Any]]):
+        """One gzipped JSON lines file per chunk, named by id range; written atomically."""
+        directory = os.path.join(self.archive_dir, table)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{table}-{records[0]['id']:010d}-{records[-1]['id']:010d}.jsonl.gz")
+        tmp_path = path + ".tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, default=_json_default) + "\n")
+        os.replace(tmp_path, path)
+
+    # ============== Compaction ==============
+
+    def compact(self, db: Session) -> bool:
+        """Return freed pages to the filesystem (SQLite VACUUM, PostgreSQL VACUUM ANALYZE of the log tables)."""
+        engine = db.get_bind()
+        try:
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                if engine.dialect.name == "sqlite":
+                    conn.exec_driver_sql("VACUUM")
+                elif engine.dialect.name == "postgresql":
+                    for table in self.policies:
+                        conn.exec_driver_sql(f"VACUUM ANALYZE {table}")
+                else:
+                    return False
+            return True
+        except Exception as e:
+            logger.warning(f"Database compaction failed: {e}")
+            return False
+
+
+# ============== Archived Counts ==============
+
+def summary_counts(
+    db: Session,
+    table: str,
+    since: datetime,
+    group_by: str = "key",
+    competitor_id: Optional[int] = None
+) -> Dict[Optional[str], int]:
+    """
+    Archived row counts per key (or sub_key) from log_summaries for periods
+    starting at or after since. A week bucket that starts before since is
+    left out, so counts near the boundary are approximate.
+    """
+    from database import LogSummary
+
+    column = LogSummary.key if group_by == "key" else LogSummary.sub_key
+    query = db.query(column, func.sum(LogSummary.row_count)).filter(
+        LogSummary.source_table == table,
+        LogSummary.period_start >= since,
+    )
+    if competitor_id is not None:
+        query = query.filter(LogSummary.competitor_id == competitor_id)
+    return {value: int(count or 0) for value, count in query.group_by(column)}
+
+
+# ============== CONVENIENCE FUNCTIONS ==============
+
+# Singleton instance
+_job_instance = None
+
+
+def get_retention_job() -> RetentionJob:
+    """Get the retention job configured from the environment."""
+    global _job_instance
+    if _job_instance is None:
+        _job_instance = RetentionJob()
+    return _job_instance
+
+
+def run_scheduled_retention() -> Dict[str, Any]:
+    """Scheduler entry point: one time-boxed run in its own session."""
+    from database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        report = get_retention_job().run(db)
+    finally:
+        db.close()
+    archived = sum(t["archived"] for t in report.get("tables", {}).values())
+    logger.info(f"Retention run archived {archived} rows: {report}")
+    return report
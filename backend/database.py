@@ -1,10 +1,13 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey
+from sqlalchemy import create_engine, event, Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey, UniqueConstraint, Index, Table
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime
 import os
 import sys
 
+import metric_values
+import sqlite_profile
+
 # Database setup - SQLite for simplicity
 # PyInstaller Fix (v5.0.3): Ensure database is created next to executable, not in temp folder
 def _get_database_url():
@@ -23,8 +26,43 @@ def _get_database_url():
     # Default for development
     return "sqlite:///./certify_intel.db"
 
-DATABASE_URL = _get_database_url()
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+def normalize_database_url(url: str) -> str:
+    """Accept the postgres:// scheme some hosts hand out (SQLAlchemy only knows postgresql://)."""
+    if url.startswith("postgres://"):
+        return "postgresql://" + url[len("postgres://"):]
+    return url
+
+
+def create_db_engine(url: str):
+    """
+    Engine for the given URL (v5.2.1).
+
+    SQLite gets its single-file connect args and the optional production
+    profile. Server databases (PostgreSQL) get a sized connection pool with
+    pre-ping, so several API workers can share one database:
+
+        DB_POOL_SIZE       Persistent connections per process (default 10)
+        DB_MAX_OVERFLOW    Extra connections under burst load (default 20)
+        DB_POOL_TIMEOUT    Seconds to wait for a free connection (default 30)
+        DB_POOL_RECYCLE    Reconnect after this many seconds (default 1800)
+    """
+    url = normalize_database_url(url)
+    if sqlite_profile.is_sqlite(url):
+        sqlite_engine = create_engine(url, connect_args=sqlite_profile.connect_args(url))
+        sqlite_profile.apply_sqlite_profile(sqlite_engine)  # WAL + pragmas when SQLITE_PRODUCTION_PROFILE=true
+        return sqlite_engine
+    return create_engine(
+        url,
+        pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),
+        pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "30")),
+        pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        pool_pre_ping=True,
+    )
+
+
+DATABASE_URL = normalize_database_url(_get_database_url())
+engine = create_db_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -189,6 +227,48 @@ class Competitor(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     last_verified_at = Column(DateTime, nullable=True)  # For freshness tracking
 
+    # ===========================================
+    # TYPED METRICS (v5.2.1) - parsed shadows of the text fields above,
+    # kept in sync on write (see metric_values.py); query these, not the text
+    # ===========================================
+    customer_count_value = Column(Float, nullable=True, index=True)
+    customer_count_unit = Column(String, nullable=True)
+    customer_count_low = Column(Float, nullable=True)
+    customer_count_high = Column(Float, nullable=True)
+    employee_count_value = Column(Float, nullable=True, index=True)
+    employee_count_unit = Column(String, nullable=True)
+    employee_count_low = Column(Float, nullable=True)
+    employee_count_high = Column(Float, nullable=True)
+    base_price_value = Column(Float, nullable=True, index=True)
+    base_price_unit = Column(String, nullable=True)
+    base_price_low = Column(Float, nullable=True)
+    base_price_high = Column(Float, nullable=True)
+    funding_total_value = Column(Float, nullable=True, index=True)
+    funding_total_unit = Column(String, nullable=True)
+    funding_total_low = Column(Float, nullable=True)
+    funding_total_high = Column(Float, nullable=True)
+    annual_revenue_value = Column(Float, nullable=True, index=True)
+    annual_revenue_unit = Column(String, nullable=True)
+    annual_revenue_low = Column(Float, nullable=True)
+    annual_revenue_high = Column(Float, nullable=True)
+    employee_growth_rate_value = Column(Float, nullable=True, index=True)
+    employee_growth_rate_unit = Column(String, nullable=True)
+    employee_growth_rate_low = Column(Float, nullable=True)
+    employee_growth_rate_high = Column(Float, nullable=True)
+    # Parser version of the shadow columns; older or NULL rows are re-parsed at startup
+    metrics_parse_version = Column(String(10), nullable=True, default=metric_values.METRICS_PARSE_VERSION)
+
+
+def _keep_metric_in_sync(field):
+    @event.listens_for(getattr(Competitor, field), "set")
+    def _on_set(target, value, oldvalue, initiator):
+        for column, parsed in metric_values.shadow_values(field, value).items():
+            setattr(target, column, parsed)
+
+
+for _metric_field in metric_values.METRIC_FIELDS:
+    _keep_metric_in_sync(_metric_field)
+
 
 class ChangeLog(Base):
     __tablename__ = "change_log"
@@ -442,6 +522,7 @@ class KnowledgeBaseItem(Base):
     source_type = Column(String, default="manual") # manual, upload, integration
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)  # v5.2.1: context fingerprints
 
 
 class SystemSetting(Base):
@@ -737,8 +818,18 @@ class NewsArticleCache(Base):
 
     Stores news articles to reduce API calls and improve load times.
     Articles are automatically refreshed by the background scheduler.
+    published_at is naive UTC; the composite indexes serve the news feed's
+    filter + (published_at, id) keyset ordering (v5.2.1). The competitor index
+    also carries sentiment and fetched_at so /api/news-coverage aggregates
+    from the index alone.
     """
     __tablename__ = "news_article_cache"
+    __table_args__ = (
+        Index("ix_news_cache_published_id", "published_at", "id"),
+        Index("ix_news_cache_competitor_coverage", "competitor_id", "published_at", "sentiment", "fetched_at"),
+        Index("ix_news_cache_sentiment_published", "sentiment", "published_at"),
+        Index("ix_news_cache_event_published", "event_type", "published_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     competitor_id = Column(Integer, ForeignKey("competitors.id"), index=True)
@@ -746,7 +837,9 @@ class NewsArticleCache(Base):
 
     # Article data
     title = Column(String)
-    url = Column(String, index=True)  # Dedupe key
+    url = Column(String, index=True)
+    url_hash = Column(String(40), unique=True, index=True)  # sha1 of normalized URL; dedupe / ON CONFLICT key
+    title_hash = Column(String(40), index=True)  # Headline fingerprint for syndicated copies
     source = Column(String)  # e.g., "TechCrunch", "Reuters"
     source_type = Column(String)  # google_news, sec_edgar, gnews, mediastack, newsdata
     published_at = Column(DateTime, index=True)
@@ -767,9 +860,311 @@ class NewsArticleCache(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
+class ExtractionCache(Base):
+    """
+    Cache of AI extraction results keyed by page content hash (v5.2.1).
+
+    One row per competitor/page type. When a re-scraped page normalizes to the
+    same content_hash, the stored ExtractedData is reused instead of calling
+    the LLM again.
+    """
+    __tablename__ = "extraction_cache"
+    __table_args__ = (
+        UniqueConstraint("competitor_name", "page_type", name="uq_extraction_cache_competitor_page"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    competitor_name = Column(String, index=True)
+    page_type = Column(String)  # homepage, pricing, about, ...
+    content_hash = Column(String, index=True)  # sha256 of normalized page text
+
+    extracted_data = Column(Text)  # JSON of ExtractedData
+    extraction_model = Column(String, nullable=True)  # e.g., "gpt-4o-mini", "hybrid"
+    content_length = Column(Integer, default=0)
+
+    hit_count = Column(Integer, default=0)
+    last_hit_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class LLMResponseCache(Base):
+    """
+    Cache of LLM responses keyed by provider, model and prompt (v5.2.1).
+
+    cache_key is a sha256 of provider, model, system prompt, user prompt and
+    JSON mode. Rows expire after their TTL; the least recently used rows are
+    evicted when the table grows past LLM_CACHE_MAX_ENTRIES.
+    """
+    __tablename__ = "llm_response_cache"
+
+    id = Column(Integer, primary_key=True, index=True)
+    cache_key = Column(String, unique=True, index=True)
+    task_type = Column(String, index=True)  # classification, threat_analysis, swot_analysis, ...
+    provider = Column(String)  # openai, gemini
+    model = Column(String)
+
+    response = Column(Text)  # Raw response content (JSON text in JSON mode)
+    response_size = Column(Integer, default=0)
+
+    hit_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, index=True)
+    last_accessed_at = Column(DateTime, default=datetime.utcnow, index=True)  # LRU order
+
+
+class NewsFetchState(Base):
+    """
+    Incremental polling state per news source and company query (v5.2.1).
+
+    Holds the validators for conditional GETs (ETag / Last-Modified) and the
+    newest published timestamp seen, so the next refresh only asks for newer
+    items. See news_fetch_state.
+    """
+    __tablename__ = "news_fetch_state"
+    __table_args__ = (
+        UniqueConstraint("source", "query_key", name="uq_news_fetch_state_source_query"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    source = Column(String(40), nullable=False)  # google_news, newsapi, gnews, ...
+    query_key = Column(String, nullable=False, index=True)  # Normalized company name
+    etag = Column(String, nullable=True)
+    last_modified = Column(String, nullable=True)
+    newest_published_at = Column(DateTime, nullable=True)  # Naive UTC
+    last_fetched_at = Column(DateTime, nullable=True)
+    last_status = Column(String(20), nullable=True)  # ok, not_modified, error
+    last_new_items = Column(Integer, default=0)
+    recent_urls = Column(Text, nullable=True)  # JSON {url_hash: published} inside the overlap window
+    covered_from = Column(DateTime, nullable=True)  # Earliest window start fetched continuously since
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class SentimentScoreCache(Base):
+    """
+    Persistent ML sentiment scores keyed by model and text hash (v5.2.1).
+
+    Headlines are re-fetched on every news refresh; a cached score skips the
+    transformer forward pass. Keyword-fallback results are never stored.
+    """
+    __tablename__ = "sentiment_score_cache"
+
+    id = Column(Integer, primary_key=True, index=True)
+    text_hash = Column(String(64), unique=True, index=True)  # sha256(version, model, text)
+    model = Column(String)
+    label = Column(String)  # positive, negative, neutral
+    score = Column(Float)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
+class ContextFragment(Base):
+    """
+    Prebuilt LLM context text for one competitor or knowledge base item (v5.2.1).
+
+    The executive summary and analytics chat concatenate these fragments
+    instead of formatting every competitor on each request. A fragment is
+    rebuilt when its fingerprint (row timestamps, data source activity) no
+    longer matches or the row was edited since it was built.
+    """
+    __tablename__ = "context_fragments"
+    __table_args__ = (
+        UniqueConstraint("scope", "entity_id", "variant", name="uq_context_fragment"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    scope = Column(String, index=True)  # competitor, knowledge_base
+    entity_id = Column(Integer, index=True)
+    variant = Column(String)  # summary, chat
+    fingerprint = Column(String)
+    content = Column(Text)
+    char_count = Column(Integer, default=0)
+    built_at = Column(DateTime, default=datetime.utcnow)
+
+
+class CompetitorMetricsRollup(Base):
+    """
+    Precomputed analytics values for one non-deleted competitor (v5.2.1).
+
+    Read by the analytics dashboard, market map, threat distribution and
+    sales priority matrix; maintained by analytics_rollup.py.
+    """
+    __tablename__ = "competitor_metrics_rollup"
+
+    competitor_id = Column(Integer, primary_key=True)
+    name = Column(String)
+    status = Column(String, index=True)
+    threat_level = Column(String, index=True)
+    last_updated = Column(DateTime, index=True)  # Competitor.last_updated, for freshness counts
+    data_quality_score = Column(Integer, nullable=True)
+    customer_count = Column(Float, nullable=True)  # Typed customer_count_value
+    employee_count = Column(Float, nullable=True)  # Typed employee_count_value
+    category = Column(String, nullable=True)  # product_categories, truncated for display
+    dim_overall_score = Column(Float, nullable=True)
+    dimension_scores = Column(Text)  # JSON {dimension_id: 1-5}
+    weaknesses = Column(Text)  # JSON [dimension_id] scored <= 2
+    strengths = Column(Text)  # JSON [dimension_id] scored >= 4
+    weakness_count = Column(Integer, default=0)
+    strength_count = Column(Integer, default=0)
+    sales_priority = Column(String, index=True)  # high_priority, medium_priority, low_priority, not_assessed
+    refreshed_at = Column(DateTime, default=datetime.utcnow)
+
+
+class AnalyticsRollupState(Base):
+    """
+    Single row (id=1) holding the dashboard aggregates of competitor_metrics_rollup
+    with a version counter bumped on every refresh (v5.2.1).
+    """
+    __tablename__ = "analytics_rollup_state"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, default=0)
+    rollup_version = Column(String)  # analytics_rollup.ROLLUP_VERSION the rows were computed with
+    summary = Column(Text)  # JSON aggregates (status/threat counts, averages)
+    refreshed_at = Column(DateTime)
+    rebuilt_at = Column(DateTime)
+
+
+class LogSummary(Base):
+    """
+    Per-day or per-week row counts for change and activity log rows moved out
+    of the hot tables by data_retention.py (v5.2.1).
+
+    key/sub_key depend on the source table: field_name/changed_by for
+    data_change_history, change_type/severity for change_log and
+    action_type/user_email for activity_logs.
+    """
+    __tablename__ = "log_summaries"
+    __table_args__ = (
+        Index("ix_log_summaries_period", "source_table", "period", "period_start"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    source_table = Column(String)
+    period = Column(String)  # day, week
+    period_start = Column(DateTime)
+    competitor_id = Column(Integer, nullable=True, index=True)
+    competitor_name = Column(String, nullable=True)
+    key = Column(String, nullable=True)
+    sub_key = Column(String, nullable=True)
+    row_count = Column(Integer, default=0)
+    first_at = Column(DateTime)
+    last_at = Column(DateTime)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class RetentionProgress(Base):
+    """Per-table state of the retention job, updated with every archived chunk (v5.2.1)."""
+    __tablename__ = "retention_progress"
+
+    table_name = Column(String, primary_key=True)
+    status = Column(String)  # running, partial (time budget reached), complete, error
+    cutoff = Column(DateTime)  # Rows older than this are archived
+    last_archived_id = Column(Integer, nullable=True)
+    rows_archived = Column(Integer, default=0)  # All runs
+    last_run_rows = Column(Integer, default=0)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+
+
+def _archive_table(model) -> Table:
+    """<table>_archive with the model's columns and no secondary indexes (RETENTION_ARCHIVE_MODE=table)."""
+    return Table(
+        f"{model.__tablename__}_archive", Base.metadata,
+        *[Column(c.name, c.type, primary_key=c.primary_key) for c in model.__table__.columns]
+    )
+
+
+ARCHIVE_TABLES = {
+    model.__tablename__: _archive_table(model)
+    for model in (DataChangeHistory, ChangeLog, ActivityLog)
+}
+
+
 # Create tables
 Base.metadata.create_all(bind=engine)
 
+
+# Indexes superseded by wider ones; dropped on upgrade so writes don't maintain both
+RETIRED_INDEXES = (
+    "ix_news_cache_competitor_published",  # -> ix_news_cache_competitor_coverage
+)
+
+
+def ensure_schema(bind=None):
+    """
+    Add columns and indexes introduced after a table was first created.
+
+    create_all only creates missing tables, so upgraded installs get new
+    nullable columns via ALTER TABLE, new indexes with checkfirst, and lose
+    RETIRED_INDEXES. Covers every model and works on SQLite and PostgreSQL.
+    Returns the "table.column" / index names it added.
+    """
+    from sqlalchemy import inspect, text
+    bind = bind or engine
+    added = []
+    with bind.begin() as conn:
+        for name in RETIRED_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+    inspector = inspect(bind)
+    tables = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in tables:
+            continue
+        existing = {col["name"] for col in inspector.get_columns(table.name)}
+        with bind.begin() as conn:
+            for column in table.columns:
+                if column.name not in existing:
+                    col_type = column.type.compile(dialect=bind.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}"))
+                    added.append(f"{table.name}.{column.name}")
+        indexes = {ix["name"] for ix in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in indexes:
+                index.create(bind=bind, checkfirst=True)
+                added.append(index.name)
+    return added
+
+
+def backfill_news_published_at(db) -> int:
+    """Give cached articles without a published date their fetch time so date filters can index them."""
+    from sqlalchemy import func
+    updated = db.query(NewsArticleCache).filter(
+        NewsArticleCache.published_at.is_(None)
+    ).update(
+        {NewsArticleCache.published_at: func.coalesce(NewsArticleCache.fetched_at, NewsArticleCache.created_at)},
+        synchronize_session=False
+    )
+    db.commit()
+    return updated
+
+
+def backfill_competitor_metrics(db) -> int:
+    """
+    Re-parse typed metric columns for rows parsed by an older parser version,
+    or written before the columns existed (or by raw SQL). Each row is parsed
+    once per version, including rows whose text holds no number.
+    Returns the number of competitors whose values changed.
+    """
+    from sqlalchemy import or_
+    version = metric_values.METRICS_PARSE_VERSION
+    pending = db.query(Competitor).filter(or_(
+        Competitor.metrics_parse_version.is_(None), Competitor.metrics_parse_version != version
+    )).all()
+    columns = [f"{field}_{part}" for field in metric_values.METRIC_FIELDS for part in ("value", "unit", "low", "high")]
+    updated = 0
+    for competitor in pending:
+        before = [getattr(competitor, column) for column in columns]
+        metric_values.sync_metric_columns(competitor)
+        competitor.metrics_parse_version = version
+        if [getattr(competitor, column) for column in columns] != before:
+            updated += 1
+    db.commit()
+    return updated
+
+
+ensure_schema()
+
 # Dependency
 def get_db():
     db = SessionLocal()
@@ -9,23 +9,86 @@ Analyzes news articles, customer reviews, and competitor data to:
 - Suggest dimension scores based on all available data
 
 Uses the existing OpenAI/Gemini hybrid AI infrastructure.
+
+v5.2.1: classify_articles_batch() tags many articles per LLM request. Articles
+        settled by keywords or with no dimension signal at all never reach the
+        model; the rest are packed into ID-tagged batches sized to a token budget.
+
+Configuration (environment):
+    DIMENSION_BATCH_TOKEN_BUDGET   Approximate prompt + response tokens per batch (default 3000)
+    DIMENSION_BATCH_MAX_ITEMS      Max articles per batch request (default 25)
 """
 
 from typing import Dict, List, Tuple, Optional, Any
 from datetime import datetime
 import json
 import os
+import re
 import logging
 
+from llm_cache import get_llm_cache
 from sales_marketing_module import (
     DimensionID,
     DIMENSION_METADATA,
     SCORE_LABELS,
-    calculate_dimension_match
+    DIMENSION_SIGNAL_MATCHER,
+    match_dimension_signals
 )
 
 logger = logging.getLogger(__name__)
 
+# Rough chars-per-token ratio (same as content_ranker)
+CHARS_PER_TOKEN = 4
+
+# Expected response tokens per article in a batch ({"id": .., "dimensions": [..]})
+RESPONSE_TOKENS_PER_ITEM = 60
+
+# Snippet characters sent per article in batch prompts
+BATCH_SNIPPET_CHARS = 300
+
+# Words from dimension names/descriptions too generic to count as a signal
+_HINT_STOPWORDS = {
+    "product", "number", "depth", "evidence", "value", "level", "model", "strength", "drivers",
+    "requirements", "operational", "sustained", "volume", "burden", "consistency", "commercial",
+    "capability", "embedded", "service", "services", "enterprise",
+}
+# How news phrases dimension topics that the metadata keywords miss (word prefixes)
+_NEWS_HINTS = (
+    "price", "priced", "discount", "subscription", "go live", "goes live", "went live", "rollout", "roll out",
+    "deploy", "rolls out", "outage", "downtime", "renew", "churn", "customer", "client", "selects", "signs",
+    "partner", "interoperab", "ehr", "emr", "api", "analytic", "dashboard", "report", "adopt", "usage",
+    "scal", "hipaa", "security", "certif", "hitrust", "soc 2", "migrat", "implement", "onboard",
+)
+_HINT_PATTERN = re.compile(r"\b(?:" + "|".join(re.escape(h) for h in _NEWS_HINTS) + ")")  # Word-start match
+_WORD = re.compile(r"[a-z]+")
+_signal_stems: Optional[set] = None
+
+
+def _stems(text: str) -> set:
+    return {word[:6] for word in _WORD.findall(text.lower()) if len(word) >= 5}
+
+
+def has_dimension_signal(text: str) -> bool:
+    """
+    Cheap pre-filter: does the text mention any dimension keyword, review
+    signal, common news phrasing of a dimension topic, or a distinctive word
+    (by 6-letter stem) from a dimension's name or description? Articles
+    without one are not sent to the LLM.
+    """
+    global _signal_stems
+    text_lower = text.lower()
+    if _HINT_PATTERN.search(text_lower):
+        return True
+    if DIMENSION_SIGNAL_MATCHER.search(text_lower):
+        return True
+    if _signal_stems is None:
+        stems = set()
+        for meta in DIMENSION_METADATA.values():
+            words = [w for w in _WORD.findall(f"{meta['name']} {meta['description']}".lower()) if w not in _HINT_STOPWORDS]
+            stems |= _stems(" ".join(words))
+        _signal_stems = stems
+    return bool(_stems(text_lower) & _signal_stems)
+
 
 class DimensionAnalyzer:
     """
@@ -76,17 +139,11 @@ class DimensionAnalyzer:
             List of (dimension_id, confidence) tuples sorted by confidence
         """
         # First try keyword-based matching (fast, no API call)
-        text = f"{title} {snippet}".lower()
-        keyword_matches = []
-
-        for dim_id in DimensionID:
-            is_match, confidence = calculate_dimension_match(text, dim_id.value)
-            if is_match:
-                keyword_matches.append((dim_id.value, confidence))
+        keyword_matches = self._keyword_matches(title, snippet)
 
         # If we have good keyword matches, return them
-        if keyword_matches and max(c for _, c in keyword_matches) > 0.5:
-            return sorted(keyword_matches, key=lambda x: x[1], reverse=True)
+        if keyword_matches and keyword_matches[0][1] > 0.5:
+            return keyword_matches
 
         # Otherwise, use AI for classification
         client = self._get_ai_client()
@@ -96,29 +153,195 @@ class DimensionAnalyzer:
 
         try:
             prompt = self._build_classification_prompt(title, snippet, competitor_name)
-
-            if hasattr(client, 'generate_json'):
-                # Gemini provider
-                response = client.generate_json(prompt)
-                if response.success:
-                    return self._parse_classification_response(response.content)
-            else:
-                # OpenAI client
-                response = client.chat.completions.create(
-                    model=self.model,
-                    messages=[{"role": "user", "content": prompt}],
-                    response_format={"type": "json_object"},
-                    temperature=0.3
-                )
-                content = response.choices[0].message.content
-                return self._parse_classification_response(json.loads(content))
-
+            response = self._complete_json(client, prompt, "dimension_classification")
+            if response is not None:
+                return self._parse_classification_response(response)
         except Exception as e:
             logger.error(f"AI classification failed: {e}")
             return keyword_matches
 
         return keyword_matches
 
+    def _keyword_matches(self, title: str, snippet: str) -> List[Tuple[str, float]]:
+        # One pass over the text for all dimensions (same scoring as calculate_dimension_match)
+        counts = match_dimension_signals(f"{title} {snippet}")
+        matches = [(dim_id.value, min(counts[dim_id.value] / 3, 1.0)) for dim_id in DimensionID if dim_id.value in counts]
+        return sorted(matches, key=lambda x: x[1], reverse=True)
+
+    def _complete_json(self, client, prompt: str, task_type: str) -> Optional[Dict[str, Any]]:
+        """One cached JSON-mode request to Gemini or OpenAI; None on a Gemini error result."""
+        cache = get_llm_cache()
+
+        if hasattr(client, 'generate_json'):
+            # Gemini provider (returns a dict, {"error": ...} on failure)
+            response = cache.get_or_compute(
+                task_type=task_type,
+                provider="gemini",
+                model=client.config.model,
+                system_prompt=None,
+                prompt=prompt,
+                json_mode=True,
+                compute=lambda: client.generate_json(prompt),
+                to_cache=lambda result: None if "error" in result else json.dumps(result),
+                from_cache=json.loads,
+            )
+            return None if "error" in response else response
+
+        # OpenAI client
+        content = cache.get_or_compute(
+            task_type=task_type,
+            provider="openai",
+            model=self.model,
+            system_prompt=None,
+            prompt=prompt,
+            json_mode=True,
+            compute=lambda: client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                response_format={"type": "json_object"},
+                temperature=0.3
+            ).choices[0].message.content,
+        )
+        return json.loads(content)
+
+    # ============== BATCHED ARTICLE CLASSIFICATION (v5.2.1) ==============
+
+    def classify_articles_batch(
+        self,
+        articles: List[Tuple[str, str]],
+        competitor_name: str,
+        token_budget: Optional[int] = None,
+        max_items: Optional[int] = None
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        Classify many (title, snippet) articles with as few LLM calls as possible.
+
+        Per article, in order:
+        - two or more keyword hits: keyword result, no LLM (as in classify_article_dimension)
+        - no dimension signal at all: [] without an LLM call
+        - otherwise: sent to the LLM in ID-tagged batches packed to the token budget
+
+        Returns one list of (dimension_id, confidence) per input article.
+        """
+        results: List[List[Tuple[str, float]]] = []
+        pending: List[int] = []
+        for index, (title, snippet) in enumerate(articles):
+            matches = self._keyword_matches(title, snippet)
+            results.append(matches)
+            if matches and matches[0][1] > 0.5:
+                continue
+            if not matches and not has_dimension_signal(f"{title} {snippet}"):
+                continue
+            pending.append(index)
+
+        if not pending:
+            return results
+        client = self._get_ai_client()
+        if not client:
+            logger.warning("No AI client available for dimension classification")
+            return results
+
+        for batch in self._pack_batches(articles, pending, competitor_name, token_budget, max_items):
+            try:
+                prompt = self._build_batch_classification_prompt(articles, batch, competitor_name)
+                response = self._complete_json(client, prompt, "dimension_classification_batch")
+                if response is None:
+                    continue
+                for index, dims in self._parse_batch_response(response, batch).items():
+                    results[index] = dims
+            except Exception as e:
+                # Articles in the failed batch keep their keyword matches
+                logger.error(f"Batched AI classification failed: {e}")
+
+        return results
+
+    def _pack_batches(
+        self,
+        articles: List[Tuple[str, str]],
+        pending: List[int],
+        competitor_name: str,
+        token_budget: Optional[int] = None,
+        max_items: Optional[int] = None
+    ) -> List[List[int]]:
+        """Group article indexes so each prompt plus its expected response fits the token budget."""
+        budget = token_budget or int(os.getenv("DIMENSION_BATCH_TOKEN_BUDGET", "3000"))
+        max_items = max_items or int(os.getenv("DIMENSION_BATCH_MAX_ITEMS", "25"))
+        overhead = len(self._build_batch_classification_prompt(articles, [], competitor_name)) // CHARS_PER_TOKEN
+
+        batches: List[List[int]] = []
+        current: List[int] = []
+        used = overhead
+        for index in pending:
+            title, snippet = articles[index]
+            cost = (len(title) + min(len(snippet or ""), BATCH_SNIPPET_CHARS) + 20) // CHARS_PER_TOKEN + RESPONSE_TOKENS_PER_ITEM
+            if current and (used + cost > budget or len(current) >= max_items):
+                batches.append(current)
+                current, used = [], overhead
+            current.append(index)
+            used += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    def _build_batch_classification_prompt(
+        self,
+        articles: List[Tuple[str, str]],
+        batch: List[int],
+        competitor_name: str
+    ) -> str:
+        """Prompt listing several articles, each with the ID the response must echo."""
+        dimensions_desc = "\n".join([
+            f"- {dim_id.value}: {meta['name']} - {meta['description']}"
+            for dim_id, meta in DIMENSION_METADATA.items()
+        ])
+        items = "\n\n".join(
+            f"[{index}] Title: {articles[index][0]}\nSnippet: {(articles[index][1] or '')[:BATCH_SNIPPET_CHARS]}"
+            for index in batch
+        )
+
+        return f"""Classify which competitive dimensions each of these news articles about {competitor_name} relates to.
+Each article starts with its numeric ID in brackets.
+
+Available Dimensions:
+{dimensions_desc}
+
+Return a JSON object with one entry per article ID:
+{{
+    "articles": [
+        {{"id": 0, "dimensions": [{{"dimension_id": "dimension_name", "confidence": 0.0-1.0}}]}}
+    ]
+}}
+
+Only include dimensions with confidence > 0.3. Use an empty "dimensions" array when none match.
+
+ARTICLES:
+{items}"""
+
+    def _parse_batch_response(self, response: Any, batch: List[int]) -> Dict[int, List[Tuple[str, float]]]:
+        """Map article ID -> dimensions, ignoring unknown IDs and dimension names."""
+        if isinstance(response, str):
+            try:
+                response = json.loads(response)
+            except json.JSONDecodeError:
+                return {}
+        valid_ids = set(batch)
+        valid_dimensions = {dim_id.value for dim_id in DimensionID}
+        parsed: Dict[int, List[Tuple[str, float]]] = {}
+        for entry in response.get("articles", []) if isinstance(response, dict) else []:
+            try:
+                index = int(entry.get("id"))
+            except (TypeError, ValueError):
+                continue
+            if index not in valid_ids:
+                continue
+            dims = [
+                (d["dimension_id"], float(d.get("confidence", 0)))
+                for d in entry.get("dimensions", [])
+                if isinstance(d, dict) and d.get("dimension_id") in valid_dimensions and float(d.get("confidence", 0)) > 0.3
+            ]
+            parsed[index] = sorted(dims, key=lambda x: x[1], reverse=True)
+        return parsed
+
     def _build_classification_prompt(
         self,
         title: str,
@@ -183,6 +406,7 @@ Only include dimensions with confidence > 0.3. Return empty array if no dimensio
         # Keyword-based quick analysis
         dimension_signals = {}
         text_lower = review_text.lower()
+        found_signals = DIMENSION_SIGNAL_MATCHER.find(text_lower)
 
         for dim_id in DimensionID:
             meta = DIMENSION_METADATA[dim_id]
@@ -191,7 +415,7 @@ Only include dimensions with confidence > 0.3. Return empty array if no dimensio
 
             # Check for review signals
             for signal in meta.get("review_signals", []):
-                if signal.lower() in text_lower:
+                if signal.lower() in found_signals:
                     # Determine if the context is positive or negative
                     # This is a simplified heuristic
                     signal_idx = text_lower.find(signal.lower())
@@ -19,14 +19,16 @@ except ImportError:
     DDGS_AVAILABLE = False
     print("Warning: duckduckgo-search not installed. Run: pip install duckduckgo-search")
 
-# Playwright for scraping
+# Playwright for scraping (browsers come from the shared pool)
 try:
-    from playwright.async_api import async_playwright
+    import playwright.async_api  # noqa: F401
     PLAYWRIGHT_AVAILABLE = True
 except ImportError:
     PLAYWRIGHT_AVAILABLE = False
     print("Warning: playwright not installed. Run: pip install playwright && playwright install chromium")
 
+from browser_pool import get_browser_pool
+
 # OpenAI for advanced qualification (optional)
 try:
     import openai
@@ -328,9 +330,9 @@ class DiscoveryAgent:
             return self._basic_url_score(url)
 
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                page = await browser.new_page()
+            # v5.2.1: Lease a context from the shared pool instead of launching Chromium
+            async with get_browser_pool().context() as context:
+                page = await context.new_page()
                 try:
                     await page.goto(url, timeout=15000, wait_until="domcontentloaded")
                     text_content = await page.evaluate("document.body.innerText")
@@ -341,7 +343,6 @@ class DiscoveryAgent:
                     
                     # 1. Context Check (Must have healthcare context)
                     if not any(k in text_lower for k in self.profile["required_context"]):
-                        await browser.close()
                         return 0, {"reasoning": "Missing healthcare context"}
                     score += 20
                     
@@ -368,11 +369,9 @@ class DiscoveryAgent:
                             break
                     
                     reasoning = f"Matched: {', '.join(matches[:3])}" if matches else "Healthcare context only"
-                    await browser.close()
                     return max(0, min(score, 100)), {"reasoning": reasoning}
                     
                 except Exception as e:
-                    await browser.close()
                     return 0, {"error": str(e)[:50]}
                     
         except Exception as e:
@@ -399,13 +398,11 @@ class DiscoveryAgent:
         text_content = ""
         if PLAYWRIGHT_AVAILABLE:
             try:
-                async with async_playwright() as p:
-                    browser = await p.chromium.launch(headless=True)
-                    page = await browser.new_page()
+                async with get_browser_pool().context() as context:
+                    page = await context.new_page()
                     await page.goto(url, timeout=15000, wait_until="domcontentloaded")
                     text_content = await page.evaluate("document.body.innerText")
                     text_content = text_content[:3000]  # Limit tokens
-                    await browser.close()
             except Exception:
                 pass
         
@@ -485,13 +482,11 @@ class DiscoveryAgent:
         text_content = ""
         if PLAYWRIGHT_AVAILABLE:
             try:
-                async with async_playwright() as p:
-                    browser = await p.chromium.launch(headless=True)
-                    page = await browser.new_page()
+                async with get_browser_pool().context() as context:
+                    page = await context.new_page()
                     await page.goto(url, timeout=15000, wait_until="domcontentloaded")
                     text_content = await page.evaluate("document.body.innerText")
                     text_content = text_content[:4000]  # Gemini can handle more tokens
-                    await browser.close()
             except Exception:
                 pass
 
@@ -0,0 +1,252 @@
+"""
+Certify Intel - Extraction Cache (v5.2.1)
+Skips AI extraction when a competitor page has not changed since the last refresh.
+
+Pages are normalized (case, whitespace, copyright years, timestamps) and hashed.
+The last ExtractedData for each competitor/page type is stored in the
+extraction_cache table; when the hash matches it is returned without an LLM call.
+Batched extraction stores only the fields attributed to each page, so its
+results live under their own keys (batch_page_type) and never answer a
+single-page lookup.
+
+Configuration (environment):
+    EXTRACTION_CACHE_ENABLED         "false" to disable the cache (default true)
+    EXTRACTION_CACHE_MAX_AGE_DAYS    Force re-extraction after N days (default 90, 0 = never)
+"""
+import os
+import re
+import json
+import hashlib
+import logging
+import threading
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# Bump when extraction prompts change so stale results are not reused
+EXTRACTION_CACHE_VERSION = "2"  # v2: extraction prompts and content trimming (v5.2.1)
+
+# extraction_notes prefixes that mark a failed extraction (never cached)
+FAILURE_NOTE_PREFIXES = (
+    "Extraction failed",
+    "OpenAI client not available",
+    "OpenAI extraction failed",
+    "Gemini extraction failed",
+    "Gemini not available",
+    "No AI provider available",
+)
+
+# Volatile fragments that change between scrapes without the content changing
+_VOLATILE_PATTERNS = [
+    re.compile(r"(?:©|\(c\)|copyright)\s*(?:\d{4}\s*[-–]\s*)?\d{4}", re.I),
+    re.compile(r"\b\d{1,2}:\d{2}(?::\d{2})?\s*(?:am|pm)?\b", re.I),
+    re.compile(r"\b\d{4}-\d{2}-\d{2}t\d{2}:\d{2}[^\s]*", re.I),
+]
+_WHITESPACE = re.compile(r"\s+")
+
+
+def batch_page_type(page_type: str) -> str:
+    """Cache key for the per-page share of a batched extraction."""
+    return f"batched:{page_type}"
+
+
+def normalize_content(content: str) -> str:
+    """Normalize page text so cosmetic differences do not change the hash."""
+    if not content:
+        return ""
+    text = content.lower()
+    for pattern in _VOLATILE_PATTERNS:
+        text = pattern.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def content_hash(content: str) -> str:
+    """sha256 of the normalized content, salted with the cache version."""
+    normalized = normalize_content(content)
+    return hashlib.sha256(f"{EXTRACTION_CACHE_VERSION}:{normalized}".encode("utf-8")).hexdigest()
+
+
+def is_cacheable(data: Any) -> bool:
+    """Only successful extractions are cached."""
+    if data is None:
+        return False
+    if isinstance(data, dict):
+        if data.get("error"):
+            return False
+        notes = data.get("extraction_notes") or ""
+    else:
+        notes = getattr(data, "extraction_notes", None) or ""
+    return not str(notes).startswith(FAILURE_NOTE_PREFIXES)
+
+
+class ExtractionCache:
+    """
+    Persistent content-hash cache for AI extraction results.
+
+    Hit/miss counters are process-wide; per-row hit counts are persisted.
+    """
+
+    def __init__(self, session_factory: Optional[Callable] = None, max_age_days: Optional[int] = None):
+        self._session_factory = session_factory
+        self.enabled = os.getenv("EXTRACTION_CACHE_ENABLED", "true").lower() != "false"
+        if max_age_days is None:
+            max_age_days = int(os.getenv("EXTRACTION_CACHE_MAX_AGE_DAYS", "90"))
+        self.max_age_days = max_age_days
+
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "errors": 0}
+
+    def _session(self):
+        if self._session_factory is None:
+            from database import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def get(self, competitor_name: str, page_type: str, content: str, data_cls: type) -> Optional[Any]:
+        """
+        Return cached extraction if this page's content is unchanged.
+
+        Args:
+            competitor_name: Competitor the page belongs to
+            page_type: homepage, pricing, about, ...
+            content: Raw page text (normalized internally)
+            data_cls: Dataclass to rebuild (e.g. ExtractedData)
+        """
+        if not self.enabled or not content or not isinstance(content, str):
+            return None
+
+        from database import ExtractionCache as ExtractionCacheRow
+
+        db = self._session()
+        try:
+            digest = content_hash(content)
+            row = db.query(ExtractionCacheRow).filter(
+                ExtractionCacheRow.competitor_name == competitor_name,
+                ExtractionCacheRow.page_type == page_type
+            ).first()
+
+            if not row or row.content_hash != digest:
+                self._count("misses")
+                return None
+
+            if self.max_age_days and row.updated_at and \
+                    row.updated_at < datetime.utcnow() - timedelta(days=self.max_age_days):
+                self._count("misses")
+                return None
+
+            payload = json.loads(row.extracted_data or "{}")
+            valid_fields = set(data_cls.__dataclass_fields__)
+            result = data_cls(**{k: v for k, v in payload.items() if k in valid_fields})
+
+            row.hit_count = (row.hit_count or 0) + 1
+            row.last_hit_at = datetime.utcnow()
+            db.commit()
+
+            self._count("hits")
+            return result
+        except Exception as e:
+            db.rollback()
+            self._count("errors")
+            logger.warning(f"Extraction cache lookup failed for {competitor_name}/{page_type}: {e}")
+            return None
+        finally:
+            db.close()
+
+    def put(
+        self,
+        competitor_name: str,
+        page_type: str,
+        content: str,
+        data: Any,
+        extraction_model: Optional[str] = None
+    ) -> bool:
+        """Store a successful extraction for this competitor/page type."""
+        if not self.enabled or not content or not isinstance(content, str) or not is_cacheable(data):
+            return False
+
+        from database import ExtractionCache as ExtractionCacheRow
+
+        payload = data if isinstance(data, dict) else asdict(data)
+        db = self._session()
+        try:
+            row = db.query(ExtractionCacheRow).filter(
+                ExtractionCacheRow.competitor_name == competitor_name,
+                ExtractionCacheRow.page_type == page_type
+            ).first()
+            if not row:
+                row = ExtractionCacheRow(competitor_name=competitor_name, page_type=page_type, hit_count=0)
+                db.add(row)
+
+            row.content_hash = content_hash(content)
+            row.extracted_data = json.dumps(payload, default=str)
+            row.extraction_model = extraction_model
+            row.content_length = len(content)
+            row.updated_at = datetime.utcnow()
+            db.commit()
+
+            self._count("stores")
+            return True
+        except Exception as e:
+            db.rollback()
+            self._count("errors")
+            logger.warning(f"Extraction cache store failed for {competitor_name}/{page_type}: {e}")
+            return False
+        finally:
+            db.close()
+
+    def invalidate(self, competitor_name: Optional[str] = None) -> int:
+        """Drop cached extractions for one competitor (or all). Returns rows deleted."""
+        from database import ExtractionCache as ExtractionCacheRow
+
+        db = self._session()
+        try:
+            query = db.query(ExtractionCacheRow)
+            if competitor_name:
+                query = query.filter(ExtractionCacheRow.competitor_name == competitor_name)
+            deleted = query.delete(synchronize_session=False)
+            db.commit()
+            return deleted
+        finally:
+            db.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Process hit/miss counters plus persisted cache size and lifetime hits."""
+        from sqlalchemy import func
+        from database import ExtractionCache as ExtractionCacheRow
+
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        stats["enabled"] = self.enabled
+
+        db = self._session()
+        try:
+            entries, lifetime_hits = db.query(
+                func.count(ExtractionCacheRow.id),
+                func.coalesce(func.sum(ExtractionCacheRow.hit_count), 0)
+            ).one()
+            stats["entries"] = entries
+            stats["lifetime_hits"] = int(lifetime_hits)
+        finally:
+            db.close()
+        return stats
+
+
+# Singleton instance
+_cache_instance = None
+
+
+def get_extraction_cache() -> ExtractionCache:
+    """Get the extraction cache instance."""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = ExtractionCache()
+    return _cache_instance
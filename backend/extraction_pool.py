@@ -0,0 +1,132 @@
+"""
+Certify Intel - Async Extraction Pool (v5.2.1)
+Runs blocking OpenAI/Gemini SDK calls off the FastAPI event loop.
+
+The extractors use the synchronous SDK clients. Calling them directly from an
+async refresh job stalls every API request for the duration of the LLM call.
+The aextract_* methods on the extractors hand the call to a bounded thread
+pool instead, and a per-loop semaphore caps how many extractions are in
+flight so parallel refreshes do not trip provider rate limits.
+
+Configuration (environment):
+    EXTRACTION_MAX_WORKERS    Threads available for blocking SDK calls (default 8)
+    EXTRACTION_CONCURRENCY    Max extractions in flight per event loop (default 4)
+"""
+import os
+import asyncio
+import functools
+import logging
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionPool:
+    """
+    Bounded thread pool + semaphore for blocking extraction calls.
+
+    The executor is shared process-wide; semaphores are created per event
+    loop because asyncio primitives cannot be shared across loops.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, concurrency: Optional[int] = None):
+        self.concurrency = max(1, concurrency or int(os.getenv("EXTRACTION_CONCURRENCY", "4")))
+        self.max_workers = max(
+            self.concurrency,
+            max_workers or int(os.getenv("EXTRACTION_MAX_WORKERS", "8"))
+        )
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphores: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+        self.in_flight = 0
+        self.stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "waits": 0,        # Calls that queued behind the semaphore
+            "peak_in_flight": 0,
+        }
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="extraction"
+                )
+            return self._executor
+
+    def _get_semaphore(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking extraction call in the pool and await its result."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._get_semaphore(loop)
+        self.stats["submitted"] += 1
+        if semaphore.locked():
+            self.stats["waits"] += 1
+
+        async with semaphore:
+            self.in_flight += 1
+            self.stats["peak_in_flight"] = max(self.stats["peak_in_flight"], self.in_flight)
+            try:
+                result = await loop.run_in_executor(
+                    self._get_executor(), functools.partial(func, *args, **kwargs)
+                )
+                self.stats["completed"] += 1
+                return result
+            except Exception:
+                self.stats["failed"] += 1
+                raise
+            finally:
+                self.in_flight -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "in_flight": self.in_flight,
+            "concurrency": self.concurrency,
+            "max_workers": self.max_workers,
+        }
+
+    def shutdown(self):
+        """Stop accepting work; running SDK calls finish in the background."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+
+# ============== CONVENIENCE FUNCTIONS ==============
+
+# Singleton instance
+_pool_instance: Optional[ExtractionPool] = None
+
+
+def get_extraction_pool() -> ExtractionPool:
+    """Get the shared extraction pool."""
+    global _pool_instance
+    if _pool_instance is None:
+        _pool_instance = ExtractionPool()
+    return _pool_instance
+
+
+async def run_extraction(func: Callable, *args, **kwargs) -> Any:
+    """Await a blocking extraction call without stalling the event loop."""
+    return await get_extraction_pool().run(func, *args, **kwargs)
+
+
+def shutdown_extraction_pool():
+    """Shut down the shared executor (called from app shutdown)."""
+    if _pool_instance is not None:
+        _pool_instance.shutdown()
@@ -3,9 +3,13 @@ Certify Intel - AI Data Extraction (v5.0.2)
 Uses OpenAI GPT or Google Gemini to extract structured competitor data from scraped content.
 
 Supports hybrid mode with automatic routing based on task type and cost optimization.
+
+v5.2.1: aextract_* methods run the blocking SDK calls in a bounded thread pool
+(extraction_pool) so refresh jobs no longer stall the API event loop.
 """
 import os
 import json
+import asyncio
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict, field
 from datetime import datetime
@@ -26,6 +30,10 @@ except ImportError:
     GeminiExtractor = None
     AIRouter = None
 
+from extraction_cache import batch_page_type, get_extraction_cache
+from extraction_pool import run_extraction
+from content_ranker import get_content_ranker, trim_for_extraction, CHARS_PER_TOKEN
+
 
 @dataclass
 class ExtractedData:
@@ -121,15 +129,34 @@ class ExtractedDataWithSource:
 class GPTExtractor:
     """Uses GPT to extract structured data from website content."""
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini"):
+    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini", use_cache: bool = True):
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         self.model = model
         self.client = None
+        self.use_cache = use_cache  # v5.2.1: Skip LLM call when page content is unchanged
         
         if OPENAI_AVAILABLE and self.api_key:
             self.client = OpenAI(api_key=self.api_key)
     
     def extract_from_content(self, competitor_name: str, content: str, page_type: str = "homepage") -> ExtractedData:
+        """Extract structured data from page content using GPT (content-hash cached)."""
+        cache = get_extraction_cache() if self.use_cache else None
+        if cache:
+            cached = cache.get(competitor_name, page_type, content, ExtractedData)
+            if cached is not None:
+                return cached
+
+        result = self._extract_uncached(competitor_name, content, page_type)
+
+        if cache:
+            cache.put(competitor_name, page_type, content, result, extraction_model=self.model)
+        return result
+
+    async def aextract_from_content(self, competitor_name: str, content: str, page_type: str = "homepage") -> ExtractedData:
+        """Async extract_from_content; the SDK call runs in the extraction pool."""
+        return await run_extraction(self.extract_from_content, competitor_name, content, page_type)
+
+    def _extract_uncached(self, competitor_name: str, content: str, page_type: str = "homepage") -> ExtractedData:
         """Extract structured data from page content using GPT."""
         
         if not self.client:
@@ -137,10 +164,8 @@ class GPTExtractor:
                 extraction_notes="OpenAI client not available. Set OPENAI_API_KEY environment variable."
             )
         
-        # Truncate content if too long
-        max_content_length = 8000
-        if len(content) > max_content_length:
-            content = content[:max_content_length] + "..."
+        # Keep the blocks most relevant to this page's fields (v5.2.1)
+        content = trim_for_extraction(competitor_name, content, page_type)
         
         prompt = self._build_extraction_prompt(competitor_name, content, page_type)
         
@@ -399,6 +424,10 @@ Always respond with valid JSON matching the requested schema."""},
                 "error": f"Extraction failed: {str(e)}"
             }
 
+    async def aextract_products_and_pricing(self, competitor_name: str, content: str) -> Dict[str, Any]:
+        """Async extract_products_and_pricing (runs in the extraction pool)."""
+        return await run_extraction(self.extract_products_and_pricing, competitor_name, content)
+
     def extract_feature_matrix(self, competitor_name: str, product_name: str, content: str) -> Dict[str, Any]:
         """
         Extract feature matrix for a specific product.
@@ -491,6 +520,27 @@ class EnhancedGPTExtractor:
         ("homepage", "customer_count"): 55,
     }
 
+    # Fields requested from every page (also used by batched prompts)
+    FIELD_SCHEMA = """{
+    "pricing_model": "Describe the model (e.g., 'Per Provider/Month', 'Per Visit')",
+    "base_price": "Lowest numeric price found (e.g., '$299')",
+    "price_unit": "The unit for the base price (e.g., 'per month', 'per provider')",
+    "product_categories": "High-level categories separated by semicolons",
+    "key_features": "Main features, comma-separated",
+    "integration_partners": "EHR/PM systems, semicolon-separated",
+    "certifications": "Security certifications (HIPAA, SOC2, etc.)",
+    "target_segments": "Customer segments (e.g., 'Health Systems; Practices')",
+    "customer_size_focus": "Practice size focus (e.g., 'Small', 'Enterprise')",
+    "geographic_focus": "Geographic markets",
+    "customer_count": "Number of customers if mentioned",
+    "key_customers": "Notable customer names if mentioned",
+    "employee_count": "Employee count if mentioned",
+    "year_founded": "Year company was founded",
+    "headquarters": "Company headquarters location",
+    "funding_total": "Total funding raised if mentioned",
+    "recent_launches": "Recent product announcements"
+}"""
+
     def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini"):
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         self.model = model
@@ -516,56 +566,116 @@ class EnhancedGPTExtractor:
         Returns:
             ExtractedDataWithSource with field-level source tracking
         """
+        result = self._new_result(page_contents)
+        if not self.client:
+            result.extraction_warnings.append("OpenAI client not available")
+            return result
+
+        page_results = []
+        for page_type, content in self._pages_to_extract(competitor_name, page_contents, result):
+            try:
+                # Extract using existing GPT extractor logic
+                extracted = self._extract_page(competitor_name, page_type, content)
+                page_results.append((page_type, content, extracted))
+            except Exception as e:
+                result.extraction_warnings.append(f"Extraction failed for {page_type}: {str(e)}")
+
+        return self._merge_page_results(result, competitor_website, page_results)
+
+    async def aextract_with_sources(
+        self,
+        competitor_name: str,
+        competitor_website: str,
+        page_contents: Dict[str, str]
+    ) -> ExtractedDataWithSource:
+        """
+        Async extract_with_sources: pages are extracted in parallel in the
+        extraction pool, then merged in page order so "first extraction wins"
+        behaves exactly as in the synchronous version.
+        """
+        result = self._new_result(page_contents)
+        if not self.client:
+            result.extraction_warnings.append("OpenAI client not available")
+            return result
+
+        pages = self._pages_to_extract(competitor_name, page_contents, result)
+        outcomes = await asyncio.gather(
+            *(run_extraction(self._extract_page, competitor_name, page_type, content)
+              for page_type, content in pages),
+            return_exceptions=True
+        )
+
+        page_results = []
+        for (page_type, content), extracted in zip(pages, outcomes):
+            if isinstance(extracted, Exception):
+                result.extraction_warnings.append(f"Extraction failed for {page_type}: {str(extracted)}")
+            else:
+                page_results.append((page_type, content, extracted))
+
+        return self._merge_page_results(result, competitor_website, page_results)
+
+    def _new_result(self, page_contents: Dict[str, str]) -> ExtractedDataWithSource:
         result = ExtractedDataWithSource()
         result.extraction_timestamp = datetime.utcnow()
         result.extraction_model = self.model
         result.total_pages_scraped = len(page_contents)
         result.pages_scraped = list(page_contents.keys())
+        return result
 
-        if not self.client:
-            result.extraction_warnings.append("OpenAI client not available")
-            return result
+    def _pages_to_extract(
+        self,
+        competitor_name: str,
+        page_contents: Dict[str, str],
+        result: ExtractedDataWithSource
+    ) -> List[tuple]:
+        """Pages with enough content to extract from (warnings recorded for the rest)."""
+        # Lets the content ranker drop text repeated across these pages
+        get_content_ranker().register_site_pages(
+            competitor_name, {pt: c for pt, c in page_contents.items() if c}
+        )
 
-        # Extract from each page and merge results
+        pages = []
         for page_type, content in page_contents.items():
             if not content or len(content.strip()) < 100:
                 result.extraction_warnings.append(f"Page '{page_type}' has insufficient content")
                 continue
+            pages.append((page_type, content))
+        return pages
 
-            try:
-                # Extract using existing GPT extractor logic
-                extracted = self._extract_page(competitor_name, page_type, content)
-
-                # Merge results, tracking source for each NEW field
-                for field_name, value in extracted.items():
-                    if value and field_name not in ["confidence_score", "extraction_notes"]:
-                        # Only set if not already set (first extraction wins)
-                        current_value = getattr(result, field_name, None)
-                        if current_value is None and hasattr(result, field_name):
-                            setattr(result, field_name, value)
-
-                            # Build source URL
-                            if page_type == "homepage":
-                                source_url = competitor_website
-                            else:
-                                source_url = f"{competitor_website.rstrip('/')}/{page_type}"
-
-                            # Get confidence for this field/page combination
-                            confidence = self._estimate_confidence(page_type, field_name, content, value)
-
-                            # Extract context snippet
-                            context = self._get_context_snippet(content, str(value))
-
-                            result.field_sources[field_name] = FieldSourceInfo(
-                                value=str(value),
-                                source_page=page_type,
-                                source_url=source_url,
-                                extraction_context=context,
-                                confidence=confidence
-                            )
-
-            except Exception as e:
-                result.extraction_warnings.append(f"Extraction failed for {page_type}: {str(e)}")
+    def _merge_page_results(
+        self,
+        result: ExtractedDataWithSource,
+        competitor_website: str,
+        page_results: List[tuple]  # [(page_type, content, extracted_dict), ...]
+    ) -> ExtractedDataWithSource:
+        """Merge per-page extractions, tracking the source of each NEW field."""
+        for page_type, content, extracted in page_results:
+            for field_name, value in extracted.items():
+                if value and field_name not in ["confidence_score", "extraction_notes"]:
+                    # Only set if not already set (first extraction wins)
+                    current_value = getattr(result, field_name, None)
+                    if current_value is None and hasattr(result, field_name):
+                        setattr(result, field_name, value)
+
+                        # Build source URL
+                        if page_type == "homepage":
+                            source_url = competitor_website
+                        else:
+                            source_url = f"{competitor_website.rstrip('/')}/{page_type}"
+
+                        # Get confidence for this field/page combination
+                        confidence = self._estimate_confidence(page_type, field_name, content, value)
+
+                        # Extract context snippet
+                        context = self._get_context_snippet(content, str(value))
+
+                        result.field_sources[field_name] = FieldSourceInfo(
+                            value=str(value),
+                            source_page=page_type,
+                            source_url=source_url,
+                            extraction_context=context,
+                            confidence=confidence
+                        )
 
         # Calculate overall confidence as average of field confidences
         if result.field_sources:
@@ -576,12 +686,215 @@ class EnhancedGPTExtractor:
 
         return result
 
+    # ============== BATCHED MULTI-PAGE EXTRACTION (v5.2.1) ==============
+
+    def extract_batched(
+        self,
+        competitor_name: str,
+        competitor_website: str,
+        page_contents: Dict[str, str],
+        token_budget: Optional[int] = None
+    ) -> ExtractedDataWithSource:
+        """
+        Extract from several pages per LLM call, keeping per-field provenance.
+
+        Pages are trimmed, then packed (each tagged with its page type) into as
+        few requests as fit the token budget. The model reports the source page
+        of every field, so to_data_sources() works exactly as with
+        extract_with_sources(). Pages unchanged since the last refresh are
+        served from the extraction cache and not sent at all.
+        """
+        result, page_results, batches = self._prepare_batches(
+            competitor_name, page_contents, token_budget
+        )
+        if not self.client:
+            return result
+
+        for batch in batches:
+            try:
+                response = self._call_batch(competitor_name, batch)
+                page_results.extend(self._split_batch_response(competitor_name, batch, page_contents, response))
+            except Exception as e:
+                result.extraction_warnings.append(self._batch_warning(batch, e))
+
+        return self._merge_batched_results(result, competitor_website, page_contents, page_results)
+
+    async def aextract_batched(
+        self,
+        competitor_name: str,
+        competitor_website: str,
+        page_contents: Dict[str, str],
+        token_budget: Optional[int] = None
+    ) -> ExtractedDataWithSource:
+        """Async extract_batched; batches run in parallel in the extraction pool."""
+        result, page_results, batches = await run_extraction(
+            self._prepare_batches, competitor_name, page_contents, token_budget
+        )
+        if not self.client:
+            return result
+
+        responses = await asyncio.gather(
+            *(run_extraction(self._call_batch, competitor_name, batch) for batch in batches),
+            return_exceptions=True
+        )
+        for batch, response in zip(batches, responses):
+            if isinstance(response, Exception):
+                result.extraction_warnings.append(self._batch_warning(batch, response))
+                continue
+            page_results.extend(await run_extraction(
+                self._split_batch_response, competitor_name, batch, page_contents, response
+            ))
+
+        return self._merge_batched_results(result, competitor_website, page_contents, page_results)
+
+    def _prepare_batches(
+        self,
+        competitor_name: str,
+        page_contents: Dict[str, str],
+        token_budget: Optional[int] = None
+    ) -> tuple:
+        """Cache lookups, trimming and packing: (result, cached page results, batches)."""
+        result = self._new_result(page_contents)
+        result.extraction_model = f"{self.model} (batched)"
+        if not self.client:
+            result.extraction_warnings.append("OpenAI client not available")
+            return result, [], []
+
+        budget_chars = (token_budget or int(os.getenv("EXTRACTION_BATCH_TOKEN_BUDGET", "8000"))) * CHARS_PER_TOKEN
+        cache = get_extraction_cache()
+
+        page_results = []
+        batches: List[List[tuple]] = []
+        current: List[tuple] = []
+        current_chars = 0
+        for page_type, content in self._pages_to_extract(competitor_name, page_contents, result):
+            cached = cache.get(competitor_name, batch_page_type(page_type), content, ExtractedData)
+            if cached is not None:
+                page_results.append((page_type, content, asdict(cached)))
+                continue
+
+            trimmed = trim_for_extraction(competitor_name, content, page_type)
+            if len(trimmed) > budget_chars:
+                trimmed = trimmed[:budget_chars] + "..."
+            if current and current_chars + len(trimmed) > budget_chars:
+                batches.append(current)
+                current, current_chars = [], 0
+            current.append((page_type, trimmed))
+            current_chars += len(trimmed)
+        if current:
+            batches.append(current)
+
+        return result, page_results, batches
+
+    def _call_batch(self, competitor_name: str, batch: List[tuple]) -> Dict[str, Any]:
+        """One LLM call for a batch of (page_type, trimmed_content) pages."""
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": self._get_system_prompt()},
+                {"role": "user", "content": self._build_batch_prompt(competitor_name, batch)}
+            ],
+            response_format={"type": "json_object"},
+            temperature=0.1
+        )
+        return json.loads(response.choices[0].message.content)
+
+    def _build_batch_prompt(self, competitor_name: str, batch: List[tuple]) -> str:
+        """Prompt covering several pages, each introduced by a page-type header."""
+        page_types = ", ".join(page_type for page_type, _ in batch)
+        sections = "\n\n".join(
+            f"=== PAGE: {page_type} ===\n{content}" for page_type, content in batch
+        )
+        return f"""Analyze these {len(batch)} pages from {competitor_name}'s website ({page_types}).
+Each page starts with a "=== PAGE: <page type> ===" header.
+
+For every field you find, report its value and the page type it came from.
+Only include fields where you found information.
+Return JSON:
+{{
+    "fields": {{
+        "<field_name>": {{"value": "...", "source_page": "<page type>"}}
+    }}
+}}
+
+Available fields:
+{self.FIELD_SCHEMA}
+
+PAGES TO ANALYZE:
+{sections}"""
+
+    def _split_batch_response(
+        self,
+        competitor_name: str,
+        batch: List[tuple],
+        page_contents: Dict[str, str],
+        response: Dict[str, Any]
+    ) -> List[tuple]:
+        """Turn a batch response into per-page (page_type, content, fields) results."""
+        batch_types = [page_type for page_type, _ in batch]
+        valid_fields = set(ExtractedData.__dataclass_fields__) - {"confidence_score", "extraction_notes"}
+        per_page: Dict[str, Dict[str, Any]] = {page_type: {} for page_type in batch_types}
+
+        fields = response.get("fields", response) if isinstance(response, dict) else {}
+        for field_name, entry in fields.items():
+            if field_name not in valid_fields:
+                continue
+            if isinstance(entry, dict):
+                value, source_page = entry.get("value"), entry.get("source_page")
+            else:
+                value, source_page = entry, None
+            if value in (None, "", "null", []):
+                continue
+            if source_page not in per_page:
+                source_page = self._locate_source_page(str(value), batch)
+            per_page[source_page][field_name] = value
+
+        # Cache per page so unchanged pages are skipped next refresh (apart from single-page results)
+        cache = get_extraction_cache()
+        for page_type in batch_types:
+            cache.put(
+                competitor_name, batch_page_type(page_type), page_contents[page_type],
+                ExtractedData(**per_page[page_type]), extraction_model=f"{self.model} (batched)"
+            )
+
+        return [
+            (page_type, page_contents[page_type], per_page[page_type])
+            for page_type in batch_types if per_page[page_type]
+        ]
+
+    def _locate_source_page(self, value: str, batch: List[tuple]) -> str:
+        """Fallback provenance: first page in the batch whose text contains the value."""
+        needle = value.lower()[:60]
+        for page_type, content in batch:
+            if needle and needle in content.lower():
+                return page_type
+        return batch[0][0]
+
+    def _merge_batched_results(
+        self,
+        result: ExtractedDataWithSource,
+        competitor_website: str,
+        page_contents: Dict[str, str],
+        page_results: List[tuple]
+    ) -> ExtractedDataWithSource:
+        """Merge in original page order so "first page wins" matches extract_with_sources."""
+        order = {page_type: idx for idx, page_type in enumerate(page_contents)}
+        page_results.sort(key=lambda item: order.get(item[0], len(order)))
+        return self._merge_page_results(result, competitor_website, page_results)
+
+    def _batch_warning(self, batch: List[tuple], error: Exception) -> str:
+        return f"Batched extraction failed for {', '.join(pt for pt, _ in batch)}: {str(error)}"
+
+    def to_extracted_data(self, result: ExtractedDataWithSource) -> ExtractedData:
+        """Drop provenance to get the plain ExtractedData used by the scheduler."""
+        return ExtractedData(**{
+            name: getattr(result, name) for name in ExtractedData.__dataclass_fields__
+        })
+
     def _extract_page(self, competitor_name: str, page_type: str, content: str) -> Dict[str, Any]:
         """Extract data from a single page using GPT."""
-        # Truncate content if too long
-        max_content_length = 8000
-        if len(content) > max_content_length:
-            content = content[:max_content_length] + "..."
+        # Keep the blocks most relevant to this page's fields (v5.2.1)
+        content = trim_for_extraction(competitor_name, content, page_type)
 
         # Build prompt based on page type
         prompt = self._build_page_prompt(competitor_name, page_type, content)
@@ -615,26 +928,7 @@ Always respond with valid JSON."""
     def _build_page_prompt(self, competitor_name: str, page_type: str, content: str) -> str:
         """Build extraction prompt based on page type."""
 
-        base_schema = """
-{
-    "pricing_model": "Describe the model (e.g., 'Per Provider/Month', 'Per Visit')",
-    "base_price": "Lowest numeric price found (e.g., '$299')",
-    "price_unit": "The unit for the base price (e.g., 'per month', 'per provider')",
-    "product_categories": "High-level categories separated by semicolons",
-    "key_features": "Main features, comma-separated",
-    "integration_partners": "EHR/PM systems, semicolon-separated",
-    "certifications": "Security certifications (HIPAA, SOC2, etc.)",
-    "target_segments": "Customer segments (e.g., 'Health Systems; Practices')",
-    "customer_size_focus": "Practice size focus (e.g., 'Small', 'Enterprise')",
-    "geographic_focus": "Geographic markets",
-    "customer_count": "Number of customers if mentioned",
-    "key_customers": "Notable customer names if mentioned",
-    "employee_count": "Employee count if mentioned",
-    "year_founded": "Year company was founded",
-    "headquarters": "Company headquarters location",
-    "funding_total": "Total funding raised if mentioned",
-    "recent_launches": "Recent product announcements"
-}"""
+        base_schema = self.FIELD_SCHEMA
 
         page_focus = {
             "homepage": "Extract general company and product overview information.",
@@ -773,21 +1067,24 @@ class HybridExtractor:
     v5.0.2 Implementation
     """
 
-    def __init__(self, prefer_provider: Optional[str] = None):
+    def __init__(self, prefer_provider: Optional[str] = None, use_cache: bool = True):
         """
         Initialize hybrid extractor.
 
         Args:
             prefer_provider: Optional override ("openai" or "gemini")
+            use_cache: Reuse the last extraction when page content is unchanged
         """
         self.prefer_provider = prefer_provider or os.getenv("AI_PROVIDER", "hybrid")
+        self.use_cache = use_cache
 
         # Initialize providers
         self.openai_extractor = None
         self.gemini_extractor = None
 
         if OPENAI_AVAILABLE and os.getenv("OPENAI_API_KEY"):
-            self.openai_extractor = GPTExtractor()
+            # Caching happens at the hybrid level, whichever provider answers
+            self.openai_extractor = GPTExtractor(use_cache=False)
 
         if GEMINI_AVAILABLE and GeminiExtractor and os.getenv("GOOGLE_AI_API_KEY"):
             self.gemini_extractor = GeminiExtractor()
@@ -835,6 +1132,41 @@ class HybridExtractor:
         """
         Extract structured data using the best available AI provider.
 
+        Returns the cached extraction when the page content hash is unchanged.
+        """
+        cache = get_extraction_cache() if self.use_cache else None
+        if cache:
+            cached = cache.get(competitor_name, page_type, content, ExtractedData)
+            if cached is not None:
+                return cached
+
+        result = self._extract_uncached(competitor_name, content, page_type)
+
+        if cache:
+            cache.put(
+                competitor_name, page_type, content, result,
+                extraction_model=self.get_provider("data_extraction")
+            )
+        return result
+
+    async def aextract_from_content(
+        self,
+        competitor_name: str,
+        content: str,
+        page_type: str = "homepage"
+    ) -> ExtractedData:
+        """Async extract_from_content; provider calls and fallback run in the extraction pool."""
+        return await run_extraction(self.extract_from_content, competitor_name, content, page_type)
+
+    def _extract_uncached(
+        self,
+        competitor_name: str,
+        content: str,
+        page_type: str = "homepage"
+    ) -> ExtractedData:
+        """
+        Extract structured data using the best available AI provider.
+
         Falls back to the secondary provider if the primary fails.
         """
         provider = self.get_provider("data_extraction")
@@ -847,6 +1179,9 @@ class HybridExtractor:
                 )
                 # Convert dict to ExtractedData
                 if isinstance(result, dict):
+                    if result.get("error"):
+                        # Surface API/parse errors so they trigger fallback (and are never cached)
+                        raise RuntimeError(result["error"])
                     return self._dict_to_extracted_data(result)
                 return result
             except Exception as e:
@@ -902,6 +1237,14 @@ class HybridExtractor:
 
         return {"products": [], "error": "No AI provider available"}
 
+    async def aextract_products_and_pricing(
+        self,
+        competitor_name: str,
+        content: str
+    ) -> Dict[str, Any]:
+        """Async extract_products_and_pricing (runs in the extraction pool)."""
+        return await run_extraction(self.extract_products_and_pricing, competitor_name, content)
+
 
 # Convenience function (updated for v5.0.2)
 def extract_competitor_data(
@@ -30,6 +30,10 @@ from datetime import datetime
 from pathlib import Path
 import logging
 
+from extraction_pool import run_extraction
+from llm_cache import get_llm_cache
+from content_ranker import trim_for_extraction
+
 # Image processing
 try:
     from PIL import Image
@@ -1382,10 +1386,8 @@ class GeminiExtractor:
                 "_provider": "gemini",
             }
 
-        # Truncate content if too long
-        max_content_length = 12000  # Gemini has larger context windows
-        if len(content) > max_content_length:
-            content = content[:max_content_length] + "..."
+        # Keep the most relevant blocks (Gemini has larger context windows)
+        content = trim_for_extraction(competitor_name, content, page_type, token_budget=3000)
 
         prompt = self._build_extraction_prompt(competitor_name, content, page_type)
         system_prompt = self._get_system_prompt()
@@ -1396,6 +1398,15 @@ class GeminiExtractor:
             temperature=0.1,
         )
 
+    async def aextract_from_content(
+        self,
+        competitor_name: str,
+        content: str,
+        page_type: str = "homepage"
+    ) -> Dict[str, Any]:
+        """Async extract_from_content; the Gemini call runs in the extraction pool."""
+        return await run_extraction(self.extract_from_content, competitor_name, content, page_type)
+
     def _get_system_prompt(self) -> str:
         """System prompt for the extraction agent."""
         return """You are a competitive intelligence analyst specializing in healthcare IT companies.
@@ -1669,6 +1680,37 @@ class AIRouter:
                 error="No AI provider available. Configure OPENAI_API_KEY or GOOGLE_AI_API_KEY.",
             )
 
+        model = self.gemini.config.model if provider == "gemini" else os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+
+        # v5.2.1: Identical requests are served from the persistent LLM cache
+        return get_llm_cache().get_or_compute(
+            task_type=task_type,
+            provider=provider,
+            model=model,
+            system_prompt=system_prompt,
+            prompt=prompt,
+            json_mode=require_json,
+            compute=lambda: self._dispatch(provider, prompt, system_prompt, require_json),
+            to_cache=lambda response: response.content if response.success else None,
+            from_cache=lambda content: AIResponse(
+                content=content,
+                model=model,
+                provider=provider,
+                tokens_used=0,
+                cost_estimate=0.0,
+                latency_ms=0.0,
+                success=True,
+            ),
+        )
+
+    def _dispatch(
+        self,
+        provider: str,
+        prompt: str,
+        system_prompt: Optional[str],
+        require_json: bool,
+    ) -> AIResponse:
+        """Send the request to the chosen provider (uncached)."""
         if provider == "gemini":
             if require_json:
                 result = self.gemini.generate_json(prompt, system_prompt)
@@ -0,0 +1,364 @@
+"""
+Certify Intel - HTTP Fetch Tier (v5.2.1)
+Fetches competitor pages with a pooled async HTTP client before falling back to Playwright.
+
+Most healthcare vendor marketing sites render server-side, so a plain GET plus
+HTML-to-text extraction returns the same content as a headless browser at a
+fraction of the latency, CPU and memory. Pages that look JavaScript-rendered
+(empty body, SPA root div, too little text) or that block plain clients are
+escalated to the browser, and the domain is remembered so later pages go
+straight to Playwright.
+
+Configuration (environment):
+    SCRAPER_HTTP_FIRST            "false" to always use Playwright (default true)
+    SCRAPER_MIN_TEXT_CHARS        Below this much text a page is treated as JS-rendered (default 400)
+    SCRAPER_JS_DOMAIN_TTL_HOURS   How long a domain stays flagged as browser-only (default 168)
+"""
+import asyncio
+import os
+import re
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from urllib.parse import urljoin, urlparse
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    from bs4 import BeautifulSoup
+    BS4_AVAILABLE = True
+except ImportError:
+    BS4_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+# Fetch outcomes
+FETCH_OK = "ok"
+FETCH_NOT_FOUND = "not_found"          # 404/410/non-HTML: try next candidate URL, no browser needed
+FETCH_NEEDS_BROWSER = "needs_browser"  # JS-rendered, blocked or transport error: escalate
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+}
+
+# Same elements the Playwright extractor strips before reading innerText
+UNWANTED_TAGS = ["script", "style", "noscript", "iframe", "svg", "img", "video", "audio",
+                 "nav", "footer", "header", "aside", "template"]
+UNWANTED_SELECTORS = [".cookie-banner", ".popup", ".modal", '[role="banner"]',
+                      '[role="navigation"]', '[role="contentinfo"]']
+
+# Empty mount points left by client-side frameworks
+SPA_ROOT_PATTERN = re.compile(
+    r'<div[^>]+id=["\'](?:root|app|__next|__nuxt|___gatsby|svelte)["\'][^>]*>\s*</div>',
+    re.I
+)
+NOSCRIPT_JS_PATTERN = re.compile(r"<noscript>[^<]*(?:enable|requires?)\s+javascript", re.I)
+
+# Status codes that usually mean "plain clients are blocked", not "page missing"
+BLOCKED_STATUSES = {401, 403, 406, 429, 503}
+
+
+@dataclass
+class FetchResult:
+    """Outcome of an HTTP-tier fetch."""
+    url: str
+    outcome: str
+    status_code: int = 0
+    html: str = ""
+    content: str = ""
+    title: str = ""
+    meta_description: Optional[str] = None
+    links: List[str] = field(default_factory=list)
+    reason: Optional[str] = None  # Why the page was escalated / rejected
+    elapsed_ms: float = 0.0
+
+
+def extract_text_from_html(html: str) -> str:
+    """Extract clean visible text from HTML (mirrors the browser innerText cleanup)."""
+    if not html or not BS4_AVAILABLE:
+        return ""
+    soup = BeautifulSoup(html, "html.parser")
+    body = soup.body or soup
+    for tag in body.find_all(UNWANTED_TAGS):
+        tag.decompose()
+    for selector in UNWANTED_SELECTORS:
+        for tag in body.select(selector):
+            tag.decompose()
+    text = body.get_text(separator=" ")
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def detect_js_rendering(html: str, text: str, min_text_chars: int) -> Optional[str]:
+    """
+    Decide whether a page needs a real browser.
+
+    Returns a reason string ("empty_body", "spa_root", "noscript", "thin_content")
+    or None if the server-rendered HTML is usable.
+    """
+    if not html or not html.strip():
+        return "empty_body"
+    if not text:
+        return "empty_body"
+    if SPA_ROOT_PATTERN.search(html) and len(text) < min_text_chars * 2:
+        return "spa_root"
+    if NOSCRIPT_JS_PATTERN.search(html) and len(text) < min_text_chars * 2:
+        return "noscript"
+    if len(text) < min_text_chars:
+        return "thin_content"
+    return None
+
+
+def domain_of(url: str) -> str:
+    """Normalized domain used for browser-only bookkeeping."""
+    if not url.startswith("http"):
+        url = f"https://{url}"
+    domain = urlparse(url).netloc.lower()
+    return domain[4:] if domain.startswith("www.") else domain
+
+
+class HttpFetcher:
+    """
+    Pooled async HTTP client with JavaScript-rendering detection.
+
+    Like the browser pool, the underlying httpx client is bound to the event
+    loop it was created on; use get_http_fetcher() for the shared instance.
+    """
+
+    # Signals strong enough to flag the whole domain (thin_content only escalates the page)
+    DOMAIN_FLAG_REASONS = {"empty_body", "spa_root", "noscript", "blocked"}
+
+    def __init__(
+        self,
+        timeout_seconds: float = 15.0,
+        min_text_chars: Optional[int] = None,
+        js_domain_ttl_hours: Optional[int] = None
+    ):
+        self.enabled = (
+            HTTPX_AVAILABLE and BS4_AVAILABLE
+            and os.getenv("SCRAPER_HTTP_FIRST", "true").lower() != "false"
+        )
+        self.timeout_seconds = timeout_seconds
+        self.min_text_chars = min_text_chars or int(os.getenv("SCRAPER_MIN_TEXT_CHARS", "400"))
+        ttl_hours = js_domain_ttl_hours or int(os.getenv("SCRAPER_JS_DOMAIN_TTL_HOURS", "168"))
+        self.js_domain_ttl = timedelta(hours=ttl_hours)
+
+        self._client = None
+        self._js_domains: Dict[str, Dict] = {}  # domain -> {"reason", "flagged_at"}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.stats = {
+            "http_ok": 0,
+            "http_not_found": 0,
+            "escalated": 0,
+            "skipped_js_domain": 0,
+        }
+
+    def _get_client(self) -> "httpx.AsyncClient":
+        if self._client is None:
+            self.loop = asyncio.get_running_loop()
+            self._client = httpx.AsyncClient(
+                headers=DEFAULT_HEADERS,
+                timeout=httpx.Timeout(self.timeout_seconds),
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+            )
+        return self._client
+
+    # ============== Domain memory ==============
+
+    def needs_browser(self, url: str) -> bool:
+        """True if this domain was recently found to require JavaScript rendering."""
+        entry = self._js_domains.get(domain_of(url))
+        if not entry:
+            return False
+        if datetime.utcnow() - entry["flagged_at"] > self.js_domain_ttl:
+            self._js_domains.pop(domain_of(url), None)
+            return False
+        return True
+
+    def mark_needs_browser(self, url: str, reason: str):
+        domain = domain_of(url)
+        if domain not in self._js_domains:
+            logger.info(f"Domain {domain} flagged for browser rendering ({reason})")
+        self._js_domains[domain] = {"reason": reason, "flagged_at": datetime.utcnow()}
+
+    # ============== Fetching ==============
+
+    async def fetch(self, url: str) -> FetchResult:
+        """Fetch a page over plain HTTP and classify the result."""
+        if not self.enabled:
+            return FetchResult(url=url, outcome=FETCH_NEEDS_BROWSER, reason="http_tier_disabled")
+
+        if self.needs_browser(url):
+            self.stats["skipped_js_domain"] += 1
+            return FetchResult(url=url, outcome=FETCH_NEEDS_BROWSER, reason="known_js_domain")
+
+        start = datetime.utcnow()
+        try:
+            response = await self._get_client().get(url)
+        except Exception as e:
+            self.stats["escalated"] += 1
+            return FetchResult(url=url, outcome=FETCH_NEEDS_BROWSER, reason=f"transport_error: {str(e)[:80]}")
+
+        elapsed_ms = (datetime.utcnow() - start).total_seconds() * 1000
+        status = response.status_code
+
+        if status in BLOCKED_STATUSES:
+            self.stats["escalated"] += 1
+            self.mark_needs_browser(url, "blocked")
+            return FetchResult(url=url, outcome=FETCH_NEEDS_BROWSER, status_code=status,
+                               reason="blocked", elapsed_ms=elapsed_ms)
+
+        if status >= 400:
+            self.stats["http_not_found"] += 1
+            return FetchResult(url=url, outcome=FETCH_NOT_FOUND, status_code=status,
+                               reason=f"http_{status}", elapsed_ms=elapsed_ms)
+
+        content_type = response.headers.get("content-type", "")
+        if content_type and "html" not in content_type:
+            self.stats["http_not_found"] += 1
+            return FetchResult(url=url, outcome=FETCH_NOT_FOUND, status_code=status,
+                               reason="not_html", elapsed_ms=elapsed_ms)
+
+        html = response.text
+        content = extract_text_from_html(html)
+        reason = detect_js_rendering(html, content, self.min_text_chars)
+        if reason:
+            self.stats["escalated"] += 1
+            if reason in self.DOMAIN_FLAG_REASONS:
+                self.mark_needs_browser(url, reason)
+            return FetchResult(url=url, outcome=FETCH_NEEDS_BROWSER, status_code=status,
+                               html=html, content=content, reason=reason, elapsed_ms=elapsed_ms)
+
+        self.stats["http_ok"] += 1
+        title, meta_description, links = self._parse_metadata(html, str(response.url))
+        return FetchResult(
+            url=url,
+            outcome=FETCH_OK,
+            status_code=status,
+            html=html,
+            content=content,
+            title=title,
+            meta_description=meta_description,
+            links=links,
+            elapsed_ms=elapsed_ms,
+        )
+
+    def _parse_metadata(self, html: str, base_url: str):
+        """Title, meta description and internal links (first 50) from raw HTML."""
+        soup = BeautifulSoup(html, "html.parser")
+        title = soup.title.get_text(strip=True) if soup.title else ""
+        meta = soup.find("meta", attrs={"name": "description"})
+        meta_description = meta.get("content") if meta else None
+
+        origin = f"{urlparse(base_url).scheme}://{urlparse(base_url).netloc}"
+        links = []
+        for a in soup.find_all("a", href=True):
+            href = a["href"]
+            if href.startswith(("#", "javascript:", "mailto:", "tel:")):
+                continue
+            absolute = urljoin(base_url, href)
+            if absolute.startswith(origin) and absolute not in links:
+                links.append(absolute)
+            if len(links) >= 50:
+                break
+        return title, meta_description, links
+
+    def discover_navigation_links(self, html: str, base_url: str) -> List[str]:
+        """Navigation links from server-rendered HTML (same selectors as the browser version)."""
+        if not html or not BS4_AVAILABLE:
+            return []
+        soup = BeautifulSoup(html, "html.parser")
+        origin = f"{urlparse(base_url).scheme}://{urlparse(base_url).netloc}"
+        selectors = ['nav a', 'header a', '[role="navigation"] a',
+                     '.nav a', '.navbar a', '.menu a', '.navigation a']
+        links = []
+        for selector in selectors:
+            for a in soup.select(selector):
+                href = a.get("href")
+                if not href or href.startswith(("#", "javascript:")):
+                    continue
+                absolute = urljoin(base_url + "/", href)
+                if absolute.startswith(origin) and absolute not in links:
+                    links.append(absolute)
+        return links[:20]
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            "enabled": self.enabled,
+            "js_domains": {
+                domain: {"reason": entry["reason"], "flagged_at": entry["flagged_at"].isoformat()}
+                for domain, entry in self._js_domains.items()
+            },
+        }
+
+    async def close(self):
+        if self._client is not None:
+            try:
+                await self._client.aclose()
+            except Exception:
+                pass
+            self._client = None
+
+
+# ============== CONVENIENCE FUNCTIONS ==============
+
+# Singleton instance (client re-created if the event loop changes)
+_fetcher_instance: Optional[HttpFetcher] = None
+
+
+def get_http_fetcher() -> HttpFetcher:
+    """Get the shared HTTP fetcher (domain memory survives event loop changes)."""
+    global _fetcher_instance
+
+    if _fetcher_instance is None:
+        _fetcher_instance = HttpFetcher()
+        return _fetcher_instance
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if _fetcher_instance.loop is not None and loop is not None and _fetcher_instance.loop is not loop:
+        # httpx clients cannot be reused across loops; keep the learned domains
+        _close_abandoned_client(_fetcher_instance._client, _fetcher_instance.loop)
+        _fetcher_instance._client = None
+        _fetcher_instance.loop = None
+    return _fetcher_instance
+
+
+def _close_abandoned_client(client, loop: asyncio.AbstractEventLoop):
+    """
+    Close an httpx client dropped because its event loop is not the running one.
+
+    The client's connections belong to its own loop, so aclose() runs there:
+    scheduled onto it if it is running in another thread, or on a helper
+    thread if it is idle. Once that loop is closed its sockets can no longer
+    be shut down cleanly and are left to the garbage collector.
+    """
+    if client is None:
+        return
+    if loop.is_running():
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+    elif not loop.is_closed():
+        threading.Thread(
+            target=loop.run_until_complete, args=(client.aclose(),), name="http-client-close", daemon=True
+        ).start()
+    else:
+        logger.debug("HTTP client replaced after its event loop closed; leaving its connections to be collected")
+
+
+async def shutdown_http_fetcher():
+    """Close the shared HTTP client (called from app shutdown)."""
+    if _fetcher_instance is not None:
+        await _fetcher_instance.close()
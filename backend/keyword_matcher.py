@@ -0,0 +1,130 @@
+"""
+Certify Intel - Compiled Keyword Matcher (v5.2.1)
+Single-pass, multi-category keyword matching for news and alert rules.
+
+Keyword checks used to loop over Python lists with `keyword in text`, one
+scan of the text per keyword. KeywordMatcher compiles every keyword of every
+category into one regex, built once, and finds all of them in a single pass.
+
+The keywords are merged into a trie-shaped alternation ("acqui(?:res|red)")
+so the regex engine follows shared prefixes instead of retrying each keyword,
+and each match is the longest keyword at its position. The scan is
+non-overlapping, so two fix-ups keep the exact semantics of the substring
+loops it replaces: a match implies every keyword it contains ("api" within
+"api integration"), and offsets where another keyword could start inside a
+match and run past its end are re-probed. Both are precomputed at build time.
+
+Very small keyword sets are faster as plain `in` checks (C substring search),
+so below SMALL_SET_SIZE keywords the matcher uses those instead.
+"""
+import re
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Set
+
+
+# Below this many keywords, per-keyword `in` checks beat one regex scan
+SMALL_SET_SIZE = 48
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Regex alternation for the words, merged by common prefix; longer words win."""
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def emit(node: Dict) -> str:
+        terminal = "" in node
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch != ""]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            # Greedy optional: the longest keyword at a position is the one reported
+            return body + "?" if len(branches) == 1 and len(body) == 1 else "(?:" + body + ")?"
+        return body
+
+    return emit(trie)
+
+
+class KeywordMatcher:
+    """
+    Keyword categories compiled for one-pass lookup.
+
+    Matching is case-insensitive substring matching, like `kw.lower() in
+    text.lower()`. Categories keep their definition order, so first() behaves
+    like a loop over an ordered dict of keyword lists.
+    """
+
+    def __init__(self, categories: Mapping[str, Iterable[str]]):
+        self.categories: Dict[str, List[str]] = {
+            name: [k.lower() for k in keywords if k] for name, keywords in categories.items()
+        }
+        # keyword -> {category: number of times listed}
+        self._weights: Dict[str, Dict[str, int]] = {}
+        for name, keywords in self.categories.items():
+            for keyword in keywords:
+                weights = self._weights.setdefault(keyword, {})
+                weights[name] = weights.get(name, 0) + 1
+
+        keywords = sorted(self._weights, key=len)
+        self._keywords = keywords
+        # A keyword found at a position implies every keyword it contains
+        self._contains: Dict[str, FrozenSet[str]] = {
+            k: frozenset(other for other in keywords[:i] if other in k) | {k}
+            for i, k in enumerate(keywords)
+        }
+        # Offsets inside a keyword where another keyword may start and extend past its end
+        self._overlaps: Dict[str, List[int]] = {
+            k: [i for i in range(1, len(k)) if any(o.startswith(k[i:]) and len(o) > len(k) - i for o in keywords)]
+            for k in keywords
+        }
+        self._regex = re.compile(_trie_pattern(keywords)) if len(keywords) >= SMALL_SET_SIZE else None
+
+    def find(self, text: str) -> Set[str]:
+        """Every distinct (lowercased) keyword that occurs in the text."""
+        if not text or not self._keywords:
+            return set()
+        text = text.lower()
+        if self._regex is None:
+            return {k for k in self._keywords if k in text}
+
+        hits: Set[str] = set()
+        pending = list(self._regex.finditer(text))
+        while pending:
+            match = pending.pop()
+            keyword = match.group()
+            hits |= self._contains[keyword]
+            for offset in self._overlaps[keyword]:
+                probe = self._regex.match(text, match.start() + offset)
+                if probe and probe.end() > match.end():
+                    pending.append(probe)
+        return hits
+
+    def counts(self, text: str, hits: Optional[Set[str]] = None) -> Dict[str, int]:
+        """Category -> number of its keywords found (categories with no hits are omitted)."""
+        result: Dict[str, int] = {}
+        for keyword in self.find(text) if hits is None else hits:
+            for name, weight in self._weights.get(keyword, {}).items():
+                result[name] = result.get(name, 0) + weight
+        return result
+
+    def matching(self, text: str) -> List[str]:
+        """Categories with at least one keyword in the text, in definition order."""
+        found = self.counts(text)
+        return [name for name in self.categories if name in found]
+
+    def first(self, text: str) -> Optional[str]:
+        """First category (in definition order) with a keyword in the text."""
+        matched = self.matching(text)
+        return matched[0] if matched else None
+
+    def search(self, text: str) -> bool:
+        """Whether any keyword occurs in the text."""
+        if not text or not self._keywords:
+            return False
+        text = text.lower()
+        if self._regex is None:
+            return any(k in text for k in self._keywords)
+        return self._regex.search(text) is not None
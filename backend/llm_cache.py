@@ -0,0 +1,361 @@
+"""
+Certify Intel - LLM Response Cache (v5.2.1)
+Persistent cache for identical LLM requests (router tasks, dimension tagging, threat analysis, SWOT).
+
+Requests are keyed by provider, model, system prompt, user prompt and JSON
+mode, and stored in the llm_response_cache table with a TTL. The least
+recently used rows are evicted once the table exceeds its size limit.
+Concurrent identical requests are coalesced so only one upstream call is in
+flight; the other callers wait for its result.
+
+Configuration (environment):
+    LLM_CACHE_ENABLED         "false" to disable the cache (default true)
+    LLM_CACHE_TTL_HOURS       Default time-to-live for cached responses (default 24)
+    LLM_CACHE_MAX_ENTRIES     LRU eviction threshold (default 5000)
+    LLM_CACHE_BYPASS_TASKS    Comma-separated task types never cached (default "chat_response")
+"""
+import os
+import hashlib
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+# Bump to invalidate every cached response (e.g. after a prompt format change)
+LLM_CACHE_VERSION = "1"
+
+# Run LRU/TTL eviction after this many stores
+EVICTION_INTERVAL = 50
+
+
+def make_cache_key(
+    provider: str,
+    model: str,
+    system_prompt: Optional[str],
+    prompt: str,
+    json_mode: bool
+) -> str:
+    """sha256 over every input that changes the upstream response."""
+    parts = [LLM_CACHE_VERSION, provider, model, system_prompt, prompt, "json" if json_mode else "text"]
+    parts = ["" if part is None else str(part) for part in parts]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class _Flight:
+    """An in-progress upstream call that identical requests can wait on."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.done = False
+        self.value: Any = None
+
+
+class LLMCache:
+    """
+    SQLite-backed LLM response cache with TTL, LRU eviction and single-flight.
+
+    Callers pass the upstream call as a zero-argument function plus converters
+    between their response type and the cached string, so OpenAI completions,
+    Gemini JSON dicts and AIResponse objects can all share one cache.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable] = None,
+        ttl_hours: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        bypass_tasks: Optional[Set[str]] = None,
+        flight_timeout_seconds: float = 120.0
+    ):
+        self._session_factory = session_factory
+        self.enabled = os.getenv("LLM_CACHE_ENABLED", "true").lower() != "false"
+        if ttl_hours is None:
+            ttl_hours = float(os.getenv("LLM_CACHE_TTL_HOURS", "24"))
+        self.default_ttl = timedelta(hours=ttl_hours)
+        self.max_entries = max_entries or int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+        if bypass_tasks is None:
+            bypass_tasks = {
+                t.strip() for t in os.getenv("LLM_CACHE_BYPASS_TASKS", "chat_response").split(",") if t.strip()
+            }
+        self.bypass_tasks = set(bypass_tasks)
+        self.flight_timeout_seconds = flight_timeout_seconds
+
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, _Flight] = {}
+        self._stores_since_eviction = 0
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,   # Requests that waited on an identical in-flight call
+            "bypassed": 0,
+            "stores": 0,
+            "expired": 0,
+            "evicted": 0,
+            "errors": 0,
+        }
+        self.task_stats: Dict[str, Dict[str, int]] = {}
+
+    def _session(self):
+        if self._session_factory is None:
+            from database import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    def _count(self, key: str, task_type: Optional[str] = None, amount: int = 1):
+        with self._lock:
+            self.stats[key] += amount
+            if task_type:
+                per_task = self.task_stats.setdefault(task_type, {"hits": 0, "misses": 0, "coalesced": 0, "bypassed": 0})
+                if key in per_task:
+                    per_task[key] += amount
+
+    # ============== Bypass switches ==============
+
+    def set_bypass(self, task_type: str, bypass: bool = True):
+        """Turn caching off (or back on) for one task type."""
+        if bypass:
+            self.bypass_tasks.add(task_type)
+        else:
+            self.bypass_tasks.discard(task_type)
+
+    def is_bypassed(self, task_type: str) -> bool:
+        return not self.enabled or task_type in self.bypass_tasks
+
+    # ============== Main entry point ==============
+
+    def get_or_compute(
+        self,
+        task_type: str,
+        provider: str,
+        model: str,
+        system_prompt: Optional[str],
+        prompt: str,
+        json_mode: bool,
+        compute: Callable[[], Any],
+        to_cache: Callable[[Any], Optional[str]] = lambda value: value,
+        from_cache: Callable[[str], Any] = lambda cached: cached,
+        ttl: Optional[timedelta] = None
+    ) -> Any:
+        """
+        Return the cached response for this request, or call compute() once.
+
+        Args:
+            task_type: Used for bypass switches and per-task metrics
+            provider, model, system_prompt, prompt, json_mode: Cache key inputs
+            compute: Makes the upstream call and returns the caller's response type
+            to_cache: Converts a response to the string to store, or None if it
+                      must not be cached (errors, empty responses)
+            from_cache: Rebuilds the caller's response type from the stored string
+            ttl: Overrides the default time-to-live
+        """
+        if self.is_bypassed(task_type):
+            self._count("bypassed", task_type)
+            return compute()
+
+        key = make_cache_key(provider, model, system_prompt, prompt, json_mode)
+        cached = self._lookup(key)
+        if cached is not None:
+            self._count("hits", task_type)
+            return from_cache(cached)
+
+        def call_upstream():
+            self._count("misses", task_type)
+            result = compute()
+            try:
+                value = to_cache(result)
+            except Exception:
+                value = None
+            if value:
+                self._store(key, task_type, provider, model, value, ttl or self.default_ttl)
+            return result
+
+        return self._single_flight(key, task_type, call_upstream)
+
+    def _single_flight(self, key: str, task_type: str, call_upstream: Callable[[], Any]) -> Any:
+        """Run call_upstream once per key; concurrent callers share its result."""
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._inflight[key] = flight
+
+        if not leader:
+            self._count("coalesced", task_type)
+            flight.event.wait(self.flight_timeout_seconds)
+            if flight.done:
+                return flight.value
+            # Leader failed or timed out; make our own call
+            return call_upstream()
+
+        try:
+            flight.value = call_upstream()
+            flight.done = True
+            return flight.value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.event.set()
+
+    # ============== Storage ==============
+
+    def _lookup(self, key: str) -> Optional[str]:
+        from database import LLMResponseCache
+
+        db = self._session()
+        try:
+            row = db.query(LLMResponseCache).filter(LLMResponseCache.cache_key == key).first()
+            if not row:
+                return None
+            now = datetime.utcnow()
+            if row.expires_at and row.expires_at < now:
+                db.delete(row)
+                db.commit()
+                self._count("expired")
+                return None
+            row.hit_count = (row.hit_count or 0) + 1
+            row.last_accessed_at = now
+            db.commit()
+            return row.response
+        except Exception as e:
+            db.rollback()
+            self._count("errors")
+            logger.warning(f"LLM cache lookup failed: {e}")
+            return None
+        finally:
+            db.close()
+
+    def _store(self, key: str, task_type: str, provider: str, model: str, value: str, ttl: timedelta):
+        from database import LLMResponseCache
+
+        now = datetime.utcnow()
+        db = self._session()
+        try:
+            row = db.query(LLMResponseCache).filter(LLMResponseCache.cache_key == key).first()
+            if not row:
+                row = LLMResponseCache(cache_key=key, hit_count=0, created_at=now)
+                db.add(row)
+            row.task_type = task_type
+            row.provider = str(provider)
+            row.model = str(model)
+            row.response = value
+            row.response_size = len(value)
+            row.expires_at = now + ttl
+            row.last_accessed_at = now
+            db.commit()
+            self._count("stores")
+        except Exception as e:
+            db.rollback()
+            self._count("errors")
+            logger.warning(f"LLM cache store failed: {e}")
+            return
+        finally:
+            db.close()
+
+        with self._lock:
+            self._stores_since_eviction += 1
+            due = self._stores_since_eviction >= EVICTION_INTERVAL
+            if due:
+                self._stores_since_eviction = 0
+        if due:
+            self.evict()
+
+    def evict(self) -> int:
+        """Delete expired rows, then least recently used rows above max_entries."""
+        from database import LLMResponseCache
+
+        db = self._session()
+        try:
+            expired = db.query(LLMResponseCache).filter(
+                LLMResponseCache.expires_at < datetime.utcnow()
+            ).delete(synchronize_session=False)
+
+            overflow = db.query(LLMResponseCache).count() - self.max_entries
+            evicted = 0
+            if overflow > 0:
+                oldest_ids = [
+                    row_id for (row_id,) in db.query(LLMResponseCache.id)
+                    .order_by(LLMResponseCache.last_accessed_at.asc())
+                    .limit(overflow)
+                ]
+                evicted = db.query(LLMResponseCache).filter(
+                    LLMResponseCache.id.in_(oldest_ids)
+                ).delete(synchronize_session=False)
+            db.commit()
+
+            self._count("expired", amount=expired)
+            self._count("evicted", amount=evicted)
+            return expired + evicted
+        except Exception as e:
+            db.rollback()
+            self._count("errors")
+            logger.warning(f"LLM cache eviction failed: {e}")
+            return 0
+        finally:
+            db.close()
+
+    def clear(self, task_type: Optional[str] = None) -> int:
+        """Drop cached responses for one task type (or all). Returns rows deleted."""
+        from database import LLMResponseCache
+
+        db = self._session()
+        try:
+            query = db.query(LLMResponseCache)
+            if task_type:
+                query = query.filter(LLMResponseCache.task_type == task_type)
+            deleted = query.delete(synchronize_session=False)
+            db.commit()
+            return deleted
+        finally:
+            db.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters (overall and per task type) plus persisted cache size."""
+        from sqlalchemy import func
+        from database import LLMResponseCache
+
+        with self._lock:
+            stats = dict(self.stats)
+            by_task = {task: dict(counts) for task, counts in self.task_stats.items()}
+
+        def hit_rate(counts):
+            served = counts["hits"] + counts["coalesced"]
+            total = served + counts["misses"]
+            return round(served / total, 3) if total else 0.0
+
+        stats["hit_rate"] = hit_rate(stats)
+        for counts in by_task.values():
+            counts["hit_rate"] = hit_rate(counts)
+        stats["by_task_type"] = by_task
+        stats["enabled"] = self.enabled
+        stats["bypass_tasks"] = sorted(self.bypass_tasks)
+        stats["max_entries"] = self.max_entries
+        stats["ttl_hours"] = self.default_ttl.total_seconds() / 3600
+
+        db = self._session()
+        try:
+            entries, total_bytes = db.query(
+                func.count(LLMResponseCache.id),
+                func.coalesce(func.sum(LLMResponseCache.response_size), 0)
+            ).one()
+            stats["entries"] = entries
+            stats["total_bytes"] = int(total_bytes)
+        finally:
+            db.close()
+        return stats
+
+
+# Singleton instance
+_cache_instance = None
+
+
+def get_llm_cache() -> LLMCache:
+    """Get the LLM response cache instance."""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = LLMCache()
+    return _cache_instance
@@ -7,6 +7,7 @@ A lightweight FastAPI backend that:
 4. Exports data to Excel-compatible formats
 """
 import os
+import re
 import sys
 
 # ==============================================================================
@@ -55,20 +56,12 @@ def _load_env():
         return False
 
 _load_env()
-print(f"[ENV] Database URL: {os.getenv('DATABASE_URL', 'sqlite:///./certify_intel.db')}")
+_db_url = re.sub(r"://([^:/@]+):.*@", r"://\1:***@", os.getenv('DATABASE_URL', 'sqlite:///./certify_intel.db'))
+print(f"[ENV] Database URL: {_db_url}")  # Password masked
 # ==============================================================================
 
 import json
 import asyncio
-try:
-    import yfinance as yf
-except ImportError:
-    class MockYF:
-        class Ticker:
-            def __init__(self, t): self.info = {}
-        def Ticker(self, t): return self.Ticker(t)
-    yf = MockYF()
-    print("yfinance not found, using mock")
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from contextlib import asynccontextmanager
@@ -123,6 +116,9 @@ from confidence_scoring import (
 from data_triangulator import (
     DataTriangulator, triangulate_competitor, triangulation_result_to_dict
 )
+from context_store import get_context_store
+from analytics_rollup import get_metrics_rollup, version_info
+from stock_quotes import get_quote_service
 
 # Auth imports for route protection
 from fastapi.security import OAuth2PasswordBearer
@@ -156,6 +152,13 @@ def log_activity(db: Session, user_email: str, user_id: int, action_type: str, a
         action_type=action_type,
         action_details=action_details if isinstance(action_details, str) else json.dumps(action_details) if action_details else None
     )
+    # v5.2.1: Production SQLite profile batches activity rows on the writer thread
+    from sqlite_profile import write_queue_enabled, get_write_queue
+    if write_queue_enabled():
+        activity.created_at = datetime.utcnow()  # Time of the action, not of the batch commit
+        fields = {c.name: getattr(activity, c.name) for c in ActivityLog.__table__.columns if c.name != "id"}
+        get_write_queue().submit(lambda session: session.add(ActivityLog(**fields)))
+        return activity
     db.add(activity)
     db.commit()
     return activity
@@ -223,11 +226,12 @@ KNOWN_TICKERS = {
 
 def lookup_ticker_dynamically(company_name: str) -> dict:
     """
-    Try to find ticker symbol for a company using yfinance.
+    Try to find ticker symbol for a company using the stock quote service.
     Returns dict with symbol, exchange, name or None values if not found.
+    Lookups (including misses) are cached by the quote service.
     """
     try:
-        import yfinance as yf
+        quotes = get_quote_service()
         # Common patterns to try
         search_terms = [
             company_name,
@@ -235,23 +239,12 @@ def lookup_ticker_dynamically(company_name: str) -> dict:
             company_name.split()[0] if " " in company_name else company_name
         ]
 
-        for term in search_terms:
+        for term in dict.fromkeys(search_terms):
             try:
-                ticker = yf.Ticker(term)
-                info = ticker.info
-                if info and info.get('symbol') and info.get('shortName'):
-                    exchange = info.get('exchange', 'UNKNOWN')
-                    # Map exchange codes to readable names
-                    exchange_map = {
-                        'NMS': 'NASDAQ', 'NGM': 'NASDAQ', 'NCM': 'NASDAQ',
-                        'NYQ': 'NYSE', 'NYSE': 'NYSE', 'PCX': 'NYSE ARCA'
-                    }
-                    return {
-                        "symbol": info.get('symbol'),
-                        "exchange": exchange_map.get(exchange, exchange),
-                        "name": info.get('shortName') or info.get('longName')
-                    }
-            except:
+                found = quotes.lookup(term)
+                if found:
+                    return found
+            except Exception:
                 continue
         return None
     except Exception as e:
@@ -414,6 +407,61 @@ async def lifespan(app: FastAPI):
 
     print("=" * 60)
 
+    # Track competitor/KB writes so summary and chat context fragments stay current
+    get_context_store()
+
+    # Cached news without a published date would fall outside every feed date filter,
+    # and rows without a url_hash would bypass bulk-ingest deduplication
+    try:
+        from database import backfill_news_published_at
+        from news_ingest import backfill_hashes
+        backfill_db = SessionLocal()
+        try:
+            backfilled = backfill_news_published_at(backfill_db)
+            if backfilled:
+                print(f"[News Cache] Backfilled published_at for {backfilled} articles")
+            # Rows cached before url_hash existed; duplicate URLs are dropped so the unique index holds
+            hashed = backfill_hashes(backfill_db)
+            if hashed:
+                print(f"[News Cache] Backfilled url_hash for {hashed} articles")
+        finally:
+            backfill_db.close()
+    except Exception as e:
+        print(f"[News Cache] Backfill skipped: {e}")
+
+    # Typed metric columns (customer_count_value, ...) for competitors saved before they existed
+    try:
+        from database import backfill_competitor_metrics
+        backfill_db = SessionLocal()
+        try:
+            parsed = backfill_competitor_metrics(backfill_db)
+            if parsed:
+                print(f"[Metrics] Parsed typed metrics for {parsed} competitors")
+        finally:
+            backfill_db.close()
+    except Exception as e:
+        print(f"[Metrics] Backfill skipped: {e}")
+
+    # Precomputed dashboard/market map/priority matrix metrics; built once, then kept current
+    try:
+        rollup_db = SessionLocal()
+        try:
+            state = get_metrics_rollup().current_state(rollup_db)
+            print(f"[Rollup] Competitor metrics rollup at version {state.version}")
+        finally:
+            rollup_db.close()
+    except Exception as e:
+        print(f"[Rollup] Build skipped: {e}")
+
+    # Full-text search index (SQLite FTS5); new indexes are built from existing rows once
+    try:
+        from search_index import ensure_search_index
+        built = ensure_search_index(engine)
+        if built:
+            print(f"[Search] Built full-text index for: {', '.join(built)}")
+    except Exception as e:
+        print(f"[Search] Full-text index unavailable, using LIKE search: {e}")
+
     # Start Enterprise Scheduler
     if SCHEDULER_AVAILABLE:
         print("Initializing Enterprise Automation Engine...")
@@ -462,6 +510,36 @@ async def lifespan(app: FastAPI):
     print("Certify Intel Backend shutting down...")
     if SCHEDULER_AVAILABLE:
         stop_scheduler()
+    try:
+        from browser_pool import shutdown_browser_pool
+        await shutdown_browser_pool()
+    except Exception as e:
+        print(f"Browser pool shutdown warning: {e}")
+    try:
+        from extraction_pool import shutdown_extraction_pool
+        shutdown_extraction_pool()
+    except Exception as e:
+        print(f"Extraction pool shutdown warning: {e}")
+    try:
+        from stock_quotes import shutdown_quote_service
+        shutdown_quote_service()
+    except Exception as e:
+        print(f"Stock quote service shutdown warning: {e}")
+    try:
+        from http_fetcher import shutdown_http_fetcher
+        await shutdown_http_fetcher()
+    except Exception as e:
+        print(f"HTTP fetcher shutdown warning: {e}")
+    try:
+        from analytics_rollup import shutdown_metrics_rollup
+        shutdown_metrics_rollup()
+    except Exception as e:
+        print(f"Metrics rollup shutdown warning: {e}")
+    try:
+        from sqlite_profile import shutdown_write_queue
+        shutdown_write_queue()
+    except Exception as e:
+        print(f"Write queue shutdown warning: {e}")
 
 app = FastAPI(
     title="Certify Health Intel API",
@@ -540,10 +618,11 @@ async def get_dashboard_summary(db: Session = Depends(get_db), current_user: dic
         import os
         from openai import OpenAI
         
-        # Get all non-deleted competitors (matching dashboard count)
-        competitors = db.query(Competitor).filter(
-            Competitor.is_deleted == False
-        ).all()
+        # Get all non-deleted competitors (matching dashboard count) with their
+        # prebuilt context fragments; only changed competitors are re-rendered
+        context_store = get_context_store()
+        fragments = context_store.competitor_fragments(db, "summary")
+        competitors = [c for c, _ in fragments]
         
         if not competitors:
             return {"summary": "No active competitors found to analyze.", "type": "empty", "model": None}
@@ -586,51 +665,22 @@ PRICING MODEL DISTRIBUTION:
 
 DETAILED COMPETITOR DATA (ALL {total} ACTIVE COMPETITORS):
 """
+        # Live stock data for all public companies in one batched, cached lookup
+        quotes = await asyncio.to_thread(
+            get_quote_service().get_quotes,
+            [c.ticker_symbol for c in competitors if c.is_public and c.ticker_symbol]
+        )
+
         # INCLUDED ALL COMPETITORS (No limit) for maximum context
-        for i, c in enumerate(competitors, 1):
-            data_summary += f"""
---- COMPETITOR #{i} of {total} ---
-NAME: {c.name}
-THREAT LEVEL: {c.threat_level}
-STATUS: {c.status or 'Active'}
-WEBSITE: {c.website or 'N/A'}
-LAST UPDATED: {c.last_updated.strftime('%Y-%m-%d %H:%M') if c.last_updated else 'N/A'}
-DATA QUALITY SCORE: {c.data_quality_score or 'N/A'}/100
-
-PRICING INFO:
-- Model: {c.pricing_model or 'Unknown'}
-- Base Price: {c.base_price or 'N/A'}
-- Price Unit: {c.price_unit or 'N/A'}
-
-PRODUCT INFO:
-- Categories: {c.product_categories or 'N/A'}
-- Key Features: {c.key_features or 'N/A'}
-- Integrations: {c.integration_partners or 'N/A'}
-- Certifications: {c.certifications or 'N/A'}
-
-MARKET INFO:
-- Target Segments: {c.target_segments or 'N/A'}
-- Customer Size Focus: {c.customer_size_focus or 'N/A'}
-- Geographic Focus: {c.geographic_focus or 'N/A'}
-- Customer Count: {c.customer_count or 'N/A'}
-- Key Customers: {c.key_customers or 'N/A'}
-- G2 Rating: {c.g2_rating or 'N/A'}
-
-COMPANY INFO:
-- Headquarters: {c.headquarters or 'N/A'}
-- Founded: {c.year_founded or 'N/A'}
-- Employees: {c.employee_count or 'N/A'}
-- Employee Growth: {c.employee_growth_rate or 'N/A'}
-- Total Funding: {c.funding_total or 'N/A'}
-- Latest Round: {c.latest_round or 'N/A'}
-- Is Public: {'Yes' if c.is_public else 'No (Private)'}
-"""
+        sections = [data_summary]
+        for i, (c, fragment) in enumerate(fragments, 1):
+            sections.append(f"\n--- COMPETITOR #{i} of {total} ---\n{fragment}")
             # Add live stock data for public companies
             if c.is_public and c.ticker_symbol:
-                stock_info = fetch_real_stock_data(c.ticker_symbol)
+                stock_info = quotes.get(c.ticker_symbol.strip().upper())
                 if stock_info and stock_info.get('price'):
                     change_sign = '+' if stock_info.get('change', 0) >= 0 else ''
-                    data_summary += f"""
+                    sections.append(f"""
 STOCK DATA (LIVE):
 - Ticker: {c.ticker_symbol} ({c.stock_exchange or 'NYSE'})
 - Current Price: ${stock_info.get('price', 0):.2f}
@@ -638,18 +688,15 @@ STOCK DATA (LIVE):
 - Market Cap: ${stock_info.get('market_cap', 0):,.0f}
 - 52-Week High: ${stock_info.get('high52', 'N/A')}
 - 52-Week Low: ${stock_info.get('low52', 'N/A')}
-"""
+""")
                 else:
-                    data_summary += f"""
+                    sections.append(f"""
 STOCK DATA:
 - Ticker: {c.ticker_symbol} ({c.stock_exchange or 'NYSE'})
 - Stock Price: Data unavailable
-"""
-
-            data_summary += f"""
-NOTES: {c.notes or 'None'}
---- END {c.name} ---
-"""
+""")
+            sections.append(f"--- END {c.name} ---\n")
+        data_summary = "".join(sections)
 
         # Try OpenAI first
         api_key = os.getenv("OPENAI_API_KEY")
@@ -683,11 +730,10 @@ Your summary MUST include:
 Use data-driven insights. Be specific with numbers and competitor names. Format with markdown headers and bullet points."""
 
                 # RAG: Inject Knowledge Base
-                kb_items = db.query(KnowledgeBaseItem).filter(KnowledgeBaseItem.is_active == True).all()
-                if kb_items:
+                kb_fragments = context_store.knowledge_base_fragments(db, "summary")
+                if kb_fragments:
                     data_summary += "\n\nINTERNAL KNOWLEDGE BASE (USE THIS CONTEXT):\n==========================\n"
-                    for item in kb_items:
-                        data_summary += f"\n--- {item.title} ({item.source_type}) ---\n{item.content_text}\n"
+                    data_summary += "".join(kb_fragments)
 
                 client = OpenAI(api_key=api_key)
                 response = client.chat.completions.create(
@@ -770,15 +816,12 @@ def chat_with_summary(request: dict, db: Session = Depends(get_db), current_user
             return {"response": "Please provide a message.", "success": False}
         
         # Get competitor data for context
-        # Get ALL non-deleted competitors for consistency
-        competitors = db.query(Competitor).filter(Competitor.is_deleted == False).all()
+        # Get ALL non-deleted competitors for consistency (prebuilt context fragments)
+        context_store = get_context_store()
+        fragments = context_store.competitor_fragments(db, "chat")
+        competitors = [c for c, _ in fragments]
         
         # Build Comprehensive Context (Same as Summary Generation to ensure consistency)
-        pricing_models = {}
-        for c in competitors:
-            model = c.pricing_model or "Unknown"
-            pricing_models[model] = pricing_models.get(model, 0) + 1
-
         context = f"""
 FULL DATA SNAPSHOT (LIVE):
 ==========================
@@ -789,43 +832,35 @@ Low Threat: {sum(1 for c in competitors if c.threat_level == 'Low')}
 
 COMPETITORS:
 """
+        # Stock data for all public companies in one batched, cached lookup
+        quotes = get_quote_service().get_quotes(
+            [c.ticker_symbol for c in competitors if c.is_public and c.ticker_symbol]
+        )
+
         # Include ALL competitors in chat context too
-        for c in competitors:
-            # Build base competitor info
-            comp_info = f"""
----
-COMPETITOR: {c.name}
-THREAT: {c.threat_level}
-WEBSITE: {c.website or 'N/A'}
-PRICING: {c.base_price or 'N/A'} ({c.pricing_model or 'Unknown Model'})
-OFFERING: {c.product_categories or 'N/A'}
-FEATURES: {c.key_features or 'N/A'}
-EMPLOYEES: {c.employee_count or 'N/A'}
-G2 RATING: {c.g2_rating or 'N/A'}
-"""
+        sections = [context]
+        for c, fragment in fragments:
+            sections.append(fragment)
             # Add stock data for public companies
             if c.is_public and c.ticker_symbol:
-                stock_data = fetch_real_stock_data(c.ticker_symbol)
+                stock_data = quotes.get(c.ticker_symbol.strip().upper())
                 if stock_data and stock_data.get('price'):
                     change_sign = '+' if stock_data.get('change', 0) >= 0 else ''
-                    comp_info += f"""PUBLIC COMPANY: Yes
+                    sections.append(f"""PUBLIC COMPANY: Yes
 STOCK TICKER: {c.ticker_symbol} ({c.stock_exchange or 'NYSE'})
 CURRENT STOCK PRICE: ${stock_data.get('price', 'N/A'):.2f}
 PRICE CHANGE: {change_sign}{stock_data.get('change', 0):.2f} ({change_sign}{stock_data.get('change_percent', 0):.2f}%)
 MARKET CAP: ${stock_data.get('market_cap', 0):,.0f}
 52-WEEK HIGH: ${stock_data.get('high52', 'N/A')}
 52-WEEK LOW: ${stock_data.get('low52', 'N/A')}
-"""
+""")
                 else:
-                    comp_info += f"""PUBLIC COMPANY: Yes
+                    sections.append(f"""PUBLIC COMPANY: Yes
 STOCK TICKER: {c.ticker_symbol} ({c.stock_exchange or 'NYSE'})
 STOCK DATA: Unable to fetch live data
-"""
-            else:
-                comp_info += f"PUBLIC COMPANY: No (Private)\n"
-
-            comp_info += f"NOTES: {c.notes or ''}\n---\n"
-            context += comp_info
+""")
+            sections.append("---\n")
+        context = "".join(sections)
 
         api_key = os.getenv("OPENAI_API_KEY")
         if api_key:
@@ -858,11 +893,10 @@ STOCK DATA: Unable to fetch live data
 
             # RAG: Inject Knowledge Base
             kb_text = ""
-            kb_items = db.query(KnowledgeBaseItem).filter(KnowledgeBaseItem.is_active == True).all()
-            if kb_items:
+            kb_fragments = context_store.knowledge_base_fragments(db, "chat")
+            if kb_fragments:
                 kb_text += "\n\nINTERNAL KNOWLEDGE BASE:\n"
-                for item in kb_items:
-                    kb_text += f"\n--- {item.title} ---\n{item.content_text}\n"
+                kb_text += "".join(kb_fragments)
             
 
             full_system_content = f"""{base_persona}
@@ -909,6 +943,102 @@ def api_health():
     return {"status": "healthy", "timestamp": datetime.utcnow().isoformat(), "version": "1.0.0"}
 
 
+# Storage Profile Status (v5.2.1)
+@app.get("/api/storage/status")
+def get_storage_status(current_user: dict = Depends(get_current_user)):
+    """Effective SQLite pragmas and write queue counters (production profile)."""
+    import sqlite_profile
+    return {
+        "backend": engine.url.get_backend_name(),
+        "production_profile": sqlite_profile.PROFILE_ENABLED,
+        "pragmas": sqlite_profile.current_pragmas(engine),
+        "write_queue": sqlite_profile.get_write_queue().get_stats() if sqlite_profile.write_queue_enabled() else None,
+    }
+
+
+# Log Retention & Archival (v5.2.1)
+@app.get("/api/admin/retention")
+def get_retention_status(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    """Retention policies, archive progress per log table and rows currently past retention (admin only)."""
+    from data_retention import get_retention_job
+
+    if current_user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Admin role required")
+    return get_retention_job().get_status(db)
+
+
+@app.post("/api/admin/retention/run")
+def run_retention(
+    tables: Optional[str] = None,
+    max_seconds: int = 60,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Summarize, archive and delete log rows past retention now (admin only).
+
+    tables: comma-separated subset of data_change_history, change_log, activity_logs.
+    Stops after max_seconds; a later run continues where this one stopped.
+    """
+    from data_retention import POLICIES, get_retention_job
+
+    if current_user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Admin role required")
+    selected = [t.strip() for t in tables.split(",") if t.strip()] if tables else None
+    unknown = [t for t in selected or [] if t not in POLICIES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown log table(s): {', '.join(unknown)}")
+
+    report = get_retention_job().run(db, tables=selected, max_seconds=max_seconds)
+    if "skipped" in report:
+        raise HTTPException(status_code=409, detail=report["skipped"])
+    archived = sum(t["archived"] for t in report["tables"].values())
+    log_activity(db, current_user.get("email", "unknown"), current_user.get("id"), "data_retention",
+                 f"Archived {archived} log rows")
+    return report
+
+
+@app.get("/api/admin/retention/summaries")
+def get_log_summaries(
+    table: str,
+    days: int = 365,
+    competitor_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """Daily/weekly counts of archived rows of one log table (admin only)."""
+    from datetime import timedelta
+    from database import LogSummary
+
+    if current_user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Admin role required")
+
+    query = db.query(LogSummary).filter(
+        LogSummary.source_table == table,
+        LogSummary.period_start >= datetime.utcnow() - timedelta(days=days)
+    )
+    if competitor_id is not None:
+        query = query.filter(LogSummary.competitor_id == competitor_id)
+    summaries = query.order_by(LogSummary.period_start.desc(), LogSummary.id).limit(5000).all()
+    return {
+        "table": table,
+        "summaries": [
+            {
+                "period": s.period,
+                "period_start": s.period_start.isoformat(),
+                "competitor_id": s.competitor_id,
+                "competitor_name": s.competitor_name,
+                "key": s.key,
+                "sub_key": s.sub_key,
+                "count": s.row_count,
+                "first_at": s.first_at.isoformat() if s.first_at else None,
+                "last_at": s.last_at.isoformat() if s.last_at else None
+            }
+            for s in summaries
+        ]
+    }
+
+
 # AI Provider Status (v5.0.2)
 @app.get("/api/ai/status")
 def get_ai_status():
@@ -970,6 +1100,59 @@ def get_ai_status():
     }
 
 
+# Extraction Cache Status (v5.2.1)
+@app.get("/api/ai/extraction-cache")
+def get_extraction_cache_stats():
+    """Get content-hash extraction cache hit/miss counters and size."""
+    from extraction_cache import get_extraction_cache
+    return get_extraction_cache().get_stats()
+
+
+@app.delete("/api/ai/extraction-cache")
+def clear_extraction_cache(competitor_name: Optional[str] = None):
+    """Drop cached extractions (one competitor or all) to force re-extraction."""
+    from extraction_cache import get_extraction_cache
+    deleted = get_extraction_cache().invalidate(competitor_name)
+    return {"success": True, "deleted": deleted, "competitor_name": competitor_name}
+
+
+@app.get("/api/ai/llm-cache")
+def get_llm_cache_stats():
+    """Get LLM response cache hit rates (overall and per task type) and size."""
+    from llm_cache import get_llm_cache
+    return get_llm_cache().get_stats()
+
+
+@app.delete("/api/ai/llm-cache")
+def clear_llm_cache(task_type: Optional[str] = None):
+    """Drop cached LLM responses (one task type or all)."""
+    from llm_cache import get_llm_cache
+    deleted = get_llm_cache().clear(task_type)
+    return {"success": True, "deleted": deleted, "task_type": task_type}
+
+
+@app.put("/api/ai/llm-cache/bypass/{task_type}")
+def set_llm_cache_bypass(task_type: str, bypass: bool = True):
+    """Turn the LLM cache off (or back on) for one task type until restart."""
+    from llm_cache import get_llm_cache
+    cache = get_llm_cache()
+    cache.set_bypass(task_type, bypass)
+    return {"success": True, "bypass_tasks": sorted(cache.bypass_tasks)}
+
+
+@app.get("/api/ai/context-fragments")
+def get_context_fragment_stats(db: Session = Depends(get_db)):
+    """Get prebuilt summary/chat context fragment counts and rebuild statistics."""
+    return get_context_store().get_stats(db)
+
+
+@app.delete("/api/ai/context-fragments")
+def clear_context_fragments(db: Session = Depends(get_db)):
+    """Drop all prebuilt context fragments; they are rebuilt on the next summary or chat."""
+    deleted = get_context_store().clear(db)
+    return {"success": True, "deleted": deleted}
+
+
 # ============== MULTIMODAL AI ENDPOINTS (v5.0.5) ==============
 
 @app.post("/api/ai/analyze-screenshot")
@@ -1794,28 +1977,32 @@ async def firecrawl_status():
 # Analytics sub-endpoints
 @app.get("/api/analytics/threats")
 def get_threat_analytics(db: Session = Depends(get_db)):
-    """Get threat distribution analytics."""
-    competitors = db.query(Competitor).filter(Competitor.is_deleted == False).all()
+    """Get threat distribution analytics (from the metrics rollup)."""
+    summary = get_metrics_rollup().summary(db)
+    levels = summary["threat_levels"]
     return {
-        "high": sum(1 for c in competitors if c.threat_level == "High"),
-        "medium": sum(1 for c in competitors if c.threat_level == "Medium"),
-        "low": sum(1 for c in competitors if c.threat_level == "Low"),
-        "total": len(competitors)
+        "high": levels.get("High", 0),
+        "medium": levels.get("Medium", 0),
+        "low": levels.get("Low", 0),
+        "total": summary["total"],
+        "rollup": summary["rollup"]
     }
 
 
 @app.get("/api/analytics/market-share")
 def get_market_share_analytics(db: Session = Depends(get_db)):
     """Get estimated market share by customer count."""
-    competitors = db.query(Competitor).filter(Competitor.is_deleted == False).all()
+    # Top 10 by typed customer count, sorted in SQL (unknown counts last)
+    competitors = db.query(Competitor.name, Competitor.customer_count, Competitor.customer_count_value).filter(
+        Competitor.is_deleted == False
+    ).order_by(
+        Competitor.customer_count_value.is_(None), Competitor.customer_count_value.desc(), Competitor.id
+    ).limit(10).all()
     shares = []
-    for c in competitors[:10]:
-        count = 0
-        if c.customer_count:
-            try:
-                count = int(''.join(filter(str.isdigit, str(c.customer_count)))) or 100
-            except:
-                count = 100
+    for c in competitors:
+        count = int(c.customer_count_value or 0)
+        if c.customer_count and not count:
+            count = 100
         shares.append({"name": c.name, "customers": count})
     total = sum(s["customers"] for s in shares)
     for s in shares:
@@ -1851,88 +2038,53 @@ def get_analytics_dashboard(db: Session = Depends(get_db)):
     from datetime import timedelta
     from sqlalchemy import func
 
-    competitors = db.query(Competitor).filter(Competitor.is_deleted == False).all()
-    total = len(competitors)
-
-    # Status breakdown
-    status_counts = {}
-    for c in competitors:
-        status = c.status or "Unknown"
-        status_counts[status] = status_counts.get(status, 0) + 1
-
-    # Threat level breakdown
-    threat_counts = {"High": 0, "Medium": 0, "Low": 0}
-    for c in competitors:
-        level = c.threat_level or "Low"
-        if level in threat_counts:
-            threat_counts[level] += 1
+    # Competitor aggregates are precomputed in the metrics rollup (v5.2.1)
+    rollup = get_metrics_rollup()
+    rollup_summary = rollup.summary(db)
+    total = rollup_summary["total"]
+    status_counts = rollup_summary["status_counts"]
+
+    # Threat level breakdown (unset counts as Low)
+    levels = rollup_summary["threat_levels"]
+    threat_counts = {
+        "High": levels.get("High", 0),
+        "Medium": levels.get("Medium", 0),
+        "Low": levels.get("Low", 0) + levels.get("", 0)
+    }
 
     # Data freshness
     now = datetime.utcnow()
-    fresh_count = 0  # Updated within 7 days
-    stale_count = 0  # Not updated in 30+ days
-    for c in competitors:
-        if c.last_updated:
-            age = (now - c.last_updated).days
-            if age <= 7:
-                fresh_count += 1
-            elif age > 30:
-                stale_count += 1
-
-    # Data quality average
-    quality_sum = sum(c.data_quality_score or 0 for c in competitors)
-    avg_quality = quality_sum / total if total > 0 else 0
+    freshness = rollup.freshness_counts(db, now)
 
     # News sentiment from cache
     try:
         from database import NewsArticleCache
         recent_cutoff = now - timedelta(days=30)
-        news_query = db.query(NewsArticleCache).filter(
-            NewsArticleCache.published_at >= recent_cutoff
-        ).all()
-
         sentiment_counts = {"positive": 0, "negative": 0, "neutral": 0}
-        for article in news_query:
-            sent = article.sentiment or "neutral"
+        news_total = 0
+        for sentiment, count in db.query(
+            NewsArticleCache.sentiment, func.count(NewsArticleCache.id)
+        ).filter(
+            NewsArticleCache.published_at >= recent_cutoff
+        ).group_by(NewsArticleCache.sentiment):
+            news_total += count
+            sent = sentiment or "neutral"
             if sent in sentiment_counts:
-                sentiment_counts[sent] += 1
-
-        news_total = len(news_query)
+                sentiment_counts[sent] += count
     except:
         sentiment_counts = {"positive": 0, "negative": 0, "neutral": 0}
         news_total = 0
 
-    # Dimension score averages (if available)
-    dimension_averages = {}
-    dimension_fields = [
-        "product_packaging_score", "integration_depth_score", "support_service_score",
-        "retention_stickiness_score", "user_adoption_score", "implementation_ttv_score",
-        "reliability_enterprise_score", "pricing_flexibility_score", "reporting_analytics_score"
-    ]
-
-    for field in dimension_fields:
-        scores = [getattr(c, field, None) for c in competitors if hasattr(c, field)]
-        valid_scores = [s for s in scores if s is not None]
-        if valid_scores:
-            dimension_name = field.replace("_score", "").replace("_", " ").title()
-            dimension_averages[dimension_name] = sum(valid_scores) / len(valid_scores)
-
     # Market positioning (customer count vs threat level)
+    from database import CompetitorMetricsRollup
     market_data = []
-    for c in competitors[:50]:  # Limit for performance
-        customer_count = 0
-        if c.customer_count:
-            try:
-                customer_count = int(''.join(filter(str.isdigit, str(c.customer_count)[:10])))
-            except:
-                customer_count = 100
-
+    for row in rollup.rows(db).order_by(CompetitorMetricsRollup.competitor_id).limit(30):
         market_data.append({
-            "name": c.name,
-            "x": c.data_quality_score or 50,  # Data quality as proxy for market presence
-            "y": customer_count,
-            "threat": c.threat_level or "Low",
-            "size": {"High": 30, "Medium": 20, "Low": 10}.get(c.threat_level, 15)
+            "name": row.name,
+            "x": row.data_quality_score or 50,  # Data quality as proxy for market presence
+            "y": int(row.customer_count or 0),
+            "threat": row.threat_level or "Low",
+            "size": {"High": 30, "Medium": 20, "Low": 10}.get(row.threat_level, 15)
         })
 
     # Recent changes count
@@ -1945,9 +2097,9 @@ def get_analytics_dashboard(db: Session = Depends(get_db)):
             "total_competitors": total,
             "active_count": status_counts.get("Active", 0),
             "discovered_count": status_counts.get("Discovered", 0),
-            "avg_data_quality": round(avg_quality, 1),
-            "fresh_data_count": fresh_count,
-            "stale_data_count": stale_count,
+            "avg_data_quality": rollup_summary["avg_data_quality"],
+            "fresh_data_count": freshness["fresh"],
+            "stale_data_count": freshness["stale"],
             "recent_changes": changes_count
         },
         "threat_distribution": threat_counts,
@@ -1956,9 +2108,10 @@ def get_analytics_dashboard(db: Session = Depends(get_db)):
             "counts": sentiment_counts,
             "total": news_total
         },
-        "dimension_averages": dimension_averages,
-        "market_positioning": market_data[:30],
-        "generated_at": now.isoformat()
+        "dimension_averages": rollup_summary["dimension_averages"],
+        "market_positioning": market_data,
+        "generated_at": now.isoformat(),
+        "rollup": rollup_summary["rollup"]
     }
 
 
@@ -1971,37 +2124,27 @@ def get_market_map_data(db: Session = Depends(get_db)):
 
     Returns competitors positioned by data quality (x) and estimated size (y).
     """
-    competitors = db.query(Competitor).filter(
-        Competitor.is_deleted == False,
-        Competitor.status == "Active"
-    ).all()
+    from database import CompetitorMetricsRollup
+    rollup = get_metrics_rollup()
+    state = rollup.current_state(db)
+    rows = rollup.rows(db).filter(CompetitorMetricsRollup.status == "Active").order_by(
+        CompetitorMetricsRollup.customer_count.is_(None), CompetitorMetricsRollup.customer_count.desc()
+    )
 
     data = []
-    for c in competitors:
-        # Estimate customer count
-        customer_count = 100
-        if c.customer_count:
-            try:
-                customer_count = int(''.join(filter(str.isdigit, str(c.customer_count)[:10]))) or 100
-            except:
-                customer_count = 100
-
-        # Estimate employee count for sizing
-        employee_count = 50
-        if c.employee_count:
-            try:
-                employee_count = int(''.join(filter(str.isdigit, str(c.employee_count)[:6]))) or 50
-            except:
-                employee_count = 50
+    for row in rows:
+        # Typed customer/employee counts (v5.2.1); defaults when unknown
+        customer_count = int(row.customer_count or 0) or 100
+        employee_count = int(row.employee_count or 0) or 50
 
         data.append({
-            "id": c.id,
-            "name": c.name,
-            "x": c.data_quality_score or 50,
+            "id": row.competitor_id,
+            "name": row.name,
+            "x": row.data_quality_score or 50,
             "y": min(customer_count, 10000),  # Cap for display
             "size": min(employee_count / 10, 50),  # Scale for bubble size
-            "threat": c.threat_level or "Low",
-            "category": c.product_categories[:50] if c.product_categories else "Unknown"
+            "threat": row.threat_level or "Low",
+            "category": row.category or "Unknown"
         })
 
     return {
@@ -2010,10 +2153,25 @@ def get_market_map_data(db: Session = Depends(get_db)):
         "axes": {
             "x": {"label": "Data Quality Score", "min": 0, "max": 100},
             "y": {"label": "Estimated Customers", "min": 0, "max": 10000}
-        }
+        },
+        "rollup": version_info(state)
     }
 
 
+@app.get("/api/analytics/rollup")
+def get_metrics_rollup_status(db: Session = Depends(get_db)):
+    """Get the metrics rollup version, row count, queued refreshes and counters."""
+    return get_metrics_rollup().get_stats(db)
+
+
+@app.post("/api/analytics/rollup/rebuild")
+def rebuild_metrics_rollup(db: Session = Depends(get_db)):
+    """Recompute every competitor's rollup row and the dashboard aggregates."""
+    rollup = get_metrics_rollup()
+    rows = rollup.rebuild(db)
+    return {"success": True, "rows": rows, "rollup": version_info(rollup.current_state(db))}
+
+
 # ============== DATA QUALITY ENDPOINTS ==============
 
 # List of all data fields that should be tracked
@@ -2448,6 +2606,7 @@ def get_activity_summary(
     current_user: dict = Depends(get_current_user)
 ):
     """Get summary of recent activity by user and action type."""
+    from datetime import timedelta
     from sqlalchemy import func
 
     cutoff = datetime.utcnow() - timedelta(days=days)
@@ -2468,10 +2627,19 @@ def get_activity_summary(
         ActivityLog.created_at >= cutoff
     ).group_by(ActivityLog.action_type).all()
 
+    # Rows the retention job has moved out of activity_logs (v5.2.1)
+    from data_retention import summary_counts
+    by_user = {u[0]: u[1] for u in user_activity}
+    for user, count in summary_counts(db, "activity_logs", cutoff, group_by="sub_key").items():
+        by_user[user] = by_user.get(user, 0) + count
+    by_type = {t[0]: t[1] for t in type_activity}
+    for action_type, count in summary_counts(db, "activity_logs", cutoff).items():
+        by_type[action_type] = by_type.get(action_type, 0) + count
+
     return {
         "period_days": days,
-        "by_user": [{"user": u[0], "count": u[1]} for u in user_activity],
-        "by_type": [{"type": t[0], "count": t[1]} for t in type_activity]
+        "by_user": [{"user": user, "count": count} for user, count in by_user.items()],
+        "by_type": [{"type": action_type, "count": count} for action_type, count in by_type.items()]
     }
 
 
@@ -4041,7 +4209,7 @@ async def extract_products_from_content(
 
     # Extract products using AI (v5.0.2 - hybrid routing)
     extractor = get_extractor()
-    extraction_result = extractor.extract_products_and_pricing(competitor.name, content)
+    extraction_result = await extractor.aextract_products_and_pricing(competitor.name, content)
 
     if "error" in extraction_result:
         return {
@@ -4856,7 +5024,7 @@ async def _run_enhanced_scrape_job(
 
         # 2. Extract with source tracking
         extractor = EnhancedGPTExtractor()
-        extracted = extractor.extract_with_sources(
+        extracted = await extractor.aextract_batched(
             competitor_name=competitor_name,
             competitor_website=website,
             page_contents=page_contents
@@ -5543,6 +5711,27 @@ async def get_scrape_progress():
     return scrape_progress
 
 
+@app.get("/api/scrape/browser-pool")
+async def get_browser_pool_stats():
+    """Get shared browser pool status (launches, recycles, open contexts)."""
+    from browser_pool import get_browser_pool
+    return get_browser_pool().get_stats()
+
+
+@app.get("/api/scrape/fetch-tier")
+async def get_fetch_tier_stats():
+    """Get HTTP-first fetch tier stats and the domains that need browser rendering."""
+    from http_fetcher import get_http_fetcher
+    return get_http_fetcher().get_stats()
+
+
+@app.get("/api/ai/extraction-pool")
+async def get_extraction_pool_stats():
+    """Get async extraction pool status (in-flight calls, waits, peak concurrency)."""
+    from extraction_pool import get_extraction_pool
+    return get_extraction_pool().get_stats()
+
+
 # Phase 2: Task 5.0.1-028 - Get detailed session information
 @app.get("/api/scrape/session")
 async def get_scrape_session_details():
@@ -5740,8 +5929,8 @@ async def run_scrape_job(competitor_id: int):
                 # Extract data using GPT
                 from dataclasses import asdict
                 
-                # Note: extract_from_content is synchronous and takes (name, content)
-                extracted_obj = extractor.extract_from_content(comp.name, content)
+                # Runs in the extraction pool so the event loop stays responsive
+                extracted_obj = await extractor.aextract_from_content(comp.name, content.get("content", ""))
                 # Convert dataclass to dict for iteration
                 extracted = asdict(extracted_obj)
                 
@@ -5902,7 +6091,7 @@ async def run_scrape_job_with_progress(competitor_id: int, competitor_name: str)
                 # Extract data using AI (v5.0.2 - hybrid routing)
                 from dataclasses import asdict
 
-                extracted_obj = extractor.extract_from_content(comp.name, content.get("content", ""))
+                extracted_obj = await extractor.aextract_from_content(comp.name, content.get("content", ""))
                 extracted = asdict(extracted_obj) if hasattr(extracted_obj, '__dataclass_fields__') else extracted_obj
 
                 # Get extraction confidence from AI (if available)
@@ -6169,17 +6358,30 @@ async def get_swot_analysis(competitor_id: int, db: Session = Depends(get_db)):
         Weaknesses/Gaps: {comp.notes}
         """
 
-        response = client.chat.completions.create(
+        system_prompt = "You are a competitive strategy expert. Generate a strict JSON SWOT analysis with 3-4 bullet points per section."
+
+        # v5.2.1: Cached per competitor snapshot; runs off the event loop
+        from llm_cache import get_llm_cache
+        raw = await asyncio.to_thread(
+            get_llm_cache().get_or_compute,
+            task_type="swot_analysis",
+            provider="openai",
             model="gpt-4.1",
-            messages=[
-                {"role": "system", "content": "You are a competitive strategy expert. Generate a strict JSON SWOT analysis with 3-4 bullet points per section."},
-                {"role": "user", "content": context}
-            ],
-            temperature=0.7,
-            response_format={"type": "json_object"}
+            system_prompt=system_prompt,
+            prompt=context,
+            json_mode=True,
+            compute=lambda: client.chat.completions.create(
+                model="gpt-4.1",
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": context}
+                ],
+                temperature=0.7,
+                response_format={"type": "json_object"}
+            ).choices[0].message.content,
         )
-        
-        content = json.loads(response.choices[0].message.content)
+
+        content = json.loads(raw)
         # Ensure correct key structure
         return {
             "strengths": content.get("strengths", []) or content.get("Strengths", []),
@@ -6202,40 +6404,22 @@ async def get_swot_analysis(competitor_id: int, db: Session = Depends(get_db)):
 # --- Stock Ticker Endpoint ---
 
 def fetch_real_stock_data(ticker: str) -> Dict[str, Any]:
-    """Fetch real-time stock data using yfinance."""
+    """Cached real-time stock data for one ticker (see stock_quotes.StockQuoteService)."""
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
-        
-        # Calculate change if not provided
-        current = info.get("currentPrice") or info.get("regularMarketPrice", 0)
-        previous = info.get("previousClose", 0)
-        change = current - previous if current and previous else 0
-        percent = (change / previous) * 100 if previous else 0
-        
-        return {
-            "price": current,
-            "change": change,
-            "change_percent": percent,
-            "market_cap": info.get("marketCap"),
-            "pe_ratio": info.get("trailingPE"),
-            "eps": info.get("trailingEps"),
-            "beta": info.get("beta"),
-            "volume": info.get("volume"),
-            "high52": info.get("fiftyTwoWeekHigh"),
-            "low52": info.get("fiftyTwoWeekLow"),
-            "target_est": info.get("targetMeanPrice"),
-            "company": info.get("longName"),
-            "ticker": ticker
-        }
+        return get_quote_service().get_quote(ticker)
     except Exception as e:
         print(f"Error fetching stock data for {ticker}: {e}")
         return None
 
+@app.get("/api/stock-quotes/status")
+def get_stock_quote_status():
+    """Get stock quote cache statistics (provider, market hours TTL, stale serves)."""
+    return get_quote_service().get_stats()
+
+
 @app.get("/api/stock/{company_name}")
 async def get_stock_data(company_name: str, db: Session = Depends(get_db)):
-    """Get stock data for a public company using yfinance."""
-    import yfinance as yf
+    """Get stock data for a public company (cached company info plus live quote)."""
     from datetime import datetime
     
     company_lower = company_name.lower()
@@ -6258,9 +6442,10 @@ async def get_stock_data(company_name: str, db: Session = Depends(get_db)):
     
     if ticker_obj:
         try:
-            # Fetch data from yfinance
-            ticker = yf.Ticker(ticker_obj["symbol"])
-            info = ticker.info
+            # Cached company info with the latest batched quote applied
+            info = await asyncio.to_thread(get_quote_service().get_info, ticker_obj["symbol"])
+            if not info:
+                raise ValueError("No market data returned")
             
             # Helper for safe float formatting
             def get_val(key, default=None):
@@ -6921,6 +7106,61 @@ def get_news_by_name(company_name: str, days: int = 7):
         return {"error": str(e), "articles": []}
 
 
+@app.get("/api/news-sources/latency")
+def get_news_source_latency():
+    """Per-source news fetch latency and timeout/error counts since startup (slowest first)."""
+    from news_monitor import get_source_latency_stats
+    return get_source_latency_stats()
+
+
+@app.get("/api/news-sources/fetch-state")
+def get_news_fetch_state():
+    """Incremental polling state per source and company, with conditional/304 counters."""
+    from news_fetch_state import get_fetch_state_store
+    return get_fetch_state_store().get_stats()
+
+
+@app.post("/api/news-sources/fetch-state/reset")
+def reset_news_fetch_state(company_name: Optional[str] = None):
+    """Forget polling state (one company or all) so the next refresh fetches the full window."""
+    from news_fetch_state import get_fetch_state_store
+    removed = get_fetch_state_store().reset([company_name] if company_name else None)
+    return {"status": "reset", "removed": removed}
+
+
+@app.get("/api/ml-sentiment/status")
+def get_ml_sentiment_status():
+    """Sentiment inference backend and score cache hit rate."""
+    from ml_sentiment import get_sentiment_status
+    return get_sentiment_status()
+
+
+# ============== Full-Text Search (v5.2.1) ==============
+
+@app.get("/api/search")
+def full_text_search(
+    q: str,
+    types: Optional[str] = None,
+    competitor_id: Optional[int] = None,
+    limit: int = 20,
+    db: Session = Depends(get_db)
+):
+    """
+    Ranked, highlighted search across cached news, the knowledge base and change history.
+
+    Args:
+        q: Search terms (all must match; prefix matching)
+        types: Comma-separated sources to search: news, knowledge_base, changes (default: all)
+        competitor_id: Limit news and change results to one competitor
+        limit: Max results (1-100), merged across sources by relevance
+
+    Titles and snippets are HTML-escaped with matches wrapped in <mark>.
+    """
+    from search_index import search
+    selected = [t.strip() for t in types.split(",") if t.strip()] if types else None
+    return search(db, q, types=selected, competitor_id=competitor_id, limit=limit)
+
+
 # ============== News Feed Endpoint (v5.0.3 - Phase 1) ==============
 
 @app.get("/api/news-feed")
@@ -6933,98 +7173,68 @@ def get_news_feed(
     event_type: Optional[str] = None,
     page: int = 1,
     page_size: int = 25,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
     Aggregated news feed with filtering across all competitors.
 
     v5.0.3: Core News Feed implementation.
+    v5.2.1: Filtering, sorting, counting and pagination run in SQL.
 
     Args:
         competitor_id: Filter by specific competitor ID
         start_date: Start date filter (YYYY-MM-DD)
-        end_date: End date filter (YYYY-MM-DD)
+        end_date: End date filter (YYYY-MM-DD, inclusive)
         sentiment: Filter by sentiment (positive, neutral, negative)
         source: Filter by news source (google_news, sec_edgar, newsapi, gnews, mediastack)
         event_type: Filter by event type (funding, acquisition, product_launch, partnership, leadership, financial, legal, general)
         page: Page number for pagination
-        page_size: Number of articles per page
+        page_size: Number of articles per page (max 100)
+        cursor: Keyset cursor from pagination.next_cursor; takes precedence over page
 
     Returns:
         Aggregated news articles with stats and pagination
     """
+    filters_applied = {
+        "competitor_id": competitor_id,
+        "start_date": start_date,
+        "end_date": end_date,
+        "sentiment": sentiment,
+        "source": source,
+        "event_type": event_type
+    }
     try:
-        from news_monitor import NewsMonitor
-        from datetime import datetime, timedelta
-        from database import NewsArticleCache
+        from news_feed import query_news_feed, has_cached_news, filter_live_articles, parse_date_range
 
-        monitor = NewsMonitor()
-        all_articles = []
-        cache_used = False
+        if has_cached_news(db, competitor_id):
+            result = query_news_feed(
+                db, competitor_id=competitor_id, start_date=start_date, end_date=end_date,
+                sentiment=sentiment, source=source, event_type=event_type,
+                page=page, page_size=page_size, cursor=cursor
+            )
+            result["filters_applied"] = filters_applied
+            return result
+
+        # No cache yet: fetch live (limited to prevent timeout)
+        from news_monitor import NewsMonitor
 
-        # Get competitors to fetch news for
         competitors_query = db.query(Competitor).filter(Competitor.is_deleted == False)
         if competitor_id:
             competitors_query = competitors_query.filter(Competitor.id == competitor_id)
         competitors_list = competitors_query.all()
 
-        # v5.0.8: Check cache first
-        cache_query = db.query(NewsArticleCache).filter(
-            NewsArticleCache.cache_expires_at > datetime.utcnow()
-        )
-        if competitor_id:
-            cache_query = cache_query.filter(NewsArticleCache.competitor_id == competitor_id)
-
-        cached_articles = cache_query.order_by(NewsArticleCache.published_at.desc()).limit(500).all()
-
-        if cached_articles:
-            cache_used = True
-            for cached in cached_articles:
-                all_articles.append({
-                    "competitor_id": cached.competitor_id,
-                    "competitor_name": cached.competitor_name,
-                    "title": cached.title,
-                    "url": cached.url,
-                    "source": cached.source,
-                    "source_type": cached.source_type or "google_news",
-                    "published_at": cached.published_at.isoformat() if cached.published_at else "",
-                    "snippet": cached.snippet or "",
-                    "sentiment": cached.sentiment or "neutral",
-                    "event_type": cached.event_type or "general",
-                    "is_major_event": cached.is_major_event or False,
-                    "cached": True
-                })
-
-        # If no cache, fetch live (limited to prevent timeout)
-        if not cache_used and len(competitors_list) <= 10:
-            # Determine date range (default to last 30 days)
-            if start_date:
-                try:
-                    start_dt = datetime.strptime(start_date, '%Y-%m-%d')
-                except ValueError:
-                    start_dt = datetime.utcnow() - timedelta(days=30)
-            else:
-                start_dt = datetime.utcnow() - timedelta(days=30)
-
-            if end_date:
-                try:
-                    end_dt = datetime.strptime(end_date, '%Y-%m-%d')
-                except ValueError:
-                    end_dt = datetime.utcnow()
-            else:
-                end_dt = datetime.utcnow()
-
-            # Calculate days to look back
+        all_articles = []
+        if len(competitors_list) <= 10:
+            monitor = NewsMonitor()
+            start_dt, _ = parse_date_range(start_date, end_date)
             days_lookback = (datetime.utcnow() - start_dt).days + 1
 
-            # Fetch news for each competitor
             for comp in competitors_list:
                 try:
                     digest = monitor.fetch_news(comp.name, days=days_lookback)
-
-                    # Add competitor info to each article
                     for article in digest.articles:
-                        article_dict = {
+                        all_articles.append({
                             "competitor_id": comp.id,
                             "competitor_name": comp.name,
                             "title": article.title,
@@ -7036,70 +7246,13 @@ def get_news_feed(
                             "sentiment": article.sentiment,
                             "event_type": article.event_type or "general",
                             "is_major_event": article.is_major_event
-                        }
-                        all_articles.append(article_dict)
+                        })
                 except Exception as e:
                     print(f"Error fetching news for {comp.name}: {e}")
                     continue
 
-        # Parse date range for filtering
-        if start_date:
-            try:
-                start_dt = datetime.strptime(start_date, '%Y-%m-%d')
-            except ValueError:
-                start_dt = datetime.utcnow() - timedelta(days=30)
-        else:
-            start_dt = datetime.utcnow() - timedelta(days=30)
-
-        if end_date:
-            try:
-                end_dt = datetime.strptime(end_date, '%Y-%m-%d')
-            except ValueError:
-                end_dt = datetime.utcnow()
-        else:
-            end_dt = datetime.utcnow()
-
-        # Filter by date range
-        filtered_articles = []
-        for article in all_articles:
-            try:
-                pub_date_str = article.get("published_at", "")
-                if pub_date_str:
-                    # Handle various date formats
-                    for fmt in ["%Y-%m-%dT%H:%M:%S", "%Y-%m-%d", "%a, %d %b %Y %H:%M:%S %Z", "%a, %d %b %Y %H:%M:%S GMT"]:
-                        try:
-                            pub_date = datetime.strptime(pub_date_str[:19], fmt[:len(pub_date_str)])
-                            break
-                        except:
-                            continue
-                    else:
-                        pub_date = datetime.utcnow()
-
-                    if start_dt <= pub_date <= end_dt:
-                        filtered_articles.append(article)
-                else:
-                    filtered_articles.append(article)  # Include if no date
-            except:
-                filtered_articles.append(article)  # Include on date parse error
-
-        all_articles = filtered_articles
-
-        # Apply sentiment filter
-        if sentiment:
-            all_articles = [a for a in all_articles if a.get("sentiment", "").lower() == sentiment.lower()]
-
-        # Apply source filter
-        if source:
-            all_articles = [a for a in all_articles if a.get("source_type", "").lower() == source.lower() or source.lower() in a.get("source", "").lower()]
-
-        # Apply event type filter
-        if event_type:
-            all_articles = [a for a in all_articles if a.get("event_type", "").lower() == event_type.lower()]
-
-        # Sort by date (most recent first)
-        all_articles.sort(key=lambda x: x.get("published_at", ""), reverse=True)
+        all_articles = filter_live_articles(all_articles, start_date, end_date, sentiment, source, event_type)
 
-        # Calculate stats
         stats = {
             "total": len(all_articles),
             "positive": len([a for a in all_articles if a.get("sentiment") == "positive"]),
@@ -7107,30 +7260,23 @@ def get_news_feed(
             "negative": len([a for a in all_articles if a.get("sentiment") == "negative"])
         }
 
-        # Paginate
+        page = max(1, page)
+        page_size = max(1, min(page_size, 100))
         total_items = len(all_articles)
-        total_pages = max(1, (total_items + page_size - 1) // page_size)
         start_idx = (page - 1) * page_size
-        end_idx = start_idx + page_size
-        paginated_articles = all_articles[start_idx:end_idx]
 
         return {
-            "articles": paginated_articles,
+            "articles": all_articles[start_idx:start_idx + page_size],
             "stats": stats,
             "pagination": {
                 "page": page,
                 "page_size": page_size,
                 "total_items": total_items,
-                "total_pages": total_pages
+                "total_pages": max(1, (total_items + page_size - 1) // page_size),
+                "next_cursor": None,
+                "has_more": start_idx + page_size < total_items
             },
-            "filters_applied": {
-                "competitor_id": competitor_id,
-                "start_date": start_date,
-                "end_date": end_date,
-                "sentiment": sentiment,
-                "source": source,
-                "event_type": event_type
-            }
+            "filters_applied": filters_applied
         }
 
     except Exception as e:
@@ -7143,6 +7289,13 @@ def get_news_feed(
         }
 
 
+@app.get("/api/news-feed/ingest-stats")
+def get_news_ingest_stats():
+    """Recent news cache ingestion runs with rows/sec throughput."""
+    from news_ingest import get_ingest_stats
+    return get_ingest_stats()
+
+
 @app.post("/api/news-feed/refresh-cache")
 def refresh_news_cache(
     background_tasks: BackgroundTasks,
@@ -7153,17 +7306,19 @@ def refresh_news_cache(
     Manually refresh the news cache for competitors.
 
     v5.0.8: Fetches fresh news and stores in NewsArticleCache table.
+    v5.2.1: Incremental - sources are polled from their stored fetch state and only
+            new articles are ingested; cached ones in the window get a fresh expiry.
+            The fetch state advances only after the ingest has committed.
 
     Args:
         competitor_id: Optional - refresh only this competitor
     """
-    from database import NewsArticleCache
     from news_monitor import NewsMonitor
-    from datetime import datetime, timedelta
+    from news_ingest import ingest_articles, article_row, extend_cache_expiry
 
     def do_refresh():
         monitor = NewsMonitor()
-        refreshed = 0
+        rows, digests = [], []
 
         # Get competitors
         query = db.query(Competitor).filter(Competitor.is_deleted == False)
@@ -7174,54 +7329,24 @@ def refresh_news_cache(
 
         for comp in competitors:
             try:
-                digest = monitor.fetch_news(comp.name, days=7)
-
-                for article in digest.articles:
-                    # Check if article already exists
-                    existing = db.query(NewsArticleCache).filter(
-                        NewsArticleCache.url == article.url
-                    ).first()
-
-                    if existing:
-                        # Update expiry
-                        existing.cache_expires_at = datetime.utcnow() + timedelta(hours=4)
-                    else:
-                        # Parse published date
-                        pub_date = None
-                        if article.published_date:
-                            for fmt in ["%Y-%m-%dT%H:%M:%S", "%Y-%m-%d", "%a, %d %b %Y %H:%M:%S %Z"]:
-                                try:
-                                    pub_date = datetime.strptime(article.published_date[:19], fmt[:19])
-                                    break
-                                except:
-                                    continue
-
-                        # Create new cache entry
-                        cache_entry = NewsArticleCache(
-                            competitor_id=comp.id,
-                            competitor_name=comp.name,
-                            title=article.title,
-                            url=article.url,
-                            source=article.source,
-                            source_type="google_news",
-                            published_at=pub_date or datetime.utcnow(),
-                            snippet=article.snippet,
-                            sentiment=article.sentiment,
-                            event_type=article.event_type,
-                            is_major_event=article.is_major_event,
-                            fetched_at=datetime.utcnow(),
-                            cache_expires_at=datetime.utcnow() + timedelta(hours=4)
-                        )
-                        db.add(cache_entry)
-                        refreshed += 1
-
-                db.commit()
-
+                digest = monitor.fetch_news(comp.name, days=7, incremental=True)
+                rows.extend(article_row(comp, article, "google_news") for article in digest.articles)
+                digests.append(digest)
             except Exception as e:
                 print(f"Error refreshing news for {comp.name}: {e}")
                 continue
 
-        print(f"[News Cache] Refreshed {refreshed} articles for {len(competitors)} competitors")
+        # Deduplicate and write everything in a few INSERT ... ON CONFLICT batches
+        try:
+            result = ingest_articles(db, rows, ttl_hours=4)
+            extend_cache_expiry(db, [c.id for c in competitors], days=7, ttl_hours=4)
+            print(f"[News Cache] Refreshed {result.inserted} articles for {len(competitors)} competitors")
+        except Exception as e:
+            # Fetch state was not advanced, so the next refresh asks for the same items again
+            print(f"[News Cache] Ingestion failed: {e}")
+            return
+        for digest in digests:
+            monitor.commit_fetch_state(digest)
 
     # Run in background
     background_tasks.add_task(do_refresh)
@@ -7238,71 +7363,13 @@ def get_news_coverage(db: Session = Depends(get_db)):
     Get news coverage status for all competitors.
 
     v5.1.0: Shows which competitors have news coverage and identifies gaps.
+    v5.2.1: One GROUP BY aggregation for all competitors (was 3 queries each);
+            adds a per-competitor sentiment breakdown.
     """
-    from database import NewsArticleCache
-    from sqlalchemy import func
+    from news_feed import query_news_coverage
 
     try:
-        competitors = db.query(Competitor).filter(
-            Competitor.is_deleted == False
-        ).all()
-
-        now = datetime.utcnow()
-        week_ago = now - timedelta(days=7)
-        month_ago = now - timedelta(days=30)
-
-        coverage = []
-        total_with_news = 0
-        total_recent_news = 0
-
-        for comp in competitors:
-            # Count articles
-            total = db.query(NewsArticleCache).filter(
-                NewsArticleCache.competitor_id == comp.id
-            ).count()
-
-            recent = db.query(NewsArticleCache).filter(
-                NewsArticleCache.competitor_id == comp.id,
-                NewsArticleCache.published_at >= week_ago
-            ).count()
-
-            if total > 0:
-                total_with_news += 1
-            if recent > 0:
-                total_recent_news += 1
-
-            # Get last fetch time
-            latest = db.query(NewsArticleCache).filter(
-                NewsArticleCache.competitor_id == comp.id
-            ).order_by(
-                NewsArticleCache.fetched_at.desc()
-            ).first()
-
-            coverage.append({
-                "competitor_id": comp.id,
-                "competitor_name": comp.name,
-                "total_articles": total,
-                "recent_articles": recent,
-                "has_news": total > 0,
-                "has_recent_news": recent > 0,
-                "last_fetched": latest.fetched_at.isoformat() if latest else None
-            })
-
-        coverage_pct = (total_with_news / len(competitors) * 100) if competitors else 0
-        recent_pct = (total_recent_news / len(competitors) * 100) if competitors else 0
-
-        return {
-            "total_competitors": len(competitors),
-            "competitors_with_news": total_with_news,
-            "competitors_with_recent_news": total_recent_news,
-            "coverage_percentage": round(coverage_pct, 1),
-            "recent_coverage_percentage": round(recent_pct, 1),
-            "coverage_details": coverage,
-            "competitors_missing_news": [
-                c for c in coverage if not c["has_news"]
-            ]
-        }
-
+        return query_news_coverage(db)
     except Exception as e:
         return {"error": str(e)}
 
@@ -7327,42 +7394,24 @@ def refresh_all_news_coverage(
             # Fallback to basic refresh
             print("[News Coverage] ComprehensiveNewsScraper not available, using basic refresh")
             from news_monitor import NewsMonitor
-            from database import NewsArticleCache
+            from news_ingest import ingest_articles, article_row, extend_cache_expiry
 
             monitor = NewsMonitor()
             competitors = db.query(Competitor).filter(Competitor.is_deleted == False).all()
 
+            rows, digests = [], []
             for comp in competitors:
                 try:
-                    digest = monitor.fetch_news(comp.name, days=30)
-                    for article in digest.articles:
-                        existing = db.query(NewsArticleCache).filter(
-                            NewsArticleCache.url == article.url
-                        ).first()
-
-                        if not existing:
-                            cache_entry = NewsArticleCache(
-                                competitor_id=comp.id,
-                                competitor_name=comp.name,
-                                title=article.title[:500],
-                                url=article.url,
-                                source=article.source,
-                                source_type="news_monitor",
-                                published_at=datetime.utcnow(),
-                                snippet=article.snippet[:1000] if article.snippet else None,
-                                sentiment=article.sentiment,
-                                event_type=article.event_type,
-                                is_major_event=article.is_major_event,
-                                fetched_at=datetime.utcnow(),
-                                cache_expires_at=datetime.utcnow() + timedelta(hours=24),
-                                created_at=datetime.utcnow()
-                            )
-                            db.add(cache_entry)
-
-                    db.commit()
+                    digest = monitor.fetch_news(comp.name, days=30, incremental=True)
+                    rows.extend(article_row(comp, article, "news_monitor") for article in digest.articles)
+                    digests.append(digest)
                 except Exception as e:
                     print(f"Error refreshing news for {comp.name}: {e}")
                     continue
+            ingest_articles(db, rows, ttl_hours=24)
+            extend_cache_expiry(db, [c.id for c in competitors], days=30, ttl_hours=24)
+            for digest in digests:
+                monitor.commit_fetch_state(digest)
 
     background_tasks.add_task(do_comprehensive_refresh)
 
@@ -8181,10 +8230,13 @@ def get_market_trends(db: Session = Depends(get_db)):
     from sqlalchemy import func
     import re
 
-    # 1. New Competitors (Monthly)
-    # SQLite syntax for YYYY-MM
+    # 1. New Competitors (Monthly), YYYY-MM buckets
+    if db.bind.dialect.name == "postgresql":
+        month = func.to_char(Competitor.created_at, 'YYYY-MM')
+    else:
+        month = func.strftime('%Y-%m', Competitor.created_at)
     trends = db.query(
-        func.strftime('%Y-%m', Competitor.created_at).label('month'),
+        month.label('month'),
         func.count(Competitor.id).label('count')
     ).filter(Competitor.is_deleted == False).group_by('month').order_by('month').all()
 
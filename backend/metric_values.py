@@ -0,0 +1,168 @@
+"""
+Certify Intel - Typed Competitor Metrics (v5.2.1)
+Parses free-text competitor metrics into numeric shadow columns.
+
+Competitor.customer_count, employee_count, base_price, funding_total,
+annual_revenue and employee_growth_rate are stored as scraped text ("3,000+",
+"$1.2M", "500-1,000 employees", "$99/provider/month"). Each gets four typed
+shadow columns on the competitors table:
+
+    <field>_value   Best single number (midpoint of a range, bound of "3,000+")
+    <field>_unit    "USD", "USD/month", "%", or the counted noun ("providers")
+    <field>_low     Lower bound, if known
+    <field>_high    Upper bound, if known
+
+database.py keeps them in sync whenever the text attribute is set and
+backfills existing rows at startup, so dashboards sort, filter and aggregate
+on the *_value columns in SQL instead of re-parsing strings on every read.
+Rows record the METRICS_PARSE_VERSION they were parsed with; bump it when the
+parser changes and the next startup re-parses every competitor once.
+"""
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional
+
+METRICS_PARSE_VERSION = "2"
+
+# Text field -> kind of value it holds
+METRIC_FIELDS: Dict[str, str] = {
+    "customer_count": "count",
+    "employee_count": "count",
+    "base_price": "price",
+    "funding_total": "money",
+    "annual_revenue": "money",
+    "employee_growth_rate": "percent",
+}
+
+_MULTIPLIERS = {
+    "k": 1e3, "thousand": 1e3,
+    "m": 1e6, "mm": 1e6, "mil": 1e6, "million": 1e6,
+    "b": 1e9, "bn": 1e9, "billion": 1e9,
+}
+_NUMBER = re.compile(
+    r"((?<![\d.])-)?(\d+(?:\.\d+)?)\s*(thousand|million|billion|mil|mm|bn|k|m|b)?(?![a-z])", re.IGNORECASE
+)
+_THOUSANDS_COMMA = re.compile(r"(?<=\d),(?=\d{3}(?!\d))")
+_RANGE_SEPARATOR = re.compile(r"^\s*(?:-|–|—|to)\s*$")
+_AT_LEAST = re.compile(r"(\+|\bover\b|\bmore than\b|\bat least\b|>|\bnearly\b)")
+_AT_MOST = re.compile(r"(\bunder\b|\bless than\b|\bup to\b|<|\bfewer than\b)")
+_PER_UNIT = re.compile(r"(?:/|\bper\s+)\s*([a-z]+)")
+_NOUN = re.compile(r"^\s*\+?\s*([a-z][a-z ]{1,28}?)(?:\s*(?:[,;(]|$|\b(?:and|in|across|with|of)\b))")
+_NON_NUMERIC_PRICE = ("contact", "custom", "quote", "n/a", "unknown", "varies")
+_YEAR_CONTEXT = re.compile(r"\b(?:founded|since|in|est|established|as of|fy)\.?\s*$")
+_YEAR_GAP = re.compile(r"^\s*[,;:|()]?\s*\(?\s*$")  # "2012, 200 employees"
+
+
+@dataclass
+class ParsedMetric:
+    value: float
+    unit: Optional[str]
+    low: Optional[float]
+    high: Optional[float]
+
+
+def _numbers(text: str):
+    """[amount, multiplier, start, end] for each number in the text."""
+    found = []
+    for match in _NUMBER.finditer(text):
+        amount = float(match.group(2)) * (-1 if match.group(1) else 1)
+        suffix = (match.group(3) or "").lower()
+        found.append([amount, _MULTIPLIERS.get(suffix, 1.0), match.start(), match.end()])
+    return found
+
+
+def _is_year(text: str, numbers: List[list], index: int) -> bool:
+    """A bare 4-digit year next to founded/since/in, or followed directly by the actual number."""
+    amount, multiplier, start, end = numbers[index]
+    token = text[start:end].strip()
+    if multiplier != 1.0 or len(token) != 4 or not token.isdigit() or not 1900 <= amount <= 2099:
+        return False
+    if text[:start].rstrip().endswith("$"):
+        return False
+    if _YEAR_CONTEXT.search(text[:start]):
+        return True
+    return index + 1 < len(numbers) and bool(_YEAR_GAP.match(text[end:numbers[index + 1][2]]))
+
+
+def _unit(text: str, kind: str, end: int) -> Optional[str]:
+    if kind == "percent":
+        return "%"
+    if kind == "money":
+        return "USD"
+    if kind == "price":
+        periods = _PER_UNIT.findall(text[end:])
+        return "/".join(["USD"] + periods)
+    noun = _NOUN.match(text[end:])
+    return noun.group(1).strip() if noun else None
+
+
+def parse_metric(text: Any, kind: str = "count") -> Optional[ParsedMetric]:
+    """
+    Parse a scraped metric string; None when it holds no usable number.
+
+        parse_metric("3,000+ providers")      -> 3000 providers, low 3000
+        parse_metric("$1.2M", "money")        -> 1200000 USD
+        parse_metric("500-1,000")             -> 750, low 500, high 1000
+        parse_metric("$99/month", "price")    -> 99 USD/month
+        parse_metric("Founded 2012, 200 employees") -> 200 employees (years are skipped)
+    """
+    if text is None:
+        return None
+    if isinstance(text, (int, float)) and not isinstance(text, bool):
+        return ParsedMetric(float(text), _unit("", kind, 0), float(text), float(text))
+    text = _THOUSANDS_COMMA.sub("", str(text).strip().lower())
+    if not text or (kind == "price" and any(word in text for word in _NON_NUMERIC_PRICE)):
+        return None
+    numbers = _numbers(text)
+    numbers = [n for i, n in enumerate(numbers) if not _is_year(text, numbers, i)]
+    if not numbers:
+        return None
+
+    first = numbers[0]
+    low = high = None
+    if len(numbers) > 1 and _RANGE_SEPARATOR.match(text[first[3]:numbers[1][2]]):
+        second = numbers[1]
+        if first[1] == 1.0 and second[1] != 1.0:
+            first[1] = second[1]  # "$1-2M": the multiplier applies to both ends
+        low, high, end = first[0] * first[1], second[0] * second[1], second[3]
+        value = (low + high) / 2
+    else:
+        value, end = first[0] * first[1], first[3]
+        prefix = text[:first[2]]
+        after = text[end:end + 2]
+        if "+" in after or _AT_LEAST.search(prefix):
+            low = value
+        elif _AT_MOST.search(prefix):
+            high = value
+        else:
+            low = high = value
+    return ParsedMetric(value, _unit(text, kind, end), low, high)
+
+
+def shadow_values(field: str, text: Any) -> Dict[str, Any]:
+    """Shadow column values for one text field (all None when unparseable)."""
+    parsed = parse_metric(text, METRIC_FIELDS[field])
+    return {
+        f"{field}_value": parsed.value if parsed else None,
+        f"{field}_unit": parsed.unit if parsed else None,
+        f"{field}_low": parsed.low if parsed else None,
+        f"{field}_high": parsed.high if parsed else None,
+    }
+
+
+def sync_metric_columns(competitor, fields=None) -> None:
+    """Recompute the shadow columns of a Competitor from its text fields."""
+    for field in fields or METRIC_FIELDS:
+        for column, value in shadow_values(field, getattr(competitor, field, None)).items():
+            setattr(competitor, column, value)
+
+
+def metric_value(data: Mapping[str, Any], field: str) -> Optional[float]:
+    """
+    Numeric value of a metric from a competitor dict: the stored shadow column
+    when the dict carries it, otherwise parsed from the text field.
+    """
+    if f"{field}_value" in data:
+        return data[f"{field}_value"]
+    parsed = parse_metric(data.get(field), METRIC_FIELDS.get(field, "count"))
+    return parsed.value if parsed else None
@@ -1,5 +1,5 @@
 """
-Certify Intel - ML-Powered Sentiment Analysis (v5.0.5)
+Certify Intel - ML-Powered Sentiment Analysis (v5.2.1)
 Uses Hugging Face transformers for accurate sentiment classification.
 
 Replaces keyword-based sentiment with ML models for better accuracy.
@@ -9,11 +9,26 @@ Models:
 - ProsusAI/finbert: Specialized for financial news sentiment
 
 v5.0.5: Added for Live News Feed Phase 4 - AI-Powered Enhancements
+v5.2.1: CPU inference backends (dynamic int8 quantization, ONNX Runtime),
+        length-bucketed batching and a persistent text-hash -> score cache.
+        Benchmark: python benchmark_sentiment.py
+
+Configuration (environment):
+    ML_SENTIMENT_BACKEND        int8, onnx or pytorch (default int8 on CPU, pytorch on GPU)
+    ML_SENTIMENT_BATCH_SIZE     Texts per forward pass (default 32)
+    ML_SENTIMENT_MAX_TOKENS     Truncation length; headline + snippet fits in 128 (default 128)
+    ML_SENTIMENT_THREADS        torch intra-op threads, 0 = library default (default 0)
+    ML_SENTIMENT_CACHE_ENABLED  "false" to disable the score cache (default true)
+    ML_SENTIMENT_CACHE_MAX_ENTRIES  Persisted scores kept, oldest evicted first (default 50000)
 """
 
 import os
+import time
+import hashlib
 import logging
-from typing import Dict, List, Optional, Tuple, Any
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -28,6 +43,21 @@ except ImportError:
     TRANSFORMERS_AVAILABLE = False
     logger.warning("Transformers not installed. Run: pip install transformers torch")
 
+# Optional ONNX Runtime backend (v5.2.1)
+try:
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+BACKENDS = ("int8", "onnx", "pytorch")
+
+# Bump to invalidate every cached score (e.g. after changing label mapping)
+SENTIMENT_CACHE_VERSION = "1"
+
+# Run eviction after this many stored scores
+EVICTION_INTERVAL = 500
+
 
 @dataclass
 class SentimentResult:
@@ -38,6 +68,177 @@ class SentimentResult:
     latency_ms: float
 
 
+# ============== Score Cache (v5.2.1) ==============
+
+def make_text_key(model_name: str, text: str, backend: str = "pytorch", max_tokens: int = 128) -> str:
+    """
+    sha256 over cache version, model, backend, truncation length and
+    whitespace-normalized text. int8 and ONNX scores differ slightly from
+    full precision, and max_tokens changes what the model sees, so each
+    combination keeps its own scores.
+    """
+    normalized = " ".join(text.split())
+    parts = [SENTIMENT_CACHE_VERSION, model_name, backend, str(max_tokens), normalized]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class SentimentResultCache:
+    """
+    Text-hash -> (label, score) cache: in-memory LRU in front of the
+    sentiment_score_cache table. Lookups and stores are one query per batch.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable] = None,
+        memory_entries: int = 10000,
+        max_entries: Optional[int] = None
+    ):
+        self._session_factory = session_factory
+        self.enabled = os.getenv("ML_SENTIMENT_CACHE_ENABLED", "true").lower() != "false"
+        self.memory_entries = memory_entries
+        self.max_entries = max_entries or int(os.getenv("ML_SENTIMENT_CACHE_MAX_ENTRIES", "50000"))
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stores_since_eviction = 0
+        self.stats = {"memory_hits": 0, "db_hits": 0, "misses": 0, "stores": 0, "evicted": 0, "errors": 0}
+
+    def _session(self):
+        if self._session_factory is None:
+            from database import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    def _remember(self, key: str, value: Tuple[str, float]):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys: List[str]) -> Dict[str, Tuple[str, float]]:
+        if not self.enabled or not keys:
+            return {}
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+            self.stats["memory_hits"] += len(found)
+        missing = list({k for k in keys if k not in found})
+        if missing:
+            from database import SentimentScoreCache
+            db = self._session()
+            try:
+                rows = db.query(
+                    SentimentScoreCache.text_hash, SentimentScoreCache.label, SentimentScoreCache.score
+                ).filter(SentimentScoreCache.text_hash.in_(missing)).all()
+            except Exception as e:
+                rows = []
+                self.stats["errors"] += 1
+                logger.warning(f"Sentiment cache lookup failed: {e}")
+            finally:
+                db.close()
+            with self._lock:
+                for key, label, score in rows:
+                    found[key] = (label, score)
+                    self._remember(key, (label, score))
+                self.stats["db_hits"] += len(rows)
+                self.stats["misses"] += len(missing) - len(rows)
+        return found
+
+    def put_many(self, model_name: str, entries: Dict[str, Tuple[str, float]]):
+        if not self.enabled or not entries:
+            return
+        from database import SentimentScoreCache
+        with self._lock:
+            for key, value in entries.items():
+                self._remember(key, value)
+
+        db = self._session()
+        try:
+            known = {k for (k,) in db.query(SentimentScoreCache.text_hash).filter(
+                SentimentScoreCache.text_hash.in_(list(entries))
+            )}
+            now = datetime.utcnow()
+            db.bulk_insert_mappings(SentimentScoreCache, [
+                {"text_hash": k, "model": model_name, "label": label, "score": score, "created_at": now}
+                for k, (label, score) in entries.items() if k not in known
+            ])
+            db.commit()
+            stored = len(entries) - len(known)
+        except Exception as e:
+            db.rollback()
+            self.stats["errors"] += 1
+            logger.warning(f"Sentiment cache store failed: {e}")
+            return
+        finally:
+            db.close()
+
+        with self._lock:
+            self.stats["stores"] += stored
+            self._stores_since_eviction += stored
+            due = self._stores_since_eviction >= EVICTION_INTERVAL
+            if due:
+                self._stores_since_eviction = 0
+        if due:
+            self.evict()
+
+    def evict(self) -> int:
+        """Delete the oldest persisted scores above max_entries."""
+        from database import SentimentScoreCache
+        db = self._session()
+        try:
+            overflow = db.query(SentimentScoreCache).count() - self.max_entries
+            if overflow <= 0:
+                return 0
+            oldest = [row_id for (row_id,) in db.query(SentimentScoreCache.id)
+                      .order_by(SentimentScoreCache.created_at.asc()).limit(overflow)]
+            evicted = db.query(SentimentScoreCache).filter(
+                SentimentScoreCache.id.in_(oldest)
+            ).delete(synchronize_session=False)
+            db.commit()
+            self.stats["evicted"] += evicted
+            return evicted
+        except Exception as e:
+            db.rollback()
+            self.stats["errors"] += 1
+            logger.warning(f"Sentiment cache eviction failed: {e}")
+            return 0
+        finally:
+            db.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["memory_entries"] = len(self._memory)
+        served = stats["memory_hits"] + stats["db_hits"]
+        total = served + stats["misses"]
+        stats["hit_rate"] = round(served / total, 3) if total else 0.0
+        stats["enabled"] = self.enabled
+        return stats
+
+
+_result_cache_instance = None
+
+
+def get_sentiment_cache() -> SentimentResultCache:
+    """Get the shared sentiment score cache."""
+    global _result_cache_instance
+    if _result_cache_instance is None:
+        _result_cache_instance = SentimentResultCache()
+    return _result_cache_instance
+
+
+def default_backend(use_gpu: bool = False) -> str:
+    """ML_SENTIMENT_BACKEND, else int8 on CPU and pytorch when a GPU will be used."""
+    backend = os.getenv("ML_SENTIMENT_BACKEND", "").strip().lower()
+    if backend in BACKENDS:
+        return backend
+    gpu = use_gpu and TRANSFORMERS_AVAILABLE and torch.cuda.is_available()
+    return "pytorch" if gpu else "int8"
+
+
 class MLSentimentAnalyzer:
     """
     ML-powered sentiment analyzer using Hugging Face models.
@@ -46,6 +247,11 @@ class MLSentimentAnalyzer:
     - general: Fast general-purpose sentiment
     - financial: Specialized for financial/business news
     - multilingual: For non-English text
+
+    v5.2.1 backends:
+    - int8: PyTorch dynamic quantization of Linear layers (CPU default)
+    - onnx: ONNX Runtime via optimum (requires optimum[onnxruntime])
+    - pytorch: full-precision pipeline (GPU default, original behaviour)
     """
 
     # Available models
@@ -75,39 +281,76 @@ class MLSentimentAnalyzer:
         },
     }
 
-    def __init__(self, model_type: str = "general", use_gpu: bool = False):
+    def __init__(
+        self,
+        model_type: str = "general",
+        use_gpu: bool = False,
+        backend: Optional[str] = None,
+        cache: Optional[SentimentResultCache] = None
+    ):
         """
         Initialize ML sentiment analyzer.
 
         Args:
             model_type: Type of model to use (general, financial, multilingual)
             use_gpu: Whether to use GPU if available
+            backend: int8, onnx or pytorch (default from ML_SENTIMENT_BACKEND)
+            cache: Score cache (default: shared cache; pass one with enabled=False to skip)
         """
         self.model_type = model_type
         self.model_name = self.MODELS.get(model_type, self.MODELS["general"])
-        self.device = 0 if use_gpu and torch.cuda.is_available() else -1 if TRANSFORMERS_AVAILABLE else None
+        self.backend = backend if backend in BACKENDS else default_backend(use_gpu)
+        use_device = use_gpu and self.backend == "pytorch" and TRANSFORMERS_AVAILABLE
+        self.device = 0 if use_device and torch.cuda.is_available() else -1 if TRANSFORMERS_AVAILABLE else None
+        self.batch_size = max(1, int(os.getenv("ML_SENTIMENT_BATCH_SIZE", "32")))
+        self.max_tokens = int(os.getenv("ML_SENTIMENT_MAX_TOKENS", "128"))
+        self.cache = cache if cache is not None else get_sentiment_cache()
         self.pipeline = None
         self._initialized = False
 
         if TRANSFORMERS_AVAILABLE:
+            threads = int(os.getenv("ML_SENTIMENT_THREADS", "0"))
+            if threads > 0:
+                torch.set_num_threads(threads)
             self._initialize_pipeline()
 
     def _initialize_pipeline(self):
-        """Initialize the sentiment analysis pipeline."""
+        """Initialize the sentiment analysis pipeline for the configured backend."""
         try:
-            logger.info(f"Loading sentiment model: {self.model_name}")
-            self.pipeline = pipeline(
+            logger.info(f"Loading sentiment model: {self.model_name} ({self.backend})")
+            self.pipeline = self._build_pipeline(self.backend)
+        except Exception as e:
+            if self.backend == "pytorch":
+                logger.error(f"Failed to load sentiment model: {e}")
+                self._initialized = False
+                return
+            logger.warning(f"{self.backend} sentiment backend unavailable ({e}), using pytorch")
+            self.backend = "pytorch"
+            self._initialize_pipeline()
+            return
+        self._initialized = True
+        logger.info(f"Sentiment model loaded successfully: {self.model_name} ({self.backend})")
+
+    def _build_pipeline(self, backend: str):
+        if backend == "pytorch":
+            return pipeline(
                 "sentiment-analysis",
                 model=self.model_name,
                 device=self.device,
                 truncation=True,
                 max_length=512,
             )
-            self._initialized = True
-            logger.info(f"Sentiment model loaded successfully: {self.model_name}")
-        except Exception as e:
-            logger.error(f"Failed to load sentiment model: {e}")
-            self._initialized = False
+
+        tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        if backend == "onnx":
+            if not ONNX_AVAILABLE:
+                raise ImportError("optimum[onnxruntime] not installed")
+            model = ORTModelForSequenceClassification.from_pretrained(self.model_name, export=True)
+        else:
+            model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
+            model.eval()
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer, device=-1)
 
     @property
     def is_available(self) -> bool:
@@ -124,49 +367,51 @@ class MLSentimentAnalyzer:
         Returns:
             SentimentResult with label, score, and metadata
         """
-        if not self.is_available:
-            # Fallback to keyword-based if ML not available
-            return self._keyword_fallback(text)
-
-        start_time = datetime.now()
-
-        try:
-            # Truncate very long texts
-            if len(text) > 1000:
-                text = text[:1000]
-
-            result = self.pipeline(text)[0]
-
-            # Map label to standard format
-            label_map = self.LABEL_MAPPING.get(self.model_name, {})
-            raw_label = result["label"]
-            label = label_map.get(raw_label, raw_label.lower())
-
-            # Handle models without neutral class
-            if label not in ["positive", "negative", "neutral"]:
-                # If score is not confident, mark as neutral
-                if result["score"] < 0.7:
-                    label = "neutral"
-                else:
-                    label = "positive" if "POSITIVE" in raw_label.upper() else "negative"
-
-            latency = (datetime.now() - start_time).total_seconds() * 1000
+        return self.analyze_batch([text])[0]
+
+    def _map_label(self, result: Dict[str, Any]) -> str:
+        """Map a raw pipeline label to positive/negative/neutral."""
+        label_map = self.LABEL_MAPPING.get(self.model_name, {})
+        raw_label = result["label"]
+        label = label_map.get(raw_label, raw_label.lower())
+
+        # Handle models without neutral class
+        if label not in ["positive", "negative", "neutral"]:
+            # If score is not confident, mark as neutral
+            if result["score"] < 0.7:
+                label = "neutral"
+            else:
+                label = "positive" if "POSITIVE" in raw_label.upper() else "negative"
+        return label
+
+    def _infer(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """
+        Run the model with length-bucketed batches.
 
-            return SentimentResult(
-                label=label,
-                score=result["score"],
-                model=self.model_name,
-                latency_ms=latency
+        Texts are sorted by length and chunked, so each batch is padded only to
+        its own longest member instead of the longest text overall.
+        """
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        scored: List[Optional[Tuple[str, float]]] = [None] * len(texts)
+        for start in range(0, len(order), self.batch_size):
+            bucket = order[start:start + self.batch_size]
+            outputs = self.pipeline(
+                [texts[i] for i in bucket],
+                batch_size=len(bucket),
+                truncation=True,
+                max_length=self.max_tokens,
             )
-
-        except Exception as e:
-            logger.error(f"Sentiment analysis failed: {e}")
-            return self._keyword_fallback(text)
+            for i, output in zip(bucket, outputs):
+                scored[i] = (self._map_label(output), float(output["score"]))
+        return scored
 
     def analyze_batch(self, texts: List[str]) -> List[SentimentResult]:
         """
         Analyze sentiment of multiple texts efficiently.
 
+        v5.2.1: Cached scores are served without inference; repeated texts in
+        the batch are scored once.
+
         Args:
             texts: List of texts to analyze
 
@@ -175,38 +420,39 @@ class MLSentimentAnalyzer:
         """
         if not self.is_available:
             return [self._keyword_fallback(t) for t in texts]
+        if not texts:
+            return []
 
-        start_time = datetime.now()
+        start_time = time.perf_counter()
 
         try:
             # Truncate very long texts
             processed_texts = [t[:1000] if len(t) > 1000 else t for t in texts]
 
-            results = self.pipeline(processed_texts)
-
-            label_map = self.LABEL_MAPPING.get(self.model_name, {})
-            latency = (datetime.now() - start_time).total_seconds() * 1000
-            per_text_latency = latency / len(texts) if texts else 0
-
-            sentiment_results = []
-            for result in results:
-                raw_label = result["label"]
-                label = label_map.get(raw_label, raw_label.lower())
-
-                if label not in ["positive", "negative", "neutral"]:
-                    if result["score"] < 0.7:
-                        label = "neutral"
-                    else:
-                        label = "positive" if "POSITIVE" in raw_label.upper() else "negative"
-
-                sentiment_results.append(SentimentResult(
-                    label=label,
-                    score=result["score"],
+            keys = [make_text_key(self.model_name, t, self.backend, self.max_tokens) for t in processed_texts]
+            scores = self.cache.get_many(keys)
+
+            pending: Dict[str, str] = {}
+            for key, text in zip(keys, processed_texts):
+                if key not in scores:
+                    pending.setdefault(key, text)
+            if pending:
+                computed = dict(zip(pending, self._infer(list(pending.values()))))
+                scores.update(computed)
+                self.cache.put_many(self.model_name, computed)
+
+            latency = (time.perf_counter() - start_time) * 1000
+            per_text_latency = latency / len(texts)
+
+            return [
+                SentimentResult(
+                    label=scores[key][0],
+                    score=scores[key][1],
                     model=self.model_name,
                     latency_ms=per_text_latency
-                ))
-
-            return sentiment_results
+                )
+                for key in keys
+            ]
 
         except Exception as e:
             logger.error(f"Batch sentiment analysis failed: {e}")
@@ -401,16 +647,40 @@ def get_sentiment_analyzer(model_type: str = "financial") -> MLSentimentAnalyzer
     return MLSentimentAnalyzer(model_type=model_type, use_gpu=use_gpu)
 
 
+_headline_analyzer_instance = None
+_headline_analyzer_lock = threading.Lock()
+
+
 def get_headline_analyzer() -> NewsHeadlineSentimentAnalyzer:
     """
     Get a news headline sentiment analyzer.
 
+    v5.2.1: Shared instance - every NewsMonitor used to load its own model.
+
     Returns:
         NewsHeadlineSentimentAnalyzer instance
     """
-    use_gpu = os.getenv("ML_USE_GPU", "false").lower() == "true"
-    model_type = os.getenv("ML_SENTIMENT_MODEL", "financial")
-    return NewsHeadlineSentimentAnalyzer(model_type=model_type, use_gpu=use_gpu)
+    global _headline_analyzer_instance
+    with _headline_analyzer_lock:
+        if _headline_analyzer_instance is None:
+            use_gpu = os.getenv("ML_USE_GPU", "false").lower() == "true"
+            model_type = os.getenv("ML_SENTIMENT_MODEL", "financial")
+            _headline_analyzer_instance = NewsHeadlineSentimentAnalyzer(model_type=model_type, use_gpu=use_gpu)
+    return _headline_analyzer_instance
+
+
+def get_sentiment_status() -> Dict[str, Any]:
+    """Backend and score-cache stats (does not load a model)."""
+    analyzer = _headline_analyzer_instance.analyzer if _headline_analyzer_instance else None
+    return {
+        "transformers_available": TRANSFORMERS_AVAILABLE,
+        "onnx_available": ONNX_AVAILABLE,
+        "loaded": bool(analyzer and analyzer.is_available),
+        "model": analyzer.model_name if analyzer else None,
+        "backend": analyzer.backend if analyzer else default_backend(os.getenv("ML_USE_GPU", "false").lower() == "true"),
+        "batch_size": analyzer.batch_size if analyzer else None,
+        "cache": get_sentiment_cache().get_stats(),
+    }
 
 
 def analyze_news_sentiment(headline: str, snippet: str = "") -> Dict[str, Any]:
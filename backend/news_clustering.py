@@ -0,0 +1,161 @@
+"""
+Certify Intel - Near-Duplicate News Clustering (v5.2.1)
+Groups syndicated copies of the same story so it is analyzed once.
+
+The same press release shows up on Google News, GNews, NewsData and MediaStack
+under different URLs and with small headline edits ("- Reuters", "$50M" vs
+"$50 million"). Headlines and ledes are reduced to token sets and compared by
+Jaccard similarity. MinHash signatures with LSH banding find candidate pairs
+so clustering stays close to linear; each candidate is then verified on the
+exact sets.
+
+Headlines are short, so a few shared words are not enough: two texts that
+disagree on a number or ordinal ("third quarter" vs "second quarter",
+"$50M" vs "$75M") are never merged, and headlines of fewer than
+SHORT_TITLE_TOKENS words must be near-identical ("Epic and Cerner announce
+partnership" vs "... end partnership" differ in one verb but share 3 of 5
+words); shorter copies still merge when their ledes agree.
+
+Configuration (environment):
+    NEWS_CLUSTERING_ENABLED    Collapse near-duplicate articles in fetch_news (default true)
+    NEWS_DUPLICATE_SIMILARITY  Min headline Jaccard similarity for a duplicate (default 0.6)
+"""
+import hashlib
+import os
+import random
+import re
+from collections import defaultdict
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+
+CLUSTERING_ENABLED = os.getenv("NEWS_CLUSTERING_ENABLED", "true").lower() == "true"
+DUPLICATE_SIMILARITY = float(os.getenv("NEWS_DUPLICATE_SIMILARITY", "0.6"))
+
+LEDE_WORDS = 30
+LEDE_SIMILARITY_BONUS = 0.1  # Ledes share more boilerplate, so they need a higher bar
+MIN_LEDE_TOKENS = 8  # Shorter ledes ("Read more...") match too easily
+SHORT_TITLE_TOKENS = 6  # Below this one changed word swings Jaccard past the threshold
+SHORT_TITLE_SIMILARITY = 0.8
+
+NUM_PERM = 32
+BAND_ROWS = 2  # 16 bands: pairs at Jaccard 0.5 become candidates ~99% of the time
+_PRIME = (1 << 61) - 1
+_rng = random.Random(5021)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+_TITLE_SUFFIX = re.compile(r"\s+[-|–—]\s+[^-|–—]{2,60}$")  # "Headline - Publisher"
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+_TAG = re.compile(r"<[^>]+>")
+_UNIT_SUFFIX = re.compile(r"^(\d+)(k|m|mm|b|bn)$")  # "50m" -> "50"
+_STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "for", "with", "by", "at", "as",
+    "is", "its", "it", "from", "says", "said", "thousand", "million", "billion", "usd", "inc", "corp",
+}
+_ORDINALS = {"first", "second", "third", "fourth", "q1", "q2", "q3", "q4", "h1", "h2"}
+
+
+# ============== Token sets ==============
+
+def normalize_headline(title: str) -> str:
+    """Headline without publisher suffix, case, punctuation or extra whitespace."""
+    text = _TITLE_SUFFIX.sub("", (title or "").strip()).lower()
+    return _NON_WORD.sub(" ", text).strip()
+
+
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for token in _NON_WORD.sub(" ", _TAG.sub(" ", text or "").lower()).split():
+        token = _UNIT_SUFFIX.sub(r"\1", token)
+        if token not in _STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+
+def _is_distinguishing(token: str) -> bool:
+    return token in _ORDINALS or any(ch.isdigit() for ch in token)
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def conflicting(a: FrozenSet[str], b: FrozenSet[str]) -> bool:
+    """Both sides carry a number/ordinal the other lacks: different quarter, amount, etc."""
+    return any(_is_distinguishing(t) for t in a - b) and any(_is_distinguishing(t) for t in b - a)
+
+
+# ============== MinHash ==============
+
+def minhash(tokens: FrozenSet[str]) -> List[int]:
+    hashes = [int.from_bytes(hashlib.blake2b(t.encode("utf-8"), digest_size=8).digest(), "big") for t in tokens]
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def _bands(signature: List[int]) -> List[Tuple[int, ...]]:
+    return [(i, *signature[i:i + BAND_ROWS]) for i in range(0, NUM_PERM, BAND_ROWS)]
+
+
+# ============== Clustering ==============
+
+def cluster_near_duplicates(
+    items: Sequence[Tuple[str, str]],
+    similarity: Optional[float] = None
+) -> List[List[int]]:
+    """
+    Group (title, lede) pairs that describe the same story.
+
+    Two items match when their headlines reach the similarity threshold, or
+    their ledes reach it plus LEDE_SIMILARITY_BONUS, and they do not disagree
+    on numbers. Headlines under SHORT_TITLE_TOKENS words need
+    SHORT_TITLE_SIMILARITY. Returns clusters as lists of input indexes in input order,
+    ordered by first member, so callers can treat the first index as the
+    canonical article.
+    """
+    threshold = DUPLICATE_SIMILARITY if similarity is None else similarity
+    limits = {"title": threshold, "lede": min(1.0, threshold + LEDE_SIMILARITY_BONUS)}
+    parent = list(range(len(items)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i, j):
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)
+
+    token_sets: List[Dict[str, FrozenSet[str]]] = []
+    buckets: Dict[Tuple, List[int]] = defaultdict(list)
+    for index, (title, snippet) in enumerate(items):
+        sets = {}
+        title_tokens = frozenset(tokenize(normalize_headline(title)))
+        if title_tokens:
+            sets["title"] = title_tokens
+        lede_tokens = tokenize(snippet)[:LEDE_WORDS]
+        if len(lede_tokens) >= MIN_LEDE_TOKENS:
+            sets["lede"] = frozenset(lede_tokens)
+        token_sets.append(sets)
+
+        for kind, tokens in sets.items():
+            checked = set()
+            for band in _bands(minhash(tokens)):
+                for other in buckets[(kind, *band)]:
+                    if other in checked or find(other) == find(index):
+                        continue
+                    checked.add(other)
+                    other_tokens = token_sets[other][kind]
+                    limit = limits[kind]
+                    if kind == "title" and min(len(tokens), len(other_tokens)) < SHORT_TITLE_TOKENS:
+                        limit = max(limit, SHORT_TITLE_SIMILARITY)
+                    if jaccard(tokens, other_tokens) >= limit and not conflicting(tokens, other_tokens):
+                        union(other, index)
+                buckets[(kind, *band)].append(index)
+
+    clusters: Dict[int, List[int]] = defaultdict(list)
+    for index in range(len(items)):
+        clusters[find(index)].append(index)
+    return sorted(clusters.values(), key=lambda members: members[0])
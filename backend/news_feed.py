@@ -0,0 +1,312 @@
+"""
+Certify Intel - News Feed Query (v5.2.1)
+SQL-side filtering, sorting and pagination for /api/news-feed.
+
+Filters (competitor, date range, sentiment, source, event type) become indexed
+predicates on news_article_cache. Results are ordered by (published_at, id)
+descending and paged either by OFFSET (page numbers, kept for the UI) or by
+keyset cursor, which stays flat no matter how deep the page. Totals and the
+sentiment breakdown come from one GROUP BY over the same filtered query.
+
+published_at is stored as a naive UTC datetime; parse_published_date()
+normalizes the date strings news sources return (RFC 2822, ISO 8601, ...).
+
+query_news_coverage() backs /api/news-coverage with one aggregate statement
+instead of three queries per competitor.
+"""
+import base64
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+
+
+DEFAULT_LOOKBACK_DAYS = 30
+MAX_PAGE_SIZE = 100
+
+
+# ============== Date normalization ==============
+
+def parse_published_date(value: Any) -> Optional[datetime]:
+    """Normalize a news source date (datetime, RFC 2822, ISO 8601, YYYY-MM-DD) to naive UTC."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        text = str(value).strip()
+        parsed = None
+        try:
+            parsed = parsedate_to_datetime(text)  # "Tue, 10 Jun 2025 14:00:00 GMT"
+        except (TypeError, ValueError, IndexError):
+            pass
+        if parsed is None:
+            try:
+                parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+            except ValueError:
+                pass
+        if parsed is None:
+            try:
+                from dateutil import parser
+                parsed = parser.parse(text)
+            except Exception:
+                return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def parse_date_range(start_date: Optional[str], end_date: Optional[str]) -> Tuple[datetime, datetime]:
+    """(inclusive start, exclusive end) from YYYY-MM-DD filters; end_date covers the whole day."""
+    now = datetime.utcnow()
+    try:
+        start_dt = datetime.strptime(start_date, "%Y-%m-%d") if start_date else None
+    except ValueError:
+        start_dt = None
+    try:
+        end_dt = datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1) if end_date else None
+    except ValueError:
+        end_dt = None
+    return start_dt or now - timedelta(days=DEFAULT_LOOKBACK_DAYS), end_dt or now
+
+
+# ============== Keyset cursor ==============
+
+def encode_cursor(published_at: datetime, row_id: int) -> str:
+    raw = f"{published_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[datetime, int]]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        published, _, row_id = base64.urlsafe_b64decode(padded).decode("utf-8").partition("|")
+        return datetime.fromisoformat(published), int(row_id)
+    except Exception:
+        return None
+
+
+# ============== Query ==============
+
+def filtered_query(
+    db: Session,
+    competitor_id: Optional[int] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    sentiment: Optional[str] = None,
+    source: Optional[str] = None,
+    event_type: Optional[str] = None,
+    now: Optional[datetime] = None
+):
+    """NewsArticleCache query with every feed filter applied as a SQL predicate."""
+    from database import NewsArticleCache as N
+
+    start_dt, end_dt = parse_date_range(start_date, end_date)
+    query = db.query(N).filter(
+        N.cache_expires_at > (now or datetime.utcnow()),
+        N.published_at >= start_dt,
+        N.published_at < end_dt,
+    )
+    if competitor_id:
+        query = query.filter(N.competitor_id == competitor_id)
+    if sentiment:
+        value = sentiment.lower()
+        if value == "neutral":
+            query = query.filter(or_(N.sentiment == value, N.sentiment.is_(None)))
+        else:
+            query = query.filter(N.sentiment == value)
+    if source:
+        value = source.lower()
+        query = query.filter(or_(N.source_type == value, func.lower(N.source).contains(value)))
+    if event_type:
+        value = event_type.lower()
+        if value == "general":
+            query = query.filter(or_(N.event_type == value, N.event_type.is_(None)))
+        else:
+            query = query.filter(N.event_type == value)
+    return query
+
+
+def article_to_dict(row: Any) -> Dict[str, Any]:
+    return {
+        "id": row.id,
+        "competitor_id": row.competitor_id,
+        "competitor_name": row.competitor_name,
+        "title": row.title,
+        "url": row.url,
+        "source": row.source,
+        "source_type": row.source_type or "google_news",
+        "published_at": row.published_at.isoformat() if row.published_at else "",
+        "snippet": row.snippet or "",
+        "sentiment": row.sentiment or "neutral",
+        "event_type": row.event_type or "general",
+        "is_major_event": row.is_major_event or False,
+        "cached": True
+    }
+
+
+def query_news_feed(
+    db: Session,
+    competitor_id: Optional[int] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    sentiment: Optional[str] = None,
+    source: Optional[str] = None,
+    event_type: Optional[str] = None,
+    page: int = 1,
+    page_size: int = 25,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    One page of cached news plus totals.
+
+    Pass the previous response's pagination.next_cursor as cursor for
+    constant-time deep paging; page is used only when no cursor is given.
+    """
+    from database import NewsArticleCache as N
+
+    page = max(1, page)
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    query = filtered_query(db, competitor_id, start_date, end_date, sentiment, source, event_type)
+
+    # Totals and sentiment breakdown in one aggregate over the filtered rows
+    stats = {"total": 0, "positive": 0, "neutral": 0, "negative": 0}
+    for label, count in query.with_entities(
+        func.coalesce(N.sentiment, "neutral"), func.count(N.id)
+    ).group_by(func.coalesce(N.sentiment, "neutral")):
+        stats["total"] += count
+        if label in stats:
+            stats[label] += count
+
+    page_query = query.order_by(N.published_at.desc(), N.id.desc())
+    position = decode_cursor(cursor) if cursor else None
+    if position:
+        published_at, row_id = position
+        page_query = page_query.filter(or_(
+            N.published_at < published_at,
+            and_(N.published_at == published_at, N.id < row_id)
+        ))
+    else:
+        page_query = page_query.offset((page - 1) * page_size)
+
+    rows: List[Any] = page_query.limit(page_size + 1).all()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    next_cursor = encode_cursor(rows[-1].published_at, rows[-1].id) if has_more and rows else None
+
+    total_items = stats["total"]
+    return {
+        "articles": [article_to_dict(row) for row in rows],
+        "stats": stats,
+        "pagination": {
+            "page": page,
+            "page_size": page_size,
+            "total_items": total_items,
+            "total_pages": max(1, (total_items + page_size - 1) // page_size),
+            "next_cursor": next_cursor,
+            "has_more": has_more
+        }
+    }
+
+
+# ============== Coverage ==============
+
+def query_news_coverage(db: Session, now: Optional[datetime] = None, recent_days: int = 7) -> Dict[str, Any]:
+    """
+    Per-competitor article totals, recent counts, sentiment breakdown and last
+    fetch time in one statement: active competitors LEFT JOIN a single
+    GROUP BY competitor_id over the cache (served by the coverage index).
+    """
+    from sqlalchemy import case
+    from database import Competitor, NewsArticleCache as N
+
+    recent_since = (now or datetime.utcnow()) - timedelta(days=recent_days)
+    sentiment = func.coalesce(N.sentiment, "neutral")
+
+    def count_if(condition):
+        return func.sum(case((condition, 1), else_=0))
+
+    stats = db.query(
+        N.competitor_id.label("competitor_id"),
+        func.count(N.id).label("total"),
+        count_if(N.published_at >= recent_since).label("recent"),
+        count_if(sentiment == "positive").label("positive"),
+        count_if(sentiment == "neutral").label("neutral"),
+        count_if(sentiment == "negative").label("negative"),
+        func.max(N.fetched_at).label("last_fetched"),
+    ).group_by(N.competitor_id).subquery()
+
+    rows = db.query(
+        Competitor.id, Competitor.name, stats.c.total, stats.c.recent,
+        stats.c.positive, stats.c.neutral, stats.c.negative, stats.c.last_fetched
+    ).outerjoin(stats, stats.c.competitor_id == Competitor.id).filter(
+        Competitor.is_deleted == False
+    ).order_by(Competitor.id).all()
+
+    coverage = []
+    for row in rows:
+        total, recent = row.total or 0, row.recent or 0
+        coverage.append({
+            "competitor_id": row.id,
+            "competitor_name": row.name,
+            "total_articles": total,
+            "recent_articles": recent,
+            "has_news": total > 0,
+            "has_recent_news": recent > 0,
+            "sentiment": {"positive": row.positive or 0, "neutral": row.neutral or 0, "negative": row.negative or 0},
+            "last_fetched": row.last_fetched.isoformat() if row.last_fetched else None
+        })
+
+    with_news = sum(1 for c in coverage if c["has_news"])
+    with_recent = sum(1 for c in coverage if c["has_recent_news"])
+    return {
+        "total_competitors": len(coverage),
+        "competitors_with_news": with_news,
+        "competitors_with_recent_news": with_recent,
+        "coverage_percentage": round(with_news / len(coverage) * 100, 1) if coverage else 0,
+        "recent_coverage_percentage": round(with_recent / len(coverage) * 100, 1) if coverage else 0,
+        "coverage_details": coverage,
+        "competitors_missing_news": [c for c in coverage if not c["has_news"]]
+    }
+
+
+def has_cached_news(db: Session, competitor_id: Optional[int] = None) -> bool:
+    """Whether any unexpired cached article exists for the feed scope."""
+    from database import NewsArticleCache as N
+
+    query = db.query(N.id).filter(N.cache_expires_at > datetime.utcnow())
+    if competitor_id:
+        query = query.filter(N.competitor_id == competitor_id)
+    return query.first() is not None
+
+
+def filter_live_articles(
+    articles: List[Dict[str, Any]],
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    sentiment: Optional[str] = None,
+    source: Optional[str] = None,
+    event_type: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Same filters and order as the SQL path, for the small live-fetch fallback."""
+    start_dt, end_dt = parse_date_range(start_date, end_date)
+    result = []
+    for article in articles:
+        published = parse_published_date(article.get("published_at"))
+        if published is not None and not (start_dt <= published < end_dt):
+            continue
+        if sentiment and (article.get("sentiment") or "neutral").lower() != sentiment.lower():
+            continue
+        if source and not (
+            (article.get("source_type") or "").lower() == source.lower()
+            or source.lower() in (article.get("source") or "").lower()
+        ):
+            continue
+        if event_type and (article.get("event_type") or "general").lower() != event_type.lower():
+            continue
+        article["published_at"] = published.isoformat() if published else ""
+        result.append(article)
+    result.sort(key=lambda a: a["published_at"], reverse=True)
+    return result
@@ -0,0 +1,321 @@
+"""
+Certify Intel - Incremental News Polling State (v5.2.1)
+Per-source, per-company fetch state so refreshes only download new items.
+
+For each (source, company) pair the store keeps the feed's ETag and
+Last-Modified validators and the newest published timestamp seen. On the next
+incremental fetch:
+
+- RSS feeds are requested with If-None-Match / If-Modified-Since; a 304 means
+  nothing to download or parse.
+- News APIs are asked only for items published since the newest one seen
+  (minus an overlap for late-indexed articles) instead of the whole lookback
+  window, saving request quota and payload.
+- Whatever still comes back older than that point, or was already returned
+  inside the overlap (URLs remembered per state), is dropped before
+  sentiment, event and dimension analysis.
+
+Each state also records how far back its contiguous coverage reaches
+(covered_from). A refresh asking for a longer window than that, e.g. a 90-day
+run after 7-day runs, fetches its whole window instead of only newer items.
+
+Marks never move at fetch time: fetch_news returns the pending advances with
+its digest and the caller commits them once the articles are stored
+(NewsMonitor.commit_fetch_state), so a failed or partial ingest simply fetches
+the same range again. The store hands out copies and merges saved states under
+its lock, so concurrent refreshes of one company cannot clobber each other.
+
+State lives in memory and in the news_fetch_state table, so it survives
+restarts. Only cache-refresh paths fetch incrementally; live lookups always
+get the full window.
+
+Configuration (environment):
+    NEWS_INCREMENTAL_ENABLED          Use fetch state on cache refreshes (default true)
+    NEWS_INCREMENTAL_OVERLAP_MINUTES  Re-request this much before the newest item seen (default 60)
+"""
+import copy
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, asdict, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+INCREMENTAL_ENABLED = os.getenv("NEWS_INCREMENTAL_ENABLED", "true").lower() == "true"
+OVERLAP_MINUTES = int(os.getenv("NEWS_INCREMENTAL_OVERLAP_MINUTES", "60"))
+MAX_RECENT_URLS = 500
+
+
+def query_key(company_name: str) -> str:
+    return " ".join((company_name or "").lower().split())
+
+
+@dataclass
+class FetchState:
+    """Polling state for one source and company."""
+    source: str
+    query_key: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    newest_published_at: Optional[datetime] = None
+    last_fetched_at: Optional[datetime] = None
+    last_status: Optional[str] = None
+    last_new_items: int = 0
+    recent_urls: Dict[str, str] = field(default_factory=dict)  # url_hash -> published (ISO) within the overlap
+    covered_from: Optional[datetime] = None  # Start of the window fetched continuously up to newest_published_at
+
+    def covers(self, window_start: datetime) -> bool:
+        """Whether earlier fetches already reached back to window_start."""
+        return self.covered_from is not None and self.covered_from <= window_start
+
+    def since(self, window_start: datetime, overlap_minutes: Optional[int] = None) -> datetime:
+        """Earliest publish time worth requesting: the newest item seen (minus overlap), within the window."""
+        if self.newest_published_at is None or not self.covers(window_start):
+            return window_start
+        overlap = timedelta(minutes=OVERLAP_MINUTES if overlap_minutes is None else overlap_minutes)
+        return max(window_start, self.newest_published_at - overlap)
+
+    def is_unseen(self, url: str, published: Optional[datetime], window_start: datetime) -> bool:
+        """Not older than since() and not already returned inside the overlap; undated items count as new."""
+        from news_ingest import url_hash
+        if self.newest_published_at is None or not self.covers(window_start):
+            return True
+        if published is not None and published < self.since(window_start):
+            return False
+        return url_hash(url) not in self.recent_urls
+
+    def advance(self, items: Iterable[Tuple[str, Optional[datetime]]], now: datetime, window_start: Optional[datetime] = None):
+        """Move the high-water mark to the newest dated item and remember URLs inside the overlap."""
+        from news_ingest import url_hash
+        if window_start is not None and not self.covers(window_start):
+            self.covered_from = window_start
+        for url, published in items:
+            if published is not None:
+                published = min(published, now)  # Future-dated items must not skip real ones
+                if self.newest_published_at is None or published > self.newest_published_at:
+                    self.newest_published_at = published
+            if url:
+                self.recent_urls[url_hash(url)] = (published or now).isoformat()
+        if self.newest_published_at is not None:
+            cutoff = (self.newest_published_at - timedelta(minutes=OVERLAP_MINUTES)).isoformat()
+            self.recent_urls = {h: t for h, t in self.recent_urls.items() if t >= cutoff}
+        if len(self.recent_urls) > MAX_RECENT_URLS:
+            newest = sorted(self.recent_urls.items(), key=lambda item: item[1])[-MAX_RECENT_URLS:]
+            self.recent_urls = dict(newest)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def merge(self, other: "FetchState"):
+        """Fold in a state saved concurrently for the same source and company."""
+        if other.newest_published_at and (not self.newest_published_at
+                                          or other.newest_published_at > self.newest_published_at):
+            self.newest_published_at = other.newest_published_at
+        if other.covered_from and (not self.covered_from or other.covered_from < self.covered_from):
+            self.covered_from = other.covered_from
+        if other.last_fetched_at and (not self.last_fetched_at or other.last_fetched_at > self.last_fetched_at):
+            self.etag, self.last_modified = other.etag, other.last_modified
+            self.last_fetched_at, self.last_status, self.last_new_items = (
+                other.last_fetched_at, other.last_status, other.last_new_items)
+        self.recent_urls = {**other.recent_urls, **self.recent_urls}
+        self.advance((), self.last_fetched_at or datetime.utcnow())  # Trim merged URLs to the overlap
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        for key in ("newest_published_at", "last_fetched_at", "covered_from"):
+            data[key] = data[key].isoformat() if data[key] else None
+        data["recent_urls"] = len(self.recent_urls)
+        return data
+
+
+@dataclass
+class PendingFetch:
+    """One source's fetch, applied to its state once the caller has stored the items."""
+    state: FetchState
+    items: List[Tuple[str, Optional[datetime]]]  # (url, published) of everything the source returned
+    new_urls: List[str]  # Items passed on as new; all must be stored before the mark moves
+    fetched_at: datetime
+    window_start: datetime
+
+
+class FetchStateStore:
+    """
+    (source, company) -> FetchState, held in memory and persisted to the
+    news_fetch_state table. Rows for a company are loaded on first use.
+    get() returns a copy; save_many() merges it back under the lock.
+    """
+
+    def __init__(self, session_factory: Optional[Callable] = None):
+        self._session_factory = session_factory
+        self._states: Dict[Tuple[str, str], FetchState] = {}
+        self._loaded: set = set()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # Keeps row writes in the same order as the in-memory merges
+        self.stats = {"conditional_requests": 0, "not_modified": 0, "incremental_requests": 0,
+                      "items_skipped": 0, "errors": 0}
+
+    def _session(self):
+        if self._session_factory is None:
+            from database import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    def _load(self, key: str):
+        from database import NewsFetchState
+        db = self._session()
+        try:
+            rows = db.query(NewsFetchState).filter(NewsFetchState.query_key == key).all()
+            return [FetchState(
+                source=r.source, query_key=r.query_key, etag=r.etag, last_modified=r.last_modified,
+                newest_published_at=r.newest_published_at, last_fetched_at=r.last_fetched_at,
+                last_status=r.last_status, last_new_items=r.last_new_items or 0,
+                recent_urls=json.loads(r.recent_urls) if r.recent_urls else {},
+                covered_from=r.covered_from,
+            ) for r in rows]
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"News fetch state load failed: {e}")
+            return []
+        finally:
+            db.close()
+
+    def get(self, source: str, company_name: str) -> FetchState:
+        """A private copy of the stored state; changes take effect through save_many."""
+        key = query_key(company_name)
+        if key not in self._loaded:
+            rows = self._load(key)
+            with self._lock:
+                for state in rows:
+                    self._states.setdefault((state.source, key), state)
+                self._loaded.add(key)
+        with self._lock:
+            state = self._states.get((source, key))
+            return copy.deepcopy(state) if state else FetchState(source=source, query_key=key)
+
+    def commit(self, pending: Iterable[PendingFetch], stored_urls: Optional[Set[str]] = None) -> int:
+        """
+        Advance and persist the states of a fetch whose articles are now stored.
+
+        With stored_urls, a source keeps its old mark unless every item it
+        passed on as new is among them (e.g. the caller capped the list), so
+        the next refresh asks for that range again. Returns states saved.
+        """
+        updated = []
+        for p in pending:
+            if stored_urls is not None and not all(url in stored_urls for url in p.new_urls):
+                continue
+            p.state.advance(p.items, p.fetched_at, p.window_start)
+            updated.append(p.state)
+        self.save_many(updated)
+        return len(updated)
+
+    def save_many(self, states: Iterable[FetchState]):
+        """Merge updated states into the store and persist them (one transaction for all sources of a fetch)."""
+        states = list(states)
+        if not states:
+            return
+
+        with self._save_lock:
+            merged = []
+            with self._lock:
+                for state in states:
+                    key = (state.source, state.query_key)
+                    current = self._states.get(key)
+                    if current is not None:
+                        state = copy.deepcopy(state)
+                        state.merge(current)
+                    self._states[key] = state
+                    merged.append(copy.deepcopy(state))
+            self._persist(merged)
+
+    def _persist(self, states: List[FetchState]):
+        from database import NewsFetchState
+        db = self._session()
+        try:
+            now = datetime.utcnow()
+            for state in states:
+                row = db.query(NewsFetchState).filter(
+                    NewsFetchState.source == state.source, NewsFetchState.query_key == state.query_key
+                ).first()
+                if row is None:
+                    row = NewsFetchState(source=state.source, query_key=state.query_key)
+                    db.add(row)
+                row.etag = state.etag
+                row.last_modified = state.last_modified
+                row.newest_published_at = state.newest_published_at
+                row.last_fetched_at = state.last_fetched_at
+                row.last_status = state.last_status
+                row.last_new_items = state.last_new_items
+                row.recent_urls = json.dumps(state.recent_urls)
+                row.covered_from = state.covered_from
+                row.updated_at = now
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            self.stats["errors"] += 1
+            logger.warning(f"News fetch state save failed: {e}")
+        finally:
+            db.close()
+
+    def reset(self, company_names: Optional[Iterable[str]] = None) -> int:
+        """
+        Forget fetch state (all companies, or the given ones) so the next
+        refresh downloads the full window again, e.g. after a failed cache write.
+        """
+        from database import NewsFetchState
+        keys = None if company_names is None else {query_key(n) for n in company_names}
+        with self._lock:
+            for k in [k for k in self._states if keys is None or k[1] in keys]:
+                del self._states[k]
+            self._loaded = set() if keys is None else self._loaded - keys
+
+        db = self._session()
+        try:
+            query = db.query(NewsFetchState)
+            if keys is not None:
+                query = query.filter(NewsFetchState.query_key.in_(keys))
+            removed = query.delete(synchronize_session=False)
+            db.commit()
+            return removed
+        except Exception as e:
+            db.rollback()
+            self.stats["errors"] += 1
+            logger.warning(f"News fetch state reset failed: {e}")
+            return 0
+        finally:
+            db.close()
+
+    def record(self, stat: str, count: int = 1):
+        with self._lock:
+            self.stats[stat] += count
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            states = [s.to_dict() for s in self._states.values()]
+        return {
+            "enabled": INCREMENTAL_ENABLED,
+            "overlap_minutes": OVERLAP_MINUTES,
+            **self.stats,
+            "tracked": len(states),
+            "states": sorted(states, key=lambda s: (s["query_key"], s["source"])),
+        }
+
+
+_store_instance: Optional[FetchStateStore] = None
+_store_lock = threading.Lock()
+
+
+def get_fetch_state_store() -> FetchStateStore:
+    global _store_instance
+    with _store_lock:
+        if _store_instance is None:
+            _store_instance = FetchStateStore()
+        return _store_instance
@@ -0,0 +1,301 @@
+"""
+Certify Intel - News Cache Ingestion (v5.2.1)
+Bulk, deduplicated writes into news_article_cache.
+
+Articles are deduplicated in memory by a normalized URL hash and a title
+fingerprint (same story syndicated under different URLs), checked against the
+cache with one query per batch, then written with a single
+INSERT ... ON CONFLICT (url_hash) statement per batch. Existing URLs only get
+their cache expiry extended, matching the old per-article behaviour.
+
+Each run reports rows/sec; the last runs are available from get_ingest_stats()
+(GET /api/news-feed/ingest-stats). Incremental refreshes only ingest new
+articles, so extend_cache_expiry() keeps the rest of the window cached.
+
+Configuration (environment):
+    NEWS_INGEST_BATCH_SIZE  Rows per INSERT ... ON CONFLICT batch (default 500)
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, asdict, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from sqlalchemy.orm import Session
+
+from news_clustering import normalize_headline
+
+
+BATCH_SIZE = int(os.getenv("NEWS_INGEST_BATCH_SIZE", "500"))
+
+# Query parameters that identify the referrer, not the article
+TRACKING_PARAMS = {"fbclid", "gclid", "ocid", "cmpid", "mc_cid", "mc_eid", "ref", "src", "smid", "guccounter"}
+
+
+# ============== Hashing ==============
+
+def normalize_url(url: str) -> str:
+    """Lowercase scheme/host, drop www., fragments, tracking params and trailing slashes; sort the query."""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower() or "https", host, path, urlencode(query), ""))
+
+
+def url_hash(url: str) -> str:
+    return hashlib.sha1(normalize_url(url).encode("utf-8")).hexdigest()
+
+
+def title_fingerprint(title: str) -> Optional[str]:
+    """Hash of the headline without its publisher suffix, case and punctuation; None if too short to trust."""
+    text = normalize_headline(title)
+    if len(text) < 16:
+        return None
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+# ============== Results ==============
+
+@dataclass
+class IngestResult:
+    """Outcome of one ingestion run."""
+    received: int = 0
+    inserted: int = 0
+    refreshed: int = 0
+    duplicates: int = 0
+    skipped: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+    rows_per_sec: float = 0.0
+    finished_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+_history: deque = deque(maxlen=20)
+_history_lock = threading.Lock()
+
+
+def get_ingest_stats() -> Dict[str, Any]:
+    """Recent ingestion runs (newest first) and their average throughput."""
+    with _history_lock:
+        runs = [r.to_dict() for r in reversed(_history)]
+    timed = [r for r in runs if r["seconds"] > 0]
+    return {
+        "runs": runs,
+        "avg_rows_per_sec": round(sum(r["rows_per_sec"] for r in timed) / len(timed), 1) if timed else 0.0,
+        "batch_size": BATCH_SIZE,
+    }
+
+
+# ============== Ingestion ==============
+
+def _prepare(rows: Iterable[Dict[str, Any]], ttl_hours: float, now: datetime, result: IngestResult) -> List[Dict[str, Any]]:
+    """Normalize rows and drop in-batch duplicates by URL hash and (competitor, title fingerprint)."""
+    prepared = []
+    seen_urls, seen_titles = set(), set()
+    for row in rows:
+        result.received += 1
+        url = (row.get("url") or "").strip()
+        if not url:
+            result.skipped += 1
+            continue
+        h = url_hash(url)
+        t = title_fingerprint(row.get("title") or "")
+        title_key = (row.get("competitor_id"), t)
+        if h in seen_urls or (t and title_key in seen_titles):
+            result.duplicates += 1
+            continue
+        seen_urls.add(h)
+        if t:
+            seen_titles.add(title_key)
+        prepared.append({
+            "competitor_id": row.get("competitor_id"),
+            "competitor_name": row.get("competitor_name"),
+            "title": (row.get("title") or "")[:500],
+            "url": url,
+            "url_hash": h,
+            "title_hash": t,
+            "source": row.get("source"),
+            "source_type": row.get("source_type"),
+            "published_at": row.get("published_at") or now,
+            "snippet": (row.get("snippet") or "")[:1000] or None,
+            "sentiment": row.get("sentiment") or "neutral",
+            "event_type": row.get("event_type"),
+            "is_major_event": bool(row.get("is_major_event")),
+            "dimension_tags": row.get("dimension_tags"),
+            "fetched_at": now,
+            "cache_expires_at": now + timedelta(hours=ttl_hours),
+            "created_at": now,
+        })
+    return prepared
+
+
+def _write_batch(db: Session, batch: List[Dict[str, Any]], result: IngestResult):
+    from database import NewsArticleCache as N
+
+    hashes = [r["url_hash"] for r in batch]
+    existing_urls = {h for (h,) in db.query(N.url_hash).filter(N.url_hash.in_(hashes))}
+
+    # Same headline already cached for the competitor under another URL
+    title_pairs = {(r["competitor_id"], r["title_hash"]) for r in batch if r["title_hash"] and r["url_hash"] not in existing_urls}
+    existing_titles = set()
+    if title_pairs:
+        existing_titles = set(db.query(N.competitor_id, N.title_hash).filter(
+            N.title_hash.in_({t for _, t in title_pairs}),
+            N.competitor_id.in_({c for c, _ in title_pairs}),
+        ))
+
+    rows = []
+    for r in batch:
+        if r["url_hash"] in existing_urls:
+            result.refreshed += 1
+        elif r["title_hash"] and (r["competitor_id"], r["title_hash"]) in existing_titles:
+            result.duplicates += 1
+            continue
+        else:
+            result.inserted += 1
+        rows.append(r)
+    if not rows:
+        return
+
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(N.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[N.__table__.c.url_hash],
+            set_={"cache_expires_at": stmt.excluded.cache_expires_at},
+        )
+        db.execute(stmt, rows)
+    else:
+        new_rows = [r for r in rows if r["url_hash"] not in existing_urls]
+        if new_rows:
+            db.execute(N.__table__.insert(), new_rows)
+        if existing_urls:
+            db.query(N).filter(N.url_hash.in_(existing_urls)).update(
+                {N.cache_expires_at: rows[0]["cache_expires_at"]}, synchronize_session=False
+            )
+    result.batches += 1
+
+
+def ingest_articles(
+    db: Session,
+    rows: Iterable[Dict[str, Any]],
+    ttl_hours: float = 4,
+    batch_size: Optional[int] = None
+) -> IngestResult:
+    """
+    Bulk-write article dicts (NewsArticleCache column names) into the cache.
+
+    New URLs are inserted, known URLs get a fresh cache_expires_at, and
+    duplicates within the input or by headline are dropped. Commits once.
+    """
+    batch_size = max(1, batch_size or BATCH_SIZE)
+    result = IngestResult()
+    start = time.perf_counter()
+    prepared = _prepare(rows, ttl_hours, datetime.utcnow(), result)
+    try:
+        for i in range(0, len(prepared), batch_size):
+            _write_batch(db, prepared[i:i + batch_size], result)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    result.seconds = round(time.perf_counter() - start, 4)
+    result.rows_per_sec = round(result.received / result.seconds, 1) if result.seconds else 0.0
+    result.finished_at = datetime.utcnow().isoformat()
+    with _history_lock:
+        _history.append(result)
+    print(f"[News Ingest] {result.received} rows -> {result.inserted} new, {result.refreshed} refreshed, "
+          f"{result.duplicates} duplicates in {result.seconds:.2f}s ({result.rows_per_sec:.0f} rows/sec)")
+    return result
+
+
+def extend_cache_expiry(db: Session, competitor_ids: List[int], days: int, ttl_hours: float = 4) -> int:
+    """
+    Keep already-cached articles in the refreshed window alive.
+
+    Incremental refreshes no longer re-download articles that are already
+    cached, so their expiry is extended here instead of by the upsert.
+    """
+    from database import NewsArticleCache as N
+
+    if not competitor_ids:
+        return 0
+    now = datetime.utcnow()
+    updated = db.query(N).filter(
+        N.competitor_id.in_(competitor_ids),
+        N.published_at >= now - timedelta(days=days),
+        N.cache_expires_at < now + timedelta(hours=ttl_hours),
+    ).update({N.cache_expires_at: now + timedelta(hours=ttl_hours)}, synchronize_session=False)
+    db.commit()
+    return updated
+
+
+def backfill_hashes(db: Session, chunk_size: int = 1000) -> int:
+    """
+    Hash cached rows written before url_hash existed.
+
+    Rows whose normalized URL is already cached are removed so the unique
+    url_hash index holds; the surviving row is the one hashed first.
+    """
+    from database import NewsArticleCache as N
+
+    updated = 0
+    while True:
+        chunk = db.query(N.id, N.url, N.title).filter(N.url_hash.is_(None)).order_by(N.id).limit(chunk_size).all()
+        if not chunk:
+            break
+        hashed = {row.id: url_hash(row.url or f"missing:{row.id}") for row in chunk}
+        taken = {h for (h,) in db.query(N.url_hash).filter(N.url_hash.in_(set(hashed.values())))}
+
+        updates, duplicates = [], []
+        for row in chunk:
+            h = hashed[row.id]
+            if h in taken:
+                duplicates.append(row.id)
+                continue
+            taken.add(h)
+            updates.append({"id": row.id, "url_hash": h, "title_hash": title_fingerprint(row.title or "")})
+
+        if duplicates:
+            db.query(N).filter(N.id.in_(duplicates)).delete(synchronize_session=False)
+        if updates:
+            db.bulk_update_mappings(N, updates)
+        db.commit()
+        updated += len(updates)
+    return updated
+
+
+def article_row(comp: Any, article: Any, source_type: str) -> Dict[str, Any]:
+    """Ingestion row for a news_monitor NewsArticle fetched for a competitor."""
+    from news_feed import parse_published_date
+    return {
+        "competitor_id": comp.id,
+        "competitor_name": comp.name,
+        "title": article.title,
+        "url": article.url,
+        "source": article.source,
+        "source_type": source_type,
+        "published_at": parse_published_date(article.published_date),
+        "snippet": article.snippet,
+        "sentiment": article.sentiment,
+        "event_type": article.event_type,
+        "is_major_event": article.is_major_event,
+    }
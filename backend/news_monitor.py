@@ -1,18 +1,40 @@
 """
-Certify Intel - Real-Time News Monitor (v5.0.7)
+Certify Intel - Real-Time News Monitor (v5.2.1)
 Fetches and analyzes competitor news from multiple sources.
 
 v5.0.3: Added SEC EDGAR and USPTO patent integration for government data sources.
 v5.0.4: Added GNews, MediaStack, and NewsData.io API integrations (Phase 3).
 v5.0.5: Added Hugging Face ML sentiment analysis (Phase 4).
 v5.0.7: Added dimension tagging integration for Sales & Marketing module.
+v5.2.1: Sources are fetched in parallel with per-source timeouts, error isolation,
+        an overall deadline (partial results) and per-source latency stats.
+v5.2.1: Near-duplicate copies of a story (MinHash on headline and lede) are collapsed
+        into one canonical article with the other sources attached as references,
+        so sentiment, event detection and dimension tagging run once per story.
+v5.2.1: fetch_news(incremental=True), used by cache refreshes, polls each source
+        from its stored state: conditional GETs for RSS, "newer than" queries for
+        the news APIs, and only unseen items go on to analysis (news_fetch_state).
+        The high-water marks move only when the caller commits the digest's
+        fetch_state after storing the articles (commit_fetch_state).
+
+Configuration (environment):
+    NEWS_SOURCE_TIMEOUT_SECONDS    Per-source timeout (default 15)
+    NEWS_SOURCE_TIMEOUTS           Per-source overrides, e.g. "sec_edgar=25,uspto=10"
+    NEWS_FETCH_DEADLINE_SECONDS    Max time for all sources of one company (default 20)
+    NEWS_FETCH_MAX_WORKERS         Threads shared by all concurrent fetches (default 32)
+    NEWS_CLUSTERING_ENABLED        Collapse near-duplicate articles (default true, see news_clustering)
+    NEWS_INCREMENTAL_ENABLED       Incremental polling on cache refreshes (default true, see news_fetch_state)
 """
 import os
 import re
 import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass, asdict
+import urllib.error
 import urllib.parse
 import urllib.request
 import xml.etree.ElementTree as ET
@@ -48,6 +70,10 @@ except ImportError:
     ML_SENTIMENT_AVAILABLE = False
     print("ML sentiment not available, using keyword-based")
 
+from news_clustering import cluster_near_duplicates, CLUSTERING_ENABLED
+from keyword_matcher import KeywordMatcher
+from news_fetch_state import FetchState, PendingFetch, get_fetch_state_store, INCREMENTAL_ENABLED
+
 # Dimension tagging for Sales & Marketing module (v5.0.7)
 try:
     from dimension_analyzer import DimensionAnalyzer
@@ -69,6 +95,7 @@ class NewsArticle:
     is_major_event: bool
     event_type: Optional[str]  # funding, acquisition, product_launch, partnership
     dimension_tags: Optional[List[Dict[str, Any]]] = None  # v5.0.7: dimension classifications
+    references: Optional[List[Dict[str, str]]] = None  # v5.2.1: syndicated copies (title, url, source, published_date)
 
 
 @dataclass
@@ -80,6 +107,59 @@ class NewsDigest:
     sentiment_breakdown: Dict[str, int]
     major_events: List[NewsArticle]
     fetched_at: str
+    source_stats: Optional[Dict[str, Dict[str, Any]]] = None  # v5.2.1: per-source status/latency
+    clustering: Optional[Dict[str, int]] = None  # v5.2.1: articles_in, stories, copies_collapsed
+    fetch_state: Optional[List[PendingFetch]] = None  # v5.2.1: incremental marks to commit once stored
+
+
+# ============== Source Fan-out (v5.2.1) ==============
+
+# Shared by every NewsMonitor so parallel refreshes cannot spawn unbounded threads
+_source_executor: Optional[ThreadPoolExecutor] = None
+_source_executor_lock = threading.Lock()
+
+# Rolling per-source latency/outcome counters across all fetches
+_source_latency: Dict[str, Dict[str, Any]] = {}
+_source_latency_lock = threading.Lock()
+
+
+def _get_source_executor() -> ThreadPoolExecutor:
+    global _source_executor
+    with _source_executor_lock:
+        if _source_executor is None:
+            _source_executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv("NEWS_FETCH_MAX_WORKERS", "32")),
+                thread_name_prefix="news-source"
+            )
+        return _source_executor
+
+
+def _record_source_latency(source: str, status: str, latency_ms: float, article_count: int):
+    with _source_latency_lock:
+        stats = _source_latency.setdefault(source, {
+            "calls": 0, "ok": 0, "timeout": 0, "error": 0,
+            "total_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0, "articles": 0
+        })
+        stats["calls"] += 1
+        stats[status] += 1
+        stats["total_ms"] += latency_ms
+        stats["max_ms"] = max(stats["max_ms"], latency_ms)
+        stats["last_ms"] = latency_ms
+        stats["articles"] += article_count
+
+
+def get_source_latency_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-source call counts, outcomes and latency (avg/max/last ms) since startup."""
+    with _source_latency_lock:
+        result = {}
+        for source, stats in _source_latency.items():
+            entry = dict(stats)
+            entry["avg_ms"] = round(stats["total_ms"] / stats["calls"], 1) if stats["calls"] else 0.0
+            entry["max_ms"] = round(stats["max_ms"], 1)
+            entry["last_ms"] = round(stats["last_ms"], 1)
+            del entry["total_ms"]
+            result[source] = entry
+    return dict(sorted(result.items(), key=lambda item: -item[1]["avg_ms"]))
 
 
 class NewsMonitor:
@@ -95,9 +175,22 @@ class NewsMonitor:
         "expansion": ["expands", "opens", "enters", "growth", "expansion"]
     }
     
+    # Structured government records: distinct filings can have near-identical titles
+    UNCLUSTERED_SOURCES = {"SEC EDGAR", "USPTO Patents"}
+
+    # Sources polled incrementally on cache refreshes (the government scrapers have their own caches)
+    INCREMENTAL_SOURCES = ("google_news", "newsapi", "bing_news", "gnews", "mediastack", "newsdata")
+
+    # Bing News freshness values, narrowest first (the API has no arbitrary "since")
+    BING_FRESHNESS = (("Day", timedelta(days=1)), ("Week", timedelta(days=7)), ("Month", timedelta(days=30)))
+
     # Sentiment keywords
     POSITIVE_KEYWORDS = ["growth", "success", "award", "wins", "leading", "innovative", "raises", "expands"]
     NEGATIVE_KEYWORDS = ["layoffs", "lawsuit", "breach", "decline", "struggles", "loses", "cuts", "failed"]
+
+    # Compiled once: every keyword list is checked in a single pass over the text
+    _EVENT_MATCHER = KeywordMatcher(EVENT_KEYWORDS)
+    _SENTIMENT_MATCHER = KeywordMatcher({"positive": POSITIVE_KEYWORDS, "negative": NEGATIVE_KEYWORDS})
     
     def __init__(
         self,
@@ -144,58 +237,53 @@ class NewsMonitor:
         # Initialize scrapers if available
         self.sec_scraper = SECEdgarScraper() if self.include_sec else None
         self.patent_scraper = USPTOScraper() if self.include_patents else None
+
+        # v5.2.1: Parallel fan-out limits
+        self.source_timeout = float(os.getenv("NEWS_SOURCE_TIMEOUT_SECONDS", "15"))
+        self.source_timeouts = {}
+        for override in os.getenv("NEWS_SOURCE_TIMEOUTS", "").split(","):
+            name, _, seconds = override.partition("=")
+            if name.strip() and seconds.strip():
+                self.source_timeouts[name.strip()] = float(seconds)
+        self.fetch_deadline = float(os.getenv("NEWS_FETCH_DEADLINE_SECONDS", "20"))
+
+        # v5.2.1: Collapse syndicated copies before analysis
+        self.cluster_articles = CLUSTERING_ENABLED
+
+        # v5.2.1: Per-source polling state for incremental refreshes
+        self.fetch_state = get_fetch_state_store() if INCREMENTAL_ENABLED else None
     
-    def fetch_news(self, company_name: str, days: int = 90) -> NewsDigest:
+    def fetch_news(self, company_name: str, days: int = 90, incremental: bool = False) -> NewsDigest:
         """
         Fetch news for a company from all available sources.
 
         Args:
             company_name: Name of the company
             days: Number of days to look back (default: 90 days / 3 months)
+            incremental: Only return items not seen by earlier incremental fetches
+                (v5.2.1). For callers that persist results, i.e. news cache refreshes;
+                live lookups leave this off to get the whole window. The caller
+                passes the digest to commit_fetch_state once the articles are stored.
 
         Returns:
             NewsDigest with articles and analysis
         """
-        articles = []
-
-        # Try Google News RSS (free, no API key needed)
-        google_articles = self._fetch_google_news(company_name)
-        articles.extend(google_articles)
-
-        # Try NewsAPI if key available
-        if self.newsapi_key:
-            newsapi_articles = self._fetch_newsapi(company_name, days)
-            articles.extend(newsapi_articles)
-
-        # Try Bing News if key available
-        if self.bing_news_key:
-            bing_articles = self._fetch_bing_news(company_name)
-            articles.extend(bing_articles)
-
-        # v5.0.3: SEC EDGAR filings (free, no API key needed)
-        if self.include_sec:
-            sec_articles = self._fetch_sec_filings(company_name, days)
-            articles.extend(sec_articles)
-
-        # v5.0.3: USPTO patent news (free, no API key needed)
-        if self.include_patents:
-            patent_articles = self._fetch_patent_news(company_name)
-            articles.extend(patent_articles)
-
-        # v5.0.4: GNews API (100 req/day free)
-        if self.gnews_api_key:
-            gnews_articles = self._fetch_gnews(company_name)
-            articles.extend(gnews_articles)
-
-        # v5.0.4: MediaStack API (500 req/month free)
-        if self.mediastack_api_key:
-            mediastack_articles = self._fetch_mediastack(company_name)
-            articles.extend(mediastack_articles)
-
-        # v5.0.4: NewsData.io API (200 req/day free, tech/healthcare specialty)
-        if self.newsdata_api_key:
-            newsdata_articles = self._fetch_newsdata(company_name)
-            articles.extend(newsdata_articles)
+        states: Dict[str, FetchState] = {}
+        pending: List[PendingFetch] = []
+        if incremental and self.fetch_state:
+            window_start = datetime.utcnow() - timedelta(days=days)
+            states = {name: self.fetch_state.get(name, company_name) for name in self.INCREMENTAL_SOURCES}
+            for state in states.values():
+                state.last_status = None  # Set by sources that report it (RSS: ok / not_modified / error)
+                if not state.covers(window_start):
+                    state.etag = state.last_modified = None  # A 304 must not hide the older part of the window
+
+        # v5.2.1: All sources run in parallel; results are merged in source order
+        sources = self._news_sources(company_name, days, states) if states else self._news_sources(company_name, days)
+        source_results, source_stats = self._fetch_sources_parallel(sources)
+        if states:
+            source_results, pending = self._apply_fetch_state(sources, source_results, source_stats, states, days)
+        articles = [article for result in source_results for article in result]
 
         # Deduplicate by URL
         seen_urls = set()
@@ -205,6 +293,11 @@ class NewsMonitor:
                 seen_urls.add(article.url)
                 unique_articles.append(article)
 
+        # v5.2.1: One canonical article per story; copies become references
+        clustering = None
+        if self.cluster_articles:
+            unique_articles, clustering = self._collapse_near_duplicates(unique_articles)
+
         # Analyze articles (skip for gov sources which already have sentiment/event)
         # v5.0.5: Use batch processing for ML sentiment when available
         self._analyze_sentiment_batch(unique_articles)
@@ -232,24 +325,238 @@ class NewsMonitor:
             total_count=len(unique_articles),
             sentiment_breakdown=sentiment_counts,
             major_events=major_events,  # Include ALL major events
-            fetched_at=datetime.utcnow().isoformat()
+            fetched_at=datetime.utcnow().isoformat(),
+            source_stats=source_stats,
+            clustering=clustering,
+            fetch_state=pending if states else None
         )
+
+    def commit_fetch_state(self, digest: NewsDigest, stored: Optional[List[NewsArticle]] = None) -> int:
+        """
+        Advance the incremental marks of a fetch_news(incremental=True) digest
+        once its articles are stored (v5.2.1).
+
+        Args:
+            digest: The digest whose articles were stored
+            stored: The articles actually stored, when the caller kept only some;
+                sources with a new item outside them keep their old mark
+
+        Returns:
+            Number of source states advanced
+        """
+        if not digest.fetch_state or not self.fetch_state:
+            return 0
+        stored_urls = None
+        if stored is not None:
+            stored_urls = {a.url for a in stored}
+            stored_urls.update(ref["url"] for a in stored for ref in (a.references or []))
+        return self.fetch_state.commit(digest.fetch_state, stored_urls)
+
+    def _collapse_near_duplicates(self, articles: List[NewsArticle]) -> tuple:
+        """
+        Merge syndicated copies of the same story.
+
+        The first copy in source merge order is kept as canonical (matching the
+        "first URL wins" dedupe above); the others are attached to it as
+        references and dropped from the analysis list.
+
+        Returns:
+            (canonical articles in original order, clustering stats)
+        """
+        candidates = [a for a in articles if a.source not in self.UNCLUSTERED_SOURCES]
+        clusters = cluster_near_duplicates([(a.title, a.snippet) for a in candidates])
+
+        dropped = set()
+        for members in clusters:
+            canonical = candidates[members[0]]
+            copies = [candidates[i] for i in members[1:]]
+            if not copies:
+                continue
+            canonical.references = [
+                {"title": c.title, "url": c.url, "source": c.source, "published_date": c.published_date}
+                for c in copies
+            ]
+            # Keep a snippet if the canonical copy came without one
+            if not canonical.snippet:
+                canonical.snippet = next((c.snippet for c in copies if c.snippet), "")
+            dropped.update(id(c) for c in copies)
+
+        kept = [a for a in articles if id(a) not in dropped]
+        return kept, {
+            "articles_in": len(articles),
+            "stories": len(kept),
+            "copies_collapsed": len(dropped),
+        }
+
+    def source_timeout_for(self, name: str) -> float:
+        """Timeout for one source: its NEWS_SOURCE_TIMEOUTS override, else NEWS_SOURCE_TIMEOUT_SECONDS."""
+        return self.source_timeouts.get(name, self.source_timeout)
+
+    def _news_sources(self, company_name: str, days: int, states: Optional[Dict[str, FetchState]] = None) -> List[tuple]:
+        """Enabled sources as (name, fetch function) in merge order (first URL wins)."""
+        states = states or {}
+        window_start = datetime.utcnow() - timedelta(days=days)
+        since = {name: state.since(window_start) for name, state in states.items() if state.newest_published_at}
+        timeout = self.source_timeout_for
+
+        sources = [("google_news", lambda: self._fetch_google_news(  # Free, no API key
+            company_name, state=states.get("google_news"), since=since.get("google_news"),
+            timeout=timeout("google_news")))]
+        if self.newsapi_key:
+            sources.append(("newsapi", lambda: self._fetch_newsapi(
+                company_name, days, since=since.get("newsapi"), timeout=timeout("newsapi"))))
+        if self.bing_news_key:
+            sources.append(("bing_news", lambda: self._fetch_bing_news(
+                company_name, since=since.get("bing_news"), timeout=timeout("bing_news"))))
+        if self.include_sec:
+            sources.append(("sec_edgar", lambda: self._fetch_sec_filings(company_name, days, timeout=timeout("sec_edgar"))))
+        if self.include_patents:
+            sources.append(("uspto", lambda: self._fetch_patent_news(company_name, timeout=timeout("uspto"))))
+        if self.gnews_api_key:
+            sources.append(("gnews", lambda: self._fetch_gnews(
+                company_name, since=since.get("gnews"), timeout=timeout("gnews"))))
+        if self.mediastack_api_key:
+            sources.append(("mediastack", lambda: self._fetch_mediastack(
+                company_name, since=since.get("mediastack"), timeout=timeout("mediastack"))))
+        if self.newsdata_api_key:
+            sources.append(("newsdata", lambda: self._fetch_newsdata(company_name, timeout=timeout("newsdata"))))
+        return sources
+
+    def _apply_fetch_state(
+        self,
+        sources: List[tuple],
+        source_results: List[List[NewsArticle]],
+        source_stats: Dict[str, Dict[str, Any]],
+        states: Dict[str, FetchState],
+        days: int
+    ) -> tuple:
+        """
+        Drop items older than each source's stored high-water mark and prepare
+        the advances for commit_fetch_state. Sources that failed or timed out
+        get none, so the next refresh asks for the same range again.
+
+        Returns:
+            (article lists in source order, [PendingFetch])
+        """
+        from news_feed import parse_published_date
+
+        now = datetime.utcnow()
+        window_start = now - timedelta(days=days)
+        filtered, pending = [], []
+        for (name, _), articles in zip(sources, source_results):
+            state = states.get(name)
+            if state is None:
+                filtered.append(articles)
+                continue
+            dated = [(a, parse_published_date(a.published_date)) for a in articles]
+            fresh = [a for a, published in dated if state.is_unseen(a.url, published, window_start)]
+            self.fetch_state.record("items_skipped", len(articles) - len(fresh))
+            filtered.append(fresh)
+
+            if source_stats.get(name, {}).get("status") != "ok" or state.last_status == "error":
+                continue
+            state.last_status = state.last_status or "ok"
+            state.last_fetched_at = now
+            state.last_new_items = len(fresh)
+            source_stats[name]["new_articles"] = len(fresh)
+            pending.append(PendingFetch(
+                state=state, items=[(a.url, published) for a, published in dated],
+                new_urls=[a.url for a in fresh], fetched_at=now, window_start=window_start,
+            ))
+        return filtered, pending
+
+    def _fetch_sources_parallel(self, sources: List[tuple]) -> tuple:
+        """
+        Run every source concurrently and collect what finishes in time.
+
+        Each source is cut off after its own timeout (source_timeouts, else
+        source_timeout); everything still running at fetch_deadline is abandoned
+        and the articles gathered so far are returned. A source raising an
+        exception only loses its own articles.
+
+        Returns:
+            (list of article lists in source order, {source: {status, latency_ms, articles}})
+        """
+        executor = _get_source_executor()
+        start = time.monotonic()
+        deadline = start + self.fetch_deadline
+        finished_at: Dict[str, float] = {}
+
+        def cutoff(name):
+            return min(deadline, start + self.source_timeout_for(name))
+
+        def run(name, fetch):
+            try:
+                return fetch()
+            finally:
+                finished_at[name] = time.monotonic()
+
+        futures = {executor.submit(run, name, fetch): name for name, fetch in sources}
+        results: Dict[str, List[NewsArticle]] = {}
+        stats: Dict[str, Dict[str, Any]] = {}
+
+        pending, timed_out = set(futures), set()
+        while pending:
+            now = time.monotonic()
+            expired = {f for f in pending if not f.done() and now >= cutoff(futures[f])}
+            timed_out |= expired
+            pending -= expired
+            if not pending:
+                break
+            next_cutoff = min(cutoff(futures[f]) for f in pending)
+            done, pending = wait(pending, timeout=next_cutoff - now, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = futures[future]
+                latency_ms = (finished_at.get(name, time.monotonic()) - start) * 1000
+                try:
+                    results[name] = future.result() or []
+                    stats[name] = {"status": "ok", "latency_ms": round(latency_ms, 1), "articles": len(results[name])}
+                except Exception as e:
+                    print(f"News source {name} failed: {e}")
+                    stats[name] = {"status": "error", "latency_ms": round(latency_ms, 1), "articles": 0, "error": str(e)}
+
+        for future in timed_out:
+            name = futures[future]
+            future.cancel()
+            latency_ms = (time.monotonic() - start) * 1000
+            print(f"News source {name} timed out after {latency_ms:.0f}ms; continuing with partial results")
+            stats[name] = {"status": "timeout", "latency_ms": round(latency_ms, 1), "articles": 0}
+
+        for name, entry in stats.items():
+            _record_source_latency(name, entry["status"], entry["latency_ms"], entry["articles"])
+
+        ordered = [results.get(name, []) for name, _ in sources]
+        return ordered, {name: stats[name] for name, _ in sources if name in stats}
     
-    def _fetch_google_news(self, company_name: str) -> List[NewsArticle]:
+    def _fetch_google_news(
+        self,
+        company_name: str,
+        state: Optional[FetchState] = None,
+        since: Optional[datetime] = None,
+        timeout: Optional[float] = None
+    ) -> List[NewsArticle]:
         """
         Fetch news from Google News.
 
         v5.0.3: Uses pygooglenews library when available for enhanced features.
         Falls back to raw RSS parsing if pygooglenews not installed.
+        v5.2.1: Incremental fetches pass the source's state (RSS conditional GET)
+                and since (pygooglenews date filter); timeout bounds the RSS request.
         """
         # Try enhanced pygooglenews first (v5.0.3)
         if self.use_pygooglenews and self.google_news_client:
-            return self._fetch_google_news_enhanced(company_name)
+            return self._fetch_google_news_enhanced(company_name, state=state, since=since, timeout=timeout)
 
         # Fallback to raw RSS parsing
-        return self._fetch_google_news_rss(company_name)
+        return self._fetch_google_news_rss(company_name, state=state, timeout=timeout)
 
-    def _fetch_google_news_enhanced(self, company_name: str) -> List[NewsArticle]:
+    def _fetch_google_news_enhanced(
+        self,
+        company_name: str,
+        state: Optional[FetchState] = None,
+        since: Optional[datetime] = None,
+        timeout: Optional[float] = None
+    ) -> List[NewsArticle]:
         """
         Fetch news using pygooglenews library.
 
@@ -258,8 +565,12 @@ class NewsMonitor:
         articles = []
 
         try:
-            # Search for company news
-            search_result = self.google_news_client.search(f'"{company_name}"')
+            # Search for company news (v5.2.1: only days since the last item seen)
+            if since:
+                self.fetch_state.record("incremental_requests")
+                search_result = self.google_news_client.search(f'"{company_name}"', from_=since.strftime("%Y-%m-%d"))
+            else:
+                search_result = self.google_news_client.search(f'"{company_name}"')
 
             if search_result and 'entries' in search_result:
                 for entry in search_result['entries']:
@@ -281,12 +592,25 @@ class NewsMonitor:
         except Exception as e:
             print(f"pygooglenews fetch failed: {e}, falling back to RSS")
             # Fallback to RSS if pygooglenews fails
-            return self._fetch_google_news_rss(company_name)
+            return self._fetch_google_news_rss(company_name, state=state, timeout=timeout)
+
+        if state is not None:
+            state.last_status = "ok"
 
         return articles
 
-    def _fetch_google_news_rss(self, company_name: str) -> List[NewsArticle]:
-        """Fetch news from Google News RSS (fallback method)."""
+    def _fetch_google_news_rss(
+        self,
+        company_name: str,
+        state: Optional[FetchState] = None,
+        timeout: Optional[float] = None
+    ) -> List[NewsArticle]:
+        """
+        Fetch news from Google News RSS (fallback method).
+
+        v5.2.1: With a fetch state the request is conditional; 304 Not Modified
+                returns no articles without downloading or parsing the feed.
+        """
         articles = []
 
         try:
@@ -294,8 +618,22 @@ class NewsMonitor:
             query = urllib.parse.quote(f'"{company_name}"')
             url = f"https://news.google.com/rss/search?q={query}&hl=en-US&gl=US&ceid=US:en"
 
-            with urllib.request.urlopen(url, timeout=15) as response:
-                content = response.read()
+            request = urllib.request.Request(url)
+            if state is not None:
+                for header, value in state.conditional_headers().items():
+                    request.add_header(header, value)
+                if state.etag or state.last_modified:
+                    self.fetch_state.record("conditional_requests")
+            try:
+                with urllib.request.urlopen(request, timeout=timeout or self.source_timeout) as response:
+                    content = response.read()
+                    validators = (response.headers.get("ETag"), response.headers.get("Last-Modified"))
+            except urllib.error.HTTPError as e:
+                if e.code == 304 and state is not None:
+                    state.last_status = "not_modified"
+                    self.fetch_state.record("not_modified")
+                    return articles
+                raise
 
             root = ET.fromstring(content)
 
@@ -328,25 +666,41 @@ class NewsMonitor:
                         event_type=None
                     ))
 
+            if state is not None:
+                state.etag, state.last_modified = validators
+                state.last_status = "ok"
+
         except Exception as e:
             print(f"Google News RSS fetch failed: {e}")
+            if state is not None:
+                state.last_status = "error"
 
         return articles
     
-    def _fetch_newsapi(self, company_name: str, days: int) -> List[NewsArticle]:
-        """Fetch news from NewsAPI.org."""
+    def _fetch_newsapi(
+        self,
+        company_name: str,
+        days: int,
+        since: Optional[datetime] = None,
+        timeout: Optional[float] = None
+    ) -> List[NewsArticle]:
+        """Fetch news from NewsAPI.org (v5.2.1: since narrows the window on incremental fetches)."""
         articles = []
         
         if not self.newsapi_key:
             return articles
         
         try:
-            from_date = (datetime.utcnow() - timedelta(days=days)).strftime("%Y-%m-%d")
+            if since:
+                self.fetch_state.record("incremental_requests")
+                from_date = since.strftime("%Y-%m-%dT%H:%M:%S")
+            else:
+                from_date = (datetime.utcnow() - timedelta(days=days)).strftime("%Y-%m-%d")
             # Search by company name only (most general)
             query = urllib.parse.quote(f'"{company_name}"')
             url = f"https://newsapi.org/v2/everything?q={query}&from={from_date}&sortBy=publishedAt&pageSize=100&apiKey={self.newsapi_key}"
             
-            with urllib.request.urlopen(url, timeout=15) as response:
+            with urllib.request.urlopen(url, timeout=timeout or self.source_timeout) as response:
                 data = json.loads(response.read())
             
             # Get ALL matching articles (up to 100 per source)
@@ -367,10 +721,23 @@ class NewsMonitor:
         
         return articles
     
-    def _fetch_bing_news(self, company_name: str) -> List[NewsArticle]:
-        """Fetch news from Bing News API."""
+    def _fetch_bing_news(
+        self,
+        company_name: str,
+        since: Optional[datetime] = None,
+        timeout: Optional[float] = None
+    ) -> List[NewsArticle]:
+        """
+        Fetch news from Bing News API.
+
+        v5.2.1: On incremental fetches since picks the narrowest freshness
+                (Day / Week / Month) that still reaches it; older items are
+                dropped here by datePublished.
+        """
+        from news_feed import parse_published_date
+
         articles = []
-        
+
         if not self.bing_news_key:
             return articles
         
@@ -378,15 +745,26 @@ class NewsMonitor:
             # Search by company name only (most general)
             query = urllib.parse.quote(f'"{company_name}"')
             url = f"https://api.bing.microsoft.com/v7.0/news/search?q={query}&count=100"
+            freshness = None
+            if since:
+                age = datetime.utcnow() - since
+                freshness = next((name for name, limit in self.BING_FRESHNESS if age <= limit), None)
+            if freshness:
+                self.fetch_state.record("incremental_requests")
+                url += f"&sortBy=Date&freshness={freshness}"
             
             req = urllib.request.Request(url)
             req.add_header("Ocp-Apim-Subscription-Key", self.bing_news_key)
             
-            with urllib.request.urlopen(req, timeout=15) as response:
+            with urllib.request.urlopen(req, timeout=timeout or self.source_timeout) as response:
                 data = json.loads(response.read())
             
             # Get ALL matching articles
             for item in data.get("value", []):
+                if since:
+                    published = parse_published_date(item.get("datePublished"))
+                    if published is not None and published < since:
+                        continue
                 articles.append(NewsArticle(
                     title=item.get("name", ""),
                     url=item.get("url", ""),
@@ -405,11 +783,17 @@ class NewsMonitor:
 
     # ============== Government Data Sources (v5.0.3) ==============
 
-    def _fetch_sec_filings(self, company_name: str, days: int = 90) -> List[NewsArticle]:
+    def _fetch_sec_filings(
+        self,
+        company_name: str,
+        days: int = 90,
+        timeout: Optional[float] = None
+    ) -> List[NewsArticle]:
         """
         Fetch SEC EDGAR filings as news articles.
 
         v5.0.3: Government data source - free, no API key needed.
+        v5.2.1: timeout bounds the company lookup, which runs off this thread.
         """
         articles = []
 
@@ -418,7 +802,9 @@ class NewsMonitor:
 
         try:
             # Get SEC filings formatted as news articles
-            sec_articles = self.sec_scraper.get_news_articles(company_name, days_back=days)
+            sec_articles = self.sec_scraper.get_news_articles(
+                company_name, days_back=days, timeout=timeout or self.source_timeout
+            )
 
             for item in sec_articles:
                 articles.append(NewsArticle(
@@ -437,11 +823,13 @@ class NewsMonitor:
 
         return articles
 
-    def _fetch_patent_news(self, company_name: str) -> List[NewsArticle]:
+    def _fetch_patent_news(self, company_name: str, timeout: Optional[float] = None) -> List[NewsArticle]:
         """
         Fetch USPTO patent filings as news articles.
 
         v5.0.3: Government data source - free, no API key needed.
+        v5.2.1: Takes timeout like every source; the patent data is built in,
+        so there is no request to bound yet.
         """
         articles = []
 
@@ -492,11 +880,17 @@ class NewsMonitor:
 
     # ============== Free News APIs (v5.0.4 - Phase 3) ==============
 
-    def _fetch_gnews(self, company_name: str) -> List[NewsArticle]:
+    def _fetch_gnews(
+        self,
+        company_name: str,
+        since: Optional[datetime] = None,
+        timeout: Optional[float] = None
+    ) -> List[NewsArticle]:
         """
         Fetch news from GNews API.
 
         v5.0.4: 100 requests/day free tier.
+        v5.2.1: since narrows the window on incremental fetches.
         API docs: https://gnews.io/docs/v4
 
         Features:
@@ -514,8 +908,11 @@ class NewsMonitor:
             # GNews API endpoint
             query = urllib.parse.quote(f'"{company_name}"')
             url = f"https://gnews.io/api/v4/search?q={query}&lang=en&country=us&max=50&apikey={self.gnews_api_key}"
+            if since:
+                self.fetch_state.record("incremental_requests")
+                url += f"&sortby=publishedAt&from={since.strftime('%Y-%m-%dT%H:%M:%SZ')}"
 
-            with urllib.request.urlopen(url, timeout=15) as response:
+            with urllib.request.urlopen(url, timeout=timeout or self.source_timeout) as response:
                 data = json.loads(response.read())
 
             for item in data.get("articles", []):
@@ -535,11 +932,17 @@ class NewsMonitor:
 
         return articles
 
-    def _fetch_mediastack(self, company_name: str) -> List[NewsArticle]:
+    def _fetch_mediastack(
+        self,
+        company_name: str,
+        since: Optional[datetime] = None,
+        timeout: Optional[float] = None
+    ) -> List[NewsArticle]:
         """
         Fetch news from MediaStack API.
 
         v5.0.4: 500 requests/month free tier.
+        v5.2.1: since narrows the window (by day) on incremental fetches.
         API docs: https://mediastack.com/documentation
 
         Features:
@@ -557,8 +960,11 @@ class NewsMonitor:
             # MediaStack API endpoint (note: free tier uses HTTP, not HTTPS)
             query = urllib.parse.quote(company_name)
             url = f"http://api.mediastack.com/v1/news?access_key={self.mediastack_api_key}&keywords={query}&languages=en&limit=50"
+            if since:
+                self.fetch_state.record("incremental_requests")
+                url += f"&sort=published_desc&date={since.strftime('%Y-%m-%d')},{datetime.utcnow().strftime('%Y-%m-%d')}"
 
-            with urllib.request.urlopen(url, timeout=15) as response:
+            with urllib.request.urlopen(url, timeout=timeout or self.source_timeout) as response:
                 data = json.loads(response.read())
 
             for item in data.get("data", []):
@@ -578,7 +984,7 @@ class NewsMonitor:
 
         return articles
 
-    def _fetch_newsdata(self, company_name: str) -> List[NewsArticle]:
+    def _fetch_newsdata(self, company_name: str, timeout: Optional[float] = None) -> List[NewsArticle]:
         """
         Fetch news from NewsData.io API.
 
@@ -602,7 +1008,7 @@ class NewsMonitor:
             # Use health and technology category filters for better relevance
             url = f"https://newsdata.io/api/1/news?apikey={self.newsdata_api_key}&q={query}&language=en"
 
-            with urllib.request.urlopen(url, timeout=15) as response:
+            with urllib.request.urlopen(url, timeout=timeout or self.source_timeout) as response:
                 data = json.loads(response.read())
 
             for item in data.get("results", []):
@@ -658,10 +1064,9 @@ class NewsMonitor:
 
     def _keyword_sentiment(self, text: str) -> str:
         """Keyword-based sentiment analysis fallback."""
-        text_lower = text.lower()
-
-        positive_count = sum(1 for word in self.POSITIVE_KEYWORDS if word in text_lower)
-        negative_count = sum(1 for word in self.NEGATIVE_KEYWORDS if word in text_lower)
+        counts = self._SENTIMENT_MATCHER.counts(text)
+        positive_count = counts.get("positive", 0)
+        negative_count = counts.get("negative", 0)
 
         if positive_count > negative_count:
             return "positive"
@@ -710,52 +1115,42 @@ class NewsMonitor:
     
     def _detect_event_type(self, text: str) -> Optional[str]:
         """Detect if text indicates a major event."""
-        text_lower = text.lower()
-
-        for event_type, keywords in self.EVENT_KEYWORDS.items():
-            if any(keyword in text_lower for keyword in keywords):
-                return event_type
-
-        return None
+        return self._EVENT_MATCHER.first(text)
 
     def _tag_dimensions_batch(self, articles: List[NewsArticle], company_name: str) -> None:
         """
         Tag articles with competitive dimensions.
 
         v5.0.7: Uses DimensionAnalyzer to classify articles by dimension.
+        v5.2.1: One batched classification for all articles; keyword hits and
+                articles with no dimension signal never reach the LLM.
 
         Args:
             articles: List of NewsArticle objects to tag (modified in place)
             company_name: Name of the competitor
         """
-        if not self.dimension_analyzer:
+        if not self.dimension_analyzer or not articles:
             return
 
-        for article in articles:
-            try:
-                # Classify which dimensions this article relates to
-                dimension_matches = self.dimension_analyzer.classify_article_dimension(
-                    title=article.title,
-                    snippet=article.snippet,
-                    competitor_name=company_name
-                )
-
-                # Convert to list of dicts with dimension info
-                if dimension_matches:
-                    article.dimension_tags = [
-                        {
-                            "dimension_id": dim_id,
-                            "confidence": confidence,
-                            "sentiment": article.sentiment
-                        }
-                        for dim_id, confidence in dimension_matches
-                    ]
-                else:
-                    article.dimension_tags = []
+        try:
+            all_matches = self.dimension_analyzer.classify_articles_batch(
+                [(article.title, article.snippet) for article in articles],
+                competitor_name=company_name
+            )
+        except Exception as e:
+            print(f"Dimension tagging failed: {e}")
+            all_matches = [[] for _ in articles]
 
-            except Exception as e:
-                print(f"Dimension tagging failed for article: {e}")
-                article.dimension_tags = []
+        for article, dimension_matches in zip(articles, all_matches):
+            # Convert to list of dicts with dimension info
+            article.dimension_tags = [
+                {
+                    "dimension_id": dim_id,
+                    "confidence": confidence,
+                    "sentiment": article.sentiment
+                }
+                for dim_id, confidence in dimension_matches
+            ]
 
     def store_dimension_tags(
         self,
@@ -883,6 +1278,8 @@ def fetch_competitor_news(
         "sentiment_breakdown": digest.sentiment_breakdown,
         "major_events": [asdict(a) for a in digest.major_events],
         "dimension_breakdown": dimension_counts,  # v5.0.7
+        "source_stats": digest.source_stats,  # v5.2.1
+        "clustering": digest.clustering,  # v5.2.1
         "fetched_at": digest.fetched_at
     }
 
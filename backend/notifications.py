@@ -9,6 +9,8 @@ from datetime import datetime
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
 
+from keyword_matcher import KeywordMatcher
+
 
 # ============== Slack Integration ==============
 
@@ -291,6 +293,7 @@ class AlertRuleEngine:
     
     def __init__(self):
         self.rules: List[AlertRule] = []
+        self._contains_matcher: Optional[KeywordMatcher] = None
         self._load_rules()
     
     def _load_rules(self):
@@ -342,6 +345,7 @@ class AlertRuleEngine:
     def evaluate(self, competitor_name: str, field: str, old_value: Any, new_value: Any) -> List[AlertRule]:
         """Evaluate which rules match a change."""
         matched_rules = []
+        contains_hits = None  # "contains" values found in new_value, one pass for all rules
         
         for rule in self.rules:
             if not rule.active:
@@ -356,7 +360,12 @@ class AlertRuleEngine:
                 continue
             
             # Check condition
-            if self._check_condition(rule, old_value, new_value):
+            if rule.condition == "contains":
+                if contains_hits is None:
+                    contains_hits = self._get_contains_matcher().find(str(new_value))
+                if rule.value and rule.value.lower() in contains_hits:
+                    matched_rules.append(rule)
+            elif self._check_condition(rule, old_value, new_value):
                 matched_rules.append(rule)
         
         return matched_rules
@@ -384,13 +393,23 @@ class AlertRuleEngine:
                 return False
         return False
     
+    def _get_contains_matcher(self) -> KeywordMatcher:
+        """Compiled matcher over every "contains" rule value, rebuilt after rule changes."""
+        if self._contains_matcher is None:
+            self._contains_matcher = KeywordMatcher({
+                "contains": [r.value for r in self.rules if r.condition == "contains" and r.value]
+            })
+        return self._contains_matcher
+    
     def add_rule(self, rule: AlertRule):
         """Add a new rule."""
         self.rules.append(rule)
+        self._contains_matcher = None
     
     def remove_rule(self, rule_id: str):
         """Remove a rule by ID."""
         self.rules = [r for r in self.rules if r.id != rule_id]
+        self._contains_matcher = None
     
     def get_rules(self) -> List[Dict[str, Any]]:
         """Get all rules as dicts."""
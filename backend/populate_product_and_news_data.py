@@ -384,7 +384,7 @@ def populate_news_cache(db) -> Dict[str, int]:
                             url=article.get("url", ""),
                             source=article.get("source", "Unknown"),
                             source_type=article.get("source_type", "unknown"),
-                            published_at=pub_date,
+                            published_at=pub_date or datetime.utcnow(),
                             snippet=article.get("snippet", "")[:1000] if article.get("snippet") else None,
                             sentiment=article.get("sentiment", "neutral"),
                             event_type=article.get("event_type"),
@@ -416,38 +416,9 @@ def populate_news_cache(db) -> Dict[str, int]:
 
 
 def _parse_date(date_str: Optional[str]) -> Optional[datetime]:
-    """Parse various date formats."""
-    if not date_str:
-        return None
-
-    try:
-        # Common formats
-        formats = [
-            "%Y-%m-%dT%H:%M:%SZ",
-            "%Y-%m-%dT%H:%M:%S",
-            "%a, %d %b %Y %H:%M:%S %z",
-            "%a, %d %b %Y %H:%M:%S GMT",
-            "%Y-%m-%d %H:%M:%S",
-            "%Y-%m-%d",
-        ]
-
-        for fmt in formats:
-            try:
-                return datetime.strptime(str(date_str).strip(), fmt)
-            except ValueError:
-                continue
-
-        # Try dateutil
-        try:
-            from dateutil import parser
-            return parser.parse(str(date_str))
-        except Exception:
-            pass
-
-    except Exception:
-        pass
-
-    return None
+    """Parse various date formats to a naive UTC datetime."""
+    from news_feed import parse_published_date
+    return parse_published_date(date_str)
 
 
 # ==============================================================================
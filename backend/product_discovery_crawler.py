@@ -24,13 +24,15 @@ from urllib.parse import urljoin, urlparse
 
 # Playwright for web scraping
 try:
-    from playwright.async_api import async_playwright, Page, Browser
+    from playwright.async_api import Page, Browser
     PLAYWRIGHT_AVAILABLE = True
 except ImportError:
     PLAYWRIGHT_AVAILABLE = False
     Page = object
     Browser = object
 
+from browser_pool import BrowserPool, get_browser_pool
+
 # AI for product extraction
 try:
     from gemini_provider import GeminiProvider
@@ -138,18 +140,19 @@ class ProductDiscoveryCrawler:
     4. Sitemap parsing
     """
 
-    def __init__(self, use_ai: bool = True, headless: bool = True):
+    def __init__(self, use_ai: bool = True, headless: Optional[bool] = None):
         """
         Initialize the crawler.
 
         Args:
             use_ai: Whether to use AI for product extraction
-            headless: Whether to run browser in headless mode
+            headless: Whether to run browser in headless mode (None: the shared
+                pool's BROWSER_POOL_HEADLESS setting)
         """
         self.use_ai = use_ai and (GEMINI_AVAILABLE or OPENAI_AVAILABLE)
         self.headless = headless
-        self.browser = None
-        self.playwright = None
+        self.pool = None
+        self._own_pool: Optional[BrowserPool] = None
 
         # Initialize AI provider
         self.gemini_provider = None
@@ -162,15 +165,18 @@ class ProductDiscoveryCrawler:
     async def __aenter__(self):
         if not PLAYWRIGHT_AVAILABLE:
             raise RuntimeError("Playwright not installed. Run: pip install playwright && playwright install chromium")
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(headless=self.headless)
+        # v5.2.1: Browsers come from the shared pool instead of a per-crawler launch
+        self.pool = get_browser_pool()
+        if self.headless is not None and self.headless != self.pool.headless:
+            # A different display mode (e.g. headed for debugging) gets a private single-browser pool
+            self.pool = self._own_pool = BrowserPool(pool_size=1, headless=self.headless)
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.browser:
-            await self.browser.close()
-        if self.playwright:
-            await self.playwright.stop()
+        if self._own_pool is not None:
+            await self._own_pool.close()
+            self._own_pool = None
+        self.pool = None
 
     async def discover_products(
         self,
@@ -195,7 +201,7 @@ class ProductDiscoveryCrawler:
             website=website
         )
 
-        if not self.browser:
+        if not self.pool:
             result.errors.append("Browser not initialized")
             return result
 
@@ -204,46 +210,44 @@ class ProductDiscoveryCrawler:
             website = f"https://{website}"
 
         try:
-            context = await self.browser.new_context(
+            async with self.pool.context(
                 viewport={"width": 1920, "height": 1080},
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            )
-            page = await context.new_page()
+            ) as context:
+                page = await context.new_page()
 
-            # Strategy 1: Find and crawl Products/Solutions pages
-            product_urls = await self._find_product_pages(page, website)
-            result.discovery_sources.append("website_navigation")
+                # Strategy 1: Find and crawl Products/Solutions pages
+                product_urls = await self._find_product_pages(page, website)
+                result.discovery_sources.append("website_navigation")
 
-            # Strategy 2: Crawl each product page
-            for url in product_urls[:10]:  # Limit to 10 pages
-                try:
-                    products = await self._extract_products_from_page(page, url)
-                    result.products_found.extend(products)
-                    result.pages_crawled += 1
-                except Exception as e:
-                    result.errors.append(f"Error crawling {url}: {str(e)[:50]}")
-
-            # Strategy 3: AI extraction from homepage if few products found
-            if len(result.products_found) < 3 and self.use_ai:
-                try:
-                    ai_products = await self._ai_extract_products(page, website, competitor_name)
-                    # Add products not already discovered
-                    existing_names = {p.product_name.lower() for p in result.products_found}
-                    for product in ai_products:
-                        if product.product_name.lower() not in existing_names:
-                            result.products_found.append(product)
-                    result.discovery_sources.append("ai_extraction")
-                except Exception as e:
-                    result.errors.append(f"AI extraction error: {str(e)[:50]}")
-
-            # Deduplicate products
-            result.products_found = self._deduplicate_products(result.products_found)
-
-            # Mark primary product (most mentioned or first in navigation)
-            if result.products_found:
-                result.products_found[0].is_primary_product = True
-
-            await context.close()
+                # Strategy 2: Crawl each product page
+                for url in product_urls[:10]:  # Limit to 10 pages
+                    try:
+                        products = await self._extract_products_from_page(page, url)
+                        result.products_found.extend(products)
+                        result.pages_crawled += 1
+                    except Exception as e:
+                        result.errors.append(f"Error crawling {url}: {str(e)[:50]}")
+
+                # Strategy 3: AI extraction from homepage if few products found
+                if len(result.products_found) < 3 and self.use_ai:
+                    try:
+                        ai_products = await self._ai_extract_products(page, website, competitor_name)
+                        # Add products not already discovered
+                        existing_names = {p.product_name.lower() for p in result.products_found}
+                        for product in ai_products:
+                            if product.product_name.lower() not in existing_names:
+                                result.products_found.append(product)
+                        result.discovery_sources.append("ai_extraction")
+                    except Exception as e:
+                        result.errors.append(f"AI extraction error: {str(e)[:50]}")
+
+                # Deduplicate products
+                result.products_found = self._deduplicate_products(result.products_found)
+
+                # Mark primary product (most mentioned or first in navigation)
+                if result.products_found:
+                    result.products_found[0].is_primary_product = True
 
         except Exception as e:
             result.errors.append(f"Crawl error: {str(e)[:100]}")
@@ -48,28 +48,17 @@ def generate_executive_pdf(db: Session = Depends(get_db)):
     elements.append(Paragraph("Executive Intelligence Summary", title_style))
     elements.append(Spacer(1, 12))
     
-    # Helper to parse numbers
-    def parse_number(s):
-        if not s: return 0
-        import re
-        # Remove currency symbols, commas, plus signs
-        s_clean = re.sub(r'[^\d.]', '', str(s))
-        if not s_clean: return 0
-        try:
-            return float(s_clean)
-        except ValueError:
-            return 0
-
     # Summary Statistics
     total_comps = len(competitors)
     avg_customers = 0
     avg_price = 0
     
     if total_comps > 0:
-        total_customers = sum(parse_number(c.customer_count) for c in competitors)
+        # Typed metric columns (v5.2.1) instead of re-parsing the text fields
+        total_customers = sum(c.customer_count_value or 0 for c in competitors)
         avg_customers = int(total_customers / total_comps)
         
-        total_price = sum(parse_number(c.base_price) for c in competitors)
+        total_price = sum(c.base_price_value or 0 for c in competitors)
         avg_price = int(total_price / total_comps)
 
     stats_data = [
@@ -96,7 +85,7 @@ def generate_executive_pdf(db: Session = Depends(get_db)):
     # Top Competitors
     elements.append(Paragraph("Top Competitors by Market Presence", styles['Heading2']))
     # Sort by parsed customer count
-    top_competitors = sorted(competitors, key=lambda x: parse_number(x.customer_count), reverse=True)[:10]
+    top_competitors = sorted(competitors, key=lambda x: x.customer_count_value or 0, reverse=True)[:10]
     
     comp_data = [['Competitor', 'Customers', 'Price', 'G2 Rating']]
     for c in top_competitors:
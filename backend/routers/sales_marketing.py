@@ -19,7 +19,7 @@ from datetime import datetime
 import json
 import io
 
-from database import SessionLocal, get_db, Competitor
+from database import SessionLocal, get_db, Competitor, CompetitorMetricsRollup
 from sales_marketing_module import (
     SalesMarketingModule,
     DimensionID,
@@ -27,6 +27,7 @@ from sales_marketing_module import (
     SCORE_LABELS
 )
 from dimension_analyzer import DimensionAnalyzer
+from analytics_rollup import PRIORITY_BUCKETS, get_metrics_rollup, row_to_priority_entry, version_info
 from battlecard_generator import BattlecardGenerator, BATTLECARD_TEMPLATES
 
 router = APIRouter(prefix="/api/sales-marketing", tags=["Sales & Marketing"])
@@ -962,54 +963,20 @@ async def get_sales_priority_matrix(
     Get sales priority matrix based on threat level and dimension weaknesses.
 
     Helps sales teams prioritize which competitors to focus on.
+    Buckets and weakness/strength lists are precomputed in the metrics rollup.
     """
-    competitors = db.query(Competitor).filter(Competitor.is_deleted == False).all()
-
-    matrix = {
-        "high_priority": [],
-        "medium_priority": [],
-        "low_priority": [],
-        "not_assessed": []
-    }
-
-    for comp in competitors:
-        # Count weaknesses (score <= 2)
-        weaknesses = []
-        strengths = []
-
-        for dim_id in DimensionID:
-            score = getattr(comp, f"dim_{dim_id.value}_score", None)
-            if score is not None:
-                if score <= 2:
-                    weaknesses.append(dim_id.value)
-                elif score >= 4:
-                    strengths.append(dim_id.value)
+    rollup = get_metrics_rollup()
+    state = rollup.current_state(db)
 
-        comp_data = {
-            "id": comp.id,
-            "name": comp.name,
-            "threat_level": comp.threat_level,
-            "overall_score": comp.dim_overall_score,
-            "weakness_count": len(weaknesses),
-            "strength_count": len(strengths),
-            "weaknesses": weaknesses,
-            "strengths": strengths
-        }
-
-        # Prioritization logic
-        if not weaknesses and not strengths:
-            matrix["not_assessed"].append(comp_data)
-        elif comp.threat_level == "High" and len(weaknesses) > 0:
-            matrix["high_priority"].append(comp_data)
-        elif comp.threat_level in ["High", "Medium"] or len(weaknesses) >= 3:
-            matrix["medium_priority"].append(comp_data)
-        else:
-            matrix["low_priority"].append(comp_data)
+    matrix = {bucket: [] for bucket in PRIORITY_BUCKETS}
+    for row in rollup.rows(db).order_by(CompetitorMetricsRollup.competitor_id):
+        matrix[row.sales_priority].append(row_to_priority_entry(row))
 
-    # Sort each category
+    # Sort each category: most weaknesses first, then lowest overall score
     for category in matrix.values():
-        category.sort(key=lambda x: (x["weakness_count"], -x.get("overall_score", 0)), reverse=True)
+        category.sort(key=lambda x: (x["weakness_count"], -(x["overall_score"] or 0)), reverse=True)
 
+    matrix["rollup"] = version_info(state)
     return matrix
 
 
@@ -27,6 +27,8 @@ from enum import Enum
 import json
 import logging
 
+from keyword_matcher import KeywordMatcher
+
 logger = logging.getLogger(__name__)
 
 
@@ -697,6 +699,18 @@ def get_score_label(score: int) -> str:
     return SCORE_LABELS.get(score, "Unknown")
 
 
+# Keywords and review signals of every dimension, compiled once for one-pass matching
+DIMENSION_SIGNAL_MATCHER = KeywordMatcher({
+    dim.value: meta.get("keywords", []) + meta.get("review_signals", [])
+    for dim, meta in DIMENSION_METADATA.items()
+})
+
+
+def match_dimension_signals(text: str) -> Dict[str, int]:
+    """Dimension ID -> number of its keywords/review signals in the text (one pass for all dimensions)."""
+    return DIMENSION_SIGNAL_MATCHER.counts(text)
+
+
 def calculate_dimension_match(
     text: str,
     dimension_id: str
@@ -709,12 +723,7 @@ def calculate_dimension_match(
     if not meta:
         return False, 0.0
 
-    text_lower = text.lower()
-    keywords = meta.get("keywords", [])
-    review_signals = meta.get("review_signals", [])
-
-    all_signals = keywords + review_signals
-    matches = sum(1 for signal in all_signals if signal.lower() in text_lower)
+    matches = match_dimension_signals(text).get(dimension_id, 0)
 
     if matches == 0:
         return False, 0.0
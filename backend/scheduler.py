@@ -22,7 +22,8 @@ from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR
 
 from scraper import CompetitorScraper, ScrapeResult
-from extractor import GPTExtractor, ExtractedData
+from extractor import GPTExtractor, EnhancedGPTExtractor, ExtractedData
+from content_ranker import get_content_ranker
 from database import SessionLocal, Competitor, ChangeLog, RefreshSession
 
 # Configure logging
@@ -56,6 +57,9 @@ class CompetitorRefreshJob:
     def __init__(self):
         self.scraper = None
         self.extractor = GPTExtractor()
+        # v5.2.1: Pack all scraped pages of a competitor into as few LLM calls as fit the budget
+        self.batched_extraction = os.getenv("EXTRACTION_BATCHED", "true").lower() == "true"
+        self.batch_extractor = EnhancedGPTExtractor() if self.batched_extraction else None
 
     async def run_full_refresh(
         self,
@@ -108,7 +112,8 @@ class CompetitorRefreshJob:
             success_count = 0
             changes_total = 0
 
-            async with CompetitorScraper(headless=True) as scraper:
+            # Page types are scraped in parallel (bounded per domain)
+            async with CompetitorScraper(headless=True, concurrent_pages=True) as scraper:
                 for idx, competitor in enumerate(competitors, 1):
                     logger.info(f"[{idx}/{total_count}] Processing {competitor.name}...")
 
@@ -121,19 +126,13 @@ class CompetitorRefreshJob:
                         )
 
                         if scrape_result.success and scrape_result.pages:
-                            # Extract data from scraped content
-                            extractions = []
-                            for page in scrape_result.pages:
-                                try:
-                                    extracted = self.extractor.extract_from_content(
-                                        competitor.name,
-                                        page.content,
-                                        page.page_type
-                                    )
-                                    extractions.append(extracted)
-                                except Exception as ext_err:
-                                    logger.warning(f"Extraction failed for {competitor.name}/{page.page_type}: {ext_err}")
+                            # Prime cross-page boilerplate detection before extracting
+                            get_content_ranker().register_site_pages(
+                                competitor.name,
+                                {page.page_type: page.content for page in scrape_result.pages}
+                            )
 
+                            extractions = await self._extract_pages(competitor, scrape_result.pages)
                             if extractions:
                                 # Merge extractions
                                 merged = self.extractor.merge_extractions(extractions)
@@ -196,6 +195,39 @@ class CompetitorRefreshJob:
         finally:
             db.close()
     
+    async def _extract_pages(self, competitor: Competitor, pages: List) -> List[ExtractedData]:
+        """Extract every scraped page (batched when enabled) without blocking the event loop."""
+        if self.batch_extractor and self.batch_extractor.client:
+            result = await self.batch_extractor.aextract_batched(
+                competitor.name,
+                competitor.website,
+                {page.page_type: page.content for page in pages}
+            )
+            for warning in result.extraction_warnings:
+                logger.warning(f"{competitor.name}: {warning}")
+            batch_failed = any(w.startswith("Batched extraction failed") for w in result.extraction_warnings)
+            if result.field_sources or not batch_failed:
+                return [self.batch_extractor.to_extracted_data(result)]
+            # Every batch call failed; fall back to one call per page
+
+        # Extract all pages in parallel without blocking the event loop
+        outcomes = await asyncio.gather(
+            *(self.extractor.aextract_from_content(
+                competitor.name,
+                page.content,
+                page.page_type
+            ) for page in pages),
+            return_exceptions=True
+        )
+        extractions = []
+        for page, extracted in zip(pages, outcomes):
+            if isinstance(extracted, Exception):
+                logger.warning(f"Extraction failed for {competitor.name}/{page.page_type}: {extracted}")
+            else:
+                extractions.append(extracted)
+
+        return extractions
+
     def _update_competitor(self, db, competitor: Competitor, extracted: ExtractedData) -> List[ChangeLog]:
         """Update competitor data and log changes."""
         changes = []
@@ -330,6 +362,49 @@ def schedule_daily_backup():
     print("Scheduled daily database backup for 3 AM")
 
 
+def schedule_data_retention():
+    """Schedule the nightly log retention run (DATA_RETENTION_ENABLED=true)."""
+    from data_retention import RETENTION_ENABLED, run_scheduled_retention
+
+    if not RETENTION_ENABLED:
+        return
+
+    # Run every day at 4 AM, after the 3 AM backup
+    scheduler.add_job(
+        run_scheduled_retention,
+        CronTrigger(hour=4, minute=0),
+        id="daily_data_retention",
+        name="Daily Log Retention",
+        replace_existing=True
+    )
+    print("Scheduled daily log retention for 4 AM")
+
+
+def schedule_rollup_rebuild():
+    """Schedule the periodic full rebuild of the competitor metrics rollup."""
+    from analytics_rollup import REBUILD_MINUTES, get_metrics_rollup
+
+    if REBUILD_MINUTES <= 0:
+        return
+
+    def rebuild():
+        db = SessionLocal()
+        try:
+            get_metrics_rollup().rebuild(db)
+        finally:
+            db.close()
+
+    # Picks up competitor writes made by other processes or raw SQL
+    scheduler.add_job(
+        rebuild,
+        IntervalTrigger(minutes=REBUILD_MINUTES),
+        id="analytics_rollup_rebuild",
+        name="Analytics Rollup Rebuild",
+        replace_existing=True
+    )
+    print(f"Scheduled analytics rollup rebuild every {REBUILD_MINUTES} minutes")
+
+
 
 from discovery_agent import DiscoveryAgent
 
@@ -423,6 +498,8 @@ def start_scheduler():
     schedule_weekly_discovery()
     schedule_daily_high_priority_check()
     schedule_daily_backup()
+    schedule_rollup_rebuild()
+    schedule_data_retention()
     scheduler.start()
     print("Scheduler started!")
 
@@ -8,6 +8,8 @@ Enhanced Features:
 - Retry logic with exponential backoff
 - Screenshot capture
 - Better JavaScript handling
+- Shared browser pool (v5.2.1) - no Chromium launch per scrape job
+- HTTP-first fetch tier (v5.2.1) - Playwright only for JS-rendered pages
 """
 import asyncio
 import re
@@ -17,6 +19,7 @@ from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from urllib.parse import urljoin, urlparse
+from contextlib import asynccontextmanager
 import hashlib
 
 try:
@@ -30,6 +33,9 @@ except ImportError:
     PlaywrightTimeout = Exception
     print("Warning: Playwright not installed. Run: pip install playwright && playwright install chromium")
 
+from browser_pool import BrowserPool, get_browser_pool, BROWSER_LAUNCH_ARGS
+from http_fetcher import get_http_fetcher, FetchResult, FETCH_OK, FETCH_NEEDS_BROWSER
+
 
 @dataclass
 class ScrapedPage:
@@ -44,6 +50,7 @@ class ScrapedPage:
     meta_description: Optional[str] = None
     links_found: List[str] = field(default_factory=list)
     status_code: int = 200
+    fetched_via: str = "browser"  # "http" or "browser"
 
 
 @dataclass
@@ -90,6 +97,16 @@ class CompetitorScraper:
     - Retry logic with exponential backoff
     - Screenshot capture for visual verification
     - Better JavaScript handling with wait strategies
+
+    v5.2.1: Contexts are leased from the shared BrowserPool by default, so
+    entering the scraper no longer launches Chromium. A headless flag that
+    differs from the pool's BROWSER_POOL_HEADLESS gets a private one-browser
+    pool for the lifetime of the scraper. Pass use_pool=False to get a
+    dedicated browser instead.
+
+    v5.2.1: Pages are fetched over plain HTTP first and only escalated to
+    Playwright when they look JavaScript-rendered (see http_fetcher).
+    Pass http_first=False to always use the browser.
     """
 
     # Common page patterns for healthcare/SaaS companies
@@ -113,18 +130,41 @@ class CompetitorScraper:
     # Default pages to scrape for comprehensive analysis
     DEFAULT_PAGES = ["homepage", "pricing", "about", "products", "features", "customers", "integrations"]
 
+    # Heavy resources blocked on every scraped page
+    BLOCKED_RESOURCES = "**/*.{png,jpg,jpeg,gif,svg,mp4,webm,mp3,wav,woff,woff2,ttf}"
+
     def __init__(
         self,
-        headless: bool = True,
+        headless: Optional[bool] = None,
         timeout_ms: int = 30000,
         capture_screenshots: bool = False,
-        screenshot_dir: str = "./screenshots"
+        screenshot_dir: str = "./screenshots",
+        use_pool: bool = True,
+        concurrent_pages: Optional[bool] = None,
+        max_concurrency_per_domain: Optional[int] = None,
+        http_first: Optional[bool] = None
     ):
         self.headless = headless
         self.timeout_ms = timeout_ms
         self.capture_screenshots = capture_screenshots
         self.screenshot_dir = screenshot_dir
+        self.use_pool = use_pool
         self.browser: Optional[Browser] = None
+        self._own_pool: Optional[BrowserPool] = None
+
+        # v5.2.1: Concurrent multi-page mode (page types scraped in parallel)
+        if concurrent_pages is None:
+            concurrent_pages = os.getenv("SCRAPER_CONCURRENT_PAGES", "false").lower() == "true"
+        self.concurrent_pages = concurrent_pages
+        self.max_concurrency_per_domain = max(
+            1, max_concurrency_per_domain or int(os.getenv("SCRAPER_DOMAIN_CONCURRENCY", "4"))
+        )
+        self._domain_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+        # v5.2.1: HTTP-first fetch tier (screenshots always need the browser)
+        if http_first is None:
+            http_first = get_http_fetcher().enabled
+        self.http_first = http_first and not capture_screenshots
 
         # Create screenshot directory if needed
         if capture_screenshots and not os.path.exists(screenshot_dir):
@@ -132,30 +172,58 @@ class CompetitorScraper:
 
     async def __aenter__(self):
         if not PLAYWRIGHT_AVAILABLE:
+            if self.http_first:
+                # Server-rendered pages can still be scraped over HTTP
+                return self
             raise RuntimeError("Playwright is not installed")
+        if self.use_pool:
+            # Browsers are owned by the shared pool; nothing to launch
+            if self.headless is not None and self.headless != get_browser_pool().headless:
+                # A different display mode (e.g. headed for debugging) gets a private single-browser pool
+                self._own_pool = BrowserPool(pool_size=1, headless=self.headless)
+            return self
         self.playwright = await async_playwright().start()
         self.browser = await self.playwright.chromium.launch(
-            headless=self.headless,
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--disable-dev-shm-usage',
-                '--no-sandbox'
-            ]
+            headless=self.headless is not False,
+            args=BROWSER_LAUNCH_ARGS
         )
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._own_pool is not None:
+            await self._own_pool.close()
+            self._own_pool = None
         if self.browser:
             await self.browser.close()
         if hasattr(self, 'playwright'):
             await self.playwright.stop()
+
+    @property
+    def is_ready(self) -> bool:
+        """True if contexts can be opened (pooled, or dedicated browser launched)."""
+        return PLAYWRIGHT_AVAILABLE and (self.use_pool or self.browser is not None)
+
+    @asynccontextmanager
+    async def _open_context(self, **context_kwargs):
+        """Open an isolated browser context from the pool or the dedicated browser."""
+        if self.use_pool:
+            async with (self._own_pool or get_browser_pool()).context(**context_kwargs) as context:
+                yield context
+            return
+
+        context = await self.browser.new_context(**context_kwargs)
+        try:
+            yield context
+        finally:
+            await context.close()
     
     async def scrape_competitor(
         self,
         name: str,
         website: str,
         pages_to_scrape: List[str] = None,
-        discover_pages: bool = True
+        discover_pages: bool = True,
+        concurrent: Optional[bool] = None
     ) -> ScrapeResult:
         """
         Scrape a competitor's website comprehensively.
@@ -165,6 +233,7 @@ class CompetitorScraper:
             website: Base website URL
             pages_to_scrape: List of page types to scrape (uses DEFAULT_PAGES if None)
             discover_pages: If True, discover additional pages from navigation
+            concurrent: Scrape page types in parallel (defaults to self.concurrent_pages)
 
         Returns:
             ScrapeResult with all scraped pages
@@ -174,7 +243,10 @@ class CompetitorScraper:
         if pages_to_scrape is None:
             pages_to_scrape = self.DEFAULT_PAGES.copy()
 
-        if not self.browser:
+        if concurrent is None:
+            concurrent = self.concurrent_pages
+
+        if not self.is_ready and not self.http_first:
             return ScrapeResult(
                 competitor_name=name,
                 website=website,
@@ -189,48 +261,29 @@ class CompetitorScraper:
         total_content = 0
 
         try:
-            context = await self.browser.new_context(
-                viewport={"width": 1920, "height": 1080},
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
-                extra_http_headers={
-                    "Accept-Language": "en-US,en;q=0.9",
-                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                }
-            )
-            page = await context.new_page()
-
-            # Block unnecessary resources for faster scraping
-            await page.route("**/*.{png,jpg,jpeg,gif,svg,mp4,webm,mp3,wav,woff,woff2,ttf}", lambda route: route.abort())
-
-            # First, scrape homepage and discover navigation links
-            if discover_pages:
-                homepage_url = self._normalize_url(website)
-                nav_links = await self._discover_navigation_links(page, homepage_url)
-                discovered_pages = nav_links
-
-            # Scrape each requested page type
-            scraped_urls = set()  # Avoid duplicates
-
-            for page_type in pages_to_scrape:
-                urls_to_try = self._get_page_urls(website, page_type)
-
-                for url in urls_to_try:
-                    if url in scraped_urls:
-                        continue
-
-                    scraped = await self._scrape_page_with_retry(page, url, page_type, name)
-                    if scraped:
-                        scraped_pages.append(scraped)
-                        scraped_urls.add(url)
-                        total_content += len(scraped.content)
+            browser_page_types = pages_to_scrape
+            browser_discovery = discover_pages
+            if self.http_first:
+                browser_page_types, http_discovered = await self._scrape_pages_http(
+                    name, website, pages_to_scrape, discover_pages, concurrent, scraped_pages
+                )
+                if http_discovered is not None:
+                    discovered_pages = http_discovered
+                    browser_discovery = False
 
-                        # Capture screenshot if enabled
-                        if self.capture_screenshots and scraped.screenshot_path:
-                            screenshots.append(scraped.screenshot_path)
+            if (browser_page_types or browser_discovery) and not self.is_ready:
+                print(f"Browser unavailable; skipping JS-rendered pages for {name}: {browser_page_types}")
+                browser_page_types, browser_discovery = [], False
 
-                        break  # Found a working URL for this page type
+            if browser_page_types or browser_discovery:
+                discovered_pages = await self._scrape_pages_in_browser(
+                    name, website, browser_page_types, browser_discovery, concurrent, scraped_pages
+                ) or discovered_pages
 
-            await context.close()
+            self._finalize_pages(scraped_pages, pages_to_scrape)
+            total_content = sum(len(p.content) for p in scraped_pages)
+            if self.capture_screenshots:
+                screenshots = [p.screenshot_path for p in scraped_pages if p.screenshot_path]
 
             duration = (datetime.utcnow() - start_time).total_seconds()
 
@@ -246,6 +299,7 @@ class CompetitorScraper:
             )
 
         except Exception as e:
+            self._finalize_pages(scraped_pages, pages_to_scrape)
             duration = (datetime.utcnow() - start_time).total_seconds()
             return ScrapeResult(
                 competitor_name=name,
@@ -256,69 +310,385 @@ class CompetitorScraper:
                 total_content_length=total_content,
                 scrape_duration_seconds=duration
             )
-    
-    async def scrape(self, url: str) -> dict:
+
+    async def _scrape_pages_in_browser(
+        self,
+        name: str,
+        website: str,
+        pages_to_scrape: List[str],
+        discover_pages: bool,
+        concurrent: bool,
+        scraped_pages: List[ScrapedPage]
+    ) -> List[str]:
+        """Playwright tier: scrape the given page types in one browser context."""
+        async with self._open_context(
+            viewport={"width": 1920, "height": 1080},
+            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+            extra_http_headers={
+                "Accept-Language": "en-US,en;q=0.9",
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+            }
+        ) as context:
+            # Pages are appended to scraped_pages as they succeed so a
+            # mid-scrape failure still returns partial results
+            if concurrent:
+                return await self._scrape_pages_concurrently(
+                    context, name, website, pages_to_scrape, discover_pages, scraped_pages
+                )
+            return await self._scrape_pages_sequentially(
+                context, name, website, pages_to_scrape, discover_pages, scraped_pages
+            )
+
+    async def _scrape_pages_http(
+        self,
+        name: str,
+        website: str,
+        pages_to_scrape: List[str],
+        discover_pages: bool,
+        concurrent: bool,
+        scraped_pages: List[ScrapedPage]
+    ) -> Tuple[List[str], Optional[List[str]]]:
         """
-        Simple scrape method for compatibility with main.py calls.
-        Returns dict with extracted content from the website.
+        HTTP tier: try every page type with plain GETs before using the browser.
+
+        The homepage is fetched first; if it looks JavaScript-rendered the
+        domain is flagged and every page type goes straight to the browser.
+        Candidate URLs that return 404 are skipped here exactly as the browser
+        path would skip them, so only JS-rendered or blocked pages escalate.
+
+        Returns:
+            (page types that still need the browser,
+             discovered navigation links or None if discovery needs the browser)
         """
-        try:
-            if not self.browser:
-                return {"error": "Browser not initialized"}
+        fetcher = get_http_fetcher()
+        if fetcher.needs_browser(website):
+            return list(pages_to_scrape), None
+
+        semaphore = self._get_domain_semaphore(website)
+        homepage_url = self._normalize_url(website)
+        prefetched: Dict[str, FetchResult] = {}
+        discovered = None
+
+        if discover_pages or "homepage" in pages_to_scrape:
+            async with semaphore:
+                homepage = await fetcher.fetch(homepage_url)
+            prefetched[homepage_url] = homepage
+            if homepage.outcome == FETCH_OK and discover_pages:
+                discovered = fetcher.discover_navigation_links(homepage.html, homepage_url)
+
+        scraped_urls = set()
+
+        async def fetch_page_type(page_type: str) -> Tuple[Optional[ScrapedPage], bool]:
+            for url in self._get_page_urls(website, page_type):
+                if url in scraped_urls:
+                    continue
+                result = prefetched.get(url)
+                if result is None:
+                    async with semaphore:
+                        result = await fetcher.fetch(url)
+                if result.outcome == FETCH_OK:
+                    scraped_urls.add(url)
+                    return self._page_from_fetch(result, page_type), False
+                if result.outcome == FETCH_NEEDS_BROWSER:
+                    return None, True
+            return None, False
+
+        if concurrent:
+            outcomes = await asyncio.gather(*(fetch_page_type(pt) for pt in pages_to_scrape))
+        else:
+            outcomes = [await fetch_page_type(pt) for pt in pages_to_scrape]
+
+        needs_browser = []
+        for page_type, (scraped, escalate) in zip(pages_to_scrape, outcomes):
+            if scraped:
+                scraped_pages.append(scraped)
+            elif escalate:
+                needs_browser.append(page_type)
+
+        return needs_browser, discovered
+
+    def _page_from_fetch(self, result: FetchResult, page_type: str) -> ScrapedPage:
+        """Build a ScrapedPage from an HTTP-tier fetch."""
+        return ScrapedPage(
+            url=result.url,
+            title=result.title,
+            content=result.content,
+            html=result.html,
+            scraped_at=datetime.utcnow(),
+            page_type=page_type,
+            meta_description=result.meta_description,
+            links_found=result.links,
+            status_code=result.status_code,
+            fetched_via="http"
+        )
 
-            context = await self.browser.new_context(
-                viewport={"width": 1920, "height": 1080},
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
+    def _finalize_pages(self, scraped_pages: List[ScrapedPage], pages_to_scrape: List[str]):
+        """Drop URLs scraped by both tiers and restore requested page order (in place)."""
+        seen = set()
+        unique = []
+        for scraped in scraped_pages:
+            if scraped.url not in seen:
+                seen.add(scraped.url)
+                unique.append(scraped)
+        order = {page_type: idx for idx, page_type in enumerate(pages_to_scrape)}
+        unique.sort(key=lambda p: order.get(p.page_type, len(order)))
+        scraped_pages[:] = unique
+
+    async def _scrape_pages_sequentially(
+        self,
+        context,
+        name: str,
+        website: str,
+        pages_to_scrape: List[str],
+        discover_pages: bool,
+        scraped_pages: List[ScrapedPage]
+    ) -> List[str]:
+        """Scrape page types one at a time on a single page (original behaviour)."""
+        discovered_pages = []
+
+        page = await context.new_page()
+
+        # Block unnecessary resources for faster scraping
+        await page.route(self.BLOCKED_RESOURCES, lambda route: route.abort())
+
+        # First, scrape homepage and discover navigation links
+        if discover_pages:
+            homepage_url = self._normalize_url(website)
+            discovered_pages = await self._discover_navigation_links(page, homepage_url)
+
+        # Scrape each requested page type
+        tried_urls = set()  # Claimed by an earlier page type, or already failed
+
+        for page_type in pages_to_scrape:
+            urls_to_try = self._get_page_urls(website, page_type)
+
+            for url in urls_to_try:
+                if url in tried_urls:
+                    continue
+
+                tried_urls.add(url)
+                scraped = await self._scrape_page_with_retry(page, url, page_type, name)
+                if scraped:
+                    scraped_pages.append(scraped)
+                    break  # Found a working URL for this page type
+
+        return discovered_pages
+
+    async def _scrape_pages_concurrently(
+        self,
+        context,
+        name: str,
+        website: str,
+        pages_to_scrape: List[str],
+        discover_pages: bool,
+        scraped_pages: List[ScrapedPage]
+    ) -> List[str]:
+        """
+        Scrape all page types in parallel, each candidate URL on its own page.
+
+        The distinct candidate URLs are resolved up front: a URL listed by
+        several page types (e.g. /features) gets one task, and tasks are
+        created rank by rank (every page type's first URL, then every second
+        URL, ...) so the per-domain semaphore serves the most likely URLs
+        first. Page types then claim their highest-priority working URL in
+        request order, skipping URLs an earlier page type already claimed,
+        so the result matches sequential mode. Candidates no unresolved page
+        type can still use are cancelled as soon as each page type is settled.
+        """
+        semaphore = self._get_domain_semaphore(website)
+
+        discovery_task = None
+        if discover_pages:
+            discovery_task = asyncio.create_task(
+                self._discover_with_own_page(context, self._normalize_url(website), semaphore)
             )
-            page = await context.new_page()
 
-            # Block heavy resources
-            await page.route("**/*.{png,jpg,jpeg,gif,svg,mp4,webm}", lambda route: route.abort())
+        candidates = {
+            page_type: self._get_page_urls(website, page_type)
+            for page_type in pages_to_scrape
+        }
+        url_tasks: Dict[str, asyncio.Task] = {}
+        max_rank = max((len(urls) for urls in candidates.values()), default=0)
+        for rank in range(max_rank):
+            for page_type in pages_to_scrape:
+                urls = candidates[page_type]
+                if rank < len(urls) and urls[rank] not in url_tasks:
+                    url_tasks[urls[rank]] = asyncio.create_task(
+                        self._scrape_candidate(context, urls[rank], page_type, name, semaphore)
+                    )
 
-            url = self._normalize_url(url)
+        try:
+            claimed = await self._claim_candidates(pages_to_scrape, candidates, url_tasks)
+        finally:
+            leftover = [task for task in url_tasks.values() if not task.done()]
+            for task in leftover:
+                task.cancel()
+            if leftover:
+                await asyncio.gather(*leftover, return_exceptions=True)
+
+        scraped_pages.extend(claimed[page_type] for page_type in pages_to_scrape if page_type in claimed)
+
+        return await discovery_task if discovery_task else []
+
+    async def _claim_candidates(
+        self,
+        pages_to_scrape: List[str],
+        candidates: Dict[str, List[str]],
+        url_tasks: Dict[str, asyncio.Task]
+    ) -> Dict[str, ScrapedPage]:
+        """Give each page type its best working URL that no earlier page type claimed."""
+        claimed: Dict[str, ScrapedPage] = {}
+        claimed_urls = set()
+
+        for idx, page_type in enumerate(pages_to_scrape):
+            for url in candidates[page_type]:
+                if url in claimed_urls:
+                    continue
+                task = url_tasks[url]
+                await asyncio.wait([task])
+                scraped = None if task.cancelled() or task.exception() else task.result()
+                if scraped:
+                    scraped.page_type = page_type  # The task may have been created for another page type
+                    claimed[page_type] = scraped
+                    claimed_urls.add(url)
+                    break
+
+            # Candidates only this or earlier page types listed can no longer win
+            still_wanted = {url for later in pages_to_scrape[idx + 1:] for url in candidates[later]}
+            for url, task in url_tasks.items():
+                if url not in still_wanted and not task.done():
+                    task.cancel()
+
+        return claimed
+
+    async def _scrape_candidate(
+        self,
+        context,
+        url: str,
+        page_type: str,
+        competitor_name: str,
+        semaphore: asyncio.Semaphore
+    ) -> Optional[ScrapedPage]:
+        """Scrape one candidate URL on a dedicated page, bounded by the domain limit."""
+        async with semaphore:
+            page = await context.new_page()
+            try:
+                await page.route(self.BLOCKED_RESOURCES, lambda route: route.abort())
+                return await self._scrape_page_with_retry(page, url, page_type, competitor_name)
+            finally:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
 
-            # Retry logic
-            last_error = None
-            for attempt in range(self.MAX_RETRIES):
+    async def _discover_with_own_page(
+        self,
+        context,
+        homepage_url: str,
+        semaphore: asyncio.Semaphore
+    ) -> List[str]:
+        """Navigation discovery on a dedicated page (concurrent mode)."""
+        async with semaphore:
+            page = await context.new_page()
+            try:
+                await page.route(self.BLOCKED_RESOURCES, lambda route: route.abort())
+                return await self._discover_navigation_links(page, homepage_url)
+            finally:
                 try:
-                    response = await page.goto(
-                        url,
-                        wait_until="domcontentloaded",
-                        timeout=self.timeout_ms
-                    )
+                    await page.close()
+                except Exception:
+                    pass
+
+    def _get_domain_semaphore(self, website: str) -> asyncio.Semaphore:
+        """Per-domain concurrency limit shared by every scrape on this scraper."""
+        domain = urlparse(self._normalize_url(website)).netloc.lower()
+        if domain.startswith("www."):
+            domain = domain[4:]
+        if domain not in self._domain_semaphores:
+            self._domain_semaphores[domain] = asyncio.Semaphore(self.max_concurrency_per_domain)
+        return self._domain_semaphores[domain]
 
-                    if response and response.status < 400:
-                        break
-                except PlaywrightTimeout:
-                    last_error = f"Timeout on attempt {attempt + 1}"
-                    await asyncio.sleep(2 ** attempt)  # Exponential backoff
-                except Exception as e:
-                    last_error = str(e)
-                    await asyncio.sleep(2 ** attempt)
-            else:
-                await context.close()
-                return {"error": last_error or "Failed after retries"}
+    async def scrape(self, url: str) -> dict:
+        """
+        Simple scrape method for compatibility with main.py calls.
+        Returns dict with extracted content from the website.
+        """
+        try:
+            url = self._normalize_url(url)
 
-            # Wait for JavaScript to execute
-            await page.wait_for_timeout(2000)
+            if self.http_first:
+                result = await get_http_fetcher().fetch(url)
+                if result.outcome == FETCH_OK:
+                    return {
+                        "content": result.content,
+                        "title": result.title,
+                        "url": url,
+                        "meta_description": result.meta_description,
+                        "success": True,
+                        "fetched_via": "http"
+                    }
+                if result.outcome != FETCH_NEEDS_BROWSER:
+                    return {"error": f"HTTP fetch failed ({result.reason})"}
 
-            # Extract text content
-            content = await self._extract_text_content(page)
-            title = await page.title()
-            meta_desc = await self._get_meta_description(page)
+            if not self.is_ready:
+                return {"error": "Browser not initialized"}
 
-            await context.close()
+            async with self._open_context(
+                viewport={"width": 1920, "height": 1080},
+                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
+            ) as context:
+                page = await context.new_page()
+
+                # Block heavy resources
+                await page.route("**/*.{png,jpg,jpeg,gif,svg,mp4,webm}", lambda route: route.abort())
+
+                # Retry logic
+                last_error = None
+                for attempt in range(self.MAX_RETRIES):
+                    try:
+                        response = await page.goto(
+                            url,
+                            wait_until="domcontentloaded",
+                            timeout=self.timeout_ms
+                        )
+
+                        if response and response.status < 400:
+                            break
+                    except PlaywrightTimeout:
+                        last_error = f"Timeout on attempt {attempt + 1}"
+                        await asyncio.sleep(2 ** attempt)  # Exponential backoff
+                    except Exception as e:
+                        last_error = str(e)
+                        await asyncio.sleep(2 ** attempt)
+                else:
+                    return {"error": last_error or "Failed after retries"}
+
+                # Wait for JavaScript to execute
+                await self._wait_for_render(page)
+
+                # Extract text content
+                content = await self._extract_text_content(page)
+                title = await page.title()
+                meta_desc = await self._get_meta_description(page)
 
             return {
                 "content": content,
                 "title": title,
                 "url": url,
                 "meta_description": meta_desc,
-                "success": True
+                "success": True,
+                "fetched_via": "browser"
             }
         except Exception as e:
             return {"error": str(e)}
 
+    async def _wait_for_render(self, page: Page, max_wait_ms: int = 2000):
+        """Wait for the network to go idle, capped at the old fixed 2s delay."""
+        try:
+            await page.wait_for_load_state("networkidle", timeout=max_wait_ms)
+        except Exception:
+            pass  # Long-polling pages never go idle; content is usually there by now
+
     def _normalize_url(self, url: str) -> str:
         """Normalize URL to have proper scheme."""
         if not url:
@@ -490,7 +860,7 @@ class CompetitorScraper:
                 return None
 
             # Wait for JavaScript to execute
-            await page.wait_for_timeout(2000)
+            await self._wait_for_render(page)
 
             # Try to wait for common content containers
             try:
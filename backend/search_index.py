@@ -0,0 +1,291 @@
+"""
+Certify Intel - Full-Text Search (v5.2.1)
+SQLite FTS5 index over cached news, the knowledge base and change history.
+
+Each source table gets an external-content FTS5 table (the text is not stored
+twice) kept current by AFTER INSERT/UPDATE/DELETE triggers, so every write
+path - ORM sessions, bulk news ingestion, raw SQL - is indexed without
+application code. Triggers only fire for the indexed columns, so cache-expiry
+refreshes do not touch the index.
+
+search() runs one MATCH query per source, ranks with bm25 (titles weighted
+above body text), and returns HTML-escaped titles and snippets with matches
+wrapped in <mark>. On databases without FTS5 (e.g. PostgreSQL) it falls back
+to LIKE scans with the same result shape.
+
+Served by GET /api/search.
+"""
+import html
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import or_, text
+from sqlalchemy.orm import Session
+
+
+@dataclass(frozen=True)
+class SearchSource:
+    """One searchable table and how its rows become results."""
+    name: str
+    fts_table: str
+    content_table: str
+    columns: Tuple[str, ...]  # Indexed columns, in FTS column order
+    weights: Tuple[float, ...]  # bm25 weight per column
+    title_column: int  # FTS column index highlighted as the title
+    snippet_column: int  # FTS column index used for the snippet (-1: best matching column)
+
+
+SOURCES: Dict[str, SearchSource] = {
+    "news": SearchSource(
+        name="news", fts_table="news_article_cache_fts", content_table="news_article_cache",
+        columns=("title", "snippet", "competitor_name"), weights=(10.0, 2.0, 1.0),
+        title_column=0, snippet_column=1,
+    ),
+    "knowledge_base": SearchSource(
+        name="knowledge_base", fts_table="knowledge_base_fts", content_table="knowledge_base",
+        columns=("title", "content_text"), weights=(10.0, 1.0),
+        title_column=0, snippet_column=1,
+    ),
+    "changes": SearchSource(
+        name="changes", fts_table="data_change_history_fts", content_table="data_change_history",
+        columns=("field_name", "competitor_name", "old_value", "new_value", "change_reason"),
+        weights=(4.0, 4.0, 1.0, 2.0, 1.0),
+        title_column=0, snippet_column=-1,
+    ),
+}
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+SNIPPET_TOKENS = 24
+
+# Sentinels marking matches inside FTS output; the text is escaped before they become <mark>
+_OPEN, _CLOSE = "\x02", "\x03"
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+# ============== Index maintenance ==============
+
+_fts5_support: Dict[str, bool] = {}
+
+
+def fts5_available(bind) -> bool:
+    """Whether the database is SQLite built with FTS5 (probed once per database URL)."""
+    if bind.dialect.name != "sqlite":
+        return False
+    key = str(bind.url)
+    if key not in _fts5_support:
+        try:
+            with bind.connect() as conn:
+                conn.execute(text("CREATE VIRTUAL TABLE temp._fts5_probe USING fts5(x)"))
+                conn.execute(text("DROP TABLE temp._fts5_probe"))
+            _fts5_support[key] = True
+        except Exception:
+            _fts5_support[key] = False
+    return _fts5_support[key]
+
+
+def index_ready(db: Session) -> bool:
+    """FTS5 tables exist for every source (ensure_search_index has run on this database)."""
+    if not fts5_available(db.get_bind()):
+        return False
+    names = [s.fts_table for s in SOURCES.values()]
+    found = db.execute(
+        text(f"SELECT count(*) FROM sqlite_master WHERE type = 'table' AND name IN ({', '.join(f':n{i}' for i in range(len(names)))})"),
+        {f"n{i}": name for i, name in enumerate(names)}
+    ).scalar()
+    return found == len(names)
+
+
+def _trigger_sql(source: SearchSource) -> List[str]:
+    cols = ", ".join(source.columns)
+    new_vals = ", ".join(f"new.{c}" for c in source.columns)
+    old_vals = ", ".join(f"old.{c}" for c in source.columns)
+    fts, table = source.fts_table, source.content_table
+    delete_old = f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_vals});"
+    insert_new = f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_vals});"
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def ensure_search_index(bind) -> List[str]:
+    """
+    Create the FTS5 tables and triggers if missing, building each new index
+    from its source table. Returns the sources that were (re)built; [] when
+    FTS5 is unavailable or everything already exists.
+    """
+    if not fts5_available(bind):
+        return []
+    built = []
+    with bind.begin() as conn:
+        for source in SOURCES.values():
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": source.fts_table}
+            ).first()
+            if not exists:
+                conn.execute(text(
+                    f"CREATE VIRTUAL TABLE {source.fts_table} USING fts5("
+                    f"{', '.join(source.columns)}, content='{source.content_table}', content_rowid='id', "
+                    f"tokenize='porter unicode61')"
+                ))
+                conn.execute(text(f"INSERT INTO {source.fts_table}({source.fts_table}) VALUES ('rebuild')"))
+                built.append(source.name)
+            for statement in _trigger_sql(source):
+                conn.execute(text(statement))
+    return built
+
+
+def rebuild_search_index(bind) -> List[str]:
+    """Re-read every source table into its index (after restoring a backup, bulk edits with triggers off, ...)."""
+    if not fts5_available(bind):
+        return []
+    ensure_search_index(bind)
+    with bind.begin() as conn:
+        for source in SOURCES.values():
+            conn.execute(text(f"INSERT INTO {source.fts_table}({source.fts_table}) VALUES ('rebuild')"))
+    return list(SOURCES)
+
+
+# ============== Queries ==============
+
+def query_terms(query: str) -> List[str]:
+    return _TERM.findall((query or "").lower())
+
+
+def build_match_expression(terms: Sequence[str]) -> str:
+    """All terms must appear; each is quoted (no FTS syntax from users) and prefix-matched."""
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def render_highlight(value: Optional[str]) -> str:
+    """Escape FTS output for HTML, then turn match sentinels into <mark> tags."""
+    escaped = html.escape(value or "")
+    return escaped.replace(_OPEN, "<mark>").replace(_CLOSE, "</mark>")
+
+
+def _highlight_terms(value: Optional[str], terms: Sequence[str], max_chars: Optional[int] = None) -> str:
+    """Python-side highlighting for the LIKE fallback, same output format as FTS."""
+    value = value or ""
+    pattern = re.compile("|".join(re.escape(t) for t in terms), re.IGNORECASE) if terms else None
+    if max_chars and len(value) > max_chars:
+        first = pattern.search(value) if pattern else None
+        start = max(0, (first.start() if first else 0) - max_chars // 4)
+        value = ("…" if start else "") + value[start:start + max_chars] + "…"
+    if pattern:
+        value = pattern.sub(lambda m: f"{_OPEN}{m.group()}{_CLOSE}", value)
+    return render_highlight(value)
+
+
+def _fts_rows(db: Session, source: SearchSource, match: str, competitor_id: Optional[int], limit: int):
+    fts = source.fts_table
+    weights = ", ".join(str(w) for w in source.weights)
+    where = [f"{fts} MATCH :match"]
+    if source.name == "knowledge_base":
+        where.append("t.is_active = 1")
+    elif competitor_id:
+        where.append("t.competitor_id = :competitor_id")
+    params = {"match": match, "competitor_id": competitor_id, "limit": limit,
+              "open": _OPEN, "close": _CLOSE, "ellipsis": "…", "tokens": SNIPPET_TOKENS}
+    rows = db.execute(text(
+        f"SELECT t.*, highlight({fts}, {source.title_column}, :open, :close) AS hl_title, "
+        f"snippet({fts}, {source.snippet_column}, :open, :close, :ellipsis, :tokens) AS hl_snippet, "
+        f"bm25({fts}, {weights}) AS rank "
+        f"FROM {fts} JOIN {source.content_table} t ON t.id = {fts}.rowid "
+        f"WHERE {' AND '.join(where)} ORDER BY rank LIMIT :limit"
+    ), params).mappings().all()
+    total = db.execute(text(
+        f"SELECT count(*) FROM {fts} JOIN {source.content_table} t ON t.id = {fts}.rowid WHERE {' AND '.join(where)}"
+    ), params).scalar()
+    return rows, total
+
+
+def _like_rows(db: Session, source: SearchSource, terms: Sequence[str], competitor_id: Optional[int], limit: int):
+    from database import NewsArticleCache, KnowledgeBaseItem, DataChangeHistory
+
+    model = {"news": NewsArticleCache, "knowledge_base": KnowledgeBaseItem, "changes": DataChangeHistory}[source.name]
+    query = db.query(model)
+    for term in terms:
+        query = query.filter(or_(*[getattr(model, c).ilike(f"%{term}%") for c in source.columns]))
+    if source.name == "knowledge_base":
+        query = query.filter(model.is_active == True)
+    elif competitor_id:
+        query = query.filter(model.competitor_id == competitor_id)
+    date_column = {"news": "published_at", "knowledge_base": "created_at", "changes": "changed_at"}[source.name]
+    total = query.count()
+    rows = []
+    for item in query.order_by(getattr(model, date_column).desc()).limit(limit):
+        row = {c.name: getattr(item, c.name) for c in model.__table__.columns}
+        body = " … ".join(str(row[c]) for c in source.columns[1:] if row.get(c)) if source.snippet_column < 0 \
+            else row.get(source.columns[source.snippet_column])
+        row["hl_title"] = row.get(source.columns[source.title_column])
+        row["hl_snippet"] = body
+        row["rank"] = 0.0
+        rows.append(row)
+    return rows, total
+
+
+def _to_result(source: SearchSource, row: Dict[str, Any], terms: Sequence[str], fts: bool) -> Dict[str, Any]:
+    if fts:
+        title, snippet = render_highlight(row["hl_title"]), render_highlight(row["hl_snippet"])
+    else:
+        title = _highlight_terms(row["hl_title"], terms)
+        snippet = _highlight_terms(row["hl_snippet"], terms, max_chars=SNIPPET_TOKENS * 8)
+
+    def iso(value):
+        # Raw SQL returns SQLite's "YYYY-MM-DD HH:MM:SS" text; match the ORM's isoformat()
+        return value.isoformat() if hasattr(value, "isoformat") else (value or "").replace(" ", "T", 1) or None
+
+    result = {"type": source.name, "id": row["id"], "score": -float(row["rank"] or 0.0),
+              "title": title, "snippet": snippet}
+    if source.name == "news":
+        result.update(competitor_id=row["competitor_id"], competitor_name=row["competitor_name"],
+                      url=row["url"], source=row["source"], date=iso(row["published_at"]))
+    elif source.name == "knowledge_base":
+        result.update(source_type=row["source_type"], date=iso(row["created_at"]))
+    else:
+        result.update(competitor_id=row["competitor_id"], competitor_name=row["competitor_name"],
+                      field_name=row["field_name"], changed_by=row["changed_by"], date=iso(row["changed_at"]))
+        result["title"] = f"{html.escape(row['competitor_name'] or '')}: {title}" if row["competitor_name"] else title
+    return result
+
+
+def search(
+    db: Session,
+    query: str,
+    types: Optional[Sequence[str]] = None,
+    competitor_id: Optional[int] = None,
+    limit: int = DEFAULT_LIMIT
+) -> Dict[str, Any]:
+    """
+    Ranked, highlighted matches for query across the selected sources.
+
+    Every query term must appear (prefix match, porter stemming). Results
+    from all sources are merged by bm25 score; totals are per source.
+    """
+    limit = max(1, min(limit, MAX_LIMIT))
+    terms = query_terms(query)
+    selected = [SOURCES[t] for t in (types or SOURCES) if t in SOURCES]
+    response = {"query": query, "results": [], "totals": {s.name: 0 for s in selected}, "engine": "none"}
+    if not terms or not selected:
+        return response
+
+    use_fts = index_ready(db)
+    response["engine"] = "fts5" if use_fts else "like"
+    results = []
+    for source in selected:
+        if use_fts:
+            rows, total = _fts_rows(db, source, build_match_expression(terms), competitor_id, limit)
+        else:
+            rows, total = _like_rows(db, source, terms, competitor_id, limit)
+        response["totals"][source.name] = total
+        results.extend(_to_result(source, dict(row), terms, use_fts) for row in rows)
+
+    if use_fts:
+        results.sort(key=lambda r: r["score"], reverse=True)
+    else:
+        results.sort(key=lambda r: r.get("date") or "", reverse=True)
+    response["results"] = results[:limit]
+    return response
@@ -3,11 +3,16 @@ Certify Intel - SEC EDGAR Scraper (v5.0.3)
 Fetches public company filings, financials, and risk disclosures.
 
 v5.0.3: Added news feed integration with get_news_articles() method.
+v5.2.1: get_company_data()/get_news_articles() take a timeout; the Yahoo lookup
+        then runs on a small dedicated pool so a hung request cannot hold the
+        caller's thread (e.g. a news fan-out worker).
 """
 import os
 import re
 import json
 import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, asdict
@@ -80,6 +85,12 @@ class SECData:
     last_updated: str
 
 
+# Timed lookups run here; one lookup per company at a time (v5.2.1)
+_lookup_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="sec-lookup")
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+
 class SECEdgarScraper:
     """Scrapes public company filings from SEC EDGAR."""
     
@@ -164,8 +175,8 @@ class SECEdgarScraper:
             "User-Agent": "Certify-Intel research@certifyhealth.com"
         }
     
-    def get_company_data(self, company_name: str) -> SECData:
-        """Get SEC EDGAR data for a company."""
+    def get_company_data(self, company_name: str, timeout: Optional[float] = None) -> SECData:
+        """Get SEC EDGAR data for a company (placeholder if the lookup exceeds timeout)."""
         name_lower = company_name.lower()
         
         if name_lower in self.KNOWN_COMPANIES:
@@ -173,11 +184,24 @@ class SECEdgarScraper:
         
         # Try to search EDGAR
         try:
-            return self._search_edgar(company_name)
+            if timeout is None:
+                return self._search_edgar(company_name)
+            return self._search_edgar_in_pool(company_name).result(timeout=timeout)
         except Exception as e:
-            print(f"SEC EDGAR search failed: {e}")
+            print(f"SEC EDGAR search failed: {e!r}")
         
         return self._build_placeholder(company_name)
+
+    def _search_edgar_in_pool(self, company_name: str) -> Future:
+        """Run _search_edgar on the lookup pool, joining a lookup already running for this company."""
+        key = company_name.lower()
+        with _inflight_lock:
+            future = _inflight.get(key)
+            if future is None:
+                future = _lookup_executor.submit(self._search_edgar, company_name)
+                _inflight[key] = future
+                future.add_done_callback(lambda done: _finish_lookup(key, done))
+        return future
     
     def _build_from_known(self, company_name: str, data: Dict) -> SECData:
         """Build SECData from known data."""
@@ -383,19 +407,22 @@ class SECEdgarScraper:
 
     # ============== News Feed Integration (v5.0.3) ==============
 
-    def get_news_articles(self, company_name: str, days_back: int = 90) -> List[Dict[str, Any]]:
+    def get_news_articles(
+        self, company_name: str, days_back: int = 90, timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
         """
         Get SEC filings formatted as news articles for the news feed.
 
         Args:
             company_name: Company name or ticker
             days_back: Number of days to look back
+            timeout: Seconds to wait for the company lookup (None waits)
 
         Returns:
             List of article dictionaries compatible with news feed
         """
         articles = []
-        data = self.get_company_data(company_name)
+        data = self.get_company_data(company_name, timeout=timeout)
 
         if not data.stock_symbol or "Private" in data.stock_symbol:
             return articles  # No SEC filings for private companies
@@ -531,6 +558,12 @@ def get_sec_data(company_name: str) -> Dict[str, Any]:
     return result
 
 
+def _finish_lookup(key: str, future: Future):
+    with _inflight_lock:
+        if _inflight.get(key) is future:
+            del _inflight[key]
+
+
 # ============== News Feed Integration Functions (v5.0.3) ==============
 
 def get_sec_news(company_name: str, days_back: int = 90) -> List[Dict[str, Any]]:
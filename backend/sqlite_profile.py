@@ -0,0 +1,263 @@
+"""
+Certify Intel - SQLite Production Profile (v5.2.1)
+WAL journal, tuned pragmas and a serialized write queue for the SQLite file.
+
+Background scrapes, APScheduler jobs, activity logging and API requests all
+commit against the same database file. With the default rollback journal
+every writer blocks every reader and a burst of small commits during a
+refresh-all ends in "database is locked". The production profile (opt-in):
+
+- switches the file to WAL, so readers never wait for the writer;
+- sets synchronous=NORMAL (safe with WAL; fsync at checkpoint, not per commit),
+  a busy timeout so writers wait for the lock instead of failing, and a
+  larger page cache and memory map;
+- routes small fire-and-forget writes (activity log rows) through one writer
+  thread that batches them into a single transaction per burst.
+
+Non-SQLite databases ignore the pragmas; the write queue still works but
+only saves commits there.
+
+Configuration (environment):
+    SQLITE_PRODUCTION_PROFILE   Enable WAL, pragmas and the write queue (default false)
+    SQLITE_SYNCHRONOUS          OFF / NORMAL / FULL (default NORMAL)
+    SQLITE_BUSY_TIMEOUT_MS      How long a writer waits for the lock (default 15000)
+    SQLITE_CACHE_SIZE_MB        Page cache per connection (default 64)
+    SQLITE_MMAP_SIZE_MB         Memory-mapped I/O size (default 256)
+    SQLITE_WRITE_BATCH_SIZE     Max queued writes per commit (default 200)
+    SQLITE_WRITE_BATCH_WAIT_MS  How long the writer waits to fill a batch (default 20)
+"""
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ENABLED = os.getenv("SQLITE_PRODUCTION_PROFILE", "false").lower() == "true"
+SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").upper()
+BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "15000"))
+CACHE_SIZE_MB = int(os.getenv("SQLITE_CACHE_SIZE_MB", "64"))
+MMAP_SIZE_MB = int(os.getenv("SQLITE_MMAP_SIZE_MB", "256"))
+WRITE_BATCH_SIZE = int(os.getenv("SQLITE_WRITE_BATCH_SIZE", "200"))
+WRITE_BATCH_WAIT_MS = int(os.getenv("SQLITE_WRITE_BATCH_WAIT_MS", "20"))
+
+_SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+
+# ============== Engine setup ==============
+
+def is_sqlite(url: Any) -> bool:
+    return str(url).startswith("sqlite")
+
+
+def connect_args(url: str, enabled: Optional[bool] = None) -> Dict[str, Any]:
+    """create_engine connect_args; the profile also raises the driver's lock timeout."""
+    if not is_sqlite(url):
+        return {}
+    args: Dict[str, Any] = {"check_same_thread": False}
+    if PROFILE_ENABLED if enabled is None else enabled:
+        args["timeout"] = BUSY_TIMEOUT_MS / 1000
+    return args
+
+
+def profile_pragmas() -> List[Tuple[str, Any]]:
+    """Pragmas run on every new connection, in order (journal_mode first)."""
+    synchronous = SYNCHRONOUS if SYNCHRONOUS in _SYNCHRONOUS_MODES else "NORMAL"
+    return [
+        ("journal_mode", "WAL"),
+        ("synchronous", synchronous),
+        ("busy_timeout", BUSY_TIMEOUT_MS),
+        ("cache_size", -CACHE_SIZE_MB * 1024),  # Negative = KiB rather than pages
+        ("mmap_size", MMAP_SIZE_MB * 1024 * 1024),
+        ("temp_store", "MEMORY"),
+    ]
+
+
+def apply_sqlite_profile(engine, enabled: Optional[bool] = None) -> bool:
+    """Run the profile pragmas on each connection the engine opens. Returns whether it applied."""
+    if not (PROFILE_ENABLED if enabled is None else enabled) or not is_sqlite(engine.url):
+        return False
+    from sqlalchemy import event
+
+    pragmas = profile_pragmas()
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    return True
+
+
+def current_pragmas(engine) -> Dict[str, Any]:
+    """Effective settings on a pooled connection, for the status endpoint."""
+    if not is_sqlite(engine.url):
+        return {}
+    from sqlalchemy import text
+    with engine.connect() as conn:
+        return {
+            name: conn.execute(text(f"PRAGMA {name}")).scalar()
+            for name in ("journal_mode", "synchronous", "busy_timeout", "cache_size", "mmap_size")
+        }
+
+
+# ============== Write queue ==============
+
+class WriteQueue:
+    """
+    One writer thread that applies queued write jobs in batches.
+
+    A job is a callable taking a Session that stages writes (db.add, updates)
+    and does not commit. Jobs that arrive within WRITE_BATCH_WAIT_MS of each
+    other share a transaction, so a burst of activity rows costs one commit
+    and one lock acquisition instead of one each. If a job fails, the batch
+    is rolled back and replayed job by job so only the failing job is lost.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable] = None,
+        batch_size: Optional[int] = None,
+        batch_wait_ms: Optional[int] = None
+    ):
+        self._session_factory = session_factory
+        self.batch_size = max(1, batch_size or WRITE_BATCH_SIZE)
+        self.batch_wait = (WRITE_BATCH_WAIT_MS if batch_wait_ms is None else batch_wait_ms) / 1000
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self.stats = {"submitted": 0, "written": 0, "failed": 0, "commits": 0, "replays": 0,
+                      "largest_batch": 0, "peak_queue_depth": 0}
+
+    def _session(self):
+        if self._session_factory is None:
+            from database import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    def submit(self, job: Callable[[Any], Any]) -> Future:
+        """Queue a write job; the future resolves (to the job's return value) after its commit."""
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Write queue is shut down")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+                self._thread.start()
+            self.stats["submitted"] += 1
+            self._queue.put((job, future))
+            self.stats["peak_queue_depth"] = max(self.stats["peak_queue_depth"], self._queue.qsize())
+        return future
+
+    def run(self, job: Callable[[Any], Any], timeout: Optional[float] = None) -> Any:
+        """Submit a job and wait for its commit."""
+        return self.submit(job).result(timeout)
+
+    def flush(self, timeout: Optional[float] = None):
+        """Wait until everything queued so far is committed."""
+        if self._thread is not None:
+            self.run(lambda db: None, timeout)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.batch_wait
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._write(batch)
+            if stop:
+                return
+
+    def _write(self, batch: List[Tuple[Callable, Future]]):
+        self.stats["largest_batch"] = max(self.stats["largest_batch"], len(batch))
+        db = self._session()
+        try:
+            results = [job(db) for job, _ in batch]
+            db.commit()
+            self.stats["commits"] += 1
+            self.stats["written"] += len(batch)
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+            return
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Write batch of {len(batch)} failed, replaying individually: {e}")
+        finally:
+            db.close()
+
+        self.stats["replays"] += 1
+        for job, future in batch:
+            db = self._session()
+            try:
+                result = job(db)
+                db.commit()
+                self.stats["commits"] += 1
+                self.stats["written"] += 1
+                future.set_result(result)
+            except Exception as e:
+                db.rollback()
+                self.stats["failed"] += 1
+                future.set_exception(e)
+            finally:
+                db.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "queue_depth": self._queue.qsize(),
+            "batch_size": self.batch_size,
+            "batch_wait_ms": int(self.batch_wait * 1000),
+        }
+
+    def shutdown(self, timeout: float = 10.0):
+        """Commit what is queued, then stop the writer thread."""
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout)
+
+
+_queue_instance: Optional[WriteQueue] = None
+_queue_lock = threading.Lock()
+
+
+def write_queue_enabled() -> bool:
+    from database import DATABASE_URL
+    return PROFILE_ENABLED and is_sqlite(DATABASE_URL)
+
+
+def get_write_queue() -> WriteQueue:
+    global _queue_instance
+    with _queue_lock:
+        if _queue_instance is None:
+            _queue_instance = WriteQueue()
+        return _queue_instance
+
+
+def shutdown_write_queue():
+    global _queue_instance
+    with _queue_lock:
+        instance, _queue_instance = _queue_instance, None
+    if instance is not None:
+        instance.shutdown()
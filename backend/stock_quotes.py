@@ -0,0 +1,468 @@
+"""
+Certify Intel - Stock Quote Service (v5.2.1)
+Batched, cached stock quotes for the dashboard summary, chat, stock endpoint and ticker lookup.
+
+- Prices for all requested tickers are fetched in one batched provider call
+- Quotes are cached with a market-hours-aware TTL: short while NYSE is open,
+  until the next open (capped) while it is closed
+- Slow-changing company info (market cap basis, 52-week range, valuation) is
+  cached separately per ticker for STOCK_PROFILE_TTL_HOURS; missing profiles
+  of a batch are fetched concurrently (STOCK_PROFILE_MAX_WORKERS at a time)
+- Requested tickers the provider does not return (delisted, mistyped) are
+  remembered as missing for STOCK_QUOTE_MISSING_TTL_SECONDS
+- When upstream does not answer within STOCK_QUOTE_TIMEOUT_SECONDS the last
+  known (stale) quote is served and the refresh finishes in the background
+- Providers are swappable: yfinance by default, or a local JSON fixture
+
+Configuration (environment):
+    STOCK_QUOTE_PROVIDER            "yfinance" (default) or "fixture"
+    STOCK_QUOTE_FIXTURE             Path to a JSON file {symbol: info} for the fixture provider
+    STOCK_QUOTE_TTL_SECONDS         Quote TTL during market hours (default 60)
+    STOCK_QUOTE_CLOSED_TTL_SECONDS  Max quote TTL while the market is closed (default 21600)
+    STOCK_QUOTE_MISSING_TTL_SECONDS How long a ticker with no quote is not re-fetched (default 300)
+    STOCK_PROFILE_TTL_HOURS         Company info TTL (default 24)
+    STOCK_PROFILE_MAX_WORKERS       Concurrent company info lookups per refresh (default 4)
+    STOCK_QUOTE_TIMEOUT_SECONDS     Max wait for upstream before serving stale (default 3)
+"""
+import os
+import json
+import time
+import logging
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+try:
+    import yfinance as yf
+    YFINANCE_AVAILABLE = True
+except ImportError:
+    yf = None
+    YFINANCE_AVAILABLE = False
+    logger.warning("yfinance not installed. Stock quotes unavailable.")
+
+try:
+    from zoneinfo import ZoneInfo
+    MARKET_TZ = ZoneInfo("America/New_York")
+except Exception:
+    MARKET_TZ = timezone(timedelta(hours=-5))
+
+# NYSE regular session (holidays are not modelled; quotes just refresh on schedule)
+MARKET_OPEN = (9, 30)
+MARKET_CLOSE = (16, 0)
+
+# Exchange codes reported by Yahoo -> readable names
+EXCHANGE_NAMES = {
+    'NMS': 'NASDAQ', 'NGM': 'NASDAQ', 'NCM': 'NASDAQ',
+    'NYQ': 'NYSE', 'NYSE': 'NYSE', 'PCX': 'NYSE ARCA'
+}
+
+
+# ============== Market hours ==============
+
+def is_market_open(now: Optional[datetime] = None) -> bool:
+    """True during the NYSE regular session (Mon-Fri 9:30-16:00 New York time)."""
+    local = (now or datetime.now(timezone.utc)).astimezone(MARKET_TZ)
+    if local.weekday() >= 5:
+        return False
+    return MARKET_OPEN <= (local.hour, local.minute) < MARKET_CLOSE
+
+
+def next_market_open(now: Optional[datetime] = None) -> datetime:
+    """Start of the next regular session (UTC-aware)."""
+    local = (now or datetime.now(timezone.utc)).astimezone(MARKET_TZ)
+    candidate = local.replace(hour=MARKET_OPEN[0], minute=MARKET_OPEN[1], second=0, microsecond=0)
+    if candidate <= local:
+        candidate += timedelta(days=1)
+    while candidate.weekday() >= 5:
+        candidate += timedelta(days=1)
+    return candidate
+
+
+def quote_ttl_seconds(now: Optional[datetime] = None, open_ttl: float = 60, closed_ttl: float = 21600) -> float:
+    """Short TTL while trading; otherwise until the next open, capped at closed_ttl."""
+    now = now or datetime.now(timezone.utc)
+    if is_market_open(now):
+        return open_ttl
+    until_open = (next_market_open(now) - now.astimezone(MARKET_TZ)).total_seconds()
+    return max(open_ttl, min(closed_ttl, until_open))
+
+
+# ============== Providers ==============
+
+class QuoteProvider(ABC):
+    """
+    Upstream market data source.
+
+    fetch_quotes() must answer for many symbols in one call and return
+    {symbol: {"price", "previous_close", "volume"}} for the symbols it found.
+    fetch_info() returns Yahoo-style company info for one symbol, or None.
+    """
+    name = "base"
+
+    @abstractmethod
+    def fetch_quotes(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def fetch_info(self, symbol: str) -> Optional[Dict[str, Any]]:
+        ...
+
+
+class YFinanceProvider(QuoteProvider):
+    """Yahoo Finance via yfinance: one yf.download() for prices, Ticker.info for company info."""
+    name = "yfinance"
+
+    def fetch_quotes(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        if not YFINANCE_AVAILABLE or not symbols:
+            return {}
+        data = yf.download(
+            tickers=" ".join(symbols), period="5d", interval="1d", group_by="ticker",
+            auto_adjust=False, progress=False, threads=True
+        )
+        quotes = {}
+        for symbol in symbols:
+            try:
+                multi = getattr(data.columns, "nlevels", 1) > 1
+                frame = data[symbol] if multi else data
+                closes = frame["Close"].dropna()
+                if closes.empty:
+                    continue
+                volumes = frame["Volume"].dropna()
+                quotes[symbol] = {
+                    "price": float(closes.iloc[-1]),
+                    "previous_close": float(closes.iloc[-2]) if len(closes) > 1 else None,
+                    "volume": int(volumes.iloc[-1]) if not volumes.empty else None,
+                }
+            except Exception as e:
+                logger.debug(f"No batched quote for {symbol}: {e}")
+        return quotes
+
+    def fetch_info(self, symbol: str) -> Optional[Dict[str, Any]]:
+        if not YFINANCE_AVAILABLE:
+            return None
+        info = yf.Ticker(symbol).info
+        return info if info and info.get("symbol") else None
+
+
+class FixtureQuoteProvider(QuoteProvider):
+    """Serves Yahoo-style info dicts from memory or a JSON file (tests, offline demos)."""
+    name = "fixture"
+
+    def __init__(self, data: Optional[Dict[str, Dict[str, Any]]] = None, path: Optional[str] = None):
+        if data is None and path:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        self.data = {symbol.upper(): info for symbol, info in (data or {}).items()}
+        self.quote_calls = 0
+        self.info_calls = 0
+
+    def fetch_quotes(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        self.quote_calls += 1
+        quotes = {}
+        for symbol in symbols:
+            info = self.data.get(symbol.upper())
+            if info:
+                quotes[symbol] = {
+                    "price": info.get("currentPrice") or info.get("regularMarketPrice"),
+                    "previous_close": info.get("previousClose"),
+                    "volume": info.get("volume"),
+                }
+        return quotes
+
+    def fetch_info(self, symbol: str) -> Optional[Dict[str, Any]]:
+        self.info_calls += 1
+        info = self.data.get(symbol.upper())
+        return dict(info, symbol=info.get("symbol", symbol.upper())) if info else None
+
+
+def create_provider(name: Optional[str] = None) -> QuoteProvider:
+    name = (name or os.getenv("STOCK_QUOTE_PROVIDER", "yfinance")).lower()
+    if name == "fixture":
+        return FixtureQuoteProvider(path=os.getenv("STOCK_QUOTE_FIXTURE"))
+    return YFinanceProvider()
+
+
+# ============== Quote service ==============
+
+class _Entry:
+    __slots__ = ("value", "fetched_at", "expires_at")
+
+    def __init__(self, value: Any, fetched_at: float, expires_at: float):
+        self.value = value
+        self.fetched_at = fetched_at
+        self.expires_at = expires_at
+
+
+class StockQuoteService:
+    """
+    In-process quote and company info cache in front of a QuoteProvider.
+
+    Refreshes run on a small thread pool and are single-flight per symbol:
+    concurrent requests for the same expired symbol share one upstream call.
+    """
+
+    def __init__(
+        self,
+        provider: Optional[QuoteProvider] = None,
+        timeout_seconds: Optional[float] = None,
+        max_workers: int = 2
+    ):
+        self.provider = provider or create_provider()
+        self.timeout_seconds = timeout_seconds if timeout_seconds is not None else float(
+            os.getenv("STOCK_QUOTE_TIMEOUT_SECONDS", "3")
+        )
+        self.open_ttl = float(os.getenv("STOCK_QUOTE_TTL_SECONDS", "60"))
+        self.closed_ttl = float(os.getenv("STOCK_QUOTE_CLOSED_TTL_SECONDS", "21600"))
+        self.missing_ttl = float(os.getenv("STOCK_QUOTE_MISSING_TTL_SECONDS", "300"))
+        self.profile_ttl = float(os.getenv("STOCK_PROFILE_TTL_HOURS", "24")) * 3600
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="stock-quotes")
+        # Separate pool: batch refreshes wait on profile lookups and must not starve them
+        self._profile_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("STOCK_PROFILE_MAX_WORKERS", "4")), thread_name_prefix="stock-profiles"
+        )
+        self._lock = threading.Lock()
+        self._quotes: Dict[str, _Entry] = {}  # None value = no quote upstream
+        self._profiles: Dict[str, _Entry] = {}  # None value = symbol not found
+        self._inflight: Dict[str, Future] = {}
+
+        self.stats = {
+            "requests": 0,
+            "fresh_hits": 0,
+            "stale_served": 0,
+            "misses": 0,
+            "batch_calls": 0,
+            "symbols_fetched": 0,
+            "info_calls": 0,
+            "errors": 0,
+            "timeouts": 0,
+        }
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def set_provider(self, provider: QuoteProvider):
+        """Swap the upstream provider and drop everything cached from the old one."""
+        with self._lock:
+            self.provider = provider
+            self._quotes.clear()
+            self._profiles.clear()
+
+    # ============== Public API ==============
+
+    def get_quotes(self, symbols: Iterable[str], timeout: Optional[float] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Quotes for many tickers with at most one batched upstream call.
+
+        Returns {symbol: quote or None} in the fetch_real_stock_data format plus
+        "stale" and "as_of". Expired quotes are refreshed; if upstream takes
+        longer than the timeout the previous quote is returned with stale=True.
+        """
+        symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s and s.strip()))
+        if not symbols:
+            return {}
+        self._count("requests")
+
+        now = time.time()
+        with self._lock:
+            expired = [s for s in symbols if s not in self._quotes or self._quotes[s].expires_at <= now]
+        if expired:
+            done, pending = wait(self._refresh(expired), timeout=self.timeout_seconds if timeout is None else timeout)
+            if pending:
+                self._count("timeouts")
+                logger.info(f"Stock quote refresh slow; serving cached quotes for {', '.join(expired)}")
+            for future in done:
+                if future.exception() is not None:
+                    self._count("errors")
+                    logger.warning(f"Stock quote refresh failed: {future.exception()}")
+
+        now = time.time()
+        results = {}
+        with self._lock:
+            for symbol in symbols:
+                entry = self._quotes.get(symbol)
+                profile = self._profiles.get(symbol)
+                if entry is None or entry.value is None:
+                    self.stats["misses"] += 1
+                    results[symbol] = None
+                    continue
+                stale = entry.expires_at <= now
+                self.stats["stale_served" if stale else "fresh_hits"] += 1
+                results[symbol] = self._to_quote(symbol, entry, profile.value if profile else None, stale)
+        return results
+
+    def get_quote(self, symbol: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Quote for one ticker (see get_quotes)."""
+        if not symbol:
+            return None
+        return self.get_quotes([symbol], timeout).get(symbol.strip().upper())
+
+    def get_info(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Yahoo-style company info with live price fields from the quote cache.
+
+        Used by /api/stock/{company_name}; None if the symbol is unknown.
+        """
+        symbol = (symbol or "").strip().upper()
+        if not symbol:
+            return None
+        quote = self.get_quote(symbol)
+        info = self._profile(symbol)
+        if info is None and quote is None:
+            return None
+        merged = dict(info or {"symbol": symbol})
+        if quote and quote.get("price") is not None:
+            merged["currentPrice"] = quote["price"]
+            if quote.get("previous_close") is not None:
+                merged["previousClose"] = quote["previous_close"]
+            if quote.get("volume") is not None:
+                merged["volume"] = quote["volume"]
+            if quote.get("market_cap") is not None:
+                merged["marketCap"] = quote["market_cap"]
+        return merged
+
+    def lookup(self, term: str) -> Optional[Dict[str, Any]]:
+        """Resolve a company name/symbol guess to {symbol, exchange, name} (cached, including misses)."""
+        info = self._profile((term or "").strip().upper())
+        if not info or not info.get("shortName"):
+            return None
+        exchange = info.get("exchange", "UNKNOWN")
+        return {
+            "symbol": info.get("symbol"),
+            "exchange": EXCHANGE_NAMES.get(exchange, exchange),
+            "name": info.get("shortName") or info.get("longName"),
+        }
+
+    # ============== Refresh ==============
+
+    def _refresh(self, symbols: List[str]) -> Set[Future]:
+        """Start (or join) the upstream refresh for these symbols; returns the futures to wait on."""
+        with self._lock:
+            futures = {self._inflight[s] for s in symbols if s in self._inflight}
+            missing = [s for s in symbols if s not in self._inflight]
+            if missing:
+                future = self._executor.submit(self._fetch_batch, missing)
+                for symbol in missing:
+                    self._inflight[symbol] = future
+                futures.add(future)
+        return futures
+
+    def _fetch_batch(self, symbols: List[str]):
+        try:
+            self._count("batch_calls")
+            quotes = self.provider.fetch_quotes(symbols)
+            now = time.time()
+            ttl = quote_ttl_seconds(open_ttl=self.open_ttl, closed_ttl=self.closed_ttl)
+            with self._lock:
+                for symbol, quote in quotes.items():
+                    if quote and quote.get("price") is not None:
+                        self._quotes[symbol.upper()] = _Entry(quote, now, now + ttl)
+                # Unknown tickers would otherwise trigger a batch call on every request;
+                # a ticker that had a quote keeps serving it as stale instead
+                for symbol in symbols:
+                    previous = self._quotes.get(symbol)
+                    if previous is None or previous.value is None:
+                        self._quotes[symbol] = _Entry(None, now, now + self.missing_ttl)
+            self._count("symbols_fetched", len(quotes))
+            # Company info changes slowly; only fetched when missing or older than a day
+            with self._lock:
+                due = [s.upper() for s in quotes
+                       if s.upper() not in self._profiles or self._profiles[s.upper()].expires_at <= now]
+            wait([self._profile_executor.submit(self._profile, symbol) for symbol in due])
+        finally:
+            with self._lock:
+                for symbol in symbols:
+                    self._inflight.pop(symbol, None)
+
+    def _profile(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Cached company info (negative results cached too)."""
+        if not symbol:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._profiles.get(symbol)
+            if entry and entry.expires_at > now:
+                return entry.value
+        try:
+            self._count("info_calls")
+            info = self.provider.fetch_info(symbol)
+        except Exception as e:
+            self._count("errors")
+            logger.debug(f"Company info lookup failed for {symbol}: {e}")
+            # Keep serving the previous info if there was one
+            return entry.value if entry else None
+        with self._lock:
+            self._profiles[symbol] = _Entry(info, now, now + self.profile_ttl)
+        return info
+
+    def _to_quote(self, symbol: str, entry: _Entry, info: Optional[Dict[str, Any]], stale: bool) -> Dict[str, Any]:
+        info = info or {}
+        price = entry.value.get("price")
+        previous = entry.value.get("previous_close") or info.get("previousClose")
+        change = price - previous if price and previous else 0
+        shares = info.get("sharesOutstanding")
+        return {
+            "price": price,
+            "previous_close": previous,
+            "change": change,
+            "change_percent": (change / previous) * 100 if previous else 0,
+            "market_cap": price * shares if price and shares else info.get("marketCap"),
+            "pe_ratio": info.get("trailingPE"),
+            "eps": info.get("trailingEps"),
+            "beta": info.get("beta"),
+            "volume": entry.value.get("volume") or info.get("volume"),
+            "high52": info.get("fiftyTwoWeekHigh"),
+            "low52": info.get("fiftyTwoWeekLow"),
+            "target_est": info.get("targetMeanPrice"),
+            "company": info.get("longName"),
+            "ticker": symbol,
+            "stale": stale,
+            "as_of": datetime.utcfromtimestamp(entry.fetched_at).isoformat() + "Z",
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["cached_quotes"] = sum(1 for entry in self._quotes.values() if entry.value is not None)
+            stats["missing_tickers"] = len(self._quotes) - stats["cached_quotes"]
+            stats["cached_profiles"] = len(self._profiles)
+            stats["refreshing"] = len(self._inflight)
+        stats["provider"] = self.provider.name
+        stats["market_open"] = is_market_open()
+        stats["quote_ttl_seconds"] = quote_ttl_seconds(open_ttl=self.open_ttl, closed_ttl=self.closed_ttl)
+        stats["timeout_seconds"] = self.timeout_seconds
+        return stats
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+        self._profile_executor.shutdown(wait=False)
+
+
+# ============== CONVENIENCE FUNCTIONS ==============
+
+# Singleton instance
+_service_instance = None
+_service_lock = threading.Lock()
+
+
+def get_quote_service() -> StockQuoteService:
+    """Get the stock quote service instance."""
+    global _service_instance
+    with _service_lock:
+        if _service_instance is None:
+            _service_instance = StockQuoteService()
+        return _service_instance
+
+
+def shutdown_quote_service():
+    """Stop the refresh thread pool (app shutdown)."""
+    global _service_instance
+    with _service_lock:
+        if _service_instance is not None:
+            _service_instance.shutdown()
+            _service_instance = None
@@ -5,6 +5,30 @@ Test modules:
 - test_gemini_provider.py - Unit tests for Gemini AI provider
 - test_hybrid_integration.py - Integration tests for hybrid AI routing
 - test_cost_comparison.py - Cost comparison and optimization tests
+- test_browser_pool.py - Shared Playwright browser pool
+- test_scraper_concurrency.py - Concurrent multi-page scraping
+- test_extraction_cache.py - Content-hash extraction cache
+- test_http_fetcher.py - HTTP-first fetch tier and browser escalation
+- test_async_extraction.py - Non-blocking extraction pool
+- test_llm_cache.py - Persistent LLM response cache
+- test_content_ranker.py - Relevance-ranked content trimming
+- test_batched_extraction.py - Multi-page batched extraction with provenance
+- test_context_store.py - Prebuilt summary/chat context fragments
+- test_stock_quotes.py - Batched, cached stock quote service
+- test_news_fanout.py - Parallel news source fetching
+- test_news_feed.py - SQL-side news feed filtering and keyset pagination
+- test_news_ingest.py - Bulk, deduplicated news cache ingestion
+- test_news_clustering.py - Near-duplicate news clustering
+- test_ml_sentiment.py - Batched, cached CPU sentiment inference
+- test_dimension_batch.py - Batched news dimension tagging
+- test_keyword_matcher.py - Compiled one-pass keyword matching
+- test_search_index.py - Full-text search index and /api/search
+- test_news_fetch_state.py - Incremental news polling (conditional GET, newer-than queries)
+- test_sqlite_profile.py - SQLite production profile (WAL pragmas, batched write queue)
+- test_db_migrate.py - PostgreSQL engine, schema upgrades, SQLite -> PostgreSQL copy
+- test_metric_values.py - Typed competitor metric columns (parsing, sync on write, backfill)
+- test_analytics_rollup.py - Competitor metrics rollup (incremental refresh, rebuild, versioning)
+- test_data_retention.py - Log retention (summaries, archive files/tables, resumable runs)
 
 Run all tests:
     cd backend
@@ -0,0 +1,35 @@
+"""
+Certify Intel - Shared Test Fixtures (v5.2.1)
+Database fixtures used across the test modules.
+
+Modules that need a different database (e.g. a file for WAL or cross-thread
+tests) override the engine fixture; session_factory then binds to theirs.
+"""
+
+import os
+import sys
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def engine():
+    """Isolated in-memory SQLite database with the current schema (one shared connection)."""
+    pytest.importorskip("sqlalchemy")
+    from sqlalchemy import create_engine
+    from sqlalchemy.pool import StaticPool
+    from database import Base
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    """sessionmaker bound to the test engine."""
+    from sqlalchemy.orm import sessionmaker
+    return sessionmaker(bind=engine)
@@ -0,0 +1,204 @@
+"""
+Certify Intel - Competitor Metrics Rollup Tests (v5.2.1)
+Tests for rollup rows, incremental refresh on commit, full rebuilds and versioning.
+
+Run with: pytest tests/test_analytics_rollup.py -v
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("sqlalchemy")
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import analytics_rollup
+from analytics_rollup import MetricsRollup, sales_priority
+from database import Base, Competitor, CompetitorMetricsRollup
+
+
+# ============== TEST FIXTURES ==============
+
+def make_rollup(monkeypatch, session_factory, debounce_seconds=None):
+    """Rollup installed as the singleton that change tracking reports to."""
+    rollup = MetricsRollup(session_factory, debounce_seconds=debounce_seconds)
+    monkeypatch.setattr(analytics_rollup, "_rollup_instance", rollup)
+    analytics_rollup.install_change_tracking()
+    return rollup
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    session.add_all([
+        Competitor(name="Phreesia", status="Active", threat_level="High", customer_count="3,000+",
+                   data_quality_score=80, dim_product_packaging_score=2, dim_integration_depth_score=4),
+        Competitor(name="Clearwave", status="Active", threat_level="Medium", customer_count="500",
+                   data_quality_score=60, dim_product_packaging_score=4),
+        Competitor(name="Kyruus", status="Discovered", threat_level="Low"),
+        Competitor(name="Gone", status="Active", threat_level="High", is_deleted=True),
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+
+def row(db, name):
+    return db.query(CompetitorMetricsRollup).filter(CompetitorMetricsRollup.name == name).one_or_none()
+
+
+# ============== ROWS / AGGREGATES ==============
+
+class TestRollupBuild:
+    """The first read builds one row per live competitor and the stored aggregates."""
+
+    def test_first_read_builds(self, monkeypatch, session_factory, db):
+        rollup = make_rollup(monkeypatch, session_factory)
+        summary = rollup.summary(db)
+
+        assert summary["rollup"]["version"] == 1
+        assert summary["total"] == 3
+        assert summary["status_counts"] == {"Active": 2, "Discovered": 1}
+        assert summary["threat_levels"] == {"High": 1, "Medium": 1, "Low": 1}
+        assert summary["avg_data_quality"] == round(140 / 3, 1)
+        assert summary["dimension_averages"] == {"Product Packaging": 3.0, "Integration Depth": 4.0}
+
+        phreesia = row(db, "Phreesia")
+        assert phreesia.customer_count == 3000
+        assert phreesia.sales_priority == "high_priority"
+        assert row(db, "Kyruus").sales_priority == "not_assessed"
+        assert row(db, "Gone") is None
+
+    def test_sales_priority_buckets(self):
+        assert sales_priority("High", ["a"], []) == "high_priority"
+        assert sales_priority("Low", ["a", "b", "c"], []) == "medium_priority"
+        assert sales_priority("Medium", [], ["a"]) == "medium_priority"
+        assert sales_priority("Low", ["a"], ["b"]) == "low_priority"
+        assert sales_priority("High", [], []) == "not_assessed"
+
+    def test_freshness_counts(self, monkeypatch, session_factory, db):
+        now = datetime.utcnow()
+        for name, age in (("Phreesia", 7), ("Clearwave", 31), ("Kyruus", 20)):
+            db.query(Competitor).filter(Competitor.name == name).one().last_updated = now - timedelta(days=age, hours=1)
+        db.commit()
+        rollup = make_rollup(monkeypatch, session_factory)
+        rollup.current_state(db)
+
+        assert rollup.freshness_counts(db, now) == {"fresh": 1, "stale": 1}
+
+
+# ============== REFRESH ==============
+
+class TestIncrementalRefresh:
+    """Committed competitor writes refresh only their rows and bump the version."""
+
+    def test_commit_refreshes_changed_rows(self, monkeypatch, session_factory, db):
+        rollup = make_rollup(monkeypatch, session_factory)
+        built = rollup.current_state(db)
+        rebuilt_at = built.rebuilt_at
+
+        clearwave = db.query(Competitor).filter(Competitor.name == "Clearwave").one()
+        clearwave.threat_level = "High"
+        clearwave.dim_support_service_score = 1
+        db.commit()
+        assert rollup.pending_count == 1
+
+        summary = rollup.summary(db)
+        assert rollup.pending_count == 0
+        assert summary["rollup"]["version"] == 2
+        assert summary["rollup"]["rebuilt_at"] == rebuilt_at.isoformat()
+        assert summary["threat_levels"]["High"] == 2
+        assert row(db, "Clearwave").sales_priority == "high_priority"
+        assert rollup.stats["rows_refreshed"] == 1
+
+    def test_new_and_deleted_competitors(self, monkeypatch, session_factory, db):
+        rollup = make_rollup(monkeypatch, session_factory)
+        rollup.current_state(db)
+
+        db.add(Competitor(name="Luma Health", status="Active", threat_level="Low"))
+        db.query(Competitor).filter(Competitor.name == "Kyruus").one().is_deleted = True
+        db.commit()
+
+        assert rollup.summary(db)["total"] == 3
+        assert row(db, "Luma Health") is not None
+        assert row(db, "Kyruus") is None
+
+    def test_rolled_back_writes_are_ignored(self, monkeypatch, session_factory, db):
+        rollup = make_rollup(monkeypatch, session_factory)
+        rollup.current_state(db)
+
+        db.query(Competitor).filter(Competitor.name == "Phreesia").one().threat_level = "Low"
+        db.flush()
+        db.rollback()
+        assert rollup.pending_count == 0
+
+    def test_read_does_not_commit_callers_session(self, monkeypatch, session_factory, db):
+        rollup = make_rollup(monkeypatch, session_factory)
+        rollup.current_state(db)
+        db.query(Competitor).filter(Competitor.name == "Clearwave").one().threat_level = "High"
+        db.commit()
+
+        db.add(Competitor(name="Uncommitted", status="Active"))
+        with db.no_autoflush:
+            state = rollup.current_state(db)
+        assert state.version == 2
+        assert row(db, "Clearwave").threat_level == "High"
+        db.rollback()
+        assert db.query(Competitor).filter(Competitor.name == "Uncommitted").count() == 0
+
+    def test_debounced_background_refresh(self, monkeypatch, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'rollup.db'}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+        rollup = make_rollup(monkeypatch, Session, debounce_seconds=0.05)
+        db = Session()
+        db.add(Competitor(name="Phreesia", threat_level="Medium"))
+        db.commit()
+        rollup.current_state(db)
+
+        db.query(Competitor).one().threat_level = "High"
+        db.commit()
+        assert rollup.pending_count == 1
+
+        check = Session()
+        deadline = time.time() + 5
+        while check.query(CompetitorMetricsRollup.threat_level).scalar() != "High" and time.time() < deadline:
+            time.sleep(0.02)
+        assert check.query(CompetitorMetricsRollup.threat_level).scalar() == "High"
+        assert rollup.pending_count == 0
+        check.close()
+        db.close()
+        rollup.shutdown()
+        engine.dispose()
+
+
+class TestFullRebuild:
+    """Rebuilds pick up writes the change tracking never saw."""
+
+    def test_rebuild_catches_raw_sql(self, monkeypatch, session_factory, db):
+        from sqlalchemy import text
+        rollup = make_rollup(monkeypatch, session_factory)
+        rollup.current_state(db)
+
+        db.execute(text("UPDATE competitors SET threat_level = 'Low' WHERE name = 'Phreesia'"))
+        db.commit()
+        assert row(db, "Phreesia").threat_level == "High"  # Not seen by the ORM hooks
+
+        assert rollup.rebuild(db) == 3
+        assert row(db, "Phreesia").threat_level == "Low"
+        assert rollup.current_state(db).version == 2
+
+    def test_version_bump_rebuilds(self, monkeypatch, session_factory, db):
+        rollup = make_rollup(monkeypatch, session_factory)
+        rollup.current_state(db)
+        monkeypatch.setattr(analytics_rollup, "ROLLUP_VERSION", "test-next")
+
+        state = rollup.current_state(db)
+        assert state.rollup_version == "test-next"
+        assert rollup.stats["rebuilds"] == 2
@@ -0,0 +1,133 @@
+"""
+Certify Intel - Async Extraction Tests (v5.2.1)
+Tests for the bounded extraction pool and the extractors' aextract_* methods.
+
+Run with: pytest tests/test_async_extraction.py -v
+"""
+
+import os
+import sys
+import time
+import asyncio
+import threading
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extraction_pool import ExtractionPool
+from extractor import EnhancedGPTExtractor
+
+
+# ============== POOL TESTS ==============
+
+class TestExtractionPool:
+    """Tests for off-loop execution and the concurrency cap."""
+
+    def test_blocking_calls_do_not_stall_event_loop(self):
+        pool = ExtractionPool(max_workers=4, concurrency=4)
+        ticks = []
+
+        async def heartbeat():
+            for _ in range(5):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        async def run():
+            await asyncio.gather(
+                pool.run(time.sleep, 0.1),
+                pool.run(time.sleep, 0.1),
+                heartbeat(),
+            )
+
+        start = time.monotonic()
+        asyncio.run(run())
+        elapsed = time.monotonic() - start
+        pool.shutdown()
+
+        # Both sleeps overlapped, and the heartbeat kept ticking meanwhile
+        assert elapsed < 0.19
+        assert len(ticks) == 5
+        assert ticks[-1] - ticks[0] < 0.09
+
+    def test_concurrency_capped(self):
+        pool = ExtractionPool(max_workers=8, concurrency=2)
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def work():
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.02)
+            with lock:
+                state["active"] -= 1
+            return True
+
+        async def run():
+            return await asyncio.gather(*(pool.run(work) for _ in range(6)))
+
+        results = asyncio.run(run())
+        pool.shutdown()
+        assert all(results)
+        assert state["peak"] == 2
+        assert pool.stats["completed"] == 6
+        assert pool.stats["waits"] >= 1
+
+    def test_exceptions_propagate(self):
+        pool = ExtractionPool(max_workers=1, concurrency=1)
+
+        def boom():
+            raise ValueError("bad json")
+
+        async def run():
+            try:
+                await pool.run(boom)
+            except ValueError as e:
+                return str(e)
+
+        assert asyncio.run(run()) == "bad json"
+        assert pool.stats["failed"] == 1
+        pool.shutdown()
+
+
+# ============== EXTRACTOR TESTS ==============
+
+class TestAsyncEnhancedExtraction:
+    """aextract_with_sources must merge exactly like the sync version."""
+
+    def _extractor(self, responses):
+        extractor = EnhancedGPTExtractor(api_key="test")
+        extractor.client = object()  # Never called; _extract_page is replaced
+
+        def fake_extract_page(competitor_name, page_type, content):
+            time.sleep(0.01)
+            response = responses[page_type]
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        extractor._extract_page = fake_extract_page
+        return extractor
+
+    def test_async_matches_sync(self):
+        responses = {
+            "homepage": {"headquarters": "Austin, TX", "customer_count": "500+"},
+            "about": {"headquarters": "Dallas, TX", "year_founded": "2015"},
+            "pricing": RuntimeError("rate limited"),
+        }
+        pages = {page_type: f"{page_type} content " * 20 for page_type in responses}
+        pages["contact"] = "too short"
+        extractor = self._extractor(responses)
+
+        sync_result = extractor.extract_with_sources("Acme", "https://acme.com", pages)
+        async_result = asyncio.run(
+            extractor.aextract_with_sources("Acme", "https://acme.com", pages)
+        )
+
+        for result in (sync_result, async_result):
+            # First page in order wins, later pages only fill gaps
+            assert result.headquarters == "Austin, TX"
+            assert result.field_sources["headquarters"].source_page == "homepage"
+            assert result.field_sources["year_founded"].source_url == "https://acme.com/about"
+        assert sorted(sync_result.extraction_warnings) == sorted(async_result.extraction_warnings)
+        assert any("pricing" in w for w in async_result.extraction_warnings)
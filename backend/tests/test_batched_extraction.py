@@ -0,0 +1,135 @@
+"""
+Certify Intel - Batched Extraction Tests (v5.2.1)
+Tests for packing several pages into one LLM call while keeping per-field provenance.
+
+Run with: pytest tests/test_batched_extraction.py -v
+"""
+
+import os
+import sys
+import json
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import extractor as extractor_module
+from extractor import EnhancedGPTExtractor
+from extraction_cache import ExtractionCache
+
+
+PAGES = {
+    "homepage": "Acme builds patient intake and payments software for health systems. " * 3,
+    "pricing": "The Professional plan starts at $299 per provider per month, billed annually. " * 3,
+    "about": "Acme was founded in 2015 and is headquartered in Austin, Texas. " * 3,
+}
+
+
+class FakeCompletions:
+    """Records prompts and answers with a canned batch response."""
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.prompts = []
+
+    def create(self, **kwargs):
+        prompt = kwargs["messages"][-1]["content"]
+        self.prompts.append(prompt)
+        pages = prompt.split("PAGES TO ANALYZE:")[-1]
+        # Only report fields found in this batch's pages
+        fields = {
+            name: entry for name, entry in self.fields.items()
+            if f"=== PAGE: {entry['source_page']} ===" in pages or entry["value"] in pages
+        }
+        message = SimpleNamespace(content=json.dumps({"fields": fields}))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+@pytest.fixture
+def cache(session_factory):
+    """ExtractionCache backed by an isolated in-memory SQLite database."""
+    cache = ExtractionCache(session_factory=session_factory, max_age_days=0)
+    cache.enabled = True
+    with patch.object(extractor_module, "get_extraction_cache", lambda: cache):
+        yield cache
+
+
+def make_extractor(fields):
+    extractor = EnhancedGPTExtractor(api_key="test")
+    completions = FakeCompletions(fields)
+    extractor.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return extractor, completions
+
+
+FIELDS = {
+    "base_price": {"value": "$299", "source_page": "pricing"},
+    "year_founded": {"value": "2015", "source_page": "about"},
+    "headquarters": {"value": "Austin, Texas", "source_page": "nonsense"},  # located by text search
+    "product_categories": {"value": "Intake; Payments", "source_page": "homepage"},
+}
+
+
+# ============== BATCHING TESTS ==============
+
+class TestBatchedExtraction:
+    """Tests for packing, provenance and cache reuse."""
+
+    def test_all_pages_in_one_call_with_provenance(self, cache):
+        extractor, completions = make_extractor(FIELDS)
+        result = extractor.extract_batched("Acme", "https://acme.com", PAGES)
+
+        assert len(completions.prompts) == 1
+        assert result.base_price == "$299"
+        assert result.field_sources["base_price"].source_page == "pricing"
+        assert result.field_sources["base_price"].source_url == "https://acme.com/pricing"
+        assert result.field_sources["year_founded"].source_page == "about"
+        assert result.field_sources["headquarters"].source_page == "about"
+        assert result.field_sources["product_categories"].source_url == "https://acme.com"
+
+        data_sources = extractor.to_data_sources(result, competitor_id=1)
+        assert {ds["field_name"]: ds["source_name"] for ds in data_sources}["base_price"] == "Website - Pricing"
+
+    def test_budget_overflow_splits_calls(self, cache):
+        extractor, completions = make_extractor(FIELDS)
+        # ~100 chars per call: one (deduplicated) page each
+        result = asyncio.run(extractor.aextract_batched("Acme", "https://acme.com", PAGES, token_budget=25))
+
+        assert len(completions.prompts) == 3
+        assert result.field_sources["base_price"].source_page == "pricing"
+        assert result.field_sources["year_founded"].source_page == "about"
+
+    def test_unchanged_pages_served_from_cache(self, cache):
+        extractor, completions = make_extractor(FIELDS)
+        extractor.extract_batched("Acme", "https://acme.com", PAGES)
+
+        changed = dict(PAGES, pricing=PAGES["pricing"].replace("$299", "$349"))
+        extractor.extract_batched("Acme", "https://acme.com", changed)
+
+        assert len(completions.prompts) == 2
+        # Only the changed pricing page was sent the second time
+        assert "=== PAGE: pricing ===" in completions.prompts[1]
+        assert "=== PAGE: about ===" not in completions.prompts[1]
+
+    def test_batch_results_not_served_to_single_page_extraction(self, cache):
+        from extractor import ExtractedData
+        extractor, _ = make_extractor(FIELDS)
+        extractor.extract_batched("Acme", "https://acme.com", PAGES)
+
+        # The pricing page's share of the batch holds only base_price; a full extraction must miss
+        assert cache.get("Acme", "pricing", PAGES["pricing"], ExtractedData) is None
+        assert cache.get("Acme", "batched:pricing", PAGES["pricing"], ExtractedData).base_price == "$299"
+
+    def test_failed_batch_reported(self, cache):
+        extractor, _ = make_extractor(FIELDS)
+
+        def boom(**kwargs):
+            raise RuntimeError("rate limited")
+
+        extractor.client.chat.completions.create = boom
+        result = extractor.extract_batched("Acme", "https://acme.com", PAGES)
+
+        assert not result.field_sources
+        assert any(w.startswith("Batched extraction failed") for w in result.extraction_warnings)
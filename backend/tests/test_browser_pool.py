@@ -0,0 +1,243 @@
+"""
+Certify Intel - Browser Pool Tests (v5.2.1)
+Tests for the shared Playwright browser pool using fake browser objects.
+
+Run with: pytest tests/test_browser_pool.py -v
+"""
+
+import os
+import sys
+import asyncio
+import time
+import pytest
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import browser_pool
+from browser_pool import BrowserPool
+
+
+# ============== FAKE PLAYWRIGHT ==============
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.closed = False
+        self._handlers = {}
+
+    def on(self, event, handler):
+        self._handlers[event] = handler
+
+    async def new_page(self):
+        if "page" in self._handlers:
+            self._handlers["page"](object())
+        return object()
+
+    async def close(self):
+        self.closed = True
+        self.browser.contexts.remove(self)
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.closed = False
+        self.contexts = []
+        self._handlers = {}
+
+    def on(self, event, handler):
+        self._handlers[event] = handler
+
+    def is_connected(self):
+        return self.connected
+
+    def crash(self):
+        self.connected = False
+        self._handlers["disconnected"](self)
+
+    async def new_context(self, **kwargs):
+        context = FakeContext(self)
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeChromium:
+    def __init__(self):
+        self.launched = []
+
+    async def launch(self, **kwargs):
+        browser = FakeBrowser()
+        browser.headless = kwargs.get("headless")
+        self.launched.append(browser)
+        return browser
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.chromium = FakeChromium()
+
+    async def start(self):
+        return self
+
+    async def stop(self):
+        pass
+
+
+@pytest.fixture
+def fake_playwright():
+    fake = FakePlaywright()
+    with patch.object(browser_pool, "PLAYWRIGHT_AVAILABLE", True), \
+         patch.object(browser_pool, "async_playwright", lambda: fake):
+        yield fake
+
+
+# ============== POOL TESTS ==============
+
+class TestBrowserPool:
+    """Tests for browser reuse, recycling and concurrency capping."""
+
+    def test_browser_reused_across_leases(self, fake_playwright):
+        async def run():
+            pool = BrowserPool(pool_size=1, max_contexts=2, max_pages_per_browser=100)
+            for _ in range(5):
+                async with pool.context() as context:
+                    await context.new_page()
+            await pool.close()
+            return pool
+
+        pool = asyncio.run(run())
+        assert len(fake_playwright.chromium.launched) == 1
+        assert pool.stats["contexts_served"] == 5
+        assert pool.stats["pages_served"] == 5
+
+    def test_browser_recycled_after_max_pages(self, fake_playwright):
+        async def run():
+            pool = BrowserPool(pool_size=1, max_contexts=2, max_pages_per_browser=2)
+            for _ in range(5):
+                async with pool.context() as context:
+                    await context.new_page()
+            return pool
+
+        pool = asyncio.run(run())
+        launched = fake_playwright.chromium.launched
+        assert len(launched) == 3
+        assert pool.stats["recycles"] == 2
+        # Retired browsers are closed once idle
+        assert launched[0].closed and launched[1].closed
+        assert not launched[2].closed
+
+    def test_crashed_browser_relaunched(self, fake_playwright):
+        async def run():
+            pool = BrowserPool(pool_size=1, max_contexts=2, max_pages_per_browser=100)
+            async with pool.context():
+                pass
+            fake_playwright.chromium.launched[0].crash()
+            async with pool.context():
+                pass
+            return pool
+
+        pool = asyncio.run(run())
+        assert len(fake_playwright.chromium.launched) == 2
+        assert pool.stats["crash_restarts"] == 1
+
+    def test_max_contexts_caps_concurrency(self, fake_playwright):
+        peak = {"open": 0, "max": 0}
+
+        async def worker(pool):
+            async with pool.context():
+                peak["open"] += 1
+                peak["max"] = max(peak["max"], peak["open"])
+                await asyncio.sleep(0.01)
+                peak["open"] -= 1
+
+        async def run():
+            pool = BrowserPool(pool_size=2, max_contexts=3, max_pages_per_browser=100)
+            await asyncio.gather(*(worker(pool) for _ in range(10)))
+            return pool
+
+        pool = asyncio.run(run())
+        assert peak["max"] == 3
+        assert len(fake_playwright.chromium.launched) == 2
+
+    def test_closed_pool_rejects_leases(self, fake_playwright):
+        async def run():
+            pool = BrowserPool(pool_size=1)
+            await pool.close()
+            async with pool.context():
+                pass
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(run())
+
+
+class TestPoolSingleton:
+    """A pool left behind on another event loop is closed, not leaked."""
+
+    def test_idle_loop_pool_closed_on_replace(self, fake_playwright, monkeypatch):
+        monkeypatch.setattr(browser_pool, "_pool_instance", None)
+
+        async def lease():
+            async with browser_pool.get_browser_pool().context():
+                pass
+
+        async def current():
+            return browser_pool.get_browser_pool()
+
+        old_loop = asyncio.new_event_loop()
+        old_loop.run_until_complete(lease())
+        old_pool = browser_pool._pool_instance
+
+        new_pool = asyncio.run(current())
+        assert new_pool is not old_pool
+
+        deadline = time.time() + 2
+        while not fake_playwright.chromium.launched[0].closed and time.time() < deadline:
+            time.sleep(0.01)
+        assert old_pool._closed
+        assert fake_playwright.chromium.launched[0].closed
+        old_loop.close()
+        monkeypatch.setattr(browser_pool, "_pool_instance", None)
+
+    def test_closed_loop_pool_terminates_driver(self, fake_playwright, monkeypatch):
+        monkeypatch.setattr(browser_pool, "_pool_instance", None)
+        killed = []
+        monkeypatch.setattr(browser_pool.os, "kill", lambda pid, sig: killed.append(pid))
+        fake_playwright._connection = type("Conn", (), {"_transport": type("T", (), {"_proc": type("P", (), {"pid": 4242})})})
+
+        async def lease():
+            async with browser_pool.get_browser_pool().context():
+                pass
+
+        asyncio.run(lease())
+        old_pool = browser_pool._pool_instance
+
+        async def current():
+            return browser_pool.get_browser_pool()
+
+        assert asyncio.run(current()) is not old_pool
+        assert old_pool._closed and killed == [4242]
+        monkeypatch.setattr(browser_pool, "_pool_instance", None)
+
+    def test_scraper_headless_override_uses_private_pool(self, fake_playwright, monkeypatch):
+        import scraper as scraper_module
+        monkeypatch.setattr(scraper_module, "PLAYWRIGHT_AVAILABLE", True)
+        shared = BrowserPool(headless=True)
+        monkeypatch.setattr(browser_pool, "_pool_instance", shared)
+        monkeypatch.setattr(scraper_module, "get_browser_pool", lambda: shared)
+
+        async def run(headless):
+            async with scraper_module.CompetitorScraper(headless=headless, http_first=False) as scraper:
+                async with scraper._open_context():
+                    pass
+                return scraper._own_pool
+
+        assert asyncio.run(run(None)) is None
+        own_pool = asyncio.run(run(False))
+        assert [b.headless for b in fake_playwright.chromium.launched] == [True, False]
+        assert own_pool._closed and not shared._closed
+        monkeypatch.setattr(browser_pool, "_pool_instance", None)
@@ -0,0 +1,87 @@
+"""
+Certify Intel - Content Ranker Tests (v5.2.1)
+Tests for boilerplate removal, BM25 ranking and token-budget packing.
+
+Run with: pytest tests/test_content_ranker.py -v
+"""
+
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from content_ranker import ContentRanker, split_sentences, bm25_scores
+
+
+COOKIE = "We use cookies to improve your experience. Accept all cookies to continue."
+NAV_CTA = "Request a demo today and see why teams choose Acme."
+FILLER = " ".join(
+    f"Our mission statement number {i} talks about transforming healthcare together." for i in range(40)
+)
+PRICING = "The Professional plan starts at $299 per provider per month, billed annually. A free trial is available."
+
+
+def make_ranker(budget=100):
+    ranker = ContentRanker(token_budget=budget)
+    ranker.enabled = True
+    return ranker
+
+
+# ============== BUILDING BLOCKS ==============
+
+class TestBuildingBlocks:
+    """Tests for sentence splitting and BM25 scoring."""
+
+    def test_split_collapsed_text(self):
+        text = "Intake made easy. Payments too! Starts at $5. Contact us"
+        assert split_sentences(text) == ["Intake made easy.", "Payments too!", "Starts at $5.", "Contact us"]
+
+    def test_bm25_prefers_matching_block(self):
+        scores = bm25_scores(
+            ["We love healthcare.", "Pricing per provider per month.", "Our team is great."],
+            ["pricing", "provider", "month"]
+        )
+        assert scores[1] > scores[0] and scores[1] > scores[2]
+
+
+# ============== TRIMMING ==============
+
+class TestTrimming:
+    """Tests for the end-to-end trim pipeline."""
+
+    def test_short_content_only_loses_boilerplate(self):
+        ranker = make_ranker(budget=2000)
+        result = ranker.trim("Acme", f"{COOKIE} Acme builds patient intake software.", "homepage")
+        assert result.content == "Acme builds patient intake software."
+        assert result.sentences_dropped == 2
+
+    def test_pricing_block_survives_budget_cut(self):
+        ranker = make_ranker(budget=100)  # ~400 chars
+        content = f"{FILLER} {PRICING} {FILLER}"
+        result = ranker.trim("Acme", content, "pricing")
+
+        assert "$299 per provider per month" in result.content
+        assert len(result.content) <= 400
+        assert result.field_group == "pricing"
+        # A plain character cut would have lost the pricing table
+        assert "$299" not in content[:400]
+
+    def test_cross_page_boilerplate_removed(self):
+        ranker = make_ranker(budget=2000)
+        ranker.register_site_pages("Acme", {
+            "homepage": f"{NAV_CTA} Acme builds patient intake software. {PRICING}",
+            "about": f"{NAV_CTA} Acme was founded in 2015 in Austin, Texas.",
+        })
+        result = ranker.trim("Acme", f"{NAV_CTA} The Starter plan is $99 per month. {PRICING}", "pricing")
+
+        assert NAV_CTA not in result.content
+        # Repeated sentences that carry pricing signals are kept
+        assert "$299" in result.content
+        assert "$99 per month" in result.content
+
+    def test_disabled_falls_back_to_character_cut(self):
+        ranker = make_ranker(budget=10)
+        ranker.enabled = False
+        result = ranker.trim("Acme", "x" * 100, "homepage")
+        assert result.content == "x" * 40 + "..."
@@ -0,0 +1,162 @@
+"""
+Certify Intel - Context Fragment Store Tests (v5.2.1)
+Tests for prebuilt summary/chat context fragments and their invalidation.
+
+Run with: pytest tests/test_context_store.py -v
+"""
+
+import os
+import sys
+from datetime import datetime
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from context_store import ContextFragmentStore, SCOPE_COMPETITOR, install_change_tracking
+import context_store as context_store_module
+
+
+# ============== TEST FIXTURES ==============
+
+@pytest.fixture
+def db(monkeypatch, session_factory):
+    """Isolated in-memory database with two competitors and one KB item."""
+    from database import Competitor, KnowledgeBaseItem
+
+    session = session_factory()
+    session.add_all([
+        Competitor(name="Phreesia", threat_level="High", website="https://phreesia.com",
+                   base_price="$299", is_public=True, ticker_symbol="PHR", last_updated=datetime(2026, 1, 1)),
+        Competitor(name="Clearwave", threat_level="Medium", notes="Kiosk focus", last_updated=datetime(2026, 1, 1)),
+        KnowledgeBaseItem(title="Battle notes", content_text="Lead with time-to-value.", source_type="manual"),
+    ])
+    session.commit()
+
+    store = ContextFragmentStore()
+    store.enabled = True
+    monkeypatch.setattr(context_store_module, "_store_instance", store)
+    install_change_tracking()
+    yield session
+    session.close()
+
+
+def rebuilt(store, before):
+    return store.stats["rebuilt"] - before
+
+
+# ============== FRAGMENT TESTS ==============
+
+class TestContextFragments:
+    """Fragments are built once and rebuilt only for changed entities."""
+
+    def test_fragments_built_then_served(self, db):
+        store = context_store_module.get_context_store()
+        first = store.competitor_fragments(db, "summary")
+        assert [c.name for c, _ in first] == ["Phreesia", "Clearwave"]
+        assert "Base Price: $299" in first[0][1]
+        assert "NOTES: Kiosk focus" in first[1][1]
+        assert store.stats["rebuilt"] == 2
+
+        second = store.competitor_fragments(db, "summary")
+        assert [f for _, f in second] == [f for _, f in first]
+        assert store.stats["rebuilt"] == 2
+        assert store.stats["served"] == 2
+
+    def test_variants_are_separate(self, db):
+        store = context_store_module.get_context_store()
+        chat = dict((c.name, f) for c, f in store.competitor_fragments(db, "chat"))
+        assert "COMPETITOR: Phreesia" in chat["Phreesia"]
+        assert "PUBLIC COMPANY: No (Private)" in chat["Clearwave"]
+        # Public company stock lines are appended live by the caller
+        assert "PUBLIC COMPANY" not in chat["Phreesia"]
+
+    def test_orm_edit_rebuilds_only_that_competitor(self, db):
+        from database import Competitor
+
+        store = context_store_module.get_context_store()
+        store.competitor_fragments(db, "summary")
+        before = store.stats["rebuilt"]
+
+        # Edit without touching last_updated: caught by the session hooks
+        clearwave = db.query(Competitor).filter(Competitor.name == "Clearwave").first()
+        clearwave.notes = "Acquired"
+        db.commit()
+
+        fragments = dict((c.name, f) for c, f in store.competitor_fragments(db, "summary"))
+        assert rebuilt(store, before) == 1
+        assert "NOTES: Acquired" in fragments["Clearwave"]
+
+    def test_rolled_back_edit_does_not_invalidate(self, db):
+        from database import Competitor
+
+        store = context_store_module.get_context_store()
+        store.competitor_fragments(db, "summary")
+        db.query(Competitor).first().notes = "Draft"
+        db.flush()
+        db.rollback()
+        assert store.stats["invalidated"] == 0
+
+    def test_data_source_change_rebuilds_competitor(self, db):
+        from sqlalchemy import text
+        from database import Competitor
+
+        store = context_store_module.get_context_store()
+        store.competitor_fragments(db, "chat")
+        before = store.stats["rebuilt"]
+
+        # Raw SQL bypasses the hooks; the data source fingerprint still changes
+        phreesia_id = db.query(Competitor.id).filter(Competitor.name == "Phreesia").scalar()
+        db.execute(text(
+            "INSERT INTO data_sources (competitor_id, field_name, updated_at) VALUES (:cid, 'base_price', :ts)"
+        ), {"cid": phreesia_id, "ts": datetime(2026, 2, 1)})
+        db.commit()
+
+        store.competitor_fragments(db, "chat")
+        assert rebuilt(store, before) == 1
+
+    def test_deleted_competitor_pruned(self, db):
+        from database import Competitor, ContextFragment
+
+        store = context_store_module.get_context_store()
+        store.competitor_fragments(db, "summary")
+        db.query(Competitor).filter(Competitor.name == "Clearwave").first().is_deleted = True
+        db.commit()
+
+        assert [c.name for c, _ in store.competitor_fragments(db, "summary")] == ["Phreesia"]
+        assert db.query(ContextFragment).filter(
+            ContextFragment.scope == SCOPE_COMPETITOR, ContextFragment.variant == "summary"
+        ).count() == 1
+
+    def test_knowledge_base_fragments(self, db):
+        from database import KnowledgeBaseItem
+
+        store = context_store_module.get_context_store()
+        assert store.knowledge_base_fragments(db, "summary") == [
+            "\n--- Battle notes (manual) ---\nLead with time-to-value.\n"
+        ]
+        item = db.query(KnowledgeBaseItem).first()
+        item.content_text = "Lead with integrations."
+        db.commit()
+        assert "Lead with integrations." in store.knowledge_base_fragments(db, "chat")[0]
+
+        item.is_active = False
+        db.commit()
+        assert store.knowledge_base_fragments(db, "summary") == []
+
+    def test_knowledge_base_edit_from_other_worker(self, db):
+        from sqlalchemy import text
+
+        store = context_store_module.get_context_store()
+        store.knowledge_base_fragments(db, "summary")
+
+        # Another worker's commit is not seen by this process's hooks; same text length
+        db.execute(text(
+            "UPDATE knowledge_base SET content_text = 'Lead with time-to-close.', updated_at = :ts"
+        ), {"ts": datetime(2026, 2, 1)})
+        db.execute(text("UPDATE knowledge_base SET title = 'Battle cards'"))
+        db.commit()
+
+        assert store.knowledge_base_fragments(db, "summary") == [
+            "\n--- Battle cards (manual) ---\nLead with time-to-close.\n"
+        ]
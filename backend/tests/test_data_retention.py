@@ -0,0 +1,148 @@
+"""
+Certify Intel - Log Retention Tests (v5.2.1)
+Tests for summarizing, archiving and deleting old change/activity log rows in resumable chunks.
+
+Run with: pytest tests/test_data_retention.py -v
+"""
+
+import os
+import sys
+import gzip
+import json
+from datetime import datetime, timedelta
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("sqlalchemy")
+from sqlalchemy import select, func
+
+from data_retention import RetentionJob, period_start, summary_counts
+from database import (
+    ARCHIVE_TABLES, ActivityLog, ChangeLog, DataChangeHistory, LogSummary, RetentionProgress
+)
+
+NOW = datetime(2026, 6, 15, 12, 0)  # A Monday
+
+
+# ============== TEST FIXTURES ==============
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    old = NOW - timedelta(days=400)
+    session.add_all(
+        [DataChangeHistory(competitor_id=1, competitor_name="Phreesia", field_name="base_price",
+                           old_value="$3", new_value="$4", changed_by="scraper", changed_at=old + timedelta(hours=i))
+         for i in range(5)]
+        + [DataChangeHistory(competitor_id=2, competitor_name="Clearwave", field_name="customer_count",
+                             changed_by="admin@example.com", changed_at=old + timedelta(days=1))]
+        + [DataChangeHistory(competitor_id=1, competitor_name="Phreesia", field_name="base_price",
+                             changed_by="scraper", changed_at=NOW - timedelta(days=3))]
+        + [ActivityLog(user_email="admin@example.com", action_type="login", created_at=NOW - timedelta(days=120, hours=i))
+           for i in range(3)]
+        + [ActivityLog(user_email="admin@example.com", action_type="login", created_at=NOW - timedelta(days=1))]
+        + [ChangeLog(competitor_id=1, competitor_name="Phreesia", change_type="Pricing", severity="High",
+                     detected_at=NOW - timedelta(days=10))]
+    )
+    session.commit()
+    yield session
+    session.close()
+
+
+def make_job(tmp_path, **kwargs):
+    kwargs.setdefault("archive_mode", "file")
+    return RetentionJob(archive_dir=str(tmp_path / "archives"), chunk_pause_ms=0, vacuum=False, **kwargs)
+
+
+# ============== RUN ==============
+
+class TestRetentionRun:
+    """Old rows are summarized, archived and removed; recent rows stay."""
+
+    def test_summarize_archive_and_delete(self, db, tmp_path):
+        job = make_job(tmp_path, chunk_size=2)
+        assert job.eligible_counts(db, NOW) == {"data_change_history": 6, "change_log": 0, "activity_logs": 3}
+
+        report = job.run(db, now=NOW)
+
+        assert report["tables"]["data_change_history"] == {"archived": 6, "status": "complete"}
+        assert report["tables"]["activity_logs"] == {"archived": 3, "status": "complete"}
+        assert db.query(DataChangeHistory).count() == 1
+        assert db.query(ActivityLog).count() == 1
+        assert db.query(ChangeLog).count() == 1
+
+        # Daily summaries per competitor/field/user
+        phreesia = db.query(LogSummary).filter(
+            LogSummary.source_table == "data_change_history", LogSummary.competitor_id == 1
+        ).one()
+        assert (phreesia.period, phreesia.key, phreesia.sub_key, phreesia.row_count) == ("day", "base_price", "scraper", 5)
+        assert phreesia.competitor_name == "Phreesia"
+
+        # Weekly activity summary, merged across chunks
+        activity = db.query(LogSummary).filter(LogSummary.source_table == "activity_logs").all()
+        assert sum(s.row_count for s in activity) == 3
+        assert all(s.period == "week" and s.period_start.weekday() == 0 for s in activity)
+
+        # Raw rows are in the archive files
+        files = sorted((tmp_path / "archives" / "data_change_history").iterdir())
+        assert len(files) == 3
+        with gzip.open(files[0], "rt") as f:
+            first = json.loads(f.readline())
+        assert first["field_name"] == "base_price" and first["old_value"] == "$3"
+
+        progress = db.get(RetentionProgress, "data_change_history")
+        assert progress.status == "complete" and progress.rows_archived == 6
+
+    def test_archive_table_mode(self, db, tmp_path):
+        job = make_job(tmp_path, archive_mode="table")
+        job.run(db, tables=["data_change_history"], now=NOW)
+
+        archive = ARCHIVE_TABLES["data_change_history"]
+        assert db.execute(select(func.count()).select_from(archive)).scalar() == 6
+        assert db.query(ActivityLog).count() == 4  # Not selected
+
+    def test_time_budget_resumes_next_run(self, db, tmp_path):
+        job = make_job(tmp_path, chunk_size=2)
+        report = job.run(db, tables=["data_change_history"], max_seconds=0, now=NOW)
+        assert report["tables"]["data_change_history"] == {"archived": 0, "status": "partial"}
+        assert db.get(RetentionProgress, "data_change_history").status == "partial"
+
+        report = job.run(db, tables=["data_change_history"], now=NOW)
+        assert report["tables"]["data_change_history"]["status"] == "complete"
+        assert db.query(LogSummary).filter(LogSummary.source_table == "data_change_history").count() == 2
+
+    def test_summaries_merge_across_runs(self, db, tmp_path):
+        job = make_job(tmp_path, archive_mode="delete")
+        job.run(db, tables=["activity_logs"], now=NOW)
+        start = db.query(LogSummary).filter(LogSummary.source_table == "activity_logs").first().period_start
+        db.add(ActivityLog(user_email="admin@example.com", action_type="login", created_at=start + timedelta(hours=1)))
+        db.commit()
+        job.run(db, tables=["activity_logs"], now=NOW)
+
+        counts = summary_counts(db, "activity_logs", NOW - timedelta(days=365))
+        assert counts == {"login": 4}
+        assert not (tmp_path / "archives").exists()
+
+    def test_zero_retention_keeps_everything(self, db, tmp_path):
+        from data_retention import POLICIES, RetentionPolicy
+        policies = dict(POLICIES, data_change_history=RetentionPolicy(
+            "data_change_history", "changed_at", 0, "day", "field_name", "changed_by"
+        ))
+        report = make_job(tmp_path, policies=policies).run(db, now=NOW)
+        assert "data_change_history" not in report["tables"]
+        assert db.query(DataChangeHistory).count() == 7
+
+
+class TestPolicies:
+    """Summary buckets and configuration checks."""
+
+    def test_period_start(self):
+        ts = datetime(2026, 6, 18, 15, 30)  # Thursday
+        assert period_start(ts, "day") == datetime(2026, 6, 18)
+        assert period_start(ts, "week") == datetime(2026, 6, 15)
+
+    def test_rejects_unknown_archive_mode(self, tmp_path):
+        with pytest.raises(ValueError):
+            make_job(tmp_path, archive_mode="s3")
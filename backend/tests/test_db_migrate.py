@@ -0,0 +1,132 @@
+"""
+Certify Intel - Database Migration Tests (v5.2.1)
+Tests for engine configuration, schema upgrades and the SQLite -> PostgreSQL copy.
+
+The copy runs SQLite -> SQLite here; set TEST_POSTGRES_URL (e.g. the
+docker-compose "postgres" profile) to also run it against PostgreSQL.
+
+Run with: pytest tests/test_db_migrate.py -v
+"""
+
+import os
+import sys
+from datetime import datetime
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("sqlalchemy")
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+import db_migrate
+import search_index
+from database import Base, Competitor, NewsArticleCache, ActivityLog, normalize_database_url, ensure_schema
+
+
+# ============== TEST FIXTURES ==============
+
+@pytest.fixture
+def source(tmp_path):
+    """SQLite file with a few related rows and (when available) the FTS5 search tables."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'source.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    competitor = Competitor(name="Phreesia", website="https://phreesia.com", is_deleted=False)
+    session.add(competitor)
+    session.flush()
+    session.add_all([
+        NewsArticleCache(competitor_id=competitor.id, competitor_name="Phreesia", title="Phreesia raises $50M",
+                         url="https://news.example.com/1", url_hash="a" * 40, published_at=datetime(2025, 6, 10)),
+        ActivityLog(user_email="admin@example.com", action_type="login"),
+    ])
+    session.commit()
+    session.close()
+    if search_index.fts5_available(engine):
+        search_index.ensure_search_index(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def target(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'target.db'}")
+    yield engine
+    engine.dispose()
+
+
+def quiet(*args):
+    pass
+
+
+# ============== ENGINE / SCHEMA ==============
+
+class TestSchema:
+    """URLs are normalized and older databases gain missing columns and indexes."""
+
+    def test_normalize_url(self):
+        assert normalize_database_url("postgres://u:p@db/certify") == "postgresql://u:p@db/certify"
+        assert normalize_database_url("sqlite:///./certify_intel.db") == "sqlite:///./certify_intel.db"
+
+    def test_postgres_engine_is_pooled(self):
+        pytest.importorskip("psycopg2")
+        from database import create_db_engine
+        engine = create_db_engine("postgres://u:p@localhost:5432/certify")
+        assert engine.dialect.name == "postgresql"
+        assert engine.pool._pre_ping
+        assert engine.pool.size() == int(os.getenv("DB_POOL_SIZE", "10"))
+
+    def test_upgrade_adds_missing_columns(self, target):
+        with target.begin() as conn:
+            conn.execute(text("CREATE TABLE competitors (id INTEGER PRIMARY KEY, name VARCHAR)"))
+        added = db_migrate.upgrade(target)
+
+        columns = {c["name"] for c in inspect(target).get_columns("competitors")}
+        assert {"website", "threat_level", "is_deleted"} <= columns
+        assert "competitors.website" in added
+        assert ensure_schema(target) == []  # Idempotent
+
+
+# ============== COPY ==============
+
+class TestCopy:
+    """All model tables are copied in dependency order; search tables are left behind."""
+
+    def test_copy_all_tables(self, source, target):
+        copied = db_migrate.copy_data(source, target, batch_size=1, log=quiet)
+
+        assert copied["competitors"] == 1
+        assert copied["news_article_cache"] == 1
+        assert copied["activity_logs"] == 1
+        assert db_migrate.verify_counts(source, target, list(copied)) == {}
+        assert not [t for t in inspect(target).get_table_names() if db_migrate.is_search_table(t)]
+
+        session = sessionmaker(bind=target)()
+        article = session.query(NewsArticleCache).one()
+        assert article.published_at == datetime(2025, 6, 10)
+        assert session.query(Competitor).one().is_deleted is False
+        session.close()
+
+    def test_refuses_non_empty_target_unless_truncate(self, source, target):
+        db_migrate.copy_data(source, target, log=quiet)
+        with pytest.raises(RuntimeError):
+            db_migrate.copy_data(source, target, log=quiet)
+        copied = db_migrate.copy_data(source, target, truncate=True, log=quiet)
+        assert copied["competitors"] == 1
+        assert db_migrate.verify_counts(source, target, list(copied)) == {}
+
+    @pytest.mark.skipif(not os.getenv("TEST_POSTGRES_URL"), reason="TEST_POSTGRES_URL not set")
+    def test_copy_to_postgres(self, source):
+        from database import create_db_engine
+        target = create_db_engine(os.environ["TEST_POSTGRES_URL"])
+        copied = db_migrate.copy_data(source, target, truncate=True, log=quiet)
+        assert db_migrate.verify_counts(source, target, list(copied)) == {}
+
+        # Sequences were advanced past the copied ids
+        session = sessionmaker(bind=target)()
+        session.add(Competitor(name="Clearwave"))
+        session.commit()
+        assert session.query(Competitor).count() == 2
+        session.close()
+        target.dispose()
@@ -0,0 +1,117 @@
+"""
+Certify Intel - Batched Dimension Tagging Tests (v5.2.1)
+Tests for the keyword pre-filter, token-budget packing and ID-tagged batch responses.
+
+Run with: pytest tests/test_dimension_batch.py -v
+"""
+
+import os
+import sys
+import json
+import re
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dimension_analyzer as dimension_module
+from dimension_analyzer import DimensionAnalyzer, has_dimension_signal
+
+
+class FakeLLMCache:
+    """Pass-through cache: always computes."""
+
+    def get_or_compute(self, compute, from_cache=None, to_cache=None, **kwargs):
+        return compute()
+
+
+class FakeOpenAI:
+    """Minimal chat.completions client that tags every article ID with a dimension chosen by title."""
+
+    def __init__(self):
+        self.prompts = []
+        self.chat = self
+        self.completions = self
+
+    def create(self, model, messages, **kwargs):
+        prompt = messages[0]["content"]
+        self.prompts.append(prompt)
+        ids = [int(i) for i in re.findall(r"^\[(\d+)\] Title:", prompt, re.M)]
+        body = {"articles": [
+            {"id": i, "dimensions": [{"dimension_id": "implementation_ttv", "confidence": 0.8},
+                                     {"dimension_id": "not_a_dimension", "confidence": 0.9}]}
+            for i in ids
+        ] + [{"id": 999, "dimensions": [{"dimension_id": "pricing_flexibility", "confidence": 0.9}]}]}
+        message = type("M", (), {"content": json.dumps(body)})
+        return type("R", (), {"choices": [type("C", (), {"message": message})]})
+
+
+def make_analyzer():
+    analyzer = DimensionAnalyzer()
+    client = FakeOpenAI()
+    analyzer._get_ai_client = lambda: client
+    return analyzer, client
+
+
+# ============== PRE-FILTER ==============
+
+class TestPreFilter:
+    """Only articles with some dimension signal reach the model."""
+
+    def test_signal(self):
+        assert has_dimension_signal("Health system goes live with Phreesia intake")
+        assert has_dimension_signal("Phreesia raises prices for small practices")
+        assert not has_dimension_signal("Phreesia names new CFO")
+        assert not has_dimension_signal("Phreesia CEO to speak at JPMorgan conference")
+
+
+# ============== BATCHING ==============
+
+class TestClassifyArticlesBatch:
+    """One request for many articles, with keyword short-circuits."""
+
+    def test_single_call_with_prefilter(self):
+        analyzer, client = make_analyzer()
+        articles = [
+            ("Phreesia adds EHR integration and API for Epic", ""),   # Strong keyword match: no LLM
+            ("Phreesia names new CFO", ""),                          # No signal: no LLM
+            ("Health system goes live with Phreesia intake", ""),    # Signal only: LLM
+            ("Clinic selects Phreesia after pilot", "Rollout planned for spring"),  # LLM
+        ]
+        with patch.object(dimension_module, "get_llm_cache", return_value=FakeLLMCache()):
+            results = analyzer.classify_articles_batch(articles, "Phreesia")
+
+        assert len(client.prompts) == 1
+        assert "[2] Title:" in client.prompts[0] and "[3] Title:" in client.prompts[0]
+        assert "[0] Title:" not in client.prompts[0] and "[1] Title:" not in client.prompts[0]
+        assert results[0][0][0] == "integration_depth"
+        assert results[1] == []
+        # Unknown dimension names and IDs outside the batch are ignored
+        assert results[2] == [("implementation_ttv", 0.8)]
+        assert results[3] == [("implementation_ttv", 0.8)]
+
+    def test_token_budget_splits_batches(self):
+        analyzer, client = make_analyzer()
+        articles = [(f"Hospital {i} goes live with Phreesia intake", "x" * 280) for i in range(12)]
+        overhead = len(analyzer._build_batch_classification_prompt(articles, [], "Phreesia")) // 4
+
+        batches = analyzer._pack_batches(articles, list(range(12)), "Phreesia", token_budget=overhead + 500)
+        assert len(batches) > 1
+        assert sorted(i for b in batches for i in b) == list(range(12))
+
+        assert analyzer._pack_batches(articles, list(range(12)), "Phreesia", token_budget=100000, max_items=5) == [
+            [0, 1, 2, 3, 4], [5, 6, 7, 8, 9], [10, 11]
+        ]
+
+    def test_failed_batch_keeps_keyword_matches(self):
+        analyzer, client = make_analyzer()
+
+        def broken(**kwargs):
+            raise RuntimeError("rate limited")
+        client.create = broken
+
+        articles = [("Phreesia pricing update", ""), ("Health system goes live", "")]
+        with patch.object(dimension_module, "get_llm_cache", return_value=FakeLLMCache()):
+            results = analyzer.classify_articles_batch(articles, "Phreesia")
+        assert [d for d, _ in results[0]] == ["pricing_flexibility"]
+        assert results[1] == []
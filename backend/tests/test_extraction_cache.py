@@ -0,0 +1,138 @@
+"""
+Certify Intel - Extraction Cache Tests (v5.2.1)
+Tests for content-hash caching of AI extraction results.
+
+Run with: pytest tests/test_extraction_cache.py -v
+"""
+
+import os
+import sys
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extraction_cache import ExtractionCache, content_hash, normalize_content, is_cacheable
+
+
+# ============== TEST FIXTURES ==============
+
+@pytest.fixture
+def cache(session_factory):
+    """ExtractionCache backed by an isolated in-memory SQLite database."""
+    return ExtractionCache(session_factory=session_factory, max_age_days=0)
+
+
+# ============== HASHING TESTS ==============
+
+class TestContentHash:
+    """Tests for page normalization and hashing."""
+
+    def test_whitespace_and_case_ignored(self):
+        assert content_hash("Pricing  starts at\n$299") == content_hash("pricing starts at $299")
+
+    def test_copyright_year_ignored(self):
+        a = "Acme Health. © 2025 Acme Inc. All rights reserved."
+        b = "Acme Health. © 2026 Acme Inc. All rights reserved."
+        assert content_hash(a) == content_hash(b)
+
+    def test_real_change_detected(self):
+        assert content_hash("Starting at $299/month") != content_hash("Starting at $349/month")
+
+    def test_founded_year_preserved(self):
+        assert "2005" in normalize_content("Founded in 2005")
+
+    def test_failed_extraction_not_cacheable(self):
+        assert not is_cacheable({"error": "rate limited"})
+        assert not is_cacheable({"extraction_notes": "Extraction failed: timeout"})
+        assert is_cacheable({"base_price": "$299", "extraction_notes": "Found on pricing page"})
+
+
+# ============== CACHE TESTS ==============
+
+class TestExtractionCache:
+    """Tests for persistent get/put behaviour and counters."""
+
+    def test_miss_then_hit(self, cache):
+        from extractor import ExtractedData
+
+        content = "Acme pricing starts at $299 per provider per month"
+        assert cache.get("Acme", "pricing", content, ExtractedData) is None
+
+        cache.put("Acme", "pricing", content, ExtractedData(base_price="$299"), extraction_model="test")
+        cached = cache.get("Acme", "pricing", content + "  ", ExtractedData)
+
+        assert cached.base_price == "$299"
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["entries"] == 1
+
+    def test_changed_content_misses(self, cache):
+        from extractor import ExtractedData
+
+        cache.put("Acme", "pricing", "Starting at $299", ExtractedData(base_price="$299"))
+        assert cache.get("Acme", "pricing", "Starting at $349", ExtractedData) is None
+
+    def test_page_types_isolated(self, cache):
+        from extractor import ExtractedData
+
+        cache.put("Acme", "pricing", "same text", ExtractedData(base_price="$299"))
+        assert cache.get("Acme", "about", "same text", ExtractedData) is None
+
+    def test_failed_extraction_not_stored(self, cache):
+        from extractor import ExtractedData
+
+        stored = cache.put("Acme", "pricing", "text", ExtractedData(extraction_notes="Extraction failed: 429"))
+        assert stored is False
+        assert cache.get_stats()["entries"] == 0
+
+    def test_non_text_content_bypasses_cache(self, cache):
+        from extractor import ExtractedData
+
+        page = {"content": "Starting at $299", "success": True}
+        assert cache.get("Acme", "homepage", page, ExtractedData) is None
+        assert cache.put("Acme", "homepage", page, ExtractedData(base_price="$299")) is False
+        assert cache.get_stats()["errors"] == 0
+
+
+# ============== SCRAPE JOB ==============
+
+class TestScrapeJobExtraction:
+    """POST /api/scrape/{id} extracts from the scraped page text, not the scrape() dict."""
+
+    def test_run_scrape_job_extracts_page_text(self, monkeypatch, session_factory):
+        pytest.importorskip("fastapi")
+        import asyncio
+        import main
+        import scraper
+        import extractor
+        from database import Competitor
+
+        db = session_factory()
+        db.add(Competitor(name="Acme", website="acme.com"))
+        db.commit()
+        competitor_id = db.query(Competitor.id).scalar()
+        db.close()
+
+        class FakeScraper:
+            async def scrape(self, url):
+                return {"content": "Acme pricing starts at $299", "title": "Acme", "url": url, "success": True}
+
+        received = []
+
+        class FakeExtractor:
+            async def aextract_from_content(self, competitor_name, content, page_type="homepage"):
+                received.append(content)
+                return extractor.ExtractedData(base_price="$299")
+
+        monkeypatch.setattr(main, "SessionLocal", session_factory)
+        monkeypatch.setattr(scraper, "CompetitorScraper", FakeScraper)
+        monkeypatch.setattr(extractor, "get_extractor", lambda: FakeExtractor())
+
+        asyncio.run(main.run_scrape_job(competitor_id))
+
+        assert received == ["Acme pricing starts at $299"]
+        check = session_factory()
+        assert check.get(Competitor, competitor_id).base_price == "$299"
+        check.close()
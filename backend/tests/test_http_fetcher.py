@@ -0,0 +1,195 @@
+"""
+Certify Intel - HTTP Fetch Tier Tests (v5.2.1)
+Tests for JS-rendering detection and HTTP-first scraping with browser escalation.
+
+Run with: pytest tests/test_http_fetcher.py -v
+"""
+
+import os
+import sys
+import time
+import asyncio
+import pytest
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("bs4")
+
+import scraper as scraper_module
+from http_fetcher import (
+    HttpFetcher, detect_js_rendering, extract_text_from_html,
+    FETCH_OK, FETCH_NOT_FOUND, FETCH_NEEDS_BROWSER
+)
+from scraper import CompetitorScraper
+
+
+BODY_TEXT = "Certify Health delivers patient intake, payments and biometric check-in. " * 10
+
+SERVER_RENDERED = f"""
+<html><head><title>Acme Health</title>
+<meta name="description" content="Patient experience platform"></head>
+<body>
+<nav><a href="/pricing">Pricing</a><a href="/about">About</a></nav>
+<main><h1>Acme</h1><p>{BODY_TEXT}</p></main>
+<script>var tracking = "should not appear";</script>
+</body></html>
+"""
+
+SPA_SHELL = """
+<html><head><title>App</title><script src="/bundle.js"></script></head>
+<body><div id="root"></div></body></html>
+"""
+
+
+def make_fetcher(routes):
+    """Fetcher backed by an in-memory transport: url -> (status, html)."""
+    def handler(request):
+        status, html = routes.get(str(request.url), (404, "not found"))
+        return httpx.Response(status, text=html, headers={"content-type": "text/html"})
+
+    fetcher = HttpFetcher(min_text_chars=200)
+    fetcher.enabled = True
+    fetcher._client = httpx.AsyncClient(transport=httpx.MockTransport(handler), follow_redirects=True)
+    return fetcher
+
+
+# ============== DETECTION TESTS ==============
+
+class TestJsDetection:
+    """Tests for deciding when a page needs a real browser."""
+
+    def test_server_rendered_page_is_usable(self):
+        text = extract_text_from_html(SERVER_RENDERED)
+        assert "biometric check-in" in text
+        assert "should not appear" not in text
+        assert "Pricing" not in text  # nav stripped like the browser extractor
+        assert detect_js_rendering(SERVER_RENDERED, text, 200) is None
+
+    def test_spa_shell_detected(self):
+        text = extract_text_from_html(SPA_SHELL)
+        assert detect_js_rendering(SPA_SHELL, text, 200) in ("empty_body", "spa_root")
+
+    def test_thin_content_detected(self):
+        html = "<html><body><p>Loading...</p></body></html>"
+        assert detect_js_rendering(html, extract_text_from_html(html), 200) == "thin_content"
+
+    def test_empty_body_detected(self):
+        assert detect_js_rendering("", "", 200) == "empty_body"
+
+
+# ============== FETCHER TESTS ==============
+
+class TestHttpFetcher:
+    """Tests for fetch outcomes and domain memory."""
+
+    def test_fetch_outcomes(self):
+        fetcher = make_fetcher({
+            "https://acme.com": (200, SERVER_RENDERED),
+            "https://spa.com": (200, SPA_SHELL),
+            "https://blocked.com": (403, "denied"),
+        })
+
+        async def run():
+            return (
+                await fetcher.fetch("https://acme.com"),
+                await fetcher.fetch("https://acme.com/missing"),
+                await fetcher.fetch("https://spa.com"),
+                await fetcher.fetch("https://blocked.com"),
+            )
+
+        ok, missing, spa, blocked = asyncio.run(run())
+        assert ok.outcome == FETCH_OK
+        assert ok.title == "Acme Health"
+        assert ok.meta_description == "Patient experience platform"
+        assert "https://acme.com/pricing" in ok.links
+        assert missing.outcome == FETCH_NOT_FOUND
+        assert spa.outcome == FETCH_NEEDS_BROWSER
+        assert blocked.outcome == FETCH_NEEDS_BROWSER
+
+    def test_js_domain_remembered(self):
+        fetcher = make_fetcher({"https://spa.com": (200, SPA_SHELL)})
+
+        async def run():
+            await fetcher.fetch("https://spa.com")
+            return await fetcher.fetch("https://www.spa.com/pricing")
+
+        second = asyncio.run(run())
+        assert fetcher.needs_browser("spa.com")
+        assert second.reason == "known_js_domain"
+        assert fetcher.stats["skipped_js_domain"] == 1
+
+    def test_loop_change_closes_old_client(self, monkeypatch):
+        import http_fetcher
+        monkeypatch.setattr(http_fetcher, "_fetcher_instance", None)
+        old_loop = asyncio.new_event_loop()
+
+        async def get_client():
+            return http_fetcher.get_http_fetcher()._get_client()
+
+        old_client = old_loop.run_until_complete(get_client())
+        new_client = asyncio.run(get_client())  # Different loop: the old client is replaced
+
+        deadline = time.time() + 5
+        while (not old_client.is_closed or old_loop.is_running()) and time.time() < deadline:
+            time.sleep(0.02)
+        assert old_client.is_closed
+        assert new_client is not old_client and not new_client.is_closed
+        old_loop.close()
+        asyncio.run(new_client.aclose())
+
+
+# ============== SCRAPER INTEGRATION ==============
+
+class TestHttpFirstScraping:
+    """Tests for CompetitorScraper routing between the HTTP and browser tiers."""
+
+    def _run(self, fetcher, pages, concurrent=False):
+        scraper = CompetitorScraper(http_first=True, concurrent_pages=concurrent)
+        escalated = {}
+
+        async def fake_browser(name, website, page_types, discover, concurrent, scraped_pages):
+            escalated["page_types"] = list(page_types)
+            escalated["discover"] = discover
+            return []
+
+        scraper._scrape_pages_in_browser = fake_browser
+        with patch.object(scraper_module, "get_http_fetcher", lambda: fetcher), \
+             patch.object(scraper_module, "PLAYWRIGHT_AVAILABLE", True):
+            result = asyncio.run(scraper.scrape_competitor("Acme", "acme.com", pages))
+        return result, escalated
+
+    def test_server_rendered_site_never_opens_browser(self):
+        fetcher = make_fetcher({
+            "https://acme.com": (200, SERVER_RENDERED),
+            "https://acme.com/plans": (200, SERVER_RENDERED.replace("Acme Health", "Plans")),
+        })
+        result, escalated = self._run(fetcher, ["homepage", "pricing"])
+
+        assert result.success
+        assert [p.page_type for p in result.pages] == ["homepage", "pricing"]
+        assert result.pages[1].url == "https://acme.com/plans"  # /pricing 404s, /plans works
+        assert all(p.fetched_via == "http" for p in result.pages)
+        assert "https://acme.com/pricing" in result.discovered_pages
+        assert escalated == {}
+
+    def test_js_pages_escalate_to_browser(self):
+        fetcher = make_fetcher({
+            "https://acme.com": (200, SERVER_RENDERED),
+            "https://acme.com/pricing": (200, "<html><body><p>Loading...</p></body></html>"),
+        })
+        result, escalated = self._run(fetcher, ["homepage", "pricing", "about"], concurrent=True)
+
+        assert [p.page_type for p in result.pages] == ["homepage"]
+        # Only the thin pricing page escalates; about pages all 404 over HTTP too
+        assert escalated == {"page_types": ["pricing"], "discover": False}
+        assert not fetcher.needs_browser("acme.com")
+
+    def test_spa_homepage_sends_everything_to_browser(self):
+        fetcher = make_fetcher({"https://acme.com": (200, SPA_SHELL)})
+        result, escalated = self._run(fetcher, ["homepage", "pricing"])
+
+        assert escalated == {"page_types": ["homepage", "pricing"], "discover": True}
+        assert fetcher.needs_browser("acme.com")
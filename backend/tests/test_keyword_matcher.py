@@ -0,0 +1,106 @@
+"""
+Certify Intel - Compiled Keyword Matcher Tests (v5.2.1)
+Tests that the one-pass matcher agrees with the substring loops it replaced.
+
+Run with: pytest tests/test_keyword_matcher.py -v
+"""
+
+import os
+import sys
+import random
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import keyword_matcher
+from keyword_matcher import KeywordMatcher
+
+
+def naive_counts(categories, text):
+    text = text.lower()
+    result = {}
+    for name, keywords in categories.items():
+        count = sum(1 for k in keywords if k.lower() in text)
+        if count:
+            result[name] = count
+    return result
+
+
+@pytest.fixture(params=["regex", "loop"])
+def strategy(request, monkeypatch):
+    """Run each test against the compiled regex and the small-set substring path."""
+    monkeypatch.setattr(keyword_matcher, "SMALL_SET_SIZE", 0 if request.param == "regex" else 10 ** 6)
+    return request.param
+
+
+# ============== MATCHING ==============
+
+class TestKeywordMatcher:
+    """Same hits as `keyword in text`, in one pass."""
+
+    def test_nested_and_overlapping_keywords(self, strategy):
+        categories = {"a": ["api", "api integration", "Integration"], "b": ["rapid", "idea", "cuts", "success"]}
+        matcher = KeywordMatcher(categories)
+        text = "Rapidea cutsuccess via API Integration"
+        assert matcher.find(text) == {"api", "api integration", "integration", "rapid", "idea", "cuts", "success"}
+        assert matcher.counts(text) == naive_counts(categories, text)
+
+    def test_randomized_equivalence(self, strategy):
+        rng = random.Random(5021)
+        alphabet = "abc "
+        for _ in range(200):
+            categories = {
+                f"c{c}": ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))).strip() or "a"
+                          for _ in range(rng.randint(1, 6))]
+                for c in range(3)
+            }
+            matcher = KeywordMatcher(categories)
+            text = "".join(rng.choice(alphabet + "ABC") for _ in range(rng.randint(0, 30)))
+            assert matcher.counts(text) == naive_counts(categories, text), (categories, text)
+            assert matcher.search(text) == bool(naive_counts(categories, text))
+
+    def test_first_follows_definition_order(self, strategy):
+        matcher = KeywordMatcher({"funding": ["raises"], "expansion": ["expands"], "empty": []})
+        assert matcher.first("Phreesia expands after it raises $50M") == "funding"
+        assert matcher.matching("Phreesia expands") == ["expansion"]
+        assert matcher.first("") is None
+        assert KeywordMatcher({}).find("anything") == set()
+
+
+# ============== CALL SITES ==============
+
+class TestCallSites:
+    """News, dimension and alert-rule keyword checks keep their results."""
+
+    def test_news_keywords(self):
+        from news_monitor import NewsMonitor
+        monitor = NewsMonitor.__new__(NewsMonitor)
+        assert monitor._keyword_sentiment("Phreesia wins award, expands") == "positive"
+        assert monitor._keyword_sentiment("Layoffs follow lawsuit") == "negative"
+        assert monitor._keyword_sentiment("Phreesia names new CFO") == "neutral"
+        assert monitor._detect_event_type("Phreesia acquires rival and hires CEO") == "acquisition"
+        assert monitor._detect_event_type("Quarterly call scheduled") is None
+
+    def test_dimension_match(self):
+        from sales_marketing_module import calculate_dimension_match, match_dimension_signals
+        text = "New EHR integration and API for Epic"
+        counts = match_dimension_signals(text)
+        assert counts["integration_depth"] >= 2
+        assert calculate_dimension_match(text, "integration_depth") == (True, min(counts["integration_depth"] / 3, 1.0))
+        assert calculate_dimension_match("Quarterly call scheduled", "integration_depth") == (False, 0.0)
+
+    def test_alert_contains_rules(self):
+        from notifications import AlertRuleEngine, AlertRule
+        engine = AlertRuleEngine()
+        engine.rules = []
+        engine.add_rule(AlertRule(id="ai", name="AI", competitor=None, field="product_names", condition="contains",
+                                  value="AI Scribe", severity="Low", channels=[]))
+        assert [r.id for r in engine.evaluate("Phreesia", "product_names", "", "Intake, ai scribe")] == ["ai"]
+        assert engine.evaluate("Phreesia", "product_names", "", "Intake") == []
+
+        engine.add_rule(AlertRule(id="rcm", name="RCM", competitor=None, field="*", condition="contains",
+                                  value="rcm", severity="Low", channels=[]))
+        assert [r.id for r in engine.evaluate("Phreesia", "product_names", "", "RCM suite")] == ["rcm"]
+        engine.remove_rule("rcm")
+        assert engine.evaluate("Phreesia", "product_names", "", "RCM suite") == []
@@ -0,0 +1,175 @@
+"""
+Certify Intel - LLM Response Cache Tests (v5.2.1)
+Tests for TTL, LRU eviction, single-flight coalescing and bypass switches.
+
+Run with: pytest tests/test_llm_cache.py -v
+"""
+
+import os
+import sys
+import time
+import threading
+from datetime import timedelta
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llm_cache import LLMCache, make_cache_key
+
+
+# ============== TEST FIXTURES ==============
+
+@pytest.fixture
+def engine(tmp_path):
+    """Isolated file-backed SQLite database (shared safely across threads)."""
+    pytest.importorskip("sqlalchemy")
+    from sqlalchemy import create_engine
+    from database import Base
+
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'llm_cache.db'}",
+        connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+def make_cache(session_factory, **kwargs):
+    kwargs.setdefault("bypass_tasks", set())
+    cache = LLMCache(session_factory=session_factory, **kwargs)
+    cache.enabled = True
+    return cache
+
+
+def request(cache, compute, prompt="Classify this article", task_type="classification", **kwargs):
+    return cache.get_or_compute(
+        task_type=task_type,
+        provider="openai",
+        model="gpt-4o-mini",
+        system_prompt="You are an analyst.",
+        prompt=prompt,
+        json_mode=True,
+        compute=compute,
+        **kwargs
+    )
+
+
+# ============== KEY TESTS ==============
+
+class TestCacheKey:
+    """Every request input must change the key."""
+
+    def test_key_inputs(self):
+        base = make_cache_key("openai", "gpt-4o-mini", "sys", "prompt", True)
+        assert base == make_cache_key("openai", "gpt-4o-mini", "sys", "prompt", True)
+        assert base != make_cache_key("gemini", "gpt-4o-mini", "sys", "prompt", True)
+        assert base != make_cache_key("openai", "gpt-4.1", "sys", "prompt", True)
+        assert base != make_cache_key("openai", "gpt-4o-mini", "other", "prompt", True)
+        assert base != make_cache_key("openai", "gpt-4o-mini", "sys", "prompt 2", True)
+        assert base != make_cache_key("openai", "gpt-4o-mini", "sys", "prompt", False)
+
+
+# ============== CACHE TESTS ==============
+
+class TestLLMCache:
+    """Tests for hits, TTL, eviction, coalescing and bypass."""
+
+    def test_second_request_served_from_cache(self, session_factory):
+        cache = make_cache(session_factory)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return '{"dimensions": []}'
+
+        assert request(cache, compute) == '{"dimensions": []}'
+        assert request(cache, compute) == '{"dimensions": []}'
+        assert len(calls) == 1
+        stats = cache.get_stats()
+        assert stats["hits"] == 1 and stats["misses"] == 1
+        assert stats["by_task_type"]["classification"]["hit_rate"] == 0.5
+        assert stats["entries"] == 1
+
+    def test_failures_not_cached(self, session_factory):
+        cache = make_cache(session_factory)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {"error": "rate limited"}
+
+        for _ in range(2):
+            request(cache, compute, to_cache=lambda r: None if "error" in r else str(r))
+        assert len(calls) == 2
+
+    def test_expired_entries_refetched(self, session_factory):
+        cache = make_cache(session_factory)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return "answer"
+
+        request(cache, compute, ttl=timedelta(seconds=-1))
+        request(cache, compute)
+        assert len(calls) == 2
+        assert cache.stats["expired"] == 1
+
+    def test_lru_eviction(self, session_factory):
+        cache = make_cache(session_factory, max_entries=2)
+        for prompt in ("a", "b", "c"):
+            request(cache, lambda: "x", prompt=prompt)
+            time.sleep(0.01)
+        request(cache, lambda: "x", prompt="a")  # "a" is now most recently used
+
+        assert cache.evict() == 1
+        calls = []
+        request(cache, lambda: calls.append(1) or "x", prompt="b")
+        assert calls == [1]  # "b" was least recently used
+        assert cache.stats["evicted"] == 1
+
+    def test_concurrent_identical_requests_coalesced(self, session_factory):
+        cache = make_cache(session_factory)
+        calls = []
+        barrier = threading.Barrier(5)
+        results = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return "shared answer"
+
+        def worker():
+            barrier.wait()
+            results.append(request(cache, compute))
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert results == ["shared answer"] * 5
+        assert cache.stats["coalesced"] == 4
+
+    def test_bypass_per_task_type(self, session_factory):
+        cache = make_cache(session_factory)
+        cache.set_bypass("chat_response")
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return "fresh"
+
+        request(cache, compute, task_type="chat_response")
+        request(cache, compute, task_type="chat_response")
+        assert len(calls) == 2
+        assert cache.stats["bypassed"] == 2
+
+        cache.set_bypass("chat_response", False)
+        request(cache, compute, task_type="chat_response")
+        request(cache, compute, task_type="chat_response")
+        assert len(calls) == 3
@@ -0,0 +1,143 @@
+"""
+Certify Intel - Typed Competitor Metrics Tests (v5.2.1)
+Tests for metric parsing, write-time sync of the shadow columns and the backfill.
+
+Run with: pytest tests/test_metric_values.py -v
+"""
+
+import os
+import sys
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metric_values import parse_metric, metric_value
+
+
+# ============== TEST FIXTURES ==============
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+# ============== PARSING ==============
+
+class TestParseMetric:
+    """Scraped strings become value, unit and bounds."""
+
+    @pytest.mark.parametrize("text,kind,value,unit,low,high", [
+        ("3,000+ providers", "count", 3000, "providers", 3000, None),
+        ("500-1,000 employees", "count", 750, "employees", 500, 1000),
+        ("Over 40,000 practices", "count", 40000, "practices", 40000, None),
+        ("<50", "count", 50, None, None, 50),
+        ("$1.2M", "money", 1_200_000, "USD", 1_200_000, 1_200_000),
+        ("$1-2B", "money", 1_500_000_000, "USD", 1_000_000_000, 2_000_000_000),
+        ("$300M+", "money", 300_000_000, "USD", 300_000_000, None),
+        ("$49/provider/month", "price", 49, "USD/provider/month", 49, 49),
+        ("$3.00 per visit", "price", 3, "USD/visit", 3, 3),
+        ("-5% YoY", "percent", -5, "%", -5, -5),
+        ("Founded 2012, 200 employees", "count", 200, "employees", 200, 200),
+        ("Since 2015: 1,500+ clinics", "count", 1500, "clinics", 1500, None),
+        ("2,000 customers in 2023", "count", 2000, "customers", 2000, 2000),
+        ("2000-3000", "count", 2500, None, 2000, 3000),
+        ("$2020/month", "price", 2020, "USD/month", 2020, 2020),
+    ])
+    def test_parse(self, text, kind, value, unit, low, high):
+        parsed = parse_metric(text, kind)
+        assert (parsed.value, parsed.unit, parsed.low, parsed.high) == (value, unit, low, high)
+
+    @pytest.mark.parametrize("text,kind", [
+        ("Contact Sales", "price"), ("Unknown", "count"), ("Public (NASDAQ: PHR)", "money"), ("", "count"), (None, "count"),
+    ])
+    def test_unparseable(self, text, kind):
+        assert parse_metric(text, kind) is None
+
+    def test_metric_value_prefers_shadow_column(self):
+        assert metric_value({"customer_count": "3,000+"}, "customer_count") == 3000
+        assert metric_value({"customer_count": "3,000+", "customer_count_value": 2500.0}, "customer_count") == 2500.0
+
+
+# ============== SYNC / BACKFILL ==============
+
+class TestShadowColumns:
+    """Shadow columns follow every write of the text field."""
+
+    def test_synced_on_create_and_update(self, db):
+        from database import Competitor
+        competitor = Competitor(name="Phreesia", customer_count="3,000+ providers", base_price="$3.00 per visit")
+        db.add(competitor)
+        db.commit()
+        assert competitor.customer_count_value == 3000
+        assert competitor.customer_count_low == 3000 and competitor.customer_count_high is None
+        assert competitor.base_price_unit == "USD/visit"
+
+        setattr(competitor, "customer_count", "4,500")  # How the scrape/update endpoints write
+        competitor.employee_count = None
+        db.commit()
+        db.expire_all()
+        assert competitor.customer_count_value == 4500
+        assert competitor.employee_count_value is None
+
+    def test_sql_filter_and_sort(self, db):
+        from database import Competitor
+        db.add_all([
+            Competitor(name="A", customer_count="1,500"),
+            Competitor(name="B", customer_count="40,000+"),
+            Competitor(name="C", customer_count="unknown"),
+        ])
+        db.commit()
+        names = [c.name for c in db.query(Competitor).filter(Competitor.customer_count_value >= 1000)
+                 .order_by(Competitor.customer_count_value.desc())]
+        assert names == ["B", "A"]
+
+    def test_backfill_rows_written_without_sync(self, db):
+        from sqlalchemy import text
+        from database import Competitor, backfill_competitor_metrics
+        db.execute(text("INSERT INTO competitors (name, employee_count, funding_total) VALUES ('Kyruus', '200-500', '$1.2B')"))
+        db.commit()
+
+        assert backfill_competitor_metrics(db) == 1
+        row = db.query(Competitor).filter(Competitor.name == "Kyruus").one()
+        assert (row.employee_count_low, row.employee_count_high) == (200, 500)
+        assert row.funding_total_value == 1_200_000_000
+        assert backfill_competitor_metrics(db) == 0
+
+    def test_backfill_reparses_older_parser_version(self, db):
+        from sqlalchemy import text
+        from database import Competitor, backfill_competitor_metrics
+        db.execute(text(
+            "INSERT INTO competitors (name, employee_count, employee_count_value, customer_count, metrics_parse_version) "
+            "VALUES ('Kyruus', 'Founded 2012, 200 employees', 2012, 'unknown', '1')"
+        ))
+        db.commit()
+
+        assert backfill_competitor_metrics(db) == 1
+        row = db.query(Competitor).filter(Competitor.name == "Kyruus").one()
+        assert row.employee_count_value == 200
+        assert row.customer_count_value is None
+        assert backfill_competitor_metrics(db) == 0  # Unparseable text is not retried every startup
+
+
+# ============== CONSUMERS ==============
+
+class TestAnalyticsUseTypedValues:
+    """Threat and market share scoring read numbers, not substrings."""
+
+    def test_threat_components(self):
+        from analytics import ThreatScoreCalculator
+        components = ThreatScoreCalculator().calculate({
+            "name": "Phreesia", "customer_count": "3,000+", "funding_total": "$120M",
+            "employee_growth_rate": "22%",
+        }).components
+        assert components["customer_base"] == 70
+        assert components["funding_strength"] == 90
+        assert components["growth_rate"] == 90
+
+    def test_market_share_from_range(self):
+        from analytics import MarketShareEstimator
+        share = MarketShareEstimator().estimate({"customer_count": "1,000-2,000"})
+        assert share.data_points["customers"] == 1500
@@ -0,0 +1,139 @@
+"""
+Certify Intel - ML Sentiment Engine Tests (v5.2.1)
+Tests for length-bucketed batching, the score cache and backend fallback (fake pipeline, no model download).
+
+Run with: pytest tests/test_ml_sentiment.py -v
+"""
+
+import os
+import sys
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ml_sentiment
+from ml_sentiment import MLSentimentAnalyzer, SentimentResultCache
+
+
+class FakePipeline:
+    """Stands in for a transformers pipeline; records every forward pass."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts, batch_size=None, truncation=None, max_length=None):
+        self.calls.append({"texts": list(texts), "batch_size": batch_size, "max_length": max_length})
+        return [
+            {"label": "negative" if "lawsuit" in t else "positive", "score": 0.9}
+            for t in texts
+        ]
+
+
+@pytest.fixture
+def make_analyzer(monkeypatch, session_factory):
+    """Analyzer factory with a fake model; each call gets a fresh in-memory cache layer over one database."""
+    monkeypatch.setattr(ml_sentiment, "TRANSFORMERS_AVAILABLE", True)
+    monkeypatch.setenv("ML_SENTIMENT_BATCH_SIZE", "2")
+
+    def make(build=None, backend="int8"):
+        fake = FakePipeline()
+        monkeypatch.setattr(MLSentimentAnalyzer, "_build_pipeline", build or (lambda self, b: fake))
+        analyzer = MLSentimentAnalyzer(
+            model_type="financial", backend=backend, cache=SentimentResultCache(session_factory=session_factory)
+        )
+        return analyzer, fake
+    return make
+
+
+# ============== INFERENCE ==============
+
+class TestBatchedInference:
+    """Length buckets and de-duplication."""
+
+    def test_length_buckets_preserve_order(self, make_analyzer):
+        analyzer, fake = make_analyzer()
+        texts = ["a much longer headline about a lawsuit filed today", "short", "mid length news", "tiny"]
+        results = analyzer.analyze_batch(texts)
+
+        assert [c["texts"] for c in fake.calls] == [
+            ["tiny", "short"], ["mid length news", "a much longer headline about a lawsuit filed today"]
+        ]
+        assert all(c["batch_size"] == 2 and c["max_length"] == 128 for c in fake.calls)
+        assert [r.label for r in results] == ["negative", "positive", "positive", "positive"]
+
+    def test_repeated_texts_scored_once(self, make_analyzer):
+        analyzer, fake = make_analyzer()
+        results = analyzer.analyze_batch(["same headline", "same  headline ", "same headline"])
+        assert sum(len(c["texts"]) for c in fake.calls) == 1
+        assert len(results) == 3
+
+
+# ============== SCORE CACHE ==============
+
+class TestScoreCache:
+    """Scores persist across analyzers; only misses reach the model."""
+
+    def test_cache_hits_skip_inference(self, make_analyzer):
+        analyzer, fake = make_analyzer()
+        analyzer.analyze_batch(["Phreesia raises $50M", "Epic faces lawsuit"])
+        fake.calls.clear()
+
+        results = analyzer.analyze_batch(["Epic faces lawsuit", "New headline"])
+        assert [c["texts"] for c in fake.calls] == [["New headline"]]
+        assert results[0].label == "negative"
+        assert analyzer.cache.stats["memory_hits"] == 1
+
+        # A new process (fresh memory layer) is served from the database
+        restarted, fake2 = make_analyzer()
+        restarted.analyze_batch(["Phreesia raises $50M", "Epic faces lawsuit"])
+        assert fake2.calls == []
+        assert restarted.cache.stats["db_hits"] == 2
+
+    def test_backend_and_truncation_keep_separate_scores(self, make_analyzer, monkeypatch):
+        analyzer, _ = make_analyzer(backend="int8")
+        analyzer.analyze_batch(["Phreesia raises $50M"])
+
+        full_precision, fake = make_analyzer(backend="pytorch")
+        full_precision.analyze_batch(["Phreesia raises $50M"])
+        assert [c["texts"] for c in fake.calls] == [["Phreesia raises $50M"]]
+
+        monkeypatch.setenv("ML_SENTIMENT_MAX_TOKENS", "256")
+        longer, fake = make_analyzer(backend="int8")
+        longer.analyze_batch(["Phreesia raises $50M"])
+        assert [c["texts"] for c in fake.calls] == [["Phreesia raises $50M"]]
+
+    def test_model_failure_not_cached(self, make_analyzer):
+        analyzer, fake = make_analyzer()
+
+        def broken(texts, **kwargs):
+            raise RuntimeError("OOM")
+        analyzer.pipeline = broken
+
+        result = analyzer.analyze("Company reports record growth")
+        assert result.model == "keyword_fallback"
+        assert analyzer.cache.stats["stores"] == 0
+
+
+# ============== BACKENDS ==============
+
+class TestBackendFallback:
+    """An unavailable optimized backend falls back to full precision."""
+
+    def test_onnx_falls_back_to_pytorch(self, make_analyzer):
+        fake = FakePipeline()
+
+        def build(self, backend):
+            if backend == "onnx":
+                raise ImportError("optimum[onnxruntime] not installed")
+            return fake
+
+        analyzer, _ = make_analyzer(build=build, backend="onnx")
+        assert analyzer.backend == "pytorch" and analyzer.is_available
+        assert analyzer.analyze("Epic faces lawsuit").label == "negative"
+
+    def test_default_backend(self, monkeypatch):
+        monkeypatch.delenv("ML_SENTIMENT_BACKEND", raising=False)
+        assert ml_sentiment.default_backend(use_gpu=False) == "int8"
+        monkeypatch.setenv("ML_SENTIMENT_BACKEND", "onnx")
+        assert ml_sentiment.default_backend() == "onnx"
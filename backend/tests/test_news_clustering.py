@@ -0,0 +1,113 @@
+"""
+Certify Intel - Near-Duplicate News Clustering Tests (v5.2.1)
+Tests for grouping syndicated copies and collapsing them before news analysis.
+
+Run with: pytest tests/test_news_clustering.py -v
+"""
+
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from news_clustering import cluster_near_duplicates, normalize_headline
+from news_monitor import NewsMonitor, NewsArticle
+
+
+LEDE = ("Phreesia, Inc. (NYSE: PHR) today announced it has closed a $50 million growth financing "
+        "to expand its patient intake platform across health systems nationwide.")
+
+
+def article(title, url, source="Google News", snippet=""):
+    return NewsArticle(
+        title=title, url=url, source=source, published_date="", snippet=snippet,
+        sentiment="neutral", is_major_event=False, event_type=None
+    )
+
+
+# ============== CLUSTERING ==============
+
+class TestClusterNearDuplicates:
+    """Headline and lede similarity with number/ordinal vetoes."""
+
+    def test_syndicated_headlines_grouped(self):
+        titles = [
+            "Phreesia Raises $50 Million to Expand Patient Intake Platform - Reuters",
+            "Phreesia names new chief financial officer",
+            "Phreesia raises $50 million to expand patient intake platform | Yahoo Finance",
+            "Phreesia Raises $50M to Expand Its Patient Intake Platform - MSN",
+        ]
+        assert cluster_near_duplicates([(t, "") for t in titles]) == [[0, 2, 3], [1]]
+
+    def test_different_numbers_not_merged(self):
+        titles = [
+            "Phreesia reports third quarter fiscal 2026 results",
+            "Phreesia reports second quarter fiscal 2026 results",
+            "Phreesia raises $50 million to expand patient intake platform",
+            "Phreesia raises $75 million to expand patient intake platform",
+        ]
+        assert cluster_near_duplicates([(t, "") for t in titles]) == [[0], [1], [2], [3]]
+
+    def test_short_opposite_headlines_not_merged(self):
+        items = [("Epic and Cerner announce partnership", ""), ("Epic and Cerner end partnership", "")]
+        assert cluster_near_duplicates(items) == [[0], [1]]
+
+    def test_short_headline_copies_merged(self):
+        items = [("Epic and Cerner announce partnership - Reuters", ""), ("Epic, Cerner announce partnership", ""),
+                 ("Epic and Cerner end partnership", LEDE), ("Epic Cerner partnership ends", LEDE)]
+        assert cluster_near_duplicates(items) == [[0, 1], [2, 3]]
+
+    def test_rewritten_headline_matched_by_lede(self):
+        items = [
+            ("Phreesia closes growth round", LEDE),
+            ("Patient intake vendor lands new cash", "RALEIGH, N.C. -- " + LEDE),
+            ("Patient intake vendor lands new cash", "Read more"),
+        ]
+        assert cluster_near_duplicates(items) == [[0, 1, 2]]
+
+    def test_normalize_headline(self):
+        assert normalize_headline("Phreesia Wins Award! - Business Wire") == "phreesia wins award"
+
+
+# ============== NEWS MONITOR ==============
+
+class TestCollapseInFetchNews:
+    """Analysis runs once per story; copies are kept as references."""
+
+    def make_monitor(self):
+        monitor = NewsMonitor(include_sec=False, include_patents=False, use_ml_sentiment=False, tag_dimensions=False)
+        monitor.cluster_articles = True
+        return monitor
+
+    def test_fetch_news_collapses_copies(self):
+        monitor = self.make_monitor()
+        monitor._news_sources = lambda company, days: [
+            ("google_news", lambda: [article("Phreesia raises $50 million to expand platform - Reuters", "https://g/1")]),
+            ("gnews", lambda: [article("Phreesia Raises $50M to Expand Platform", "https://gn/1", "GNews", LEDE)]),
+            ("mediastack", lambda: [article("Phreesia names new chief financial officer", "https://m/2", "MediaStack")]),
+        ]
+        analyzed = []
+        original = monitor._keyword_sentiment
+        monitor._keyword_sentiment = lambda text: analyzed.append(text) or original(text)
+
+        digest = monitor.fetch_news("Phreesia")
+
+        assert [a.url for a in digest.articles] == ["https://g/1", "https://m/2"]
+        canonical = digest.articles[0]
+        assert canonical.references == [{
+            "title": "Phreesia Raises $50M to Expand Platform", "url": "https://gn/1",
+            "source": "GNews", "published_date": ""
+        }]
+        assert canonical.snippet == LEDE  # Borrowed from the copy
+        assert len(analyzed) == 2
+        assert digest.clustering == {"articles_in": 3, "stories": 2, "copies_collapsed": 1}
+
+    def test_government_records_never_clustered(self):
+        monitor = self.make_monitor()
+        articles = [
+            article("Phreesia Files Patent: System for patient check-in", "https://p/1", "USPTO Patents"),
+            article("Phreesia Files Patent: System for patient check-in kiosk", "https://p/2", "USPTO Patents"),
+        ]
+        kept, stats = monitor._collapse_near_duplicates(articles)
+        assert len(kept) == 2 and stats["copies_collapsed"] == 0
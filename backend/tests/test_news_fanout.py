@@ -0,0 +1,144 @@
+"""
+Certify Intel - News Source Fan-out Tests (v5.2.1)
+Tests for parallel news source fetching with timeouts, error isolation and latency stats.
+
+Run with: pytest tests/test_news_fanout.py -v
+"""
+
+import os
+import sys
+import time
+import threading
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from news_monitor import NewsMonitor, NewsArticle, get_source_latency_stats
+
+
+def article(title, url):
+    return NewsArticle(
+        title=title, url=url, source="Test", published_date="", snippet="",
+        sentiment="neutral", is_major_event=False, event_type=None
+    )
+
+
+def slow_source(delay, articles):
+    def fetch():
+        time.sleep(delay)
+        return articles
+    return fetch
+
+
+def failing_source():
+    raise RuntimeError("HTTP 500")
+
+
+def make_monitor(timeout=5.0, deadline=5.0, overrides=None):
+    monitor = NewsMonitor(include_sec=False, include_patents=False, use_ml_sentiment=False, tag_dimensions=False)
+    monitor.source_timeout = timeout
+    monitor.source_timeouts = overrides or {}
+    monitor.fetch_deadline = deadline
+    return monitor
+
+
+# ============== FAN-OUT TESTS ==============
+
+class TestParallelFanout:
+    """Sources run concurrently; slow or failing sources only lose their own articles."""
+
+    def test_latency_is_slowest_source_not_sum(self):
+        monitor = make_monitor()
+        sources = [
+            (f"source_{i}", slow_source(0.2, [article(f"A{i}", f"https://example.com/{i}")]))
+            for i in range(5)
+        ]
+        start = time.monotonic()
+        results, stats = monitor._fetch_sources_parallel(sources)
+        elapsed = time.monotonic() - start
+
+        assert elapsed < 0.6  # Sequential would take ~1s
+        assert [len(r) for r in results] == [1] * 5
+        assert all(s["status"] == "ok" and s["latency_ms"] >= 190 for s in stats.values())
+
+    def test_error_isolated(self):
+        monitor = make_monitor()
+        results, stats = monitor._fetch_sources_parallel([
+            ("good", slow_source(0, [article("A", "https://a")])),
+            ("broken", failing_source),
+        ])
+        assert [len(r) for r in results] == [1, 0]
+        assert stats["broken"]["status"] == "error"
+        assert "HTTP 500" in stats["broken"]["error"]
+
+    def test_per_source_timeout_and_partial_results(self):
+        monitor = make_monitor(timeout=5.0, overrides={"sluggish": 0.1})
+        start = time.monotonic()
+        results, stats = monitor._fetch_sources_parallel([
+            ("fast", slow_source(0.01, [article("A", "https://a")])),
+            ("sluggish", slow_source(1.0, [article("B", "https://b")])),
+        ])
+        assert time.monotonic() - start < 0.5
+        assert [len(r) for r in results] == [1, 0]
+        assert stats["sluggish"]["status"] == "timeout"
+
+    def test_overall_deadline(self):
+        monitor = make_monitor(timeout=5.0, deadline=0.1)
+        results, stats = monitor._fetch_sources_parallel([
+            ("hung_a", slow_source(1.0, [article("A", "https://a")])),
+            ("hung_b", slow_source(1.0, [article("B", "https://b")])),
+        ])
+        assert results == [[], []]
+        assert {s["status"] for s in stats.values()} == {"timeout"}
+
+    def test_fetch_news_merges_in_source_order(self):
+        monitor = make_monitor()
+        shared_url = "https://example.com/shared"
+        monitor._news_sources = lambda company, days: [
+            ("first", slow_source(0.1, [article("From first", shared_url)])),
+            ("second", slow_source(0, [article("From second", shared_url), article("Other", "https://o")])),
+        ]
+        digest = monitor.fetch_news("Acme")
+
+        # Deduplication keeps the earlier source even though it finished last
+        assert [a.title for a in digest.articles] == ["From first", "Other"]
+        assert set(digest.source_stats) == {"first", "second"}
+
+        stats = get_source_latency_stats()
+        assert stats["first"]["calls"] >= 1 and stats["first"]["avg_ms"] >= 90
+
+    def test_requests_use_per_source_timeout(self, monkeypatch):
+        import news_monitor
+        monitor = make_monitor(timeout=5.0, overrides={"newsapi": 2.5})
+        monitor.use_pygooglenews = False
+        monitor.newsapi_key = "key"
+        monitor.bing_news_key = monitor.gnews_api_key = None
+        monitor.mediastack_api_key = monitor.newsdata_api_key = None
+        timeouts = {}
+
+        def urlopen(request, timeout=None):
+            url = request.full_url if hasattr(request, "full_url") else request
+            timeouts["newsapi" if "newsapi.org" in url else "google_news"] = timeout
+            raise OSError("offline")
+
+        monkeypatch.setattr(news_monitor.urllib.request, "urlopen", urlopen)
+        monitor.fetch_news("Acme")
+        assert timeouts == {"google_news": 5.0, "newsapi": 2.5}
+
+    def test_hung_sec_lookup_releases_source_worker(self, monkeypatch):
+        import sec_edgar_scraper
+        release = threading.Event()
+        monkeypatch.setattr(sec_edgar_scraper.SECEdgarScraper, "_search_edgar",
+                            lambda self, name: release.wait(5))
+        monitor = make_monitor(timeout=5.0, overrides={"sec_edgar": 0.1})
+        monitor.include_sec = True
+        monitor.sec_scraper = sec_edgar_scraper.SECEdgarScraper()
+        sources = [s for s in monitor._news_sources("Unlisted Health", 90) if s[0] == "sec_edgar"]
+
+        start = time.monotonic()
+        (name, fetch), = sources
+        assert fetch() == []
+        release.set()
+
+        # The source's own thread returns once its timeout passes, even though the lookup hangs
+        assert time.monotonic() - start < 1.0
@@ -0,0 +1,179 @@
+"""
+Certify Intel - News Feed Query Tests (v5.2.1)
+Tests for SQL-side news feed filtering, counting, keyset pagination and date normalization.
+
+Run with: pytest tests/test_news_feed.py -v
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from news_feed import (
+    parse_published_date, encode_cursor, decode_cursor, query_news_feed,
+    has_cached_news, filter_live_articles, query_news_coverage
+)
+
+
+# ============== TEST FIXTURES ==============
+
+@pytest.fixture
+def db(session_factory):
+    """In-memory database with 30 cached articles across two competitors."""
+    from database import NewsArticleCache
+
+    session = session_factory()
+
+    now = datetime.utcnow()
+    sentiments = ["positive", "neutral", "negative"]
+    for i in range(30):
+        session.add(NewsArticleCache(
+            competitor_id=1 if i % 2 == 0 else 2,
+            competitor_name="Phreesia" if i % 2 == 0 else "Clearwave",
+            title=f"Article {i}",
+            url=f"https://news.example.com/{i}",
+            source="Reuters" if i % 3 == 0 else "TechCrunch",
+            source_type="google_news" if i % 3 else "newsapi",
+            # Pairs share a timestamp so the id tie-breaker is exercised
+            published_at=now - timedelta(hours=i // 2),
+            sentiment=sentiments[i % 3] if i != 28 else None,
+            event_type="funding" if i % 5 == 0 else None,
+            cache_expires_at=now + timedelta(hours=4),
+        ))
+    # Expired and out-of-range rows never show up
+    session.add(NewsArticleCache(competitor_id=1, title="Expired", url="https://x/expired",
+                                 published_at=now, cache_expires_at=now - timedelta(minutes=1)))
+    session.add(NewsArticleCache(competitor_id=1, title="Old", url="https://x/old",
+                                 published_at=now - timedelta(days=60), cache_expires_at=now + timedelta(hours=4)))
+    session.commit()
+    yield session
+    session.close()
+
+
+# ============== DATE NORMALIZATION ==============
+
+class TestParsePublishedDate:
+    """Source date strings normalize to naive UTC."""
+
+    def test_formats(self):
+        assert parse_published_date("Tue, 10 Jun 2025 14:00:00 GMT") == datetime(2025, 6, 10, 14, 0)
+        assert parse_published_date("Tue, 10 Jun 2025 10:00:00 -0400") == datetime(2025, 6, 10, 14, 0)
+        assert parse_published_date("2025-06-10T14:00:00Z") == datetime(2025, 6, 10, 14, 0)
+        assert parse_published_date("2025-06-10T16:00:00+02:00") == datetime(2025, 6, 10, 14, 0)
+        assert parse_published_date("2025-06-10") == datetime(2025, 6, 10)
+        assert parse_published_date(datetime(2025, 6, 10, 14)) == datetime(2025, 6, 10, 14)
+
+    def test_unparseable(self):
+        assert parse_published_date("") is None
+        assert parse_published_date(None) is None
+
+
+# ============== SQL FEED ==============
+
+class TestQueryNewsFeed:
+    """Filters, counts and paging run in SQL."""
+
+    def test_counts_and_default_window(self, db):
+        result = query_news_feed(db, page_size=10)
+        assert result["stats"] == {"total": 30, "positive": 10, "neutral": 10, "negative": 10}
+        assert result["pagination"]["total_pages"] == 3
+        titles = [a["title"] for a in result["articles"]]
+        assert "Expired" not in titles and "Old" not in titles
+        assert len(titles) == 10
+
+    def test_filters(self, db):
+        assert query_news_feed(db, competitor_id=1)["stats"]["total"] == 15
+        neutral = query_news_feed(db, sentiment="Neutral", page_size=100)
+        assert neutral["stats"]["total"] == 10  # NULL sentiment counts as neutral
+        assert all(a["sentiment"] == "neutral" for a in neutral["articles"])
+        assert query_news_feed(db, source="reuters")["stats"]["total"] == 10
+        assert query_news_feed(db, source="newsapi")["stats"]["total"] == 10
+        assert query_news_feed(db, event_type="funding")["stats"]["total"] == 6
+        assert query_news_feed(db, event_type="general")["stats"]["total"] == 24
+
+    def test_end_date_includes_whole_day(self, db):
+        today = datetime.utcnow().strftime("%Y-%m-%d")
+        assert query_news_feed(db, start_date="2000-01-01", end_date=today)["stats"]["total"] == 31
+
+    def test_keyset_matches_offset_pages(self, db):
+        offset_ids = []
+        for page in range(1, 4):
+            offset_ids += [a["id"] for a in query_news_feed(db, page=page, page_size=7)["articles"]]
+
+        keyset_ids, cursor = [], None
+        while True:
+            result = query_news_feed(db, page_size=7, cursor=cursor)
+            keyset_ids += [a["id"] for a in result["articles"]]
+            cursor = result["pagination"]["next_cursor"]
+            if not cursor:
+                break
+
+        assert len(keyset_ids) == 30 and len(set(keyset_ids)) == 30
+        assert keyset_ids[:21] == offset_ids
+
+    def test_cursor_round_trip(self):
+        ts = datetime(2025, 6, 10, 14, 0, 5)
+        assert decode_cursor(encode_cursor(ts, 42)) == (ts, 42)
+        assert decode_cursor("not-a-cursor") is None
+
+    def test_has_cached_news(self, db):
+        assert has_cached_news(db)
+        assert not has_cached_news(db, competitor_id=99)
+
+
+# ============== COVERAGE ==============
+
+class TestNewsCoverage:
+    """Coverage for every competitor comes from one aggregate statement."""
+
+    def test_single_statement(self, db):
+        from sqlalchemy import event
+        from database import Competitor
+
+        for cid, name, deleted in [(1, "Phreesia", False), (2, "Clearwave", False), (3, "Kyruus", False), (4, "Gone", True)]:
+            db.add(Competitor(id=cid, name=name, is_deleted=deleted))
+        db.commit()
+
+        statements = []
+        engine = db.get_bind()
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            result = query_news_coverage(db)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        assert len(statements) == 1
+        details = {c["competitor_id"]: c for c in result["coverage_details"]}
+        assert sorted(details) == [1, 2, 3]
+        # Competitor 1 also owns the expired row and the 60-day-old row
+        assert (details[1]["total_articles"], details[1]["recent_articles"]) == (17, 16)
+        assert (details[2]["total_articles"], details[2]["recent_articles"]) == (15, 15)
+        assert sum(details[1]["sentiment"].values()) == 17
+        assert details[3]["has_news"] is False and details[3]["last_fetched"] is None
+        assert result["competitors_missing_news"][0]["competitor_id"] == 3
+        assert result["coverage_percentage"] == round(2 / 3 * 100, 1)
+
+
+# ============== LIVE FALLBACK ==============
+
+class TestFilterLiveArticles:
+    """The live-fetch fallback applies the same filters in memory."""
+
+    def test_filters_and_sorts(self):
+        now = datetime.utcnow()
+        articles = [
+            {"title": "A", "published_at": (now - timedelta(days=1)).strftime("%a, %d %b %Y %H:%M:%S GMT"),
+             "sentiment": "positive", "source": "Reuters", "source_type": "google_news", "event_type": "general"},
+            {"title": "B", "published_at": now.strftime("%Y-%m-%dT%H:%M:%SZ"),
+             "sentiment": "negative", "source": "Reuters", "source_type": "google_news", "event_type": "funding"},
+            {"title": "Old", "published_at": "2001-01-01",
+             "sentiment": "positive", "source": "Reuters", "source_type": "google_news", "event_type": "general"},
+        ]
+        result = filter_live_articles([dict(a) for a in articles])
+        assert [a["title"] for a in result] == ["B", "A"]
+        assert [a["title"] for a in filter_live_articles([dict(a) for a in articles], sentiment="positive")] == ["A"]
@@ -0,0 +1,285 @@
+"""
+Certify Intel - Incremental News Polling Tests (v5.2.1)
+Tests for fetch state persistence, conditional RSS requests, "newer than" API queries
+and committing the marks only after the articles are stored.
+
+Run with: pytest tests/test_news_fetch_state.py -v
+"""
+
+import os
+import sys
+import io
+import json
+import urllib.error
+from datetime import datetime, timedelta
+from email.utils import format_datetime
+from datetime import timezone
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import news_monitor
+from news_monitor import NewsMonitor
+from news_fetch_state import FetchState, FetchStateStore
+
+
+# ============== TEST FIXTURES ==============
+
+@pytest.fixture
+def store(session_factory):
+    """Fetch state store on an in-memory database."""
+    return FetchStateStore(session_factory=session_factory)
+
+
+@pytest.fixture
+def monitor(store):
+    monitor = NewsMonitor(include_sec=False, include_patents=False, use_pygooglenews=False,
+                          use_ml_sentiment=False, tag_dimensions=False)
+    monitor.newsapi_key = monitor.bing_news_key = None
+    monitor.gnews_api_key = monitor.mediastack_api_key = monitor.newsdata_api_key = None
+    monitor.cluster_articles = False
+    monitor.fetch_state = store
+    return monitor
+
+
+def rss(items):
+    body = "".join(
+        f"<item><title>{title} - Reuters</title><link>https://news.example.com/{title.lower().replace(' ', '-')}</link>"
+        f"<pubDate>{format_datetime(published.replace(tzinfo=timezone.utc), usegmt=True)}</pubDate></item>"
+        for title, published in items
+    )
+    return f"<rss><channel>{body}</channel></rss>".encode("utf-8")
+
+
+class FakeResponse(io.BytesIO):
+    def __init__(self, body, headers=None):
+        super().__init__(body)
+        self.headers = headers or {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+class FakeServer:
+    """urlopen stand-in: records requests and replays queued responses (or 304s)."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def __call__(self, request, timeout=None):
+        self.requests.append(request)
+        response = self.responses.pop(0)
+        if response == 304:
+            url = request.full_url if hasattr(request, "full_url") else request
+            raise urllib.error.HTTPError(url, 304, "Not Modified", {}, None)
+        return response
+
+
+# ============== STATE ==============
+
+class TestFetchState:
+    """High-water mark and validators survive restarts."""
+
+    def test_since_respects_window_and_overlap(self):
+        window_start = datetime(2025, 6, 1)
+        state = FetchState(source="newsapi", query_key="phreesia", covered_from=window_start)
+        assert state.since(window_start) == window_start
+        state.newest_published_at = datetime(2025, 6, 10, 12)
+        assert state.since(window_start, overlap_minutes=60) == datetime(2025, 6, 10, 11)
+        assert state.since(datetime(2025, 6, 11), overlap_minutes=60) == datetime(2025, 6, 11)
+
+    def test_longer_window_than_coverage_fetches_everything(self):
+        state = FetchState(source="newsapi", query_key="phreesia", covered_from=datetime(2025, 6, 3),
+                           newest_published_at=datetime(2025, 6, 10, 12))
+        longer = datetime(2025, 3, 12)
+        assert state.since(longer) == longer
+        assert state.is_unseen("https://x/old", datetime(2025, 4, 1), longer)
+        assert not state.is_unseen("https://x/old", datetime(2025, 6, 4), datetime(2025, 6, 4))
+
+    def test_get_returns_copy_and_saves_merge(self, store):
+        first = store.get("newsapi", "Phreesia")
+        second = store.get("newsapi", "Phreesia")
+        first.newest_published_at, first.last_fetched_at = datetime(2025, 6, 10), datetime(2025, 6, 10, 1)
+        second.newest_published_at, second.last_fetched_at = datetime(2025, 6, 9), datetime(2025, 6, 10, 2)
+        assert store.get("newsapi", "Phreesia").newest_published_at is None
+
+        store.save_many([first])
+        store.save_many([second])  # Finished later with an older high-water mark
+        merged = store.get("newsapi", "Phreesia")
+        assert merged.newest_published_at == datetime(2025, 6, 10)
+        assert merged.last_fetched_at == datetime(2025, 6, 10, 2)
+
+    def test_persisted_and_reset(self, store):
+        state = store.get("google_news", "  Phreesia ")
+        state.etag, state.newest_published_at = '"abc"', datetime(2025, 6, 10)
+        store.save_many([state])
+
+        reloaded = FetchStateStore(session_factory=store._session_factory)
+        assert reloaded.get("google_news", "phreesia").etag == '"abc"'
+        assert reloaded.reset(["PHREESIA"]) == 1
+        assert FetchStateStore(session_factory=store._session_factory).get("google_news", "phreesia").etag is None
+
+
+# ============== INCREMENTAL FETCH ==============
+
+class TestIncrementalFetch:
+    """Refreshes send validators and only pass new items on to analysis."""
+
+    def test_rss_conditional_get(self, monitor, monkeypatch):
+        now = datetime.utcnow().replace(microsecond=0)
+        server = FakeServer([
+            FakeResponse(rss([("Phreesia raises $50M", now - timedelta(hours=5))]), {"ETag": '"v1"'}),
+            304,
+            FakeResponse(rss([("Phreesia opens office", now - timedelta(minutes=5)),
+                              ("Phreesia raises $50M", now - timedelta(hours=5))]), {"ETag": '"v2"'}),
+        ])
+        monkeypatch.setattr(news_monitor.urllib.request, "urlopen", server)
+
+        first = monitor.fetch_news("Phreesia", days=7, incremental=True)
+        assert [a.title for a in first.articles] == ["Phreesia raises $50M"]
+        monitor.commit_fetch_state(first)
+
+        second = monitor.fetch_news("Phreesia", days=7, incremental=True)
+        assert second.articles == []
+        assert server.requests[1].get_header("If-none-match") == '"v1"'
+        assert monitor.fetch_state.stats["not_modified"] == 1
+        monitor.commit_fetch_state(second)
+
+        # Feed changed: only the unseen item is analyzed, not the one already returned
+        third = monitor.fetch_news("Phreesia", days=7, incremental=True)
+        monitor.commit_fetch_state(third)
+        assert [a.title for a in third.articles] == ["Phreesia opens office"]
+        assert third.source_stats["google_news"]["new_articles"] == 1
+        assert monitor.fetch_state.get("google_news", "Phreesia").etag == '"v2"'
+
+    def test_live_fetch_ignores_state(self, monitor, monkeypatch):
+        now = datetime.utcnow()
+        feed = rss([("Phreesia raises $50M", now - timedelta(hours=5))])
+        server = FakeServer([FakeResponse(feed, {"ETag": '"v1"'}), FakeResponse(feed, {"ETag": '"v1"'})])
+        monkeypatch.setattr(news_monitor.urllib.request, "urlopen", server)
+
+        monitor.commit_fetch_state(monitor.fetch_news("Phreesia", days=7, incremental=True))
+        live = monitor.fetch_news("Phreesia", days=7)
+        assert len(live.articles) == 1
+        assert server.requests[1].get_header("If-none-match") is None
+
+    def test_api_asks_only_for_newer_items(self, monitor, monkeypatch):
+        monitor.newsapi_key = "key"
+        newest = datetime(2025, 6, 10, 14, 0)
+        state = monitor.fetch_state.get("newsapi", "Phreesia")
+        state.newest_published_at, state.covered_from = newest, datetime(2025, 6, 1)
+        monitor.fetch_state.save_many([state])
+        monkeypatch.setattr(news_monitor, "datetime", type("FrozenDatetime", (datetime,), {
+            "utcnow": staticmethod(lambda: datetime(2025, 6, 11))
+        }))
+        server = FakeServer([
+            FakeResponse(rss([])),
+            FakeResponse(json.dumps({"articles": [
+                {"title": "Phreesia wins award", "url": "https://x/new", "publishedAt": "2025-06-10T20:00:00Z"},
+                {"title": "Phreesia old story", "url": "https://x/old", "publishedAt": "2025-06-09T20:00:00Z"},
+            ]}).encode("utf-8")),
+        ])
+        monkeypatch.setattr(news_monitor.urllib.request, "urlopen", lambda req, timeout=None: server(req, timeout))
+
+        digest = monitor.fetch_news("Phreesia", days=7, incremental=True)
+        newsapi_url = next(r for r in server.requests if "newsapi.org" in str(r))
+        assert "from=2025-06-10T13:00:00" in newsapi_url
+        assert [a.title for a in digest.articles] == ["Phreesia wins award"]
+        assert monitor.fetch_state.get("newsapi", "Phreesia").newest_published_at == newest
+
+        monitor.commit_fetch_state(digest)
+        assert monitor.fetch_state.get("newsapi", "Phreesia").newest_published_at == datetime(2025, 6, 10, 20, 0)
+
+    def test_bing_uses_freshness_and_filters_by_date(self, monitor, monkeypatch):
+        monitor.bing_news_key = "key"
+        state = monitor.fetch_state.get("bing_news", "Phreesia")
+        state.newest_published_at, state.covered_from = datetime(2025, 6, 8, 12), datetime(2025, 6, 1)
+        monitor.fetch_state.save_many([state])
+        monkeypatch.setattr(news_monitor, "datetime", type("FrozenDatetime", (datetime,), {
+            "utcnow": staticmethod(lambda: datetime(2025, 6, 11))
+        }))
+        server = FakeServer([
+            FakeResponse(rss([])),
+            FakeResponse(json.dumps({"value": [
+                {"name": "Phreesia wins award", "url": "https://x/new", "datePublished": "2025-06-10T20:00:00Z"},
+                {"name": "Phreesia old story", "url": "https://x/old", "datePublished": "2025-06-05T20:00:00Z"},
+            ]}).encode("utf-8")),
+        ])
+        monkeypatch.setattr(news_monitor.urllib.request, "urlopen", lambda req, timeout=None: server(req, timeout))
+
+        digest = monitor.fetch_news("Phreesia", days=7, incremental=True)
+        bing_url = next(r.full_url for r in server.requests if "bing.microsoft.com" in r.full_url)
+        assert "freshness=Week" in bing_url and "since=" not in bing_url
+        assert digest.source_stats["bing_news"]["articles"] == 1
+        assert [a.title for a in digest.articles] == ["Phreesia wins award"]
+
+
+# ============== COMMIT AFTER STORE ==============
+
+class TestCommitFetchState:
+    """Marks move only for items the caller actually stored."""
+
+    def test_uncommitted_fetch_is_repeated(self, monitor, monkeypatch):
+        now = datetime.utcnow().replace(microsecond=0)
+        feed = rss([("Phreesia raises $50M", now - timedelta(hours=5))])
+        server = FakeServer([FakeResponse(feed, {"ETag": '"v1"'}), FakeResponse(feed, {"ETag": '"v1"'})])
+        monkeypatch.setattr(news_monitor.urllib.request, "urlopen", server)
+
+        monitor.fetch_news("Phreesia", days=7, incremental=True)  # Ingest failed: never committed
+        retry = monitor.fetch_news("Phreesia", days=7, incremental=True)
+        assert server.requests[1].get_header("If-none-match") is None
+        assert [a.title for a in retry.articles] == ["Phreesia raises $50M"]
+
+    def test_capped_articles_keep_old_mark(self, monitor, monkeypatch):
+        now = datetime.utcnow().replace(microsecond=0)
+        feed = rss([("Phreesia opens office", now - timedelta(hours=1)),
+                    ("Phreesia raises $50M", now - timedelta(hours=5))])
+        monkeypatch.setattr(news_monitor.urllib.request, "urlopen", FakeServer([FakeResponse(feed)]))
+
+        digest = monitor.fetch_news("Phreesia", days=7, incremental=True)
+        assert monitor.commit_fetch_state(digest, stored=digest.articles[:1]) == 0
+        assert monitor.fetch_state.get("google_news", "Phreesia").newest_published_at is None
+
+    def test_longer_window_refetches(self, monitor, monkeypatch):
+        now = datetime.utcnow().replace(microsecond=0)
+        feed = rss([("Phreesia raises $50M", now - timedelta(days=3)),
+                    ("Phreesia opens office", now - timedelta(days=40))])
+        server = FakeServer([FakeResponse(feed, {"ETag": '"v1"'}), FakeResponse(feed, {"ETag": '"v1"'})])
+        monkeypatch.setattr(news_monitor.urllib.request, "urlopen", server)
+
+        monitor.commit_fetch_state(monitor.fetch_news("Phreesia", days=7, incremental=True))
+        longer = monitor.fetch_news("Phreesia", days=90, incremental=True)
+        assert server.requests[1].get_header("If-none-match") is None
+        assert "Phreesia opens office" in [a.title for a in longer.articles]
+        monitor.commit_fetch_state(longer)
+        assert monitor.fetch_state.get("google_news", "Phreesia").covers(now - timedelta(days=89))
+
+
+# ============== CACHE EXPIRY ==============
+
+class TestExtendCacheExpiry:
+    """Articles not re-downloaded stay cached for the refreshed window."""
+
+    def test_extends_only_window(self, store):
+        from database import NewsArticleCache
+        from news_ingest import extend_cache_expiry
+
+        db = store._session_factory()
+        now = datetime.utcnow()
+        db.add_all([
+            NewsArticleCache(competitor_id=1, title="Recent", url="https://x/1", published_at=now - timedelta(days=2),
+                             cache_expires_at=now + timedelta(minutes=5)),
+            NewsArticleCache(competitor_id=1, title="Old", url="https://x/2", published_at=now - timedelta(days=20),
+                             cache_expires_at=now + timedelta(minutes=5)),
+            NewsArticleCache(competitor_id=2, title="Other", url="https://x/3", published_at=now,
+                             cache_expires_at=now + timedelta(minutes=5)),
+        ])
+        db.commit()
+        assert extend_cache_expiry(db, [1], days=7, ttl_hours=4) == 1
+        assert db.query(NewsArticleCache).filter_by(title="Recent").one().cache_expires_at > now + timedelta(hours=3)
+        db.close()
@@ -0,0 +1,145 @@
+"""
+Certify Intel - News Cache Ingestion Tests (v5.2.1)
+Tests for URL/title deduplication, ON CONFLICT upserts and schema upgrade of the news cache.
+
+Run with: pytest tests/test_news_ingest.py -v
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from news_ingest import normalize_url, url_hash, title_fingerprint, ingest_articles, backfill_hashes
+
+
+# ============== TEST FIXTURES ==============
+
+def make_engine():
+    from sqlalchemy import create_engine
+    from sqlalchemy.pool import StaticPool
+    return create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+
+
+@pytest.fixture
+def db(session_factory):
+    """Isolated in-memory database with the current schema."""
+    session = session_factory()
+    yield session
+    session.close()
+
+
+def row(i, competitor_id=1, **kwargs):
+    data = {
+        "competitor_id": competitor_id,
+        "competitor_name": "Phreesia",
+        "title": f"Phreesia announces product update number {i}",
+        "url": f"https://news.example.com/story/{i}",
+        "source": "Reuters",
+        "source_type": "google_news",
+        "published_at": datetime(2026, 3, 1),
+        "sentiment": "positive",
+    }
+    data.update(kwargs)
+    return data
+
+
+# ============== HASHING ==============
+
+class TestHashing:
+    """URL and headline normalization."""
+
+    def test_url_normalization(self):
+        a = "https://www.Example.com/news/story/?utm_source=x&b=2&a=1#comments"
+        b = "https://example.com/news/story?a=1&b=2&fbclid=abc"
+        assert normalize_url(a) == "https://example.com/news/story?a=1&b=2"
+        assert url_hash(a) == url_hash(b)
+        assert url_hash("https://example.com/a") != url_hash("https://example.com/b")
+
+    def test_title_fingerprint(self):
+        assert title_fingerprint("Phreesia Raises $50M in Funding - Reuters") == \
+            title_fingerprint("phreesia raises $50M in funding!  | TechCrunch")
+        assert title_fingerprint("Short") is None
+
+
+# ============== INGESTION ==============
+
+class TestIngestArticles:
+    """Bulk writes dedupe in memory and upsert on url_hash."""
+
+    def test_insert_and_dedupe(self, db):
+        from database import NewsArticleCache
+        rows = [
+            row(1),
+            row(1, url="https://www.news.example.com/story/1/?utm_medium=rss"),  # Same URL
+            row(2, title="Phreesia announces product update number 1 - Yahoo"),  # Syndicated headline
+            row(3, competitor_id=2, title="Phreesia announces product update number 1"),  # Other competitor
+            row(4, url=""),
+        ]
+        result = ingest_articles(db, rows, batch_size=2)
+
+        assert result.received == 5
+        assert result.inserted == 2 and result.duplicates == 2 and result.skipped == 1
+        assert result.rows_per_sec > 0
+        assert db.query(NewsArticleCache).count() == 2
+
+    def test_existing_url_refreshes_expiry(self, db):
+        from database import NewsArticleCache
+        ingest_articles(db, [row(1), row(2)])
+        first = db.query(NewsArticleCache).filter_by(url="https://news.example.com/story/1").one()
+        first.cache_expires_at = datetime.utcnow() - timedelta(hours=1)
+        db.commit()
+
+        result = ingest_articles(db, [row(1, title="Edited headline for the same article"), row(5)], ttl_hours=4)
+        assert result.refreshed == 1 and result.inserted == 1
+        db.expire_all()
+        assert db.query(NewsArticleCache).count() == 3
+        first = db.query(NewsArticleCache).filter_by(url="https://news.example.com/story/1").one()
+        assert first.cache_expires_at > datetime.utcnow() + timedelta(hours=3)
+        assert first.title == "Phreesia announces product update number 1"
+
+    def test_known_headline_skipped_across_runs(self, db):
+        ingest_articles(db, [row(1)])
+        result = ingest_articles(db, [row(9, title="Phreesia announces product update number 1 - MSN")])
+        assert result.inserted == 0 and result.duplicates == 1
+
+
+# ============== SCHEMA UPGRADE ==============
+
+class TestSchemaUpgrade:
+    """Existing caches gain url_hash, and old duplicate URLs are collapsed."""
+
+    def test_upgrade_legacy_table(self):
+        pytest.importorskip("sqlalchemy")
+        from sqlalchemy import text, inspect
+        from sqlalchemy.orm import sessionmaker
+        from database import ensure_schema, NewsArticleCache
+
+        engine = make_engine()
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE news_article_cache (id INTEGER PRIMARY KEY, competitor_id INTEGER, "
+                "competitor_name VARCHAR, title VARCHAR, url VARCHAR, source VARCHAR, source_type VARCHAR, "
+                "published_at DATETIME, snippet TEXT, sentiment VARCHAR, event_type VARCHAR, "
+                "is_major_event BOOLEAN, dimension_tags TEXT, fetched_at DATETIME, "
+                "cache_expires_at DATETIME, created_at DATETIME)"
+            ))
+            for i, url in enumerate(["https://a.com/x", "https://www.a.com/x/", "https://a.com/y"]):
+                conn.execute(text("INSERT INTO news_article_cache (id, title, url) VALUES (:i, :t, :u)"),
+                             {"i": i + 1, "t": f"Legacy headline number {i}", "u": url})
+
+        ensure_schema(engine)
+        columns = {c["name"] for c in inspect(engine).get_columns("news_article_cache")}
+        assert {"url_hash", "title_hash"} <= columns
+
+        session = sessionmaker(bind=engine)()
+        assert backfill_hashes(session, chunk_size=2) == 2
+        assert [r.id for r in session.query(NewsArticleCache).order_by(NewsArticleCache.id)] == [1, 3]
+
+        # The unique url_hash index now backs ON CONFLICT
+        result = ingest_articles(session, [row(1, url="https://a.com/x?utm_source=feed")])
+        assert result.refreshed == 1 and session.query(NewsArticleCache).count() == 2
+        session.close()
@@ -0,0 +1,129 @@
+"""
+Certify Intel - Concurrent Scraping Tests (v5.2.1)
+Tests for CompetitorScraper's parallel multi-page mode.
+
+Run with: pytest tests/test_scraper_concurrency.py -v
+"""
+
+import os
+import sys
+import asyncio
+from datetime import datetime
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraper import CompetitorScraper, ScrapedPage
+
+
+# ============== FAKES ==============
+
+class FakePage:
+    async def route(self, pattern, handler):
+        pass
+
+    async def close(self):
+        pass
+
+
+class FakeContext:
+    async def new_page(self):
+        return FakePage()
+
+
+def make_scraper(working_urls, delays=None, concurrency=4):
+    """Scraper whose page fetches succeed only for working_urls."""
+    scraper = CompetitorScraper(concurrent_pages=True, max_concurrency_per_domain=concurrency)
+    delays = delays or {}
+    stats = {"started": [], "cancelled": [], "active": 0, "peak": 0}
+
+    async def fake_scrape(page, url, page_type, competitor_name):
+        stats["started"].append(url)
+        stats["active"] += 1
+        stats["peak"] = max(stats["peak"], stats["active"])
+        try:
+            await asyncio.sleep(delays.get(url, 0.01))
+        except asyncio.CancelledError:
+            stats["cancelled"].append(url)
+            raise
+        finally:
+            stats["active"] -= 1
+        if url not in working_urls:
+            return None
+        return ScrapedPage(
+            url=url, title=url, content="x" * 10, html="",
+            scraped_at=datetime.utcnow(), page_type=page_type
+        )
+
+    scraper._scrape_page_with_retry = fake_scrape
+    return scraper, stats
+
+
+def run_concurrent(scraper, pages):
+    scraped = []
+    asyncio.run(scraper._scrape_pages_concurrently(
+        FakeContext(), "Acme", "acme.com", pages, False, scraped
+    ))
+    return scraped
+
+
+# ============== TESTS ==============
+
+class TestConcurrentScraping:
+    """Tests for first-working-URL semantics and concurrency limits."""
+
+    def test_highest_priority_working_url_wins(self):
+        # /plans finishes first but /pricing has priority and also works
+        scraper, _ = make_scraper(
+            {"https://acme.com/pricing", "https://acme.com/plans"},
+            delays={"https://acme.com/pricing": 0.05, "https://acme.com/plans": 0.0},
+        )
+        scraped = run_concurrent(scraper, ["pricing"])
+        assert [p.url for p in scraped] == ["https://acme.com/pricing"]
+
+    def test_falls_back_to_later_candidate(self):
+        scraper, _ = make_scraper({"https://acme.com/about-us"})
+        scraped = run_concurrent(scraper, ["about"])
+        assert [p.url for p in scraped] == ["https://acme.com/about-us"]
+
+    def test_losing_candidates_cancelled(self):
+        scraper, stats = make_scraper(
+            {"https://acme.com/pricing"},
+            delays={url: 0.2 for url in ["https://acme.com/price", "https://acme.com/packages"]},
+            concurrency=10,
+        )
+        run_concurrent(scraper, ["pricing"])
+        assert "https://acme.com/price" in stats["cancelled"]
+        assert "https://acme.com/packages" in stats["cancelled"]
+
+    def test_domain_concurrency_limit(self):
+        scraper, stats = make_scraper(set(), concurrency=2)
+        run_concurrent(scraper, ["pricing", "about", "customers"])
+        assert stats["peak"] <= 2
+
+    def test_page_types_returned_in_request_order(self):
+        scraper, _ = make_scraper(
+            {"https://acme.com", "https://acme.com/pricing", "https://acme.com/about"},
+            delays={"https://acme.com": 0.05},
+        )
+        scraped = run_concurrent(scraper, ["homepage", "pricing", "about"])
+        assert [p.page_type for p in scraped] == ["homepage", "pricing", "about"]
+
+    def test_shared_url_matches_sequential_mode(self):
+        # /features is a candidate for both page types; products claims it and
+        # features falls back to its next working URL, as in sequential mode
+        working = {"https://acme.com/features", "https://acme.com/functionality"}
+        scraper, stats = make_scraper(working)
+        scraped = run_concurrent(scraper, ["products", "features"])
+        assert [(p.page_type, p.url) for p in scraped] == [
+            ("products", "https://acme.com/features"),
+            ("features", "https://acme.com/functionality"),
+        ]
+        assert stats["started"].count("https://acme.com/features") == 1
+
+        sequential, _ = make_scraper(working)
+        expected = []
+        asyncio.run(sequential._scrape_pages_sequentially(
+            FakeContext(), "Acme", "acme.com", ["products", "features"], False, expected
+        ))
+        assert [(p.page_type, p.url) for p in expected] == [(p.page_type, p.url) for p in scraped]
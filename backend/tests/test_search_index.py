@@ -0,0 +1,115 @@
+"""
+Certify Intel - Full-Text Search Tests (v5.2.1)
+Tests for the FTS5 index triggers, ranking, highlighting and LIKE fallback.
+
+Run with: pytest tests/test_search_index.py -v
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import search_index
+from search_index import ensure_search_index, search, build_match_expression
+
+
+# ============== TEST FIXTURES ==============
+
+@pytest.fixture
+def db(engine, session_factory):
+    """In-memory database with news, knowledge base and change rows; index built afterwards."""
+    from database import NewsArticleCache, KnowledgeBaseItem, DataChangeHistory
+
+    session = session_factory()
+    if not search_index.fts5_available(engine):
+        pytest.skip("SQLite built without FTS5")
+
+    now = datetime.utcnow()
+    session.add_all([
+        NewsArticleCache(competitor_id=1, competitor_name="Phreesia", title="Phreesia launches Epic integration",
+                         snippet="The <b>new</b> connector syncs intake data.", url="https://x/1",
+                         source="Reuters", published_at=now, cache_expires_at=now + timedelta(hours=4)),
+        NewsArticleCache(competitor_id=2, competitor_name="Clearwave", title="Clearwave quarterly results",
+                         snippet="Revenue grew; integrations with Epic expanded.", url="https://x/2",
+                         source="PR Newswire", published_at=now - timedelta(days=1),
+                         cache_expires_at=now + timedelta(hours=4)),
+        KnowledgeBaseItem(title="Battlecard: Phreesia", content_text="Phreesia pricing is per provider per month."),
+        KnowledgeBaseItem(title="Retired note", content_text="Old Phreesia pricing sheet", is_active=False),
+        DataChangeHistory(competitor_id=1, competitor_name="Phreesia", field_name="pricing_model",
+                          old_value="Per provider", new_value="Per visit", changed_by="analyst"),
+    ])
+    session.commit()
+    assert sorted(ensure_search_index(engine)) == ["changes", "knowledge_base", "news"]
+    yield session
+    session.close()
+
+
+# ============== INDEX ==============
+
+class TestSearchIndex:
+    """Existing rows are indexed once; triggers keep the index current."""
+
+    def test_ensure_is_idempotent(self, db):
+        assert ensure_search_index(db.get_bind()) == []
+
+    def test_triggers_follow_writes(self, db):
+        from database import NewsArticleCache
+        from news_ingest import ingest_articles
+
+        ingest_articles(db, [{"competitor_id": 3, "competitor_name": "Kyruus", "url": "https://x/3",
+                              "title": "Kyruus acquires scheduling startup", "snippet": "Deal closes in Q3."}])
+        assert search(db, "scheduling startup")["totals"]["news"] == 1
+
+        article = db.query(NewsArticleCache).filter_by(url="https://x/3").one()
+        article.title = "Kyruus buys telehealth vendor"
+        db.commit()
+        assert search(db, "scheduling startup")["totals"]["news"] == 0
+        assert search(db, "telehealth")["totals"]["news"] == 1
+
+        db.delete(article)
+        db.commit()
+        assert search(db, "telehealth")["totals"]["news"] == 0
+
+
+# ============== QUERIES ==============
+
+class TestSearch:
+    """Ranked, highlighted, filtered results."""
+
+    def test_ranking_and_stemming(self, db):
+        result = search(db, "epic integration", types=["news"])
+        assert result["engine"] == "fts5"
+        # Title match outranks a snippet match; "integrations" matches by stem
+        assert [r["competitor_name"] for r in result["results"]] == ["Phreesia", "Clearwave"]
+        assert result["results"][0]["score"] > result["results"][1]["score"]
+
+    def test_highlighting_escapes_html(self, db):
+        top = search(db, "connector", types=["news"])["results"][0]
+        assert "<mark>connector</mark>" in top["snippet"]
+        assert "&lt;b&gt;new&lt;/b&gt;" in top["snippet"]
+
+    def test_sources_and_filters(self, db):
+        result = search(db, "phreesia pricing")
+        assert result["totals"] == {"news": 0, "knowledge_base": 1, "changes": 1}  # Inactive KB items excluded
+        kb = [r for r in result["results"] if r["type"] == "knowledge_base"]
+        assert kb[0]["title"] == "Battlecard: <mark>Phreesia</mark>"
+
+        changes = search(db, "per visit", types=["changes"], competitor_id=1)
+        assert changes["results"][0]["field_name"] == "pricing_model"
+        assert search(db, "per visit", types=["changes"], competitor_id=2)["totals"]["changes"] == 0
+
+    def test_user_input_is_not_fts_syntax(self, db):
+        assert build_match_expression(["epic", "or"]) == '"epic"* "or"*'
+        assert search(db, 'epic" OR title:* NEAR(')["engine"] == "fts5"
+        assert search(db, "   ")["results"] == []
+
+    def test_like_fallback(self, db, monkeypatch):
+        monkeypatch.setattr(search_index, "index_ready", lambda session: False)
+        result = search(db, "epic integration", types=["news"])
+        assert result["engine"] == "like"
+        assert result["totals"]["news"] == 2
+        assert "<mark>Epic</mark>" in result["results"][0]["title"]
@@ -0,0 +1,118 @@
+"""
+Certify Intel - SQLite Production Profile Tests (v5.2.1)
+Tests for the WAL/pragma connection setup and the batched write queue.
+
+Run with: pytest tests/test_sqlite_profile.py -v
+"""
+
+import os
+import sys
+import threading
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sqlite_profile
+from sqlite_profile import WriteQueue, apply_sqlite_profile, connect_args, current_pragmas
+
+
+# ============== TEST FIXTURES ==============
+
+@pytest.fixture
+def engine(tmp_path):
+    """Profiled engine on a scratch database file (WAL needs a real file)."""
+    pytest.importorskip("sqlalchemy")
+    from sqlalchemy import create_engine
+    from database import Base
+
+    url = f"sqlite:///{tmp_path / 'profile.db'}"
+    engine = create_engine(url, connect_args=connect_args(url, enabled=True))
+    assert apply_sqlite_profile(engine, enabled=True)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+# ============== CONNECTION PROFILE ==============
+
+class TestConnectionProfile:
+    """Pragmas are applied to every connection when the profile is on."""
+
+    def test_pragmas_applied(self, engine):
+        pragmas = current_pragmas(engine)
+        assert pragmas["journal_mode"] == "wal"
+        assert pragmas["synchronous"] == 1  # NORMAL
+        assert pragmas["busy_timeout"] == sqlite_profile.BUSY_TIMEOUT_MS
+        assert pragmas["cache_size"] == -sqlite_profile.CACHE_SIZE_MB * 1024
+
+    def test_disabled_or_not_sqlite(self):
+        from sqlalchemy import create_engine
+        engine = create_engine("sqlite://")
+        assert not apply_sqlite_profile(engine, enabled=False)
+        assert connect_args("sqlite:///x.db", enabled=False) == {"check_same_thread": False}
+        assert connect_args("sqlite:///x.db", enabled=True)["timeout"] == sqlite_profile.BUSY_TIMEOUT_MS / 1000
+        assert connect_args("postgresql://u:p@localhost/certify") == {}
+
+
+# ============== WRITE QUEUE ==============
+
+class TestWriteQueue:
+    """Queued writes share commits; a failing job does not take the batch with it."""
+
+    def _log(self, action_type):
+        from database import ActivityLog
+        return lambda db: db.add(ActivityLog(user_email="bot@example.com", action_type=action_type))
+
+    def _count(self, session_factory):
+        from database import ActivityLog
+        db = session_factory()
+        try:
+            return db.query(ActivityLog).count()
+        finally:
+            db.close()
+
+    def test_burst_is_batched(self, session_factory):
+        writer = WriteQueue(session_factory, batch_size=50, batch_wait_ms=200)
+        futures = [writer.submit(self._log(f"event_{i}")) for i in range(40)]
+        for future in futures:
+            future.result(timeout=5)
+
+        assert self._count(session_factory) == 40
+        assert writer.stats["written"] == 40
+        assert writer.stats["commits"] < 40
+        writer.shutdown()
+
+    def test_failed_job_is_isolated(self, session_factory):
+        writer = WriteQueue(session_factory, batch_size=10, batch_wait_ms=200)
+
+        def broken(db):
+            raise ValueError("bad row")
+
+        ok_before = writer.submit(self._log("before"))
+        bad = writer.submit(broken)
+        ok_after = writer.submit(self._log("after"))
+
+        ok_before.result(timeout=5)
+        ok_after.result(timeout=5)
+        with pytest.raises(ValueError):
+            bad.result(timeout=5)
+        assert self._count(session_factory) == 2
+        assert writer.stats["failed"] == 1
+        writer.shutdown()
+
+    def test_concurrent_submitters_and_shutdown_drains(self, session_factory):
+        writer = WriteQueue(session_factory, batch_size=25, batch_wait_ms=5)
+        threads = [
+            threading.Thread(target=lambda n=n: [writer.submit(self._log(f"t{n}")) for _ in range(20)])
+            for n in range(5)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        writer.shutdown()
+
+        assert self._count(session_factory) == 100
+        with pytest.raises(RuntimeError):
+            writer.submit(self._log("late"))
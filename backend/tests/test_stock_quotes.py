@@ -0,0 +1,187 @@
+"""
+Certify Intel - Stock Quote Service Tests (v5.2.1)
+Tests for batched fetching, market-hours TTL, stale serving and ticker lookup.
+
+Run with: pytest tests/test_stock_quotes.py -v
+"""
+
+import os
+import sys
+import time
+import threading
+from datetime import datetime, timezone
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stock_quotes import (
+    StockQuoteService, FixtureQuoteProvider, QuoteProvider, is_market_open, quote_ttl_seconds
+)
+
+
+FIXTURE = {
+    "PHR": {
+        "symbol": "PHR", "shortName": "Phreesia, Inc.", "longName": "Phreesia, Inc.", "exchange": "NYQ",
+        "currentPrice": 22.0, "previousClose": 20.0, "volume": 1000,
+        "sharesOutstanding": 1000000, "fiftyTwoWeekHigh": 30.0, "fiftyTwoWeekLow": 15.0,
+    },
+    "HCAT": {
+        "symbol": "HCAT", "shortName": "Health Catalyst", "longName": "Health Catalyst, Inc.", "exchange": "NMS",
+        "currentPrice": 5.0, "previousClose": 5.0, "marketCap": 300000000,
+    },
+}
+
+
+class SlowProvider(FixtureQuoteProvider):
+    """Fixture provider whose batched call blocks until released."""
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.release = threading.Event()
+
+    def fetch_quotes(self, symbols):
+        self.release.wait(5)
+        return super().fetch_quotes(symbols)
+
+
+class SlowInfoProvider(FixtureQuoteProvider):
+    """Fixture provider that records how many company info lookups overlap."""
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.active = self.max_active = 0
+        self.lock = threading.Lock()
+
+    def fetch_info(self, symbol):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.05)
+        with self.lock:
+            self.active -= 1
+        return super().fetch_info(symbol)
+
+
+def make_service(provider=None, **kwargs):
+    service = StockQuoteService(provider=provider or FixtureQuoteProvider(FIXTURE), **kwargs)
+    service.open_ttl = 60
+    return service
+
+
+# ============== MARKET HOURS ==============
+
+class TestMarketHours:
+    """TTL follows the NYSE regular session."""
+
+    def test_open_and_closed(self):
+        # 2026-03-04 is a Wednesday; 15:00 UTC = 10:00 New York
+        assert is_market_open(datetime(2026, 3, 4, 15, 0, tzinfo=timezone.utc))
+        assert not is_market_open(datetime(2026, 3, 4, 23, 0, tzinfo=timezone.utc))
+        assert not is_market_open(datetime(2026, 3, 7, 15, 0, tzinfo=timezone.utc))  # Saturday
+
+    def test_ttl(self):
+        assert quote_ttl_seconds(datetime(2026, 3, 4, 15, 0, tzinfo=timezone.utc), 60, 21600) == 60
+        # Friday after close: capped at the closed TTL, not the whole weekend
+        assert quote_ttl_seconds(datetime(2026, 3, 6, 22, 0, tzinfo=timezone.utc), 60, 21600) == 21600
+        # 30 minutes before the open
+        assert quote_ttl_seconds(datetime(2026, 3, 4, 14, 0, tzinfo=timezone.utc), 60, 21600) == 1800
+
+
+# ============== QUOTE SERVICE ==============
+
+class TestStockQuoteService:
+    """Tests for batching, caching and stale serving."""
+
+    def test_one_batched_call_for_all_tickers(self):
+        provider = FixtureQuoteProvider(FIXTURE)
+        service = make_service(provider)
+        quotes = service.get_quotes(["PHR", "hcat", "NOPE", "PHR"])
+
+        assert provider.quote_calls == 1
+        assert quotes["PHR"]["price"] == 22.0
+        assert quotes["PHR"]["change"] == 2.0
+        assert quotes["PHR"]["change_percent"] == 10.0
+        assert quotes["PHR"]["market_cap"] == 22000000  # price * shares outstanding
+        assert quotes["PHR"]["high52"] == 30.0
+        assert quotes["HCAT"]["market_cap"] == 300000000
+        assert quotes["NOPE"] is None
+
+        service.get_quotes(["PHR", "HCAT"])
+        assert provider.quote_calls == 1
+        assert service.stats["fresh_hits"] == 4
+
+    def test_missing_tickers_not_refetched(self):
+        provider = FixtureQuoteProvider(FIXTURE)
+        service = make_service(provider)
+        assert service.get_quote("DELISTED") is None
+        assert service.get_quote("DELISTED") is None
+        assert provider.quote_calls == 1
+        assert service.stats["misses"] == 2
+
+        service._quotes["DELISTED"].expires_at = 0  # Missing entry expired: asked again
+        service.get_quote("DELISTED")
+        assert provider.quote_calls == 2
+
+    def test_stale_served_when_upstream_slow(self):
+        provider = SlowProvider(FIXTURE)
+        provider.release.set()
+        service = make_service(provider, timeout_seconds=0.05)
+        service.get_quote("PHR")
+
+        # Expire the quote, change upstream and make it slow
+        service._quotes["PHR"].expires_at = time.time() - 1
+        provider.release.clear()
+        provider.data["PHR"] = dict(FIXTURE["PHR"], currentPrice=25.0)
+
+        quote = service.get_quote("PHR")
+        assert quote["price"] == 22.0 and quote["stale"] is True
+        assert service.stats["timeouts"] == 1
+
+        # The background refresh lands once upstream answers
+        provider.release.set()
+        deadline = time.time() + 2
+        while service._inflight and time.time() < deadline:
+            time.sleep(0.01)
+        assert service.get_quote("PHR")["price"] == 25.0
+
+    def test_concurrent_requests_share_refresh(self):
+        provider = SlowProvider(FIXTURE)
+        service = make_service(provider, timeout_seconds=2)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(service.get_quote("HCAT"))) for _ in range(4)]
+        for t in threads:
+            t.start()
+        time.sleep(0.05)
+        provider.release.set()
+        for t in threads:
+            t.join()
+
+        assert provider.quote_calls == 1
+        assert all(r["price"] == 5.0 for r in results)
+
+    def test_info_and_lookup(self):
+        provider = FixtureQuoteProvider(FIXTURE)
+        service = make_service(provider)
+
+        info = service.get_info("PHR")
+        assert info["currentPrice"] == 22.0 and info["fiftyTwoWeekLow"] == 15.0
+        assert service.lookup("phr") == {"symbol": "PHR", "exchange": "NYSE", "name": "Phreesia, Inc."}
+
+        # Misses are cached too
+        assert service.lookup("Unknown Health") is None
+        calls = provider.info_calls
+        assert service.lookup("Unknown Health") is None
+        assert provider.info_calls == calls
+
+    def test_profiles_fetched_concurrently(self):
+        provider = SlowInfoProvider(FIXTURE)
+        service = make_service(provider)
+        quotes = service.get_quotes(["PHR", "HCAT"])
+
+        assert provider.max_active == 2
+        assert quotes["PHR"]["market_cap"] == 22000000
+
+    def test_provider_interface_is_abstract(self):
+        with pytest.raises(TypeError):
+            QuoteProvider()
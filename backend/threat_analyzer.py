@@ -8,6 +8,9 @@ from datetime import datetime
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 
+from llm_cache import get_llm_cache
+from metric_values import metric_value
+
 # OpenAI import (optional)
 try:
     from openai import OpenAI
@@ -72,23 +75,31 @@ class ThreatAnalyzer:
         """Use GPT-4 for threat analysis."""
         prompt = self._build_analysis_prompt(competitor)
         
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """You are a competitive intelligence analyst for Certify Health, 
+        system_prompt = """You are a competitive intelligence analyst for Certify Health, 
                         a healthcare technology company specializing in patient intake, eligibility verification, 
                         patient payments, and biometric authentication. Analyze competitors objectively."""
-                    },
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                response_format={"type": "json_object"}
+
+        try:
+            # Unchanged competitor data re-uses the cached assessment
+            content = get_llm_cache().get_or_compute(
+                task_type="threat_analysis",
+                provider="openai",
+                model="gpt-4o-mini",
+                system_prompt=system_prompt,
+                prompt=prompt,
+                json_mode=True,
+                compute=lambda: self.client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.3,
+                    response_format={"type": "json_object"}
+                ).choices[0].message.content,
             )
-            
-            result = json.loads(response.choices[0].message.content)
+
+            result = json.loads(content)
             
             return ThreatAssessment(
                 score=min(100, max(0, result.get("threat_score", 50))),
@@ -124,9 +135,8 @@ class ThreatAnalyzer:
         
         # Factor 2: Customer count (market traction)
         customers = str(competitor.get("customer_count", "0"))
-        customers_clean = ''.join(filter(str.isdigit, customers.split('+')[0].split(',')[0]))
-        if customers_clean:
-            num_customers = int(customers_clean)
+        num_customers = metric_value(competitor, "customer_count")
+        if num_customers is not None:
             if num_customers > 10000:
                 score += 15
                 risks.append(f"Large customer base ({customers})")
@@ -137,10 +147,8 @@ class ThreatAnalyzer:
                 score += 5
         
         # Factor 3: Employee count (execution capacity)
-        employees = str(competitor.get("employee_count", "0"))
-        emp_clean = ''.join(filter(str.isdigit, employees.split('+')[0].split('-')[0]))
-        if emp_clean:
-            num_employees = int(emp_clean)
+        num_employees = metric_value(competitor, "employee_count")
+        if num_employees is not None:
             if num_employees > 1000:
                 score += 10
                 risks.append("Large workforce for rapid execution")